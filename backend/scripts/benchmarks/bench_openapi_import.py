@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+OpenAPI文档导入基准测试
+
+生成合成的 OpenAPI 3 文档（每个操作引用共享的 components/schemas），在临时数据库中测试：
+- 首次导入：全部新建
+- 重复导入：内容摘要一致，全部跳过写入
+- 修改部分操作后导入：只覆盖变更的操作
+输出每一轮的耗时与结果计数，并对比流式解析与一次性加载整个文档的 tracemalloc 峰值内存。
+
+用法（从 backend/ 目录运行）：
+    python scripts/benchmarks/bench_openapi_import.py --operations 5000 --format json
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# 添加项目路径到Python路径；使用临时数据库，不影响开发库
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+_DB_DIR = tempfile.mkdtemp(prefix='bench_openapi_')
+os.environ['DATABASE_PATH'] = os.path.join(_DB_DIR, 'bench.db')
+
+from auto_test.database.connection import init_database, get_db_cursor
+from auto_test.services.openapi_import_service import OpenApiImportService, ijson, yaml
+
+WORDS = ['user', 'order', 'payment', 'product', 'auth', 'report', 'admin', 'search', 'cart', 'invoice']
+METHODS = ['get', 'post', 'put', 'delete', 'patch']
+
+
+def build_spec(operations: int, seed: int = 42) -> dict:
+    """生成含 operations 个操作的 OpenAPI 3 文档"""
+    rng = random.Random(seed)
+    schemas = {}
+    for word in WORDS:
+        schemas[word.title()] = {
+            'type': 'object',
+            'properties': {
+                'id': {'type': 'integer'},
+                'name': {'type': 'string', 'description': f"{word} name"},
+                'items': {'type': 'array', 'items': {'$ref': f"#/components/schemas/{rng.choice(WORDS).title()}Item"}}
+            }
+        }
+        schemas[f"{word.title()}Item"] = {'type': 'object', 'properties': {'sku': {'type': 'string'},
+                                                                          'qty': {'type': 'integer'}}}
+    paths = {}
+    count = 0
+    while count < operations:
+        word = WORDS[len(paths) % len(WORDS)]
+        path = f"/{word}s/{len(paths)}/{{id}}"
+        item = {'parameters': [{'name': 'id', 'in': 'path', 'required': True, 'schema': {'type': 'integer'}}]}
+        for method in METHODS[:min(len(METHODS), operations - count)]:
+            schema_ref = {'$ref': f"#/components/schemas/{rng.choice(WORDS).title()}"}
+            operation = {
+                'summary': f"{method} {word} {len(paths)}",
+                'tags': [word],
+                'responses': {'200': {'description': 'ok', 'content': {
+                    'application/json': {'schema': schema_ref, 'example': {'id': len(paths), 'name': word}}}}}
+            }
+            if method in ('post', 'put', 'patch'):
+                operation['requestBody'] = {'content': {'application/json': {'schema': schema_ref}}}
+            item[method] = operation
+            count += 1
+        paths[path] = item
+    return {'openapi': '3.0.3', 'info': {'title': 'bench', 'version': '1.0.0'},
+            'servers': [{'url': 'https://example.com/api'}], 'paths': paths,
+            'components': {'schemas': schemas}}
+
+
+def encode(spec: dict, spec_format: str) -> bytes:
+    if spec_format == 'json':
+        return json.dumps(spec, ensure_ascii=False).encode('utf-8')
+    return yaml.safe_dump(spec, allow_unicode=True, sort_keys=False).encode('utf-8')
+
+
+def run_import(data: bytes, system_id: int, spec_format: str):
+    start = time.perf_counter()
+    result = OpenApiImportService.import_spec(io.BytesIO(data), system_id, spec_format=spec_format)
+    return time.perf_counter() - start, result
+
+
+def peak_kb(func) -> float:
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAPI文档导入基准测试")
+    parser.add_argument('--operations', type=int, default=5000, help="文档中的操作数")
+    parser.add_argument('--format', choices=['json', 'yaml'], default='json', help="文档格式")
+    parser.add_argument('--changed', type=float, default=0.1, help="第三轮修改的操作比例")
+    args = parser.parse_args()
+    if args.format == 'yaml' and yaml is None:
+        print("需要安装PyYAML")
+        return 1
+
+    init_database()
+    with get_db_cursor() as cursor:
+        cursor.execute("INSERT INTO systems (name, category) VALUES ('bench', 'backend')")
+        system_id = cursor.lastrowid
+
+    spec = build_spec(args.operations)
+    data = encode(spec, args.format)
+    parser_name = ('ijson' if ijson is not None else 'json.load回退') if args.format == 'json' else 'PyYAML事件'
+    print(f"operations={args.operations} format={args.format} size={len(data) / 1024 / 1024:.1f}MB parser={parser_name}")
+    print(f"{'round':<12}{'seconds':>9}{'ops/s':>10}{'new':>7}{'updated':>9}{'unchanged':>11}{'errors':>8}")
+
+    def report(label, elapsed, result):
+        print(f"{label:<12}{elapsed:>9.2f}{result['total'] / elapsed:>10.0f}{result['success_count']:>7}"
+              f"{result['updated_count']:>9}{result['unchanged_count']:>11}{result['error_count']:>8}")
+
+    report('first', *run_import(data, system_id, args.format))
+    report('reimport', *run_import(data, system_id, args.format))
+
+    rng = random.Random(7)
+    operations = [operation for item in spec['paths'].values() for key, operation in item.items() if key in METHODS]
+    for operation in rng.sample(operations, int(len(operations) * args.changed)):
+        operation['description'] = 'changed'
+    changed = encode(spec, args.format)
+    report('changed', *run_import(changed, system_id, args.format))
+
+    # 内存：流式导入（全部未变更，避免写入干扰） vs 一次性加载整个文档
+    streaming = peak_kb(lambda: run_import(changed, system_id, args.format))
+    if args.format == 'json':
+        full = peak_kb(lambda: json.loads(changed))
+    else:
+        full = peak_kb(lambda: yaml.load(changed, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader)))
+    print(f"peak KB: streaming import={streaming:.0f}  full document load only={full:.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
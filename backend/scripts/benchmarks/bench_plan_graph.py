@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+执行计划依赖图基准测试
+
+生成合成计划（每个步骤随机依赖前面若干步骤），对比：
+- 旧实现：list.pop(0) + 每次出队扫描全部步骤的拓扑排序、O(V²)并行标注
+- PlanGraph：邻接表 + deque Kahn排序 + 分层 + 关键路径
+
+用法（从 backend/ 目录运行）：
+    python scripts/benchmarks/bench_plan_graph.py --steps 10000 --max-deps 3
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# 添加项目路径到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from auto_test.agents.plan_graph import PlanGraph
+
+
+def build_steps(count: int, max_deps: int, seed: int = 42):
+    """生成合成计划步骤"""
+    rng = random.Random(seed)
+    steps = []
+    for i in range(count):
+        deps = []
+        if i:
+            for _ in range(rng.randint(0, max_deps)):
+                deps.append(f"step_{rng.randint(max(0, i - 50), i - 1)}")
+        steps.append({
+            'step_id': f"step_{i}",
+            'dependencies': sorted(set(deps)),
+            'timeout': rng.randint(1, 30)
+        })
+    return steps
+
+
+def legacy_topological_sort(steps):
+    """旧的拓扑排序实现（用于对比）"""
+    dependency_graph = {step['step_id']: step['dependencies'] for step in steps}
+    in_degree = {step_id: 0 for step_id in dependency_graph}
+    for step_id, deps in dependency_graph.items():
+        for dep in deps:
+            if dep in in_degree:
+                in_degree[step_id] += 1
+    queue = [step_id for step_id, degree in in_degree.items() if degree == 0]
+    result = []
+    while queue:
+        current = queue.pop(0)
+        result.append(current)
+        for step_id, deps in dependency_graph.items():
+            if current in deps:
+                in_degree[step_id] -= 1
+                if in_degree[step_id] == 0:
+                    queue.append(step_id)
+    return result
+
+
+def legacy_parallel_marking(steps):
+    """旧的并行标注实现（用于对比）"""
+    marks = []
+    for i, step in enumerate(steps):
+        can_parallel = True
+        for j in range(i):
+            prev_step = steps[j]
+            if step['step_id'] in prev_step['dependencies'] or prev_step['step_id'] in step['dependencies']:
+                can_parallel = False
+                break
+        marks.append(can_parallel)
+    return marks
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{label:<32} {elapsed:>10.2f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="执行计划依赖图基准测试")
+    parser.add_argument('--steps', type=int, default=10000, help="步骤数")
+    parser.add_argument('--max-deps', type=int, default=3, help="每个步骤的最大依赖数")
+    parser.add_argument('--legacy', action='store_true', help="同时运行旧实现（大计划下耗时很长）")
+    args = parser.parse_args()
+
+    steps = build_steps(args.steps, args.max_deps)
+    print(f"合成计划: {args.steps}个步骤, 依赖边{sum(len(s['dependencies']) for s in steps)}条\n")
+
+    graph = timed("PlanGraph 建图", PlanGraph.from_steps, steps)
+    timed("PlanGraph 拓扑排序", graph.topological_order)
+    waves = timed("PlanGraph 分层", graph.waves)
+    duration, path = timed("PlanGraph 关键路径", graph.critical_path)
+    timed("PlanGraph 环检测", graph.find_cycle)
+    print(f"\n分层数: {len(waves)}, 最大并行度: {max(len(w) for w in waves)}")
+    print(f"关键路径: {len(path)}个步骤, {duration:.0f}秒 (timeout总和 {sum(graph.durations):.0f}秒)\n")
+
+    if args.legacy:
+        timed("旧实现 拓扑排序", legacy_topological_sort, steps)
+        timed("旧实现 并行标注", legacy_parallel_marking, steps)
+
+    # 环报告
+    steps[10]['dependencies'].append(f"step_{args.steps - 1}")
+    cyclic = PlanGraph.from_steps(steps)
+    cycle = timed("PlanGraph 环检测（含环）", cyclic.find_cycle)
+    print(f"环路径长度: {len(cycle)}")
+
+
+if __name__ == "__main__":
+    main()
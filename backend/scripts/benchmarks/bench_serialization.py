@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+API响应序列化基准测试
+
+生成合成的API接口行（含Service层增强字段），对比列表/导出/系统列表三类接口的序列化：
+- 旧路径：逐行构建 ApiInterface(**api)，FastAPI按 response_model 导出、校验、再编码，
+  最后由标准库 json.dumps 渲染（与 JSONResponse 一致）
+- 快速路径：ResponseShape 按模型字段投影后由 trusted_response（orjson）直接渲染
+
+输出每种路径的耗时与 tracemalloc 峰值内存，并校验两种路径的响应体解析后一致
+（系统列表旧路径为 response_model=dict，信封中没有 "code" 键，比较时忽略该键）。
+
+用法（从 backend/ 目录运行）：
+    python scripts/benchmarks/bench_serialization.py --rows 1000 --repeat 20
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# 添加项目路径到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from pydantic import TypeAdapter
+
+from auto_test.models.api_interface import ApiInterface, ApiInterfaceResponse, ApiInterfaceExportResponse
+from auto_test.models.response import ApiResponseGeneric
+from auto_test.utils.response import ResponseShape, success_response, trusted_response, orjson
+
+METHODS = ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']
+STATUSES = ['active', 'inactive', 'deprecated', 'testing']
+WORDS = ['user', 'order', 'payment', 'product', 'auth', 'report', 'admin', 'search', 'cart', 'invoice']
+
+
+def build_rows(count: int, seed: int = 42):
+    """生成合成的API接口行（DAO列 + Service层增强字段）与系统行"""
+    rng = random.Random(seed)
+    base = datetime(2023, 1, 1)
+    apis, systems = [], []
+    for i in range(count):
+        created = (base + timedelta(minutes=rng.randint(0, 900000))).strftime('%Y-%m-%d %H:%M:%S')
+        updated = (base + timedelta(minutes=rng.randint(0, 900000))).strftime('%Y-%m-%d %H:%M:%S')
+        resource = rng.choice(WORDS)
+        tags = rng.sample(WORDS, rng.randint(0, 3))
+        method = rng.choice(METHODS)
+        status = rng.choice(STATUSES)
+        apis.append({
+            'id': i + 1,
+            'system_id': rng.randint(1, 50),
+            'module_id': rng.randint(1, 200),
+            'name': f"{resource} api {i}",
+            'description': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 10))),
+            'method': method,
+            'path': f"/api/v1/{resource}/{{id}}/items",
+            'version': 'v1',
+            'status': status,
+            'request_format': 'json',
+            'response_format': 'json',
+            'auth_required': rng.randint(0, 1),
+            'rate_limit': 1000,
+            'timeout': 30,
+            'tags': ','.join(tags),
+            'request_schema': {'type': 'object', 'properties': {'id': {'type': 'integer'}}},
+            'response_schema': {'type': 'object', 'properties': {'data': {'type': 'array'}}},
+            'example_request': None,
+            'example_response': '{"code": 0}',
+            'created_at': created,
+            'updated_at': updated,
+            'system_name': f"system {rng.randint(1, 50)}",
+            'module_name': f"module {rng.randint(1, 200)}",
+            # Service层增强字段（不在响应模型中）
+            'enabled': status == 'active',
+            'status_label': status,
+            'method_color': 'success',
+            'tags_list': tags,
+            'full_url': f"http://localhost/api/v1/{resource}/{{id}}/items"
+        })
+        systems.append({
+            'id': i + 1,
+            'name': f"{resource} system {i}",
+            'description': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 10))),
+            'status': status,
+            'category': 'backend',
+            'created_at': created,
+            'updated_at': updated,
+            'status_display': '活跃',
+            'tags_list': tags,
+            'module_count': rng.randint(0, 20),
+            'search_keywords': tags + [resource]
+        })
+    return apis, systems
+
+
+def _render_legacy(content, adapter: TypeAdapter) -> bytes:
+    """模拟FastAPI旧路径：导出模型实例 -> 按response_model校验 -> 编码 -> json.dumps"""
+    data = content.get('data')
+    if hasattr(data, 'model_dump'):
+        content = dict(content, data=data.model_dump(by_alias=True))
+    value = adapter.validate_python(content)
+    encoded = adapter.dump_python(value, mode='json')
+    return json.dumps(encoded, ensure_ascii=False, allow_nan=False, indent=None, separators=(',', ':')).encode('utf-8')
+
+
+def legacy_list(apis, adapter):
+    response = ApiInterfaceResponse(list=[ApiInterface(**api) for api in apis], total=len(apis), page=1, size=1000)
+    return _render_legacy(success_response(data=response, message="获取API接口列表成功"), adapter)
+
+
+def fast_list(apis, shape):
+    data = {'list': shape.rows(apis), 'total': len(apis), 'page': 1, 'size': 1000}
+    return trusted_response(data=data, message="获取API接口列表成功").body
+
+
+def legacy_export(apis, adapter, export_time):
+    response = ApiInterfaceExportResponse(apis=[ApiInterface(**api) for api in apis], total_count=len(apis),
+                                          export_time=export_time)
+    return _render_legacy(success_response(data=response, message="导出数据成功"), adapter)
+
+
+def fast_export(apis, shape, export_time):
+    data = {'apis': shape.rows(apis), 'export_time': export_time, 'total_count': len(apis)}
+    return trusted_response(data=data, message="导出数据成功").body
+
+
+def legacy_systems(systems, adapter):
+    return _render_legacy(success_response(data=systems, message="获取系统列表成功"), adapter)
+
+
+def fast_systems(systems):
+    return trusted_response(data=systems, message="获取系统列表成功").body
+
+
+def measure(label: str, func, repeat: int, rows: int):
+    """返回 (每次耗时ms, 每行耗时µs, 峰值内存KB, 响应体)"""
+    body = func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return label, elapsed * 1000, elapsed / rows * 1e6, peak / 1024, body
+
+
+def _strip_code(body: bytes):
+    payload = json.loads(body)
+    payload.pop('code', None)
+    return payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API响应序列化基准测试")
+    parser.add_argument('--rows', type=int, default=1000, help="每次响应的行数（列表接口上限为1000）")
+    parser.add_argument('--repeat', type=int, default=20, help="每种路径的重复次数")
+    args = parser.parse_args()
+
+    apis, systems = build_rows(args.rows)
+    shape = ResponseShape(ApiInterface)
+    export_time = datetime(2024, 1, 1, 12, 0, 0, 123456)
+    list_adapter = TypeAdapter(ApiResponseGeneric[ApiInterfaceResponse])
+    export_adapter = TypeAdapter(ApiResponseGeneric[ApiInterfaceExportResponse])
+    dict_adapter = TypeAdapter(dict)
+
+    print(f"rows={args.rows} repeat={args.repeat} orjson={'yes' if orjson is not None else 'no (stdlib fallback)'}")
+    print(f"{'endpoint':<14}{'path':<8}{'ms/resp':>10}{'µs/row':>10}{'peak KB':>11}{'speedup':>9}")
+
+    scenarios = [
+        ('list', lambda: legacy_list(apis, list_adapter), lambda: fast_list(apis, shape), json.loads),
+        ('export', lambda: legacy_export(apis, export_adapter, export_time),
+         lambda: fast_export(apis, shape, export_time), json.loads),
+        ('systems', lambda: legacy_systems(systems, dict_adapter), lambda: fast_systems(systems), _strip_code),
+    ]
+    mismatches = 0
+    for name, legacy, fast, parse in scenarios:
+        old = measure('legacy', legacy, args.repeat, args.rows)
+        new = measure('fast', fast, args.repeat, args.rows)
+        for label, ms, us, peak, _ in (old, new):
+            speedup = f"{old[1] / ms:.2f}x" if label == 'fast' else ''
+            print(f"{name:<14}{label:<8}{ms:>10.2f}{us:>10.2f}{peak:>11.1f}{speedup:>9}")
+        if parse(old[4]) != parse(new[4]):
+            mismatches += 1
+            print(f"  !! {name}: 响应体不一致")
+
+    print("输出一致" if not mismatches else f"{mismatches} 个接口输出不一致")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
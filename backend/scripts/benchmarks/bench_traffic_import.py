@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+流量回放导入基准测试
+
+在临时数据库中注册一批接口，生成合成的组合格式访问日志（或HAR文件），测试：
+- 首次导入：每种新形状新建一条测试API
+- 重复导入：形状全部已存在，不再写库；分别用单进程与多进程解析，对比耗时与吞吐
+输出每一轮的耗时、吞吐与结果计数，以及主进程 tracemalloc 峰值内存（与文件大小无关）。
+
+用法（从 backend/ 目录运行）：
+    python scripts/benchmarks/bench_traffic_import.py --lines 1000000 --workers 4
+    python scripts/benchmarks/bench_traffic_import.py --lines 100000 --format har
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# 添加项目路径到Python路径；使用临时数据库，不影响开发库
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+_DB_DIR = tempfile.mkdtemp(prefix='bench_traffic_')
+os.environ['DATABASE_PATH'] = os.path.join(_DB_DIR, 'bench.db')
+
+from auto_test.database.connection import init_database, get_db_cursor
+from auto_test.services.api_import_service import ApiImportService
+from auto_test.services.traffic_import_service import TrafficImportService
+
+WORDS = ['user', 'order', 'payment', 'product', 'auth', 'report', 'admin', 'search', 'cart', 'invoice']
+
+
+def register_apis(count: int) -> list:
+    """注册 count 个接口（列表与详情交替），返回 (方法, 路径) 列表"""
+    with get_db_cursor() as cursor:
+        cursor.execute("INSERT INTO systems (name, category) VALUES ('bench', 'backend')")
+        system_id = cursor.lastrowid
+        cursor.execute("INSERT INTO modules (system_id, name) VALUES (?, 'bench')", (system_id,))
+        module_id = cursor.lastrowid
+    routes = []
+    for index in range(count):
+        word = WORDS[index % len(WORDS)]
+        path = f"/{word}s/{index}" if index % 2 == 0 else f"/{word}s/{index}/{{id}}"
+        routes.append(('GET' if index % 3 else 'POST', path))
+    rows = [dict(system_id=system_id, module_id=module_id, name=f"api {index}", method=method, path=path, version='v1')
+            for index, (method, path) in enumerate(routes)]
+    ApiImportService.import_rows(rows, False)
+    return routes
+
+
+def concrete(rng: random.Random, path: str) -> str:
+    return path.replace('{id}', str(rng.randint(1, 100000)))
+
+
+def write_log(path: str, routes: list, lines: int, unmatched: float, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        for index in range(lines):
+            if rng.random() < unmatched:
+                method, url = 'GET', f"/static/{rng.randint(1, 50)}.js"
+            else:
+                method, route = rng.choice(routes)
+                url = concrete(rng, route)
+            if rng.random() < 0.3:
+                url += f"?page={rng.randint(1, 9)}" + ('&size=20' if rng.random() < 0.5 else '')
+            second = index // 50
+            f.write(f'10.0.{rng.randint(0, 3)}.{rng.randint(1, 250)} - - '
+                    f'[19/Oct/2026:{10 + second // 3600 % 12:02d}:{second // 60 % 60:02d}:{second % 60:02d} +0000] '
+                    f'"{method} {url} HTTP/1.1" {rng.choice((200, 200, 200, 404, 500))} 512 "-" "bench"\n')
+
+
+def write_har(path: str, routes: list, entries: int, unmatched: float, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"log": {"version": "1.2", "creator": {"name": "bench"}, "entries": [')
+        for index in range(entries):
+            if rng.random() < unmatched:
+                method, url = 'GET', f"/static/{rng.randint(1, 50)}.js"
+            else:
+                method, route = rng.choice(routes)
+                url = concrete(rng, route)
+            entry = {
+                'startedDateTime': f"2026-10-19T10:{index // 60000 % 60:02d}:{index // 1000 % 60:02d}.000Z",
+                'pageref': f"page_{index // 20}",
+                'request': {'method': method, 'url': f"https://bench.example.com{url}",
+                            'headers': [{'name': 'Accept', 'value': 'application/json'}], 'queryString': []},
+                'response': {'status': 200, 'content': {'mimeType': 'application/json',
+                                                        'text': json.dumps({'id': index, 'name': 'x'})}}
+            }
+            if method == 'POST':
+                entry['request']['postData'] = {'mimeType': 'application/json',
+                                                'text': json.dumps({'name': 'x', 'qty': rng.randint(1, 5)})}
+            f.write((',' if index else '') + json.dumps(entry))
+        f.write(']}}')
+
+
+def run_import(path: str, traffic_format: str, workers: int):
+    with open(path, 'rb') as source:
+        start = time.perf_counter()
+        result = TrafficImportService.import_traffic(source, traffic_format, workers=workers)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="流量回放导入基准测试")
+    parser.add_argument('--lines', type=int, default=200000, help="日志行数 / HAR条目数")
+    parser.add_argument('--apis', type=int, default=500, help="注册的接口数")
+    parser.add_argument('--format', choices=['log', 'har'], default='log', help="流量格式")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="多进程轮次的解析进程数")
+    parser.add_argument('--unmatched', type=float, default=0.1, help="未注册路径的请求比例")
+    args = parser.parse_args()
+
+    init_database()
+    routes = register_apis(args.apis)
+    path = os.path.join(_DB_DIR, f"traffic.{args.format}")
+    (write_log if args.format == 'log' else write_har)(path, routes, args.lines, args.unmatched)
+    print(f"lines={args.lines} apis={args.apis} format={args.format} size={os.path.getsize(path) / 1024 / 1024:.1f}MB")
+    print(f"{'round':<14}{'seconds':>9}{'req/s':>10}{'matched':>9}{'shapes':>8}{'created':>9}{'existing':>10}")
+
+    def report(label, elapsed, result):
+        print(f"{label:<14}{elapsed:>9.2f}{result['total'] / elapsed:>10.0f}{result['matched']:>9}"
+              f"{result['shapes']:>8}{result['test_apis_created']:>9}{result['test_apis_existing']:>10}")
+
+    # 重复导入时形状全部已存在、不写库，用于对比解析进程数
+    report('first', *run_import(path, args.format, args.workers))
+    report('reimport w=1', *run_import(path, args.format, 1))
+    report(f"reimport w={args.workers}", *run_import(path, args.format, args.workers))
+
+    tracemalloc.start()
+    run_import(path, args.format, args.workers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"peak KB (main process): {peak / 1024:.0f}  file KB: {os.path.getsize(path) / 1024:.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
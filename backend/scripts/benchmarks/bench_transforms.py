@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+系统/模块转换器基准测试
+
+生成合成的DAO原始行，对比：
+- 旧实现：pipe串联多个步骤，每步 dict.copy()，时间字段重复解析，状态映射每行重建，
+  之后业务规则再复制一次
+- 单遍实现：SystemTransform / ModuleTransform 每行只构建一次响应字典，业务规则原地写入
+
+同时校验两种实现的输出一致（search_keywords按集合比较）。
+
+用法（从 backend/ 目录运行）：
+    python scripts/benchmarks/bench_transforms.py --rows 100000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+# 添加项目路径到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from auto_test.transforms import SystemTransform, ModuleTransform
+from auto_test.transforms.utils import pipe, format_datetime, safe_int, safe_str, parse_tags, create_key
+
+STATUSES = ['active', 'inactive', 'development', 'testing', 'production', 'maintenance', 'deprecated', 'enabled']
+WORDS = ['user', 'order', 'payment', 'web', 'portal', 'api', 'service', 'data', 'admin', 'monitor', 'core', 'gateway']
+TAGS = ['api', 'ui', 'order', 'payment', 'dev', 'prod', 'auth', 'login', 'report']
+
+
+def build_rows(count: int, seed: int = 42):
+    """生成合成的系统与模块原始行"""
+    rng = random.Random(seed)
+    base = datetime(2023, 1, 1)
+    systems, modules = [], []
+    for i in range(count):
+        created = (base + timedelta(minutes=rng.randint(0, 900000))).strftime('%Y-%m-%d %H:%M:%S')
+        updated = (base + timedelta(minutes=rng.randint(0, 900000))).strftime('%Y-%m-%d %H:%M:%S')
+        description = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 12)))
+        if rng.random() < 0.3:
+            description += f" v{rng.randint(1, 9)}.{rng.randint(0, 9)}.{rng.randint(0, 9)}"
+        systems.append({
+            'id': i + 1,
+            'name': f"{rng.choice(WORDS)} system {i}",
+            'description': description,
+            'status': rng.choice(STATUSES),
+            'category': 'custom',
+            'created_at': created,
+            'updated_at': updated
+        })
+        modules.append({
+            'id': i + 1,
+            'system_id': rng.randint(1, 100),
+            'name': f"{rng.choice(WORDS)} module {i}",
+            'description': description,
+            'status': rng.choice(STATUSES),
+            'tags': ','.join(rng.sample(TAGS, rng.randint(0, 4))),
+            'created_at': created,
+            'updated_at': updated
+        })
+    return systems, modules
+
+
+# ---------------------------------------------------------------------------
+# 旧实现（用于对比）
+# ---------------------------------------------------------------------------
+
+def _legacy_status(row, status_map):
+    enhanced = row.copy()
+    status = safe_str(row.get('status', 'active'))
+    info = status_map.get(status, {'display': '未知', 'color': 'secondary', 'icon': 'question-circle'})
+    enhanced['status_display'] = info['display']
+    enhanced['status_color'] = info['color']
+    enhanced['status_icon'] = info['icon']
+    enhanced['enabled'] = status == 'active'
+    return enhanced
+
+
+def _legacy_status_map(with_maintenance):
+    status_map = {
+        'enabled': {'display': '启用', 'color': 'success', 'icon': 'check-circle'},
+        'disabled': {'display': '禁用', 'color': 'danger', 'icon': 'times-circle'},
+        'active': {'display': '活跃', 'color': 'success', 'icon': 'check-circle'},
+        'inactive': {'display': '非活跃', 'color': 'warning', 'icon': 'pause-circle'},
+        'development': {'display': '开发中', 'color': 'info', 'icon': 'code'},
+        'testing': {'display': '测试中', 'color': 'primary', 'icon': 'test-tube'},
+        'production': {'display': '生产环境', 'color': 'success', 'icon': 'server'},
+        'deprecated': {'display': '已废弃', 'color': 'danger', 'icon': 'archive'}
+    }
+    if with_maintenance:
+        status_map['maintenance'] = {'display': '维护中', 'color': 'warning', 'icon': 'wrench'}
+    return status_map
+
+
+def _legacy_timestamps(row):
+    enhanced = row.copy()
+    for key, date_key in (('created_at', 'created_date'), ('updated_at', 'updated_date')):
+        if row.get(key):
+            enhanced[f'{key}_formatted'] = format_datetime(row[key])
+            enhanced[date_key] = format_datetime(row[key], '%Y-%m-%d')
+    return enhanced
+
+
+def _legacy_type(name, type_keywords):
+    if not name:
+        return 'unknown'
+    for kind, keywords in type_keywords.items():
+        if any(keyword in name for keyword in keywords):
+            return kind
+    return 'general'
+
+
+def legacy_system_business(system):
+    enhanced = system.copy()
+    enhanced['system_key'] = create_key('SYS', safe_int(system.get('id')))
+    enhanced['is_active'] = system.get('status') == 'active'
+    enhanced['system_type'] = _legacy_type(safe_str(system.get('name', '')).lower(), {
+        'web': ['web', 'website', 'portal', 'frontend'],
+        'api': ['api', 'service', 'backend', 'server'],
+        'mobile': ['mobile', 'app', 'android', 'ios'],
+        'desktop': ['desktop', 'client', 'application'],
+        'database': ['database', 'db', 'data', 'storage'],
+        'microservice': ['micro', 'service', 'ms'],
+        'admin': ['admin', 'management', 'console'],
+        'monitoring': ['monitor', 'log', 'metric', 'alert']
+    })
+    enhanced['priority'] = {'production': 5, 'active': 4, 'testing': 3, 'development': 2,
+                            'maintenance': 1, 'inactive': 1, 'deprecated': 0}.get(system.get('status'), 1)
+    description = system.get('description', '')
+    version = 'unknown'
+    if description:
+        for pattern in [r'v(\d+\.\d+\.\d+)', r'version\s+(\d+\.\d+\.\d+)', r'(\d+\.\d+\.\d+)',
+                        r'v(\d+\.\d+)', r'version\s+(\d+\.\d+)', r'(\d+\.\d+)']:
+            match = re.search(pattern, description.lower())
+            if match:
+                version = match.group(1)
+                break
+    enhanced['version'] = version
+    return enhanced
+
+
+def legacy_system_timestamps(system):
+    enhanced = _legacy_timestamps(system)
+    if system.get('created_at'):
+        try:
+            created = datetime.fromisoformat(str(system['created_at']).replace('Z', '+00:00'))
+            age_days = (datetime.now() - created).days
+            enhanced['system_age_days'] = age_days
+            enhanced['system_age_display'] = SystemTransform._format_age(age_days)
+        except Exception:
+            enhanced['system_age_days'] = 0
+            enhanced['system_age_display'] = '未知'
+    return enhanced
+
+
+def legacy_system_computed(system):
+    enhanced = system.copy()
+    description = safe_str(system.get('description', ''))
+    name = safe_str(system.get('name', ''))
+    status = safe_str(system.get('status', ''))
+    enhanced['description_length'] = len(description)
+    enhanced['has_description'] = len(description) > 0
+    enhanced['name_length'] = len(name)
+    keywords = name.split() + description.split() + ([status] if status else [])
+    enhanced['search_keywords'] = list(set(k.lower() for k in keywords if k))
+    score = 50 + {'production': 30, 'active': 25, 'testing': 15, 'development': 10, 'maintenance': 5,
+                  'inactive': -10, 'deprecated': -20}.get(safe_str(system.get('status', 'active')), 0)
+    score += 10 if len(description) > 50 else 5 if len(description) > 20 else 0
+    score += 10 if len(name) > 3 and not name.isdigit() else 0
+    enhanced['health_score'] = max(0, min(100, score))
+    return enhanced
+
+
+def legacy_system(system):
+    return pipe(
+        system,
+        legacy_system_business,
+        legacy_system_timestamps,
+        lambda row: _legacy_status(row, _legacy_status_map(True)),
+        legacy_system_computed
+    )
+
+
+def legacy_module_business(module):
+    enhanced = module.copy()
+    enhanced['module_key'] = create_key(safe_int(module.get('system_id')), safe_int(module.get('id')))
+    enhanced['is_active'] = module.get('status') == 'active'
+    enhanced['module_type'] = _legacy_type(safe_str(module.get('name', '')).lower(), {
+        'api': ['api', 'interface', 'endpoint'],
+        'ui': ['ui', 'page', 'view', 'component'],
+        'service': ['service', 'business', 'logic'],
+        'data': ['data', 'database', 'model'],
+        'util': ['util', 'helper', 'tool'],
+        'test': ['test', 'spec', 'mock']
+    })
+    enhanced['priority'] = {'production': 5, 'active': 4, 'testing': 3, 'development': 2,
+                            'inactive': 1, 'deprecated': 0}.get(module.get('status'), 1)
+    return enhanced
+
+
+def legacy_module_tags(module):
+    enhanced = module.copy()
+    tags = parse_tags(safe_str(module.get('tags', '')))
+    enhanced['tags_list'] = tags
+    enhanced['tags_count'] = len(tags)
+    enhanced['has_tags'] = len(tags) > 0
+    categories = {'technology': [], 'business': [], 'environment': [], 'other': []}
+    for tag in tags:
+        lower = tag.lower()
+        if any(k in lower for k in ['api', 'ui', 'backend', 'frontend', 'database', 'service']):
+            categories['technology'].append(tag)
+        elif any(k in lower for k in ['user', 'order', 'payment', 'product', 'customer']):
+            categories['business'].append(tag)
+        elif any(k in lower for k in ['dev', 'test', 'prod', 'staging', 'local']):
+            categories['environment'].append(tag)
+        else:
+            categories['other'].append(tag)
+    enhanced['tag_categories'] = {k: v for k, v in categories.items() if v}
+    return enhanced
+
+
+def legacy_module_computed(module):
+    enhanced = module.copy()
+    description = safe_str(module.get('description', ''))
+    name = safe_str(module.get('name', ''))
+    enhanced['description_length'] = len(description)
+    enhanced['has_description'] = len(description) > 0
+    enhanced['name_length'] = len(name)
+    keywords = name.split() + description.split() + parse_tags(safe_str(module.get('tags', '')))
+    enhanced['search_keywords'] = list(set(k.lower() for k in keywords if k))
+    return enhanced
+
+
+def legacy_module(module):
+    return pipe(
+        module,
+        legacy_module_business,
+        _legacy_timestamps,
+        legacy_module_tags,
+        lambda row: _legacy_status(row, _legacy_status_map(False)),
+        legacy_module_computed
+    )
+
+
+# ---------------------------------------------------------------------------
+
+
+def normalize(row):
+    return {**row, 'search_keywords': sorted(row['search_keywords'])}
+
+
+def timed(label, func, rows):
+    start = time.perf_counter()
+    result = func(rows)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:>10.1f} ms   {elapsed * 1e6 / len(rows):>7.2f} µs/行")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="系统/模块转换器基准测试")
+    parser.add_argument('--rows', type=int, default=100000, help="行数")
+    args = parser.parse_args()
+
+    systems, modules = build_rows(args.rows)
+    print(f"合成数据: 系统{len(systems)}行, 模块{len(modules)}行\n")
+
+    legacy_systems, legacy_sys_time = timed("旧实现 系统", lambda rows: [legacy_system(r) for r in rows], systems)
+    new_systems, new_sys_time = timed("单遍实现 系统", SystemTransform.to_list_response, systems)
+    legacy_modules, legacy_mod_time = timed("旧实现 模块", lambda rows: [legacy_module(r) for r in rows], modules)
+    new_modules, new_mod_time = timed("单遍实现 模块", ModuleTransform.to_list_response, modules)
+
+    print(f"\n加速比: 系统 {legacy_sys_time / new_sys_time:.2f}x, 模块 {legacy_mod_time / new_mod_time:.2f}x")
+
+    mismatches = sum(1 for a, b in zip(legacy_systems, new_systems) if normalize(a) != normalize(b))
+    mismatches += sum(1 for a, b in zip(legacy_modules, new_modules) if normalize(a) != normalize(b))
+    print(f"输出一致性: {'一致' if mismatches == 0 else f'{mismatches}行不一致'}")
+
+
+if __name__ == "__main__":
+    main()
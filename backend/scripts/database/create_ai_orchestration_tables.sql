@@ -71,7 +71,9 @@ CREATE TABLE api_orchestration_plans (
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     last_executed_at DATETIME NULL,
-    last_execution_status TEXT DEFAULT 'never' CHECK (last_execution_status IN ('success','failed','running','never'))
+    last_execution_status TEXT DEFAULT 'never' CHECK (last_execution_status IN ('success','failed','running','never')),
+    plan_hash TEXT NULL,         -- execution_plan的内容哈希
+    compiled_plan TEXT NULL      -- 编译产物（校验结果、依赖图分析、API绑定），按plan_hash失效
 );
 
 -- 创建索引
@@ -154,6 +156,25 @@ CREATE INDEX idx_execution_metrics_step_id ON execution_metrics(step_id);
 CREATE INDEX idx_execution_metrics_metric_name ON execution_metrics(metric_name);
 CREATE INDEX idx_execution_metrics_timestamp ON execution_metrics(timestamp);
 
+-- ========================================
+-- 7. LLM响应缓存表 (llm_response_cache)
+-- ========================================
+DROP TABLE IF EXISTS llm_response_cache;
+CREATE TABLE llm_response_cache (
+    cache_key TEXT PRIMARY KEY,
+    model_name TEXT NOT NULL,
+    temperature REAL NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    response_text TEXT NOT NULL,
+    hit_count INTEGER DEFAULT 0,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    last_accessed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 创建索引
+CREATE INDEX idx_llm_response_cache_created_at ON llm_response_cache(created_at);
+CREATE INDEX idx_llm_response_cache_last_accessed_at ON llm_response_cache(last_accessed_at);
+
 -- ========================================
 -- 初始化MCP工具配置数据
 -- ========================================
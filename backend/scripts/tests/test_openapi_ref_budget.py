@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+测试OpenAPI导入的 $ref 展开预算：逐层双倍引用的链条不会指数膨胀，普通引用仍完整展开
+"""
+import json
+import os
+import sys
+
+# 添加项目路径到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from auto_test.services.openapi_import_service import SpecMapper, _MAX_REF_NODES
+
+
+def map_operation(schemas: dict, root: str) -> dict:
+    """映射一个请求体引用 root 的POST操作，返回接口数据"""
+    sections = {'openapi': '3.0.0', 'info': {'title': 'bench', 'version': '1'}, 'components': {'schemas': schemas}}
+    item = {'post': {
+        'summary': 'create',
+        'requestBody': {'content': {'application/json': {'schema': {'$ref': f"#/components/schemas/{root}"}}}},
+        'responses': {'200': {'description': 'ok'}}
+    }}
+    mapper = SpecMapper(sections, system_id=1)
+    return next(data for data, _, _ in mapper.iter_operations('/items', item))
+
+
+def count_nodes(node) -> int:
+    if isinstance(node, dict):
+        return 1 + sum(count_nodes(value) for value in node.values())
+    if isinstance(node, list):
+        return 1 + sum(count_nodes(value) for value in node)
+    return 1
+
+
+def test_doubling_ref_chain_is_bounded():
+    """每层引用上一层两次的32层链条：展开节点数受预算限制，多出部分保留为 $ref"""
+    schemas = {'S0': {'type': 'string'}}
+    for level in range(1, 33):
+        child = {'$ref': f"#/components/schemas/S{level - 1}"}
+        schemas[f"S{level}"] = {'type': 'object', 'properties': {'a': child, 'b': child}}
+
+    data = map_operation(schemas, 'S32')
+    assert count_nodes(data['request_schema']) <= _MAX_REF_NODES + 100
+    assert len(json.dumps(data['request_schema'])) < 1024 * 1024
+    assert '"$ref"' in json.dumps(data['request_schema'])
+
+
+def test_regular_refs_are_inlined():
+    """普通嵌套引用完整展开，循环引用保留为 $ref"""
+    schemas = {
+        'Address': {'type': 'object', 'properties': {'city': {'type': 'string'}}},
+        'User': {'type': 'object', 'properties': {
+            'home': {'$ref': '#/components/schemas/Address'},
+            'work': {'$ref': '#/components/schemas/Address'},
+            'manager': {'$ref': '#/components/schemas/User'}
+        }}
+    }
+    body = map_operation(schemas, 'User')['request_schema']['body']
+    assert body['properties']['home'] == schemas['Address']
+    assert body['properties']['work'] == schemas['Address']
+    assert body['properties']['manager'] == {'$ref': '#/components/schemas/User'}
+
+
+if __name__ == "__main__":
+    test_doubling_ref_chain_is_bounded()
+    test_regular_refs_are_inlined()
+    print("$ref展开预算测试通过")
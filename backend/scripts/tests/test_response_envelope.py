@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+测试快速响应路径（trusted_response）的信封与 ApiResponseGeneric 序列化结果一致
+"""
+import json
+import os
+import sys
+
+# 添加项目路径到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from auto_test.models.api_interface import ApiInterface, ApiInterfaceResponse
+from auto_test.models.response import ApiResponseGeneric
+from auto_test.utils.response import ResponseShape, trusted_response
+
+API_ROW = {
+    'id': 1, 'system_id': 1, 'module_id': 1, 'name': 'get user', 'description': None,
+    'method': 'GET', 'path': '/users/{id}', 'version': 'v1', 'status': 'active',
+    'request_format': 'json', 'response_format': 'json', 'auth_required': 0,
+    'rate_limit': 1000, 'timeout': 30, 'tags': 'user',
+    'request_schema': None, 'response_schema': None, 'example_request': None, 'example_response': None,
+    'created_at': '2024-01-01 12:00:00', 'updated_at': '2024-01-02 08:30:00',
+    # Service层增强字段（不在响应模型中）
+    'system_name': '用户管理系统', 'tags_list': ['user']
+}
+
+
+def model_body(model, data, message: str) -> dict:
+    return model(success=True, message=message, data=data).model_dump(mode='json')
+
+
+def test_detail_envelope_matches_model():
+    """详情：快速路径响应体与 ApiResponseGeneric[ApiInterface] 一致（含 "code": null）"""
+    body = json.loads(trusted_response(data=ResponseShape(ApiInterface).row(API_ROW), message="ok").body)
+    assert body == model_body(ApiResponseGeneric[ApiInterface], ApiInterface(**API_ROW), "ok")
+    assert 'code' in body and body['code'] is None
+
+
+def test_empty_data_envelope_matches_model():
+    """无数据：data 与 code 键同样输出为 null"""
+    body = json.loads(trusted_response(message="ok").body)
+    assert body == model_body(ApiResponseGeneric[ApiInterface], None, "ok")
+
+
+def test_list_envelope_matches_model():
+    """列表：快速路径响应体与 ApiResponseGeneric[ApiInterfaceResponse] 一致"""
+    rows = ResponseShape(ApiInterface).rows([API_ROW])
+    body = json.loads(trusted_response(data={'list': rows, 'total': 1, 'page': 1, 'size': 20}, message="ok").body)
+    expected = ApiInterfaceResponse(list=[ApiInterface(**API_ROW)], total=1, page=1, size=20)
+    assert body == model_body(ApiResponseGeneric[ApiInterfaceResponse], expected, "ok")
+
+
+if __name__ == "__main__":
+    test_detail_envelope_matches_model()
+    test_empty_data_envelope_matches_model()
+    test_list_envelope_matches_model()
+    print("响应信封一致性测试通过")
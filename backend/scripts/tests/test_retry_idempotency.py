@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+测试工具重试的幂等性约束：对返回5xx的服务，POST只发送一次，GET按策略重试
+"""
+import asyncio
+import os
+import sys
+
+# 添加项目路径到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from aiohttp import web
+
+from auto_test.mcp.executor import ToolExecutor
+from auto_test.mcp.resilience import resilience_registry
+from auto_test.mcp.tools.http_pool import http_session_pool
+from auto_test.mcp.tools.http_tools import HttpTools
+
+MAX_RETRIES = 3
+
+
+async def count_requests(method: str, context: dict = None) -> int:
+    """启动返回500的本地服务，执行一次http_request工具，返回服务端收到的请求数"""
+    hits = []
+
+    async def handler(request):
+        hits.append(request.method)
+        return web.json_response({'error': 'boom'}, status=500)
+
+    app = web.Application()
+    app.router.add_route('*', '/orders', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    resilience_registry.reset()
+    executor = ToolExecutor({'retry_policy': {'type': 'fixed', 'delay': 0}, 'max_retries': MAX_RETRIES})
+    try:
+        result = await executor.execute_tool(
+            'http_request', {'implementation': HttpTools.http_request},
+            {'method': method, 'url': f"http://127.0.0.1:{port}/orders", 'body': {'qty': 1}},
+            dict(context or {})
+        )
+        assert result['status_code'] == 500
+    finally:
+        await http_session_pool.close()
+        await runner.cleanup()
+        resilience_registry.reset()
+    return len(hits)
+
+
+def test_post_to_5xx_is_sent_once():
+    """POST请求返回5xx时不重放"""
+    assert asyncio.run(count_requests('POST')) == 1
+
+
+def test_get_to_5xx_is_retried():
+    """GET请求返回5xx时按策略重试"""
+    assert asyncio.run(count_requests('GET')) == MAX_RETRIES + 1
+
+
+def test_post_retry_requires_opt_in():
+    """步骤级显式开启后，POST请求才会重试"""
+    assert asyncio.run(count_requests('POST', {'retry_non_idempotent': True})) == MAX_RETRIES + 1
+
+
+if __name__ == "__main__":
+    test_post_to_5xx_is_sent_once()
+    test_get_to_5xx_is_retried()
+    test_post_retry_requires_opt_in()
+    print("重试幂等性测试通过")
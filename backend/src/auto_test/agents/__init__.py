@@ -10,16 +10,27 @@ AI Agent层是平台的"大脑"，负责理解、规划和决策，包括：
 - IntentParser: 意图理解组件
 - FlowPlanner: 流程规划组件  
 - ExecutionEngine: 执行引擎组件
+- AgentPool: 应用级共享的Agent与LLM客户端
 """
 
-from .base_agent import BaseAgent
-from .intent_parser import IntentParser
-from .flow_planner import FlowPlanner
-from .execution_engine import ExecutionEngine
+from importlib import import_module
 
-__all__ = [
-    'BaseAgent',
-    'IntentParser',
-    'FlowPlanner',
-    'ExecutionEngine'
-]
\ No newline at end of file
+# 导出项按需加载：Agent组件依赖LLM客户端（langchain_openai），
+# 纯逻辑子模块（param_template、plan_graph、admission）需在未安装LLM依赖时也可导入
+_EXPORTS = {
+    'BaseAgent': '.base_agent',
+    'IntentParser': '.intent_parser',
+    'FlowPlanner': '.flow_planner',
+    'ExecutionEngine': '.execution_engine',
+    'AgentPool': '.pool',
+    'agent_pool': '.pool'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
@@ -0,0 +1,251 @@
+"""执行准入控制
+
+执行引擎此前为每个执行请求直接创建后台任务，突发请求下任务数、数据库争用和目标系统压力都不受控。
+准入控制器在启动执行前统一排队：
+- 全局并发上限（MAX_CONCURRENT_EXECUTIONS）与按系统的并发上限
+- 待执行队列按优先级（context.priority）出队，同优先级先到先执行
+- 队列已满时拒绝新执行，由API层返回429与Retry-After
+- 队列深度、排队等待时间、拒绝次数等指标
+
+说明：并发上限用计数器实现而非asyncio.Semaphore，Semaphore只能按到达顺序唤醒，
+无法按优先级出队，也无法在某个系统已满时让其他系统的执行越过它先启动。
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from typing import Dict, Any, Optional, Iterable, List, Callable, Awaitable
+
+from ..config import get_config
+from ..mcp.metrics import LatencyHistogram
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 优先级名称 -> 排序值（越小越优先）
+PRIORITY_LEVELS = {'critical': 0, 'urgent': 0, 'high': 1, 'medium': 2, 'normal': 2, 'low': 3}
+DEFAULT_PRIORITY = 2
+
+
+def priority_rank(priority: Any) -> int:
+    """将context.priority转换为排序值，支持high/medium/low或整数（越小越优先）"""
+    if isinstance(priority, bool) or priority is None:
+        return DEFAULT_PRIORITY
+    if isinstance(priority, (int, float)):
+        return int(priority)
+    return PRIORITY_LEVELS.get(str(priority).strip().lower(), DEFAULT_PRIORITY)
+
+
+class AdmissionRejectedError(Exception):
+    """待执行队列已满，拒绝新执行"""
+
+    def __init__(self, queue_depth: int, retry_after: int):
+        self.queue_depth = queue_depth
+        self.retry_after = retry_after
+        super().__init__(f"执行队列已满（{queue_depth}个待执行），请{retry_after}秒后重试")
+
+
+class _Ticket:
+    """待执行项"""
+
+    __slots__ = ('execution_id', 'rank', 'system_ids', 'start', 'enqueued_at')
+
+    def __init__(self, execution_id: str, rank: int, system_ids: List[int],
+                 start: Callable[[], Awaitable[Any]]):
+        self.execution_id = execution_id
+        self.rank = rank
+        self.system_ids = system_ids
+        self.start = start
+        self.enqueued_at = time.monotonic()
+
+
+class ExecutionAdmission:
+    """执行准入控制器"""
+
+    def __init__(self, max_concurrent: Optional[int] = None,
+                 max_per_system: Optional[int] = None,
+                 max_queue: Optional[int] = None):
+        config = get_config()
+        self.max_concurrent = max_concurrent or config.MAX_CONCURRENT_EXECUTIONS
+        self.max_per_system = max_per_system or config.MAX_CONCURRENT_EXECUTIONS_PER_SYSTEM
+        self.max_queue = config.EXECUTION_QUEUE_MAX_SIZE if max_queue is None else max_queue
+        # (排序值, 序号, 待执行项)
+        self._queue: List[Any] = []
+        self._sequence = itertools.count()
+        self._running: Dict[str, _Ticket] = {}
+        self._system_running: Dict[int, int] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.wait_time = LatencyHistogram()
+        self.run_time = LatencyHistogram()
+        self._stats = {'admitted': 0, 'queued': 0, 'rejected': 0, 'completed': 0, 'max_queue_depth': 0}
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    def retry_after(self) -> int:
+        """按平均执行耗时估算队列腾出空位所需秒数"""
+        average = self.run_time.total / self.run_time.count if self.run_time.count else 1.0
+        return max(1, math.ceil(average * max(1, self.queue_depth) / self.max_concurrent))
+
+    def ensure_capacity(self) -> None:
+        """检查能否接收新执行，队列已满时抛出AdmissionRejectedError
+
+        只要队列达到上限就拒绝，不以全局并发已满为前提：按系统并发上限成为瓶颈时，
+        全局运行数达不到上限，队列仍会持续增长。队列上限为0时，全局仍有空位则直接启动。
+        """
+        if self.queue_depth >= self.max_queue and (self.max_queue > 0 or self.running >= self.max_concurrent):
+            self._stats['rejected'] += 1
+            raise AdmissionRejectedError(self.queue_depth, self.retry_after())
+
+    def submit(self, execution_id: str, start: Callable[[], Awaitable[Any]],
+               priority: Any = None, system_ids: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+        """提交执行
+
+        Args:
+            execution_id: 执行ID
+            start: 启动执行的协程工厂
+            priority: 优先级（context.priority）
+            system_ids: 执行涉及的系统ID，用于按系统限流
+
+        Returns:
+            Dict[str, Any]: 准入结果，status为running或queued，排队时包含queue_position
+        """
+        self.ensure_capacity()
+        ticket = _Ticket(execution_id, priority_rank(priority), sorted(set(system_ids or ())), start)
+        key = (ticket.rank, next(self._sequence))
+        heapq.heappush(self._queue, (*key, ticket))
+        self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], self.queue_depth)
+        self._dispatch()
+
+        if execution_id in self._running:
+            return {'status': 'running', 'priority': ticket.rank}
+        self._stats['queued'] += 1
+        position = 1 + sum(1 for rank, sequence, _ in self._queue if (rank, sequence) < key)
+        logger.info(f"执行已排队: {execution_id}, 位置{position}, 队列深度{self.queue_depth}")
+        return {'status': 'queued', 'priority': ticket.rank, 'queue_position': position,
+                'queue_depth': self.queue_depth}
+
+    async def run(self, execution_id: str, start: Callable[[], Awaitable[Any]],
+                  priority: Any = None, system_ids: Optional[Iterable[int]] = None) -> Any:
+        """提交执行并等待其完成，供批量执行等需要在当前协程内拿到结果的调用方使用
+
+        Args:
+            execution_id: 执行ID
+            start: 启动执行的协程工厂
+            priority: 优先级
+            system_ids: 执行涉及的系统ID
+
+        Returns:
+            Any: start 协程的返回值
+
+        Raises:
+            AdmissionRejectedError: 队列已满
+        """
+        done = asyncio.get_running_loop().create_future()
+
+        async def start_and_report() -> None:
+            try:
+                result = await start()
+            except asyncio.CancelledError:
+                done.cancel()
+                raise
+            except Exception as e:
+                if not done.done():
+                    done.set_exception(e)
+            else:
+                if not done.done():
+                    done.set_result(result)
+
+        self.submit(execution_id, start_and_report, priority=priority, system_ids=system_ids)
+        try:
+            return await done
+        except asyncio.CancelledError:
+            # 调用方取消：未启动的移出队列，已启动的一并取消
+            if not self.cancel(execution_id):
+                task = self._tasks.get(execution_id)
+                if task is not None:
+                    task.cancel()
+            raise
+
+    def cancel(self, execution_id: str) -> bool:
+        """取消尚未启动的执行"""
+        for index, (_, _, ticket) in enumerate(self._queue):
+            if ticket.execution_id == execution_id:
+                self._queue.pop(index)
+                heapq.heapify(self._queue)
+                return True
+        return False
+
+    def _has_slot(self, ticket: _Ticket) -> bool:
+        return all(self._system_running.get(system_id, 0) < self.max_per_system
+                   for system_id in ticket.system_ids)
+
+    def _dispatch(self) -> None:
+        """按优先级启动可执行项；某系统已满时跳过该项，不阻塞其他系统的执行"""
+        if not self._queue or self.running >= self.max_concurrent:
+            return
+        blocked = []
+        while self._queue and self.running < self.max_concurrent:
+            item = heapq.heappop(self._queue)
+            if self._has_slot(item[2]):
+                self._launch(item[2])
+            else:
+                blocked.append(item)
+        for item in blocked:
+            heapq.heappush(self._queue, item)
+
+    def _launch(self, ticket: _Ticket) -> None:
+        now = time.monotonic()
+        self.wait_time.observe(now - ticket.enqueued_at)
+        self._stats['admitted'] += 1
+        self._running[ticket.execution_id] = ticket
+        for system_id in ticket.system_ids:
+            self._system_running[system_id] = self._system_running.get(system_id, 0) + 1
+        self._tasks[ticket.execution_id] = asyncio.create_task(self._run(ticket, now))
+
+    async def _run(self, ticket: _Ticket, started: float) -> None:
+        try:
+            await ticket.start()
+        except Exception as e:
+            logger.error(f"执行异常: {ticket.execution_id}, {e}")
+        finally:
+            self.run_time.observe(time.monotonic() - started)
+            self._stats['completed'] += 1
+            self._running.pop(ticket.execution_id, None)
+            self._tasks.pop(ticket.execution_id, None)
+            for system_id in ticket.system_ids:
+                remaining = self._system_running.get(system_id, 1) - 1
+                if remaining > 0:
+                    self._system_running[system_id] = remaining
+                else:
+                    self._system_running.pop(system_id, None)
+            self._dispatch()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取准入控制统计"""
+        return {
+            'max_concurrent': self.max_concurrent,
+            'max_per_system': self.max_per_system,
+            'max_queue': self.max_queue,
+            'running': self.running,
+            'queue_depth': self.queue_depth,
+            'running_by_system': dict(self._system_running),
+            'wait_seconds': {
+                'avg': round(self.wait_time.total / self.wait_time.count, 4) if self.wait_time.count else 0.0,
+                'p50': self.wait_time.quantile(0.5),
+                'p95': self.wait_time.quantile(0.95)
+            },
+            'run_seconds_avg': round(self.run_time.total / self.run_time.count, 4) if self.run_time.count else 0.0,
+            **self._stats
+        }
+
+
+# 全局执行准入控制器
+execution_admission = ExecutionAdmission()
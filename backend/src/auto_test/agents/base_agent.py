@@ -6,7 +6,7 @@
 import asyncio
 import uuid
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, AsyncGenerator
 from datetime import datetime
 import logging
 
@@ -15,10 +15,39 @@ from langchain_core.messages import HumanMessage, SystemMessage
 
 from ..utils.logger import get_logger
 from ..config import Config
+from .llm_cache import LLMCache
 
 logger = get_logger(__name__)
 
 
+def create_llm(config: Config):
+    """创建LLM实例
+    
+    未配置OpenAI API密钥时使用模拟LLM。
+    
+    Args:
+        config: 配置对象
+    """
+    try:
+        if not config.OPENAI_API_KEY:
+            logger.info("未配置OpenAI API密钥，使用模拟LLM")
+            from .mock_llm import MockLLM
+            return MockLLM(
+                model_name=config.DEFAULT_LLM_MODEL,
+                temperature=config.LLM_TEMPERATURE
+            )
+        return ChatOpenAI(
+            model_name=config.DEFAULT_LLM_MODEL,
+            temperature=config.LLM_TEMPERATURE,
+            openai_api_key=config.OPENAI_API_KEY,
+            max_tokens=4000,
+            request_timeout=60
+        )
+    except Exception as e:
+        logger.error(f"创建LLM实例失败: {e}")
+        raise
+
+
 class BaseAgent(ABC):
     """AI Agent基类
     
@@ -30,51 +59,40 @@ class BaseAgent(ABC):
     - 性能监控
     """
     
-    def __init__(self, config: Optional[Config] = None):
+    def __init__(self, config: Optional[Config] = None, llm=None):
         """初始化Agent
         
         Args:
             config: 配置对象
+            llm: 共享的LLM实例（由AgentPool提供），为空时自行创建
         """
         self.config = config or Config()
         self.agent_id = str(uuid.uuid4())
         self.agent_type = self.__class__.__name__
         
         # 初始化LLM
-        self.llm = self._create_llm()
+        self.llm = llm if llm is not None else self._create_llm()
+        self.llm_cache = LLMCache(self.config)
         
         # 执行统计
-        self._stats = {
+        self._stats = self._empty_stats()
+        
+        logger.info(f"Agent初始化完成: {self.agent_type}, ID: {self.agent_id}")
+    
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        return {
             'total_executions': 0,
             'successful_executions': 0,
             'failed_executions': 0,
-            'total_duration': 0.0
+            'total_duration': 0.0,
+            'llm_calls': 0,
+            'llm_cache_hits': 0
         }
-        
-        logger.info(f"Agent初始化完成: {self.agent_type}, ID: {self.agent_id}")
     
     def _create_llm(self):
         """创建LLM实例"""
-        try:
-            # 如果没有配置OpenAI API密钥，使用模拟LLM
-            if not self.config.OPENAI_API_KEY:
-                logger.info("未配置OpenAI API密钥，使用模拟LLM")
-                from .mock_llm import MockLLM
-                return MockLLM(
-                    model_name=self.config.DEFAULT_LLM_MODEL,
-                    temperature=self.config.LLM_TEMPERATURE
-                )
-            else:
-                return ChatOpenAI(
-                    model_name=self.config.DEFAULT_LLM_MODEL,
-                    temperature=self.config.LLM_TEMPERATURE,
-                    openai_api_key=self.config.OPENAI_API_KEY,
-                    max_tokens=4000,
-                    request_timeout=60
-                )
-        except Exception as e:
-            logger.error(f"创建LLM实例失败: {e}")
-            raise
+        return create_llm(self.config)
     
     @abstractmethod
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -172,36 +190,105 @@ class BaseAgent(ABC):
             
             return error_result
     
-    async def call_llm(self, messages: list, **kwargs) -> str:
+    async def call_llm(self, messages: list, use_cache: bool = True,
+                       cache_validator: Optional[Callable[[str], bool]] = None,
+                       **kwargs) -> str:
         """调用LLM
         
         Args:
             messages: 消息列表
+            use_cache: 是否使用LLM响应缓存
+            cache_validator: 响应写入缓存前的校验函数（如要求可解析为JSON）
             **kwargs: 额外参数
             
         Returns:
             str: LLM响应
         """
         try:
-            # 转换消息格式
-            formatted_messages = []
-            for msg in messages:
-                if isinstance(msg, dict):
-                    if msg['role'] == 'system':
-                        formatted_messages.append(SystemMessage(content=msg['content']))
-                    elif msg['role'] == 'user':
-                        formatted_messages.append(HumanMessage(content=msg['content']))
-                else:
-                    formatted_messages.append(msg)
+            # 查询缓存
+            cache_key = prompt_hash = None
+            model_name = getattr(self.llm, 'model_name', self.config.DEFAULT_LLM_MODEL)
+            temperature = getattr(self.llm, 'temperature', self.config.LLM_TEMPERATURE)
+            if use_cache and self.llm_cache.enabled:
+                cache_key, prompt_hash = LLMCache.build_key(model_name, temperature, messages)
+                cached = self.llm_cache.get(cache_key)
+                if cached is not None:
+                    self._stats['llm_cache_hits'] += 1
+                    logger.info(f"LLM缓存命中: {self.agent_type}")
+                    return cached
             
             # 调用LLM
-            response = await self.llm.agenerate([formatted_messages])
-            return response.generations[0][0].text
+            self._stats['llm_calls'] += 1
+            response = await self.llm.agenerate([self._format_messages(messages)])
+            text = response.generations[0][0].text
+            
+            # 写入缓存
+            if cache_key and (cache_validator is None or cache_validator(text)):
+                self.llm_cache.put(cache_key, prompt_hash, model_name, temperature, text)
+            
+            return text
             
         except Exception as e:
             logger.error(f"LLM调用失败: {e}")
             raise
     
+    async def call_llm_stream(self, messages: list, use_cache: bool = True,
+                              cache_validator: Optional[Callable[[str], bool]] = None,
+                              **kwargs) -> AsyncGenerator[str, None]:
+        """流式调用LLM
+        
+        缓存命中时一次性返回完整响应；否则逐块返回，结束后写入缓存。
+        
+        Args:
+            messages: 消息列表
+            use_cache: 是否使用LLM响应缓存
+            cache_validator: 响应写入缓存前的校验函数
+            **kwargs: 额外参数
+            
+        Yields:
+            str: 响应文本片段
+        """
+        cache_key = prompt_hash = None
+        model_name = getattr(self.llm, 'model_name', self.config.DEFAULT_LLM_MODEL)
+        temperature = getattr(self.llm, 'temperature', self.config.LLM_TEMPERATURE)
+        if use_cache and self.llm_cache.enabled:
+            cache_key, prompt_hash = LLMCache.build_key(model_name, temperature, messages)
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                self._stats['llm_cache_hits'] += 1
+                yield cached
+                return
+        
+        self._stats['llm_calls'] += 1
+        parts = []
+        try:
+            async for chunk in self.llm.astream(self._format_messages(messages)):
+                text = getattr(chunk, 'content', chunk)
+                if text:
+                    parts.append(text)
+                    yield text
+        except Exception as e:
+            logger.error(f"LLM流式调用失败: {e}")
+            raise
+        
+        full_text = ''.join(parts)
+        if cache_key and (cache_validator is None or cache_validator(full_text)):
+            self.llm_cache.put(cache_key, prompt_hash, model_name, temperature, full_text)
+    
+    @staticmethod
+    def _format_messages(messages: list) -> list:
+        """将字典格式的消息转换为LangChain消息"""
+        formatted_messages = []
+        for msg in messages:
+            if isinstance(msg, dict):
+                if msg['role'] == 'system':
+                    formatted_messages.append(SystemMessage(content=msg['content']))
+                elif msg['role'] == 'user':
+                    formatted_messages.append(HumanMessage(content=msg['content']))
+            else:
+                formatted_messages.append(msg)
+        return formatted_messages
+    
     def get_system_prompt(self) -> str:
         """获取系统提示词（子类可重写）
         
@@ -228,6 +315,10 @@ Agent ID: {self.agent_id}
         """
         stats = self._stats.copy()
         
+        # LLM缓存命中率
+        llm_requests = stats['llm_calls'] + stats['llm_cache_hits']
+        stats['llm_cache_hit_rate'] = stats['llm_cache_hits'] / llm_requests if llm_requests else 0
+        
         # 计算平均执行时间
         if stats['total_executions'] > 0:
             stats['avg_duration'] = stats['total_duration'] / stats['total_executions']
@@ -240,12 +331,7 @@ Agent ID: {self.agent_id}
     
     def reset_stats(self) -> None:
         """重置统计信息"""
-        self._stats = {
-            'total_executions': 0,
-            'successful_executions': 0,
-            'failed_executions': 0,
-            'total_duration': 0.0
-        }
+        self._stats = self._empty_stats()
         logger.info(f"Agent统计已重置: {self.agent_type}")
     
     def validate_input(self, input_data: Dict[str, Any], required_fields: list) -> None:
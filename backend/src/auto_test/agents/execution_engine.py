@@ -4,14 +4,19 @@
 """
 
 import asyncio
+import time
 import uuid
 from typing import Dict, Any, List, Optional, AsyncGenerator
 from datetime import datetime
 from enum import Enum
 
+from .admission import AdmissionRejectedError, execution_admission
 from .base_agent import BaseAgent
+from .param_template import ParamTemplate, PlanTemplates, VariableExtractor
 from ..mcp.client import MCPClient
+from ..mcp.tools.response_cache import ResponseCache, response_cache
 from ..database.dao_ai import AIExecutionDAO, ExecutionStepDAO
+from ..services.route_index import api_route_index
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -58,8 +63,8 @@ class ExecutionEngine(BaseAgent):
     - 实时事件推送
     """
     
-    def __init__(self, config=None):
-        super().__init__(config)
+    def __init__(self, config=None, llm=None):
+        super().__init__(config, llm=llm)
         self.mcp_client = MCPClient(config)
         self.active_executions = {}  # 活跃的执行实例
         self.event_subscribers = {}  # 事件订阅者
@@ -78,6 +83,8 @@ class ExecutionEngine(BaseAgent):
         
         execution_plan = input_data['execution_plan']
         context = input_data.get('context', {})
+        # 已缓存的编译产物（参数模板、变量提取器），为空时在执行时编译
+        templates = input_data.get('templates')
         
         # 生成执行ID
         execution_id = str(uuid.uuid4())
@@ -85,19 +92,39 @@ class ExecutionEngine(BaseAgent):
         logger.info(f"开始执行计划: {execution_id}")
         
         try:
+            # 队列已满时直接拒绝，不创建执行记录
+            execution_admission.ensure_capacity()
+            
             # 初始化MCP客户端
             await self.mcp_client.initialize()
             
             # 创建执行记录
             await self._create_execution_record(execution_id, execution_plan, context)
             
-            # 异步执行计划
-            asyncio.create_task(self._execute_plan_async(execution_id, execution_plan, context))
+            # 经准入控制启动执行（超出并发上限时按优先级排队）
+            try:
+                admission = execution_admission.submit(
+                    execution_id,
+                    lambda: self._execute_plan_async(execution_id, execution_plan, context, templates),
+                    priority=context.get('priority'),
+                    system_ids=self._resolve_system_ids(execution_plan)
+                )
+            except AdmissionRejectedError as e:
+                await self._update_execution_status(execution_id, ExecutionStatus.FAILED, {'error': str(e)})
+                raise
+            
+            queued = admission['status'] == 'queued'
+            self.active_executions[execution_id] = {
+                'status': 'queued' if queued else ExecutionStatus.RUNNING.value,
+                'submitted_at': datetime.now().isoformat(),
+                'priority': admission['priority']
+            }
             
             return {
                 'execution_id': execution_id,
-                'status': ExecutionStatus.RUNNING.value,
-                'message': '执行已启动',
+                'status': 'queued' if queued else ExecutionStatus.RUNNING.value,
+                'message': '执行已排队' if queued else '执行已启动',
+                'admission': admission,
                 'plan_summary': {
                     'total_steps': len(execution_plan.get('steps', [])),
                     'estimated_duration': execution_plan.get('estimated_duration', 0)
@@ -108,6 +135,75 @@ class ExecutionEngine(BaseAgent):
             logger.error(f"启动执行失败: {e}")
             raise
     
+    async def run_inline(self, execution_plan: Dict[str, Any],
+                         variables: Optional[Dict[str, Any]] = None,
+                         templates: Optional[PlanTemplates] = None,
+                         context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """在当前协程内执行计划并返回结果
+        
+        不写执行/步骤记录、不发送事件，供批量执行等高并发场景使用。
+        
+        Args:
+            execution_plan: 执行计划
+            variables: 初始变量（如数据表中的一行）
+            templates: 预编译的参数模板，为空时现场编译
+            context: 执行上下文
+            
+        Returns:
+            Dict[str, Any]: {'success': 是否全部成功, 'steps': 步骤结果列表, 'variables': 最终变量}
+        """
+        await self.mcp_client.initialize()
+        if templates is None:
+            templates = PlanTemplates.compile(execution_plan)
+        
+        variables = dict(variables or {})
+        run_context = {**(context or {}), 'variables': variables}
+        completed = set()
+        step_results = []
+        success = True
+        
+        for step in execution_plan.get('steps', []):
+            step_id = step['step_id']
+            if any(dep not in completed for dep in step.get('dependencies', [])):
+                step_results.append({'step_id': step_id, 'status': StepStatus.SKIPPED.value})
+                continue
+            
+            started = time.perf_counter()
+            template = templates.get(step_id) or ParamTemplate.compile(step.get('parameters', {}))
+            try:
+                tool_result = await self.mcp_client.call_tool(
+                    tool_name=step.get('tool_name', 'http_request'),
+                    parameters=template.render(variables),
+                    context=self._build_tool_context(step, run_context)
+                )
+            except Exception as e:
+                tool_result = {'success': False, 'error': str(e)}
+            duration_ms = round((time.perf_counter() - started) * 1000, 2)
+            
+            if tool_result['success']:
+                completed.add(step_id)
+                variables.update(self._extract_output_variables(
+                    step, tool_result['result'], templates.get_extractor(step_id)
+                ))
+                step_results.append({
+                    'step_id': step_id,
+                    'status': StepStatus.COMPLETED.value,
+                    'duration_ms': duration_ms,
+                    'result': tool_result['result']
+                })
+            else:
+                success = False
+                step_results.append({
+                    'step_id': step_id,
+                    'status': StepStatus.FAILED.value,
+                    'duration_ms': duration_ms,
+                    'error': tool_result.get('error')
+                })
+                if step.get('critical', True):
+                    break
+        
+        return {'success': success, 'steps': step_results, 'variables': variables}
+    
     async def _create_execution_record(self, execution_id: str, execution_plan: Dict[str, Any], 
                                      context: Dict[str, Any]) -> None:
         """创建执行记录"""
@@ -129,9 +225,28 @@ class ExecutionEngine(BaseAgent):
             logger.error(f"创建执行记录失败: {e}")
             raise
     
+    @staticmethod
+    def _resolve_system_ids(execution_plan: Dict[str, Any]) -> List[int]:
+        """计划涉及的系统ID（步骤上的system_id、计划元数据或api_id所属系统）"""
+        system_ids = set((execution_plan.get('metadata') or {}).get('involved_system_ids') or [])
+        for step in execution_plan.get('steps', []):
+            if not isinstance(step, dict):
+                continue
+            if step.get('system_id') is not None:
+                system_ids.add(step['system_id'])
+                continue
+            api_id = (step.get('parameters') or {}).get('api_id')
+            entry = api_route_index.get(api_id) if api_id is not None else None
+            if entry and entry.get('system_id') is not None:
+                system_ids.add(entry['system_id'])
+        return sorted(system_ids)
+    
     async def _execute_plan_async(self, execution_id: str, execution_plan: Dict[str, Any], 
-                                context: Dict[str, Any]) -> None:
+                                context: Dict[str, Any],
+                                templates: Optional[PlanTemplates] = None) -> None:
         """异步执行计划"""
+        if execution_id in self.active_executions:
+            self.active_executions[execution_id]['status'] = ExecutionStatus.RUNNING.value
         try:
             # 更新执行状态
             await self._update_execution_status(execution_id, ExecutionStatus.RUNNING)
@@ -142,8 +257,10 @@ class ExecutionEngine(BaseAgent):
                 message=f"开始执行计划: {execution_plan.get('plan_name', 'Unknown')}"
             ))
             
-            # 执行步骤
+            # 执行步骤（参数模板在计划加载时一次性编译）
             steps = execution_plan.get('steps', [])
+            if templates is None:
+                templates = PlanTemplates.compile(execution_plan)
             execution_context = {
                 'execution_id': execution_id,
                 'variables': {},  # 步骤间共享变量
@@ -162,7 +279,10 @@ class ExecutionEngine(BaseAgent):
                         continue
                     
                     # 执行步骤
-                    step_result = await self._execute_step(execution_id, step, execution_context)
+                    step_result = await self._execute_step(
+                        execution_id, step, execution_context,
+                        templates.get(step['step_id']), templates.get_extractor(step['step_id'])
+                    )
                     
                     if step_result['success']:
                         success_count += 1
@@ -224,15 +344,23 @@ class ExecutionEngine(BaseAgent):
             # 清理活跃执行
             if execution_id in self.active_executions:
                 del self.active_executions[execution_id]
+            
+            # 清理执行作用域内的HTTP响应缓存
+            scope_execution_id = context.get('execution_id', execution_id)
+            response_cache.clear_scope(ResponseCache.execution_scope(scope_execution_id))
     
     async def _execute_step(self, execution_id: str, step: Dict[str, Any], 
-                          context: Dict[str, Any]) -> Dict[str, Any]:
+                          context: Dict[str, Any],
+                          template: Optional[ParamTemplate] = None,
+                          extractor: Optional[VariableExtractor] = None) -> Dict[str, Any]:
         """执行单个步骤
         
         Args:
             execution_id: 执行ID
             step: 步骤定义
             context: 执行上下文
+            template: 预编译的参数模板，为空时现场编译
+            extractor: 预编译的变量提取器，为空时现场编译
             
         Returns:
             Dict[str, Any]: 步骤执行结果
@@ -257,19 +385,19 @@ class ExecutionEngine(BaseAgent):
             ))
             
             # 准备步骤参数
-            step_parameters = await self._prepare_step_parameters(step, context)
+            step_parameters = await self._prepare_step_parameters(step, context, template)
             
-            # 调用MCP工具
+            # 调用MCP工具（步骤级超时与重试次数覆盖执行器默认值）
             tool_result = await self.mcp_client.call_tool(
                 tool_name=tool_name,
                 parameters=step_parameters,
-                context=context
+                context=self._build_tool_context(step, context)
             )
             
             # 处理工具结果
             if tool_result['success']:
                 # 提取输出变量
-                output_variables = self._extract_output_variables(step, tool_result['result'])
+                output_variables = self._extract_output_variables(step, tool_result['result'], extractor)
                 
                 # 更新步骤状态为完成
                 await self._update_step_status(execution_id, step_id, StepStatus.COMPLETED, {
@@ -277,11 +405,14 @@ class ExecutionEngine(BaseAgent):
                     'output_variables': output_variables
                 })
                 
-                # 发送步骤成功事件
+                # 发送步骤成功事件（附带缓存命中信息）
+                event_data = {'result': tool_result['result']}
+                if isinstance(tool_result['result'], dict) and tool_result['result'].get('cache'):
+                    event_data['cache'] = tool_result['result']['cache']
                 await self._emit_event(ExecutionEvent(
                     'step_succeeded', execution_id, step_id,
                     f"步骤执行成功: {step_name}",
-                    {'result': tool_result['result']}
+                    event_data
                 ))
                 
                 logger.info(f"步骤执行成功: {step_id}")
@@ -335,83 +466,37 @@ class ExecutionEngine(BaseAgent):
                 'error': error_message
             }
     
+    def _build_tool_context(self, step: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+        """构建工具调用上下文，透传计划中的步骤级执行配置"""
+        tool_context = dict(context)
+        if step.get('timeout') is not None:
+            tool_context['timeout'] = step['timeout']
+        if step.get('retry_count') is not None:
+            tool_context['max_retries'] = step['retry_count']
+        if step.get('retry_policy'):
+            tool_context['retry_policy'] = step['retry_policy']
+        if step.get('retry_non_idempotent'):
+            tool_context['retry_non_idempotent'] = True
+        return tool_context
+    
     async def _prepare_step_parameters(self, step: Dict[str, Any], 
-                                     context: Dict[str, Any]) -> Dict[str, Any]:
-        """准备步骤参数"""
-        parameters = step.get('parameters', {}).copy()
-        variables = context.get('variables', {})
-        
-        # 替换参数中的变量引用
-        def replace_variables(obj):
-            if isinstance(obj, str):
-                # 替换 {{variable_name}} 格式的变量
-                import re
-                pattern = r'\{\{(\w+)\}\}'
-                
-                def replacer(match):
-                    var_name = match.group(1)
-                    return str(variables.get(var_name, match.group(0)))
-                
-                return re.sub(pattern, replacer, obj)
-            
-            elif isinstance(obj, dict):
-                return {k: replace_variables(v) for k, v in obj.items()}
-            
-            elif isinstance(obj, list):
-                return [replace_variables(item) for item in obj]
-            
-            else:
-                return obj
-        
-        return replace_variables(parameters)
+                                     context: Dict[str, Any],
+                                     template: Optional[ParamTemplate] = None) -> Dict[str, Any]:
+        """准备步骤参数：用共享变量渲染参数模板中的 {{variable_name}} 引用"""
+        if template is None:
+            template = ParamTemplate.compile(step.get('parameters', {}))
+        return template.render(context.get('variables', {}))
     
-    def _extract_output_variables(self, step: Dict[str, Any], result: Any) -> Dict[str, Any]:
+    def _extract_output_variables(self, step: Dict[str, Any], result: Any,
+                                  extractor: Optional[VariableExtractor] = None) -> Dict[str, Any]:
         """从步骤结果中提取输出变量"""
-        output_variables = {}
-        
-        # 获取变量提取规则
-        variable_extractions = step.get('variable_extractions', {})
-        
-        for var_name, extraction_rule in variable_extractions.items():
-            try:
-                if isinstance(extraction_rule, str):
-                    # 简单的JSONPath提取
-                    if extraction_rule.startswith('$.'):
-                        # 这里可以使用jsonpath库进行提取
-                        # 简化实现：直接从result中获取
-                        if isinstance(result, dict):
-                            keys = extraction_rule[2:].split('.')
-                            value = result
-                            for key in keys:
-                                if isinstance(value, dict) and key in value:
-                                    value = value[key]
-                                else:
-                                    value = None
-                                    break
-                            if value is not None:
-                                output_variables[var_name] = value
-                    else:
-                        # 直接赋值
-                        output_variables[var_name] = extraction_rule
-                
-                elif isinstance(extraction_rule, dict):
-                    # 复杂提取规则
-                    if extraction_rule.get('type') == 'jsonpath':
-                        # JSONPath提取
-                        path = extraction_rule.get('path', '')
-                        # 实现JSONPath提取逻辑
-                        pass
-                    elif extraction_rule.get('type') == 'regex':
-                        # 正则表达式提取
-                        import re
-                        pattern = extraction_rule.get('pattern', '')
-                        text = str(result)
-                        match = re.search(pattern, text)
-                        if match:
-                            output_variables[var_name] = match.group(1) if match.groups() else match.group(0)
-            
-            except Exception as e:
-                logger.warning(f"提取变量失败: {var_name}, {e}")
+        if extractor is None:
+            extractor = VariableExtractor.compile(step.get('variable_extractions', {}))
+        try:
+            output_variables = extractor.extract(result)
+        except Exception as e:
+            logger.warning(f"提取变量失败: {step.get('step_id')}, {e}")
+            output_variables = {}
         
         # 默认提取一些常用变量
         if isinstance(result, dict):
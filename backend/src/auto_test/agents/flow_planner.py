@@ -5,14 +5,16 @@
 
 import json
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from pydantic import BaseModel, Field
 
 from .base_agent import BaseAgent
+from .plan_graph import PlanGraph
 from ..services.api_interface_service import ApiInterfaceService
 from ..services.system_service import SystemService
 from ..services.module_service import ModuleService
+from ..services.route_index import api_route_index
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -53,8 +55,8 @@ class FlowPlanner(BaseAgent):
     - 优化执行顺序和并行度
     """
     
-    def __init__(self, config=None):
-        super().__init__(config)
+    def __init__(self, config=None, llm=None):
+        super().__init__(config, llm=llm)
         
         # 步骤类型映射
         self.step_type_mapping = {
@@ -79,6 +81,8 @@ class FlowPlanner(BaseAgent):
         
         intent_result = input_data['intent_result']
         context = input_data.get('context', {})
+        # 流式预览阶段已提前解析的API接口（按_interface_lookup_key索引）
+        resolved_interfaces = input_data.get('resolved_interfaces') or {}
         
         logger.info(f"开始流程规划: {intent_result.get('intent')}")
         
@@ -87,18 +91,22 @@ class FlowPlanner(BaseAgent):
             actions = intent_result.get('actions', [])
             entities = intent_result.get('entities', {})
             
-            # 2. 生成基础执行步骤
-            base_steps = await self._generate_base_steps(actions, entities, context)
+            # 2. 批量解析所有动作涉及的API接口
+            action_interfaces = await self._batch_resolve_interfaces(actions, resolved_interfaces)
             
-            # 3. 解析API接口依赖
-            enriched_steps = await self._enrich_steps_with_api_info(base_steps, entities)
+            # 3. 生成基础执行步骤
+            base_steps = await self._generate_base_steps(actions, entities, context, action_interfaces)
             
-            # 4. 优化执行顺序
-            optimized_steps = await self._optimize_execution_order(enriched_steps)
+            # 4. 关联API接口信息
+            enriched_steps = await self._enrich_steps_with_api_info(base_steps, entities, action_interfaces)
             
-            # 5. 生成完整执行计划
+            # 5. 优化执行顺序
+            graph = PlanGraph.from_steps(enriched_steps)
+            optimized_steps = await self._optimize_execution_order(enriched_steps, graph)
+            
+            # 6. 生成完整执行计划
             execution_plan = await self._create_execution_plan(
-                optimized_steps, intent_result, context
+                optimized_steps, intent_result, context, graph
             )
             
             logger.info(f"流程规划完成: {len(execution_plan.steps)}个步骤")
@@ -106,22 +114,61 @@ class FlowPlanner(BaseAgent):
             return {
                 'execution_plan': execution_plan.dict(),
                 'plan_summary': self._generate_plan_summary(execution_plan),
-                'validation_result': await self._validate_plan(execution_plan)
+                'validation_result': await self._validate_plan(execution_plan, graph)
             }
             
         except Exception as e:
             logger.error(f"流程规划失败: {e}")
             raise
     
+    async def _batch_resolve_interfaces(self, actions: List[Dict[str, Any]],
+                                        resolved_interfaces: Optional[Dict[Tuple, Any]] = None
+                                        ) -> List[Optional[Dict[str, Any]]]:
+        """批量解析动作对应的API接口
+        
+        先收集全部查找键并去重，一次性在内存路由索引中查找，
+        仅对未命中的键回退到数据库搜索。
+        
+        Args:
+            actions: 动作列表
+            resolved_interfaces: 已提前解析的结果（查找键 -> 接口）
+            
+        Returns:
+            List[Optional[Dict[str, Any]]]: 与actions一一对应的接口信息，非API动作或未找到时为None
+        """
+        keys = [
+            self._action_lookup_key(action) if action.get('action') in ('api_call', 'api_test') else None
+            for action in actions
+        ]
+        resolved = dict(resolved_interfaces or {})
+        pending = {key for key in keys if key is not None and key not in resolved}
+        
+        if pending:
+            try:
+                resolved.update(api_route_index.lookup_many(pending))
+            except Exception as e:
+                logger.warning(f"API路由索引查找失败，回退到搜索: {e}")
+            
+            misses = [key for key in pending if key not in resolved]
+            for key in misses:
+                resolved[key] = await self._search_interface(key)
+            
+            logger.info(f"API接口批量解析: {len(pending)}个查找键, 索引未命中{len(misses)}个")
+        
+        return [resolved.get(key) if key is not None else None for key in keys]
+    
     async def _generate_base_steps(self, actions: List[Dict[str, Any]], 
                                  entities: Dict[str, Any], 
-                                 context: Dict[str, Any]) -> List[ExecutionStep]:
+                                 context: Dict[str, Any],
+                                 action_interfaces: Optional[List[Optional[Dict[str, Any]]]] = None
+                                 ) -> List[ExecutionStep]:
         """生成基础执行步骤
         
         Args:
             actions: 动作列表
             entities: 实体信息
             context: 上下文信息
+            action_interfaces: 与actions对应的已解析API接口
             
         Returns:
             List[ExecutionStep]: 基础步骤列表
@@ -136,7 +183,8 @@ class FlowPlanner(BaseAgent):
             tool_name = self.step_type_mapping.get(action_type, 'http_request')
             
             # 构建步骤参数
-            parameters = await self._build_step_parameters(action, entities, context)
+            api_info = action_interfaces[i] if action_interfaces else None
+            parameters = await self._build_step_parameters(action, entities, context, api_info)
             
             step = ExecutionStep(
                 step_id=step_id,
@@ -155,13 +203,15 @@ class FlowPlanner(BaseAgent):
     
     async def _build_step_parameters(self, action: Dict[str, Any], 
                                    entities: Dict[str, Any], 
-                                   context: Dict[str, Any]) -> Dict[str, Any]:
+                                   context: Dict[str, Any],
+                                   api_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """构建步骤参数
         
         Args:
             action: 动作定义
             entities: 实体信息
             context: 上下文信息
+            api_info: 已解析的API接口信息
             
         Returns:
             Dict[str, Any]: 步骤参数
@@ -184,8 +234,6 @@ class FlowPlanner(BaseAgent):
             # API测试参数（使用api_call工具）
             api_endpoint = action.get('target', '')
             if api_endpoint in entities.get('api_endpoints', []):
-                # 尝试从数据库查找API接口信息
-                api_info = await self._find_api_interface(api_endpoint)
                 if api_info:
                     parameters['api_id'] = api_info['id']
                 else:
@@ -213,24 +261,30 @@ class FlowPlanner(BaseAgent):
         return parameters
     
     async def _enrich_steps_with_api_info(self, steps: List[ExecutionStep], 
-                                        entities: Dict[str, Any]) -> List[ExecutionStep]:
+                                        entities: Dict[str, Any],
+                                        action_interfaces: Optional[List[Optional[Dict[str, Any]]]] = None
+                                        ) -> List[ExecutionStep]:
         """使用API接口信息丰富步骤
         
         Args:
             steps: 基础步骤列表
             entities: 实体信息
+            action_interfaces: 与步骤对应的已解析API接口，为空时逐个解析
             
         Returns:
             List[ExecutionStep]: 丰富后的步骤列表
         """
         enriched_steps = []
         
-        for step in steps:
+        for index, step in enumerate(steps):
             enriched_step = step.copy()
             
             # 如果是API相关步骤，尝试关联API接口信息
             if step.step_type in ['api_call', 'api_test']:
-                api_info = await self._resolve_api_interface(step, entities)
+                if action_interfaces is not None:
+                    api_info = action_interfaces[index]
+                else:
+                    api_info = await self._resolve_api_interface(step, entities)
                 if api_info:
                     enriched_step.system_id = api_info.get('system_id')
                     enriched_step.module_id = api_info.get('module_id')
@@ -259,23 +313,56 @@ class FlowPlanner(BaseAgent):
             # 从参数中获取API标识
             api_id = step.parameters.get('api_id')
             if api_id:
-                return ApiInterfaceService.get_api_interface_by_id(api_id)
+                return api_route_index.get(api_id) or ApiInterfaceService.get_api_interface_raw(api_id)
             
-            # 从URL路径匹配
+            # 从URL路径匹配，否则从步骤名称匹配
             url = step.parameters.get('url', '')
             method = step.parameters.get('method', 'GET')
+            key = self._interface_lookup_key(url, method) if url else ('name', step.step_name)
             
-            if url:
-                return await self._find_api_interface_by_path(url, method)
-            
-            # 从步骤名称匹配
-            step_name = step.step_name
-            return await self._find_api_interface_by_name(step_name)
+            return api_route_index.lookup_many([key]).get(key) or await self._search_interface(key)
             
         except Exception as e:
             logger.warning(f"解析API接口信息失败: {e}")
             return None
     
+    @staticmethod
+    def _interface_lookup_key(target: str, method: Optional[str] = None) -> Tuple:
+        """API接口查找键：路径按(方法, 路径)，未指定方法时为'*'；其他按名称"""
+        if target.startswith('/') or '://' in target:
+            return ('path', (method or api_route_index.ANY_METHOD).upper(), target)
+        return ('name', target)
+    
+    def _action_lookup_key(self, action: Dict[str, Any]) -> Tuple:
+        """动作对应的API接口查找键（api_call默认GET，api_test不限定方法）"""
+        method = (action.get('parameters') or {}).get('method')
+        if not method and action.get('action') == 'api_call':
+            method = 'GET'
+        return self._interface_lookup_key(action.get('target') or '', method)
+    
+    async def _search_interface(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """路由索引未命中时回退到数据库搜索"""
+        if key[0] == 'path':
+            if key[1] == api_route_index.ANY_METHOD:
+                return await self._find_api_interface(key[2])
+            return await self._find_api_interface_by_path(key[2], key[1])
+        return await self._find_api_interface_by_name(key[1])
+    
+    async def prefetch_action_interface(self, action: Dict[str, Any]) -> Tuple[Tuple, Optional[Dict[str, Any]]]:
+        """提前解析单个动作对应的API接口（流式规划时使用）
+        
+        Args:
+            action: 意图理解输出的动作
+            
+        Returns:
+            Tuple[Tuple, Optional[Dict[str, Any]]]: (查找键, API接口信息)
+        """
+        key = self._action_lookup_key(action)
+        api_info = api_route_index.lookup_many([key]).get(key)
+        if api_info is None:
+            api_info = await self._search_interface(key)
+        return key, api_info
+    
     async def _find_api_interface(self, endpoint: str) -> Optional[Dict[str, Any]]:
         """根据端点查找API接口"""
         try:
@@ -285,7 +372,7 @@ class FlowPlanner(BaseAgent):
                 keyword=endpoint,
                 enabled_only=True
             )
-            interfaces = ApiInterfaceService.search_api_interfaces(query)
+            interfaces = ApiInterfaceService.search_api_interfaces(query, raw=True)
             
             if interfaces:
                 return interfaces[0]
@@ -306,7 +393,7 @@ class FlowPlanner(BaseAgent):
                 method=method,
                 enabled_only=True
             )
-            interfaces = ApiInterfaceService.search_api_interfaces(query)
+            interfaces = ApiInterfaceService.search_api_interfaces(query, raw=True)
             
             # 精确匹配路径
             for interface in interfaces:
@@ -331,7 +418,7 @@ class FlowPlanner(BaseAgent):
                 keyword=name,
                 enabled_only=True
             )
-            interfaces = ApiInterfaceService.search_api_interfaces(query)
+            interfaces = ApiInterfaceService.search_api_interfaces(query, raw=True)
             
             if interfaces:
                 return interfaces[0]
@@ -342,94 +429,56 @@ class FlowPlanner(BaseAgent):
             logger.warning(f"根据名称查找API接口失败: {e}")
             return None
     
-    async def _optimize_execution_order(self, steps: List[ExecutionStep]) -> List[ExecutionStep]:
+    async def _optimize_execution_order(self, steps: List[ExecutionStep],
+                                       graph: Optional[PlanGraph] = None) -> List[ExecutionStep]:
         """优化执行顺序
         
+        按拓扑序排列步骤，并标注所在层（wave）与并行机会。
+        存在循环依赖时保持原始顺序，由计划校验报告具体的环。
+        
         Args:
             steps: 步骤列表
+            graph: 步骤依赖图
             
         Returns:
             List[ExecutionStep]: 优化后的步骤列表
         """
-        # 构建依赖图
-        dependency_graph = {}
+        graph = graph or PlanGraph.from_steps(steps)
         step_map = {step.step_id: step for step in steps}
         
-        for step in steps:
-            dependency_graph[step.step_id] = step.dependencies
-        
-        # 拓扑排序
-        sorted_steps = self._topological_sort(dependency_graph, step_map)
+        if graph.has_cycle():
+            return steps
+        sorted_steps = [step_map[step_id] for step_id in graph.topological_order()]
         
-        # 优化并行执行机会
-        optimized_steps = self._optimize_parallel_execution(sorted_steps)
+        # 标注并行信息：同一层内的步骤互不依赖
+        for wave_index, wave in enumerate(graph.waves()):
+            for step_id in wave:
+                metadata = step_map[step_id].parameters.setdefault('metadata', {})
+                metadata['wave'] = wave_index
+                metadata['can_parallel'] = len(wave) > 1
         
-        return optimized_steps
-    
-    def _topological_sort(self, dependency_graph: Dict[str, List[str]], 
-                         step_map: Dict[str, ExecutionStep]) -> List[ExecutionStep]:
-        """拓扑排序"""
-        in_degree = {step_id: 0 for step_id in dependency_graph}
-        
-        # 计算入度
-        for step_id, deps in dependency_graph.items():
-            for dep in deps:
-                if dep in in_degree:
-                    in_degree[step_id] += 1
-        
-        # 队列初始化
-        queue = [step_id for step_id, degree in in_degree.items() if degree == 0]
-        result = []
-        
-        while queue:
-            current = queue.pop(0)
-            result.append(step_map[current])
-            
-            # 更新依赖此步骤的其他步骤
-            for step_id, deps in dependency_graph.items():
-                if current in deps:
-                    in_degree[step_id] -= 1
-                    if in_degree[step_id] == 0:
-                        queue.append(step_id)
-        
-        return result
-    
-    def _optimize_parallel_execution(self, steps: List[ExecutionStep]) -> List[ExecutionStep]:
-        """优化并行执行"""
-        # 简单实现：标记可以并行执行的步骤
-        for i, step in enumerate(steps):
-            # 检查是否可以与前面的步骤并行
-            can_parallel = True
-            for j in range(i):
-                prev_step = steps[j]
-                if (step.step_id in prev_step.dependencies or 
-                    prev_step.step_id in step.dependencies):
-                    can_parallel = False
-                    break
-            
-            # 在参数中标记并行信息（简化处理）
-            if 'metadata' not in step.parameters:
-                step.parameters['metadata'] = {}
-            step.parameters['metadata']['can_parallel'] = can_parallel
-        
-        return steps
+        return sorted_steps
     
     async def _create_execution_plan(self, steps: List[ExecutionStep], 
                                    intent_result: Dict[str, Any], 
-                                   context: Dict[str, Any]) -> ExecutionPlan:
+                                   context: Dict[str, Any],
+                                   graph: Optional[PlanGraph] = None) -> ExecutionPlan:
         """创建完整执行计划
         
         Args:
             steps: 优化后的步骤列表
             intent_result: 意图理解结果
             context: 上下文信息
+            graph: 步骤依赖图
             
         Returns:
             ExecutionPlan: 执行计划
         """
         plan_id = f"plan_{int(time.time() * 1000)}"
+        graph = graph or PlanGraph.from_steps(steps)
         
-        # 计算预估执行时间
+        # 预估执行时间：执行引擎按顺序逐步执行，取各步骤超时之和
+        critical_duration, critical_path = graph.critical_path()
         estimated_duration = sum(step.timeout for step in steps)
         
         # 构建元数据
@@ -445,6 +494,9 @@ class FlowPlanner(BaseAgent):
             'total_steps': len(steps),
             'api_calls': len([s for s in steps if s.step_type in ['api_call', 'api_test']]),
             'validations': len([s for s in steps if s.step_type == 'data_validation']),
+            'critical_path': critical_path,
+            'critical_path_duration': critical_duration,
+            'parallel_waves': len(graph.waves()),
             'created_at': datetime.now().isoformat(),
             'context': context
         }
@@ -483,15 +535,18 @@ class FlowPlanner(BaseAgent):
             ])
         }
     
-    async def _validate_plan(self, plan: ExecutionPlan) -> Dict[str, Any]:
+    async def _validate_plan(self, plan: ExecutionPlan,
+                             graph: Optional[PlanGraph] = None) -> Dict[str, Any]:
         """验证执行计划
         
         Args:
             plan: 执行计划
+            graph: 步骤依赖图
             
         Returns:
             Dict[str, Any]: 验证结果
         """
+        graph = graph or PlanGraph.from_steps(plan.steps)
         issues = []
         warnings = []
         
@@ -503,17 +558,18 @@ class FlowPlanner(BaseAgent):
                     issues.append(f"步骤 {step.step_id} 依赖不存在的步骤 {dep}")
         
         # 检查循环依赖
-        if self._has_circular_dependency(plan.steps):
-            issues.append("检测到循环依赖")
+        cycle = graph.find_cycle()
+        if cycle:
+            issues.append(f"检测到循环依赖: {' -> '.join(cycle)}")
         
         # 检查API接口可用性
         for step in plan.steps:
             if step.api_interface_id:
-                api_info = ApiInterfaceDAO.get_by_id(step.api_interface_id)
-                if not api_info or not api_info.get('enabled'):
+                api_info = api_route_index.get(step.api_interface_id)
+                if not api_info or api_info.get('status') != 'active':
                     warnings.append(f"步骤 {step.step_id} 关联的API接口不可用")
         
-        # 检查超时设置
+        # 检查超时设置（执行引擎按顺序逐步执行，各步骤超时累加）
         total_timeout = sum(step.timeout for step in plan.steps)
         if total_timeout > 300:  # 5分钟
             warnings.append(f"总超时时间过长: {total_timeout}秒")
@@ -525,38 +581,6 @@ class FlowPlanner(BaseAgent):
             'total_timeout': total_timeout
         }
     
-    def _has_circular_dependency(self, steps: List[ExecutionStep]) -> bool:
-        """检查是否存在循环依赖"""
-        # 构建邻接表
-        graph = {step.step_id: step.dependencies for step in steps}
-        
-        # DFS检查循环
-        visited = set()
-        rec_stack = set()
-        
-        def dfs(node):
-            if node in rec_stack:
-                return True
-            if node in visited:
-                return False
-            
-            visited.add(node)
-            rec_stack.add(node)
-            
-            for neighbor in graph.get(node, []):
-                if dfs(neighbor):
-                    return True
-            
-            rec_stack.remove(node)
-            return False
-        
-        for step_id in graph:
-            if step_id not in visited:
-                if dfs(step_id):
-                    return True
-        
-        return False
-    
     def get_system_prompt(self) -> str:
         """获取系统提示词"""
         return f"""你是一个专业的流程规划专家，负责将测试意图转换为可执行的API调用计划。
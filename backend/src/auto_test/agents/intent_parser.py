@@ -5,10 +5,11 @@
 
 import json
 import re
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncGenerator
 from pydantic import BaseModel, Field
 
 from .base_agent import BaseAgent
+from .stream_parser import IncrementalJSONParser
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -33,8 +34,8 @@ class IntentParser(BaseAgent):
     - 生成动作序列
     """
     
-    def __init__(self, config=None):
-        super().__init__(config)
+    def __init__(self, config=None, llm=None):
+        super().__init__(config, llm=llm)
         
         # 预定义意图类型
         self.intent_types = {
@@ -82,28 +83,88 @@ class IntentParser(BaseAgent):
             # 2. 基于规则的初步意图识别
             rule_based_intent = self._rule_based_intent_detection(processed_input)
             
-            # 3. 使用LLM进行深度意图理解
-            llm_result = await self._llm_intent_understanding(processed_input, context, rule_based_intent)
+            # 3. 规则置信度足够高时走快速路径，否则使用LLM进行深度意图理解
+            if rule_based_intent['confidence'] >= self.config.INTENT_RULE_FAST_PATH_THRESHOLD:
+                llm_result = self._rule_based_result(processed_input, context, rule_based_intent)
+                source = 'rule'
+            else:
+                llm_result = await self._llm_intent_understanding(processed_input, context, rule_based_intent)
+                source = 'llm'
             
             # 4. 后处理和验证
             final_result = self._post_process_result(llm_result, rule_based_intent)
             
             logger.info(f"意图理解完成: {final_result.intent} (置信度: {final_result.confidence})")
             
-            return {
-                'intent': final_result.intent,
-                'confidence': final_result.confidence,
-                'entities': final_result.entities,
-                'actions': final_result.actions,
-                'context': final_result.context,
-                'raw_input': user_input,
-                'processed_input': processed_input
-            }
+            return self._build_output(final_result, user_input, processed_input, source)
             
         except Exception as e:
             logger.error(f"意图理解失败: {e}")
             raise
     
+    async def process_stream(self, input_data: Dict[str, Any]) -> AsyncGenerator[Dict[str, Any], None]:
+        """流式意图理解
+        
+        LLM逐块输出的同时增量解析响应，actions中的每个元素一旦完整即推送，
+        供调用方提前解析API接口。最终以intent事件给出与process一致的完整结果；
+        若LLM响应整体解析失败而回退，intent事件中的actions为准。
+        
+        Args:
+            input_data: 包含用户输入的数据
+            
+        Yields:
+            Dict[str, Any]: {'type': 'action', 'index': n, 'data': {...}} 或
+                {'type': 'intent', 'data': {...}}
+        """
+        self.validate_input(input_data, ['user_input'])
+        
+        user_input = input_data['user_input']
+        context = input_data.get('context', {})
+        
+        processed_input = self._preprocess_input(user_input)
+        rule_based_intent = self._rule_based_intent_detection(processed_input)
+        emitted = 0
+        
+        if rule_based_intent['confidence'] >= self.config.INTENT_RULE_FAST_PATH_THRESHOLD:
+            llm_result = self._rule_based_result(processed_input, context, rule_based_intent)
+            source = 'rule'
+        else:
+            prompt = self._build_intent_prompt(processed_input, context, rule_based_intent)
+            parser = IncrementalJSONParser('actions')
+            async for chunk in self.call_llm_stream(prompt, cache_validator=self._is_valid_json):
+                for action in parser.feed(chunk):
+                    if isinstance(action, dict):
+                        yield {'type': 'action', 'index': emitted, 'data': action}
+                        emitted += 1
+            llm_result = self._parse_llm_response(parser.text, context, rule_based_intent)
+            source = 'llm'
+        
+        final_result = self._post_process_result(llm_result, rule_based_intent)
+        
+        # 补充推送默认生成（或快速路径生成）的动作
+        for index in range(emitted, len(final_result.actions)):
+            yield {'type': 'action', 'index': index, 'data': final_result.actions[index]}
+        
+        yield {
+            'type': 'intent',
+            'data': self._build_output(final_result, user_input, processed_input, source)
+        }
+    
+    @staticmethod
+    def _build_output(final_result: IntentResult, user_input: str,
+                      processed_input: str, source: str) -> Dict[str, Any]:
+        """构建意图理解输出"""
+        return {
+            'intent': final_result.intent,
+            'confidence': final_result.confidence,
+            'entities': final_result.entities,
+            'actions': final_result.actions,
+            'context': final_result.context,
+            'raw_input': user_input,
+            'processed_input': processed_input,
+            'source': source
+        }
+    
     def _preprocess_input(self, user_input: str) -> str:
         """预处理用户输入
         
@@ -183,10 +244,14 @@ class IntentParser(BaseAgent):
         # 构建提示词
         prompt = self._build_intent_prompt(user_input, context, rule_hint)
         
-        # 调用LLM
-        response = await self.call_llm(prompt)
+        # 调用LLM（仅缓存可解析的响应）
+        response = await self.call_llm(prompt, cache_validator=self._is_valid_json)
         
-        # 解析LLM响应
+        return self._parse_llm_response(response, context, rule_hint)
+    
+    def _parse_llm_response(self, response: str, context: Dict[str, Any],
+                            rule_hint: Dict[str, Any]) -> IntentResult:
+        """解析LLM响应，解析失败时回退到规则结果"""
         try:
             result_data = json.loads(response)
             return IntentResult(**result_data)
@@ -202,6 +267,43 @@ class IntentParser(BaseAgent):
                 context=context
             )
     
+    @staticmethod
+    def _is_valid_json(text: str) -> bool:
+        """判断LLM响应是否为合法JSON"""
+        try:
+            json.loads(text)
+            return True
+        except (json.JSONDecodeError, TypeError):
+            return False
+    
+    def _rule_based_result(self, user_input: str, context: Dict[str, Any],
+                           rule_hint: Dict[str, Any]) -> IntentResult:
+        """基于规则结果直接构建意图（跳过LLM调用）
+        
+        Args:
+            user_input: 预处理后的用户输入
+            context: 上下文信息
+            rule_hint: 规则检测结果
+            
+        Returns:
+            IntentResult: 意图解析结果
+        """
+        entities = {
+            'api_endpoints': list(dict.fromkeys(re.findall(r'(?<![\w:/])(/[\w\-./{}]+)', user_input))),
+            'methods': list(dict.fromkeys(
+                m.upper() for m in re.findall(r'\b(GET|POST|PUT|PATCH|DELETE)\b', user_input, re.IGNORECASE)
+            ))
+        }
+        logger.info(f"规则置信度{rule_hint['confidence']:.2f}达到阈值，跳过LLM调用")
+        
+        return IntentResult(
+            intent=rule_hint['intent'],
+            confidence=rule_hint['confidence'],
+            entities=entities,
+            actions=[],
+            context=dict(context)
+        )
+    
     def _build_intent_prompt(self, user_input: str, context: Dict[str, Any], 
                            rule_hint: Dict[str, Any]) -> list:
         """构建意图理解提示词
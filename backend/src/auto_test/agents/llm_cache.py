@@ -0,0 +1,95 @@
+"""LLM响应缓存
+
+对相同（或仅有空白、全半角差异）的提示词复用LLM响应，
+持久化到SQLite，避免重复的长耗时LLM调用。
+
+缓存键由模型名称、温度与规范化提示词的哈希组成。
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from typing import Dict, Any, List, Optional, Tuple
+
+from ..config import Config
+from ..database.dao_ai import LLMCacheDAO
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LLMCache:
+    """LLM响应缓存（SQLite持久化，TTL + 容量淘汰）"""
+
+    # 每写入多少条执行一次淘汰
+    EVICT_INTERVAL = 50
+
+    _writes_since_evict = 0
+
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config()
+        self.enabled = self.config.LLM_CACHE_ENABLED
+        self.ttl = self.config.LLM_CACHE_TTL
+        self.max_entries = self.config.LLM_CACHE_MAX_ENTRIES
+
+    @staticmethod
+    def normalize_prompt(messages: List[Any]) -> str:
+        """规范化提示词
+
+        - Unicode NFKC（全角/半角统一）
+        - 合并连续空白、去除首尾空白
+        不改变大小写与标点：路径、ID、参数值区分大小写，只差大小写的提示词解析结果可能不同
+        """
+        normalized = []
+        for msg in messages:
+            if isinstance(msg, dict):
+                role, content = msg.get('role', ''), msg.get('content', '')
+            else:
+                role, content = getattr(msg, 'type', ''), getattr(msg, 'content', '')
+            text = unicodedata.normalize('NFKC', str(content))
+            text = re.sub(r'\s+', ' ', text).strip()
+            normalized.append([role, text])
+        return json.dumps(normalized, ensure_ascii=False)
+
+    @staticmethod
+    def build_key(model_name: str, temperature: float, messages: List[Any]) -> Tuple[str, str]:
+        """构建缓存键
+
+        Returns:
+            Tuple[str, str]: (缓存键, 提示词哈希)
+        """
+        prompt_hash = hashlib.sha256(LLMCache.normalize_prompt(messages).encode('utf-8')).hexdigest()
+        raw = f"{model_name}|{float(temperature):.4f}|{prompt_hash}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest(), prompt_hash
+
+    def get(self, cache_key: str) -> Optional[str]:
+        """读取缓存"""
+        if not self.enabled:
+            return None
+        return LLMCacheDAO.get(cache_key, self.ttl)
+
+    def put(self, cache_key: str, prompt_hash: str, model_name: str,
+            temperature: float, response_text: str) -> None:
+        """写入缓存，并周期性执行淘汰"""
+        if not self.enabled:
+            return
+        LLMCacheDAO.put({
+            'cache_key': cache_key,
+            'model_name': model_name,
+            'temperature': temperature,
+            'prompt_hash': prompt_hash,
+            'response_text': response_text
+        })
+
+        LLMCache._writes_since_evict += 1
+        if LLMCache._writes_since_evict >= self.EVICT_INTERVAL:
+            LLMCache._writes_since_evict = 0
+            removed = LLMCacheDAO.evict(self.ttl, self.max_entries)
+            if removed:
+                logger.info(f"LLM缓存淘汰完成: {removed}条")
+
+    @staticmethod
+    def get_stats() -> Dict[str, Any]:
+        """获取缓存统计"""
+        return LLMCacheDAO.get_stats()
@@ -3,8 +3,9 @@
 用于测试环境，提供模拟的LLM响应，避免依赖真实的API密钥。
 """
 
+import asyncio
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator
 from datetime import datetime
 
 
@@ -20,21 +21,27 @@ class MockLLM:
         """异步生成响应"""
         self.call_count += 1
         
-        # 获取最后一条用户消息
         messages = messages_list[0] if messages_list else []
-        user_message = ""
         
+        # 根据用户输入生成模拟响应
+        mock_response = self._generate_mock_response(self._extract_user_message(messages))
+        
+        return MockLLMResult(mock_response)
+    
+    async def astream(self, messages: List, **kwargs) -> AsyncIterator['MockChunk']:
+        """流式生成响应（非流式模型一次性返回完整文本）"""
+        self.call_count += 1
+        yield MockChunk(self._generate_mock_response(self._extract_user_message(messages)))
+    
+    @staticmethod
+    def _extract_user_message(messages: List) -> str:
+        """获取包含用户输入的消息内容"""
         for msg in messages:
             if hasattr(msg, 'content'):
                 content = msg.content
                 if "用户输入:" in content:
-                    user_message = content
-                    break
-        
-        # 根据用户输入生成模拟响应
-        mock_response = self._generate_mock_response(user_message)
-        
-        return MockLLMResult(mock_response)
+                    return content
+        return ""
     
     def _generate_mock_response(self, user_input: str) -> str:
         """生成模拟响应"""
@@ -171,6 +178,35 @@ class MockLLM:
             }, ensure_ascii=False)
 
 
+class StreamingMockLLM(MockLLM):
+    """流式模拟LLM
+    
+    按固定字符数切分模拟响应并逐块返回，用于测试增量解析与流式预览。
+    """
+    
+    def __init__(self, model_name: str = "mock-gpt", temperature: float = 0.1,
+                 chunk_size: int = 16, chunk_delay: float = 0.0, **kwargs):
+        super().__init__(model_name=model_name, temperature=temperature, **kwargs)
+        self.chunk_size = max(1, chunk_size)
+        self.chunk_delay = chunk_delay
+    
+    async def astream(self, messages: List, **kwargs) -> AsyncIterator['MockChunk']:
+        """逐块流式生成响应"""
+        self.call_count += 1
+        text = self._generate_mock_response(self._extract_user_message(messages))
+        for start in range(0, len(text), self.chunk_size):
+            if self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
+            yield MockChunk(text[start:start + self.chunk_size])
+
+
+class MockChunk:
+    """模拟流式输出片段"""
+    
+    def __init__(self, content: str):
+        self.content = content
+
+
 class MockLLMResult:
     """模拟LLM结果"""
     
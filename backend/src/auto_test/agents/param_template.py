@@ -0,0 +1,278 @@
+"""步骤参数模板
+
+计划加载时将步骤参数一次性编译为模板树，只记录包含 {{var}} 引用的字符串叶子
+及其在参数结构中的位置：
+- 渲染只替换这些叶子，并只复制从根到叶子路径上的容器，其余子树直接共享
+- 整值引用（如 "{{id}}"）保留变量原始类型（int / dict / list），不做字符串化
+- 引用的变量名在编译时汇总为集合，未解决入参的检测变为集合运算
+- 步骤的变量提取规则（variable_extractions）同样预编译
+"""
+
+import copy
+import json
+import re
+from typing import Dict, Any, List, Optional, Tuple, Iterable, FrozenSet, Union
+
+# {{variable_name}} 格式的变量引用
+VARIABLE_PATTERN = re.compile(r'\{\{(\w+)\}\}')
+
+# 执行引擎为每个成功步骤默认写入的输出变量
+BUILTIN_OUTPUT_VARIABLES = frozenset({'last_status_code', 'last_response_id'})
+
+PathKey = Union[str, int]
+
+
+class _Leaf:
+    """包含变量引用的字符串叶子
+
+    parts为字面量与变量名交替的元组：(字面量, 变量名, 字面量, ..., 字面量)。
+    """
+
+    __slots__ = ('source', 'parts', 'whole')
+
+    def __init__(self, source: str, parts: Tuple[str, ...]):
+        self.source = source
+        self.parts = parts
+        # 整个字符串只是一个变量引用
+        self.whole = parts[1] if len(parts) == 3 and not parts[0] and not parts[2] else None
+
+    def render(self, variables: Dict[str, Any]) -> Any:
+        if self.whole is not None:
+            # 变量不存在时保留原占位符
+            return variables.get(self.whole, self.source)
+
+        parts = self.parts
+        pieces = [parts[0]]
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            if name in variables:
+                pieces.append(_stringify(variables[name]))
+            else:
+                pieces.append('{{' + name + '}}')
+            pieces.append(parts[i + 1])
+        return ''.join(pieces)
+
+
+def _stringify(value: Any) -> str:
+    """字符串内插值：容器按JSON输出，其余按str"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def _parse(value: str) -> Optional[Tuple[str, ...]]:
+    """将字符串拆分为字面量与变量名交替的元组，不含变量引用时返回None"""
+    if '{{' not in value:
+        return None
+    parts = VARIABLE_PATTERN.split(value)
+    return tuple(parts) if len(parts) > 1 else None
+
+
+class ParamTemplate:
+    """编译后的参数模板
+
+    Example:
+        template = ParamTemplate.compile(step['parameters'])
+        parameters = template.render(context['variables'])
+    """
+
+    __slots__ = ('source', 'variables', '_patch', '_leaf_count')
+
+    def __init__(self, source: Any, patch: Any, variables: FrozenSet[str], leaf_count: int):
+        self.source = source
+        self.variables = variables
+        # 补丁树：容器键 -> 子补丁树 或 _Leaf；根节点本身是叶子时为 _Leaf
+        self._patch = patch
+        self._leaf_count = leaf_count
+
+    @classmethod
+    def compile(cls, parameters: Any) -> 'ParamTemplate':
+        """编译参数结构
+
+        Args:
+            parameters: 步骤参数（dict / list / 标量）
+
+        Returns:
+            ParamTemplate: 编译后的模板，参数结构会被深拷贝，后续修改原参数不影响模板
+        """
+        source = copy.deepcopy(parameters) if parameters is not None else {}
+        variables: set = set()
+        counter = [0]
+
+        def build(node: Any) -> Any:
+            if isinstance(node, str):
+                parts = _parse(node)
+                if parts is None:
+                    return None
+                variables.update(parts[1::2])
+                counter[0] += 1
+                return _Leaf(node, parts)
+            if isinstance(node, dict):
+                items = node.items()
+            elif isinstance(node, list):
+                items = enumerate(node)
+            else:
+                return None
+            patch = {}
+            for key, child in items:
+                child_patch = build(child)
+                if child_patch is not None:
+                    patch[key] = child_patch
+            return patch or None
+
+        patch = build(source)
+        return cls(source, patch, frozenset(variables), counter[0])
+
+    @property
+    def is_static(self) -> bool:
+        """不含任何变量引用"""
+        return self._patch is None
+
+    @property
+    def leaf_count(self) -> int:
+        """包含变量引用的字符串叶子数量"""
+        return self._leaf_count
+
+    def render(self, variables: Optional[Dict[str, Any]] = None) -> Any:
+        """用变量渲染参数
+
+        返回值的顶层容器以及所有包含变量的路径上的容器都是新对象；
+        不含变量的子树与模板共享，调用方不应原地修改这些子树。
+
+        Args:
+            variables: 变量表
+
+        Returns:
+            Any: 渲染后的参数
+        """
+        source = self.source
+        if self._patch is None:
+            return _shallow_copy(source)
+        if isinstance(self._patch, _Leaf):
+            return self._patch.render(variables or {})
+        return _apply(source, self._patch, variables or {})
+
+    def missing(self, provided: Iterable[str]) -> FrozenSet[str]:
+        """未被提供的变量"""
+        return self.variables.difference(provided)
+
+
+def _shallow_copy(node: Any) -> Any:
+    if isinstance(node, dict):
+        return dict(node)
+    if isinstance(node, list):
+        return list(node)
+    return node
+
+
+def _apply(node: Any, patch: Dict[PathKey, Any], variables: Dict[str, Any]) -> Any:
+    result = _shallow_copy(node)
+    for key, child in patch.items():
+        if isinstance(child, _Leaf):
+            result[key] = child.render(variables)
+        else:
+            result[key] = _apply(node[key], child, variables)
+    return result
+
+
+class VariableExtractor:
+    """预编译的步骤输出变量提取规则
+
+    支持的规则：
+    - "$.a.b"：按键路径从结果中取值
+    - 其他字符串：直接赋值
+    - {"type": "regex", "pattern": ...}：正则提取（有分组时取第一个分组）
+    """
+
+    __slots__ = ('rules',)
+
+    def __init__(self, rules: List[Tuple[str, str, Any]]):
+        # (变量名, 规则类型, 规则参数)
+        self.rules = rules
+
+    @classmethod
+    def compile(cls, variable_extractions: Optional[Dict[str, Any]]) -> 'VariableExtractor':
+        """编译变量提取规则，无法编译的规则被忽略"""
+        rules: List[Tuple[str, str, Any]] = []
+        for var_name, rule in (variable_extractions or {}).items():
+            if isinstance(rule, str):
+                if rule.startswith('$.'):
+                    rules.append((var_name, 'path', tuple(rule[2:].split('.'))))
+                else:
+                    rules.append((var_name, 'const', rule))
+            elif isinstance(rule, dict) and rule.get('type') == 'regex':
+                try:
+                    rules.append((var_name, 'regex', re.compile(rule.get('pattern', ''))))
+                except re.error:
+                    continue
+        return cls(rules)
+
+    def extract(self, result: Any) -> Dict[str, Any]:
+        """按规则从步骤结果中提取变量"""
+        output: Dict[str, Any] = {}
+        text = None
+        for var_name, kind, arg in self.rules:
+            if kind == 'path':
+                if not isinstance(result, dict):
+                    continue
+                value = result
+                for key in arg:
+                    if isinstance(value, dict) and key in value:
+                        value = value[key]
+                    else:
+                        value = None
+                        break
+                if value is not None:
+                    output[var_name] = value
+            elif kind == 'const':
+                output[var_name] = arg
+            else:
+                if text is None:
+                    text = str(result)
+                match = arg.search(text)
+                if match:
+                    output[var_name] = match.group(1) if match.groups() else match.group(0)
+        return output
+
+
+class PlanTemplates:
+    """执行计划中全部步骤的参数模板与变量提取器"""
+
+    __slots__ = ('steps', 'extractors', 'variables', 'produced')
+
+    def __init__(self, steps: Dict[str, ParamTemplate], produced: FrozenSet[str],
+                 extractors: Optional[Dict[str, VariableExtractor]] = None):
+        self.steps = steps
+        self.extractors = extractors or {}
+        # 全部步骤引用的变量
+        self.variables: FrozenSet[str] = frozenset().union(*(t.variables for t in steps.values()))
+        # 由步骤变量提取规则产生的变量
+        self.produced = produced
+
+    @classmethod
+    def compile(cls, plan: Dict[str, Any]) -> 'PlanTemplates':
+        """编译计划中全部步骤的参数"""
+        steps: Dict[str, ParamTemplate] = {}
+        extractors: Dict[str, VariableExtractor] = {}
+        produced = set(BUILTIN_OUTPUT_VARIABLES)
+        for step in plan.get('steps', []) or []:
+            step_id = step.get('step_id')
+            if not step_id or step_id in steps:
+                continue
+            steps[step_id] = ParamTemplate.compile(step.get('parameters', {}))
+            extractions = step.get('variable_extractions') or {}
+            extractors[step_id] = VariableExtractor.compile(extractions)
+            produced.update(extractions.keys())
+        return cls(steps, frozenset(produced), extractors)
+
+    def get(self, step_id: str) -> Optional[ParamTemplate]:
+        """获取步骤模板"""
+        return self.steps.get(step_id)
+
+    def get_extractor(self, step_id: str) -> Optional[VariableExtractor]:
+        """获取步骤变量提取器"""
+        return self.extractors.get(step_id)
+
+    def unresolved_inputs(self, provided: Iterable[str] = ()) -> List[str]:
+        """需要由调用方提供的入参：引用的变量中既不是步骤产出、也未提供的部分"""
+        return sorted(self.variables - self.produced - set(provided))
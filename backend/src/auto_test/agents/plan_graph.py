@@ -0,0 +1,221 @@
+"""执行计划依赖图
+
+FlowPlanner、OrchestrationService、ExecutionEngine共用的计划图分析：
+- 邻接表建图，O(V+E)
+- Kahn拓扑排序（deque）
+- 分层（wave）：同一层的步骤之间没有依赖，可并行执行
+- 关键路径：按步骤耗时计算最长路径，作为计划预估时长
+- 环检测：返回构成环的步骤路径
+"""
+
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple, Iterable
+
+
+class PlanCycleError(ValueError):
+    """计划中存在循环依赖"""
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__(f"检测到循环依赖: {' -> '.join(cycle)}")
+
+
+def _field(step: Any, name: str, default: Any = None) -> Any:
+    """同时兼容字典步骤与ExecutionStep对象"""
+    if isinstance(step, dict):
+        return step.get(name, default)
+    return getattr(step, name, default)
+
+
+class PlanGraph:
+    """执行计划依赖图
+
+    边的方向为 依赖 -> 依赖它的步骤。不存在的依赖记录在missing_dependencies中，不参与建图。
+    """
+
+    def __init__(self, step_ids: List[str], dependencies: Dict[str, Iterable[str]],
+                 durations: Optional[Dict[str, float]] = None):
+        self.step_ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        for step_id in step_ids:
+            if step_id not in self.index:
+                self.index[step_id] = len(self.step_ids)
+                self.step_ids.append(step_id)
+
+        size = len(self.step_ids)
+        self.dependents: List[List[int]] = [[] for _ in range(size)]
+        self.requires: List[List[int]] = [[] for _ in range(size)]
+        self.missing_dependencies: List[Tuple[str, str]] = []
+        self.durations: List[float] = [
+            float((durations or {}).get(step_id, 0) or 0) for step_id in self.step_ids
+        ]
+
+        for step_id, node in self.index.items():
+            seen = set()
+            for dep in dependencies.get(step_id) or []:
+                dep_node = self.index.get(dep)
+                if dep_node is None:
+                    self.missing_dependencies.append((step_id, dep))
+                    continue
+                if dep_node in seen:
+                    continue
+                seen.add(dep_node)
+                self.requires[node].append(dep_node)
+                self.dependents[dep_node].append(node)
+
+        self._analysis: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_steps(cls, steps: Iterable[Any], default_timeout: float = 30) -> 'PlanGraph':
+        """从步骤列表建图（字典或ExecutionStep均可），步骤耗时取timeout"""
+        step_ids, dependencies, durations = [], {}, {}
+        for step in steps:
+            step_id = _field(step, 'step_id')
+            if not step_id or step_id in dependencies:
+                continue
+            step_ids.append(step_id)
+            dependencies[step_id] = _field(step, 'dependencies') or []
+            timeout = _field(step, 'timeout')
+            durations[step_id] = default_timeout if timeout is None else timeout
+        return cls(step_ids, dependencies, durations)
+
+    def _analyze(self) -> Dict[str, Any]:
+        """一次Kahn遍历同时得到拓扑序、分层与最早完成时间"""
+        if self._analysis is not None:
+            return self._analysis
+
+        size = len(self.step_ids)
+        in_degree = [len(deps) for deps in self.requires]
+        level = [0] * size
+        finish = [0.0] * size
+        # 关键路径上的前驱
+        critical_prev = [-1] * size
+
+        queue = deque(node for node in range(size) if in_degree[node] == 0)
+        for node in queue:
+            finish[node] = self.durations[node]
+
+        order: List[int] = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for child in self.dependents[node]:
+                if level[node] + 1 > level[child]:
+                    level[child] = level[node] + 1
+                candidate = finish[node] + self.durations[child]
+                if candidate > finish[child]:
+                    finish[child] = candidate
+                    critical_prev[child] = node
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    # 无前驱贡献时（理论上不会发生）至少计入自身耗时
+                    finish[child] = max(finish[child], self.durations[child])
+                    queue.append(child)
+
+        self._analysis = {
+            'order': order,
+            'level': level,
+            'finish': finish,
+            'critical_prev': critical_prev,
+            'acyclic': len(order) == size
+        }
+        return self._analysis
+
+    def has_cycle(self) -> bool:
+        """是否存在循环依赖"""
+        return not self._analyze()['acyclic']
+
+    def find_cycle(self) -> Optional[List[str]]:
+        """查找一个环
+
+        Returns:
+            Optional[List[str]]: 环上的步骤路径（首尾相同，方向为 步骤 -> 其依赖），无环返回None
+        """
+        if not self.has_cycle():
+            return None
+
+        white, gray, black = 0, 1, 2
+        color = [white] * len(self.step_ids)
+        for start in range(len(self.step_ids)):
+            if color[start] != white:
+                continue
+            path = [start]
+            iterators = [iter(self.requires[start])]
+            color[start] = gray
+            while iterators:
+                advanced = False
+                for dep in iterators[-1]:
+                    if color[dep] == gray:
+                        cycle = path[path.index(dep):] + [dep]
+                        return [self.step_ids[node] for node in cycle]
+                    if color[dep] == white:
+                        color[dep] = gray
+                        path.append(dep)
+                        iterators.append(iter(self.requires[dep]))
+                        advanced = True
+                        break
+                if not advanced:
+                    color[path.pop()] = black
+                    iterators.pop()
+        return None
+
+    def topological_order(self) -> List[str]:
+        """拓扑序（同层内保持原始顺序）
+
+        Raises:
+            PlanCycleError: 存在循环依赖
+        """
+        analysis = self._analyze()
+        if not analysis['acyclic']:
+            raise PlanCycleError(self.find_cycle() or [])
+        return [self.step_ids[node] for node in analysis['order']]
+
+    def levels(self) -> Dict[str, int]:
+        """步骤所在层（wave），从0开始；环上的步骤不出现在结果中"""
+        analysis = self._analyze()
+        return {self.step_ids[node]: analysis['level'][node] for node in analysis['order']}
+
+    def waves(self) -> List[List[str]]:
+        """按层分组的步骤，同一层内的步骤可以并行执行"""
+        analysis = self._analyze()
+        waves: List[List[str]] = []
+        for node in analysis['order']:
+            level = analysis['level'][node]
+            while len(waves) <= level:
+                waves.append([])
+            waves[level].append(self.step_ids[node])
+        return waves
+
+    def critical_path(self) -> Tuple[float, List[str]]:
+        """关键路径
+
+        Returns:
+            Tuple[float, List[str]]: (关键路径总耗时, 关键路径上的步骤)，存在环时按无环部分计算
+        """
+        analysis = self._analyze()
+        if not analysis['order']:
+            return 0.0, []
+        finish = analysis['finish']
+        end = max(analysis['order'], key=lambda node: finish[node])
+        path = []
+        node = end
+        while node != -1:
+            path.append(self.step_ids[node])
+            node = analysis['critical_prev'][node]
+        path.reverse()
+        return finish[end], path
+
+    def summary(self) -> Dict[str, Any]:
+        """图分析摘要"""
+        duration, path = self.critical_path()
+        waves = self.waves()
+        return {
+            'total_steps': len(self.step_ids),
+            'waves': len(waves),
+            'max_parallelism': max((len(wave) for wave in waves), default=0),
+            'critical_path': path,
+            'critical_path_duration': duration,
+            'total_timeout': sum(self.durations),
+            'cycle': self.find_cycle(),
+            'missing_dependencies': [list(item) for item in self.missing_dependencies]
+        }
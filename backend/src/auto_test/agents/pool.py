@@ -0,0 +1,110 @@
+"""Agent池
+
+应用级共享的Agent与LLM客户端：
+- 进程内只创建一个LLM客户端（ChatOpenAI / MockLLM），复用其HTTP连接
+- 每种Agent只创建一个实例，Agent本身按调用无状态，可被并发请求共享
+- ExecutionEngine共享后，活跃执行与事件订阅在所有请求之间可见
+- 统计信息集中汇总
+
+由FastAPI lifespan负责启动与关闭；未经lifespan启动时在首次使用时惰性创建。
+"""
+
+from typing import Dict, Any, Optional, Type, TypeVar
+
+from ..config import Config
+from ..mcp.client import MCPClient
+from ..utils.logger import get_logger
+from .base_agent import BaseAgent, create_llm
+from .intent_parser import IntentParser
+from .flow_planner import FlowPlanner
+from .execution_engine import ExecutionEngine
+
+logger = get_logger(__name__)
+
+AgentT = TypeVar('AgentT', bound=BaseAgent)
+
+
+class AgentPool:
+    """应用级Agent池"""
+
+    AGENT_TYPES = (IntentParser, FlowPlanner, ExecutionEngine)
+
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config()
+        self.llm = None
+        self._agents: Dict[Type[BaseAgent], BaseAgent] = {}
+        self._started = False
+
+    def start(self) -> None:
+        """创建共享LLM客户端与Agent实例（幂等）"""
+        if self._started:
+            return
+        self.llm = create_llm(self.config)
+        for agent_cls in self.AGENT_TYPES:
+            self._agents[agent_cls] = agent_cls(self.config, llm=self.llm)
+        self._started = True
+        logger.info(f"Agent池启动完成: {[cls.__name__ for cls in self.AGENT_TYPES]}")
+
+    async def close(self) -> None:
+        """关闭共享LLM客户端的HTTP连接"""
+        client = getattr(self.llm, 'root_async_client', None)
+        if client is not None:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"关闭LLM客户端失败: {e}")
+        self._agents.clear()
+        self.llm = None
+        self._started = False
+        logger.info("Agent池已关闭")
+
+    def get(self, agent_cls: Type[AgentT]) -> AgentT:
+        """获取共享的Agent实例
+
+        Args:
+            agent_cls: Agent类型
+
+        Returns:
+            Agent实例
+        """
+        if not self._started:
+            self.start()
+        agent = self._agents.get(agent_cls)
+        if agent is None:
+            agent = self._agents[agent_cls] = agent_cls(self.config, llm=self.llm)
+        return agent
+
+    @property
+    def intent_parser(self) -> IntentParser:
+        return self.get(IntentParser)
+
+    @property
+    def flow_planner(self) -> FlowPlanner:
+        return self.get(FlowPlanner)
+
+    @property
+    def execution_engine(self) -> ExecutionEngine:
+        return self.get(ExecutionEngine)
+
+    @property
+    def mcp_client(self) -> MCPClient:
+        """共享的MCP客户端（与执行引擎共用工具注册表）"""
+        return self.execution_engine.mcp_client
+
+    def get_stats(self) -> Dict[str, Any]:
+        """汇总所有Agent的统计信息"""
+        agents = {agent.agent_type: agent.get_stats() for agent in self._agents.values()}
+        totals = BaseAgent._empty_stats()
+        for stats in agents.values():
+            for key in totals:
+                totals[key] += stats.get(key, 0)
+        return {
+            'started': self._started,
+            'llm': type(self.llm).__name__ if self.llm is not None else None,
+            'agents': agents,
+            'totals': totals
+        }
+
+
+# 全局Agent池
+agent_pool = AgentPool()
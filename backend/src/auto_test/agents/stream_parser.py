@@ -0,0 +1,122 @@
+"""增量JSON解析
+
+在LLM流式输出的过程中逐块喂入文本，一旦顶层对象中指定数组（默认actions）
+的某个元素完整闭合，立即解析并返回该元素，无需等待整个响应生成完毕。
+"""
+
+import json
+from typing import Any, List, Optional
+
+
+class IncrementalJSONParser:
+    """增量JSON解析器
+
+    只维护扫描位置、嵌套深度和字符串状态，每个字符只扫描一次。
+
+    Example:
+        parser = IncrementalJSONParser('actions')
+        async for chunk in stream:
+            for action in parser.feed(chunk):
+                ...
+        result = parser.result()
+    """
+
+    def __init__(self, array_key: str = 'actions'):
+        self.array_key = array_key
+        self._text = ''
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._array_done = False
+        self._item_start: Optional[int] = None
+        self.items_emitted = 0
+
+    def feed(self, chunk: str) -> List[Any]:
+        """喂入一段文本
+
+        Args:
+            chunk: 新到达的文本片段
+
+        Returns:
+            List[Any]: 本次新完成的数组元素（已解析）
+        """
+        self._text += chunk
+        completed: List[Any] = []
+        text = self._text
+
+        for i in range(self._pos, len(text)):
+            c = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = text[self._string_start + 1:i]
+                continue
+
+            in_array = self._array_depth is not None and self._depth == self._array_depth
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+                if in_array and self._item_start is None:
+                    self._item_start = i
+            elif c in '{[':
+                if in_array and self._item_start is None:
+                    self._item_start = i
+                self._depth += 1
+                if (c == '[' and self._depth == 2 and self._array_depth is None
+                        and not self._array_done and self._last_key == self.array_key):
+                    self._array_depth = 2
+            elif c in '}]':
+                if in_array and c == ']':
+                    # 目标数组结束
+                    self._emit(text[self._item_start:i] if self._item_start is not None else None,
+                               completed)
+                    self._array_depth = None
+                    self._array_done = True
+                self._depth -= 1
+                if (self._array_depth is not None and self._depth == self._array_depth
+                        and self._item_start is not None):
+                    self._emit(text[self._item_start:i + 1], completed)
+            elif c == ',':
+                if in_array and self._item_start is not None:
+                    self._emit(text[self._item_start:i], completed)
+            elif in_array and self._item_start is None and not c.isspace():
+                # 标量元素
+                self._item_start = i
+
+        self._pos = len(text)
+        return completed
+
+    def _emit(self, raw: Optional[str], completed: List[Any]) -> None:
+        self._item_start = None
+        if raw is None or not raw.strip():
+            return
+        try:
+            completed.append(json.loads(raw))
+            self.items_emitted += 1
+        except json.JSONDecodeError:
+            # 元素本身不合法时跳过，由最终的完整解析兜底
+            pass
+
+    @property
+    def text(self) -> str:
+        """已接收的完整文本"""
+        return self._text
+
+    def result(self) -> Any:
+        """解析已接收的完整文本
+
+        Raises:
+            json.JSONDecodeError: 文本不是合法JSON
+        """
+        return json.loads(self._text)
@@ -8,8 +8,10 @@ API Interfaces Management API - With Service Layer
 - 只做接收请求、调用Service、返回响应
 """
 
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Query, Body, Depends
+from datetime import datetime
+from typing import Any, List, Optional
+from fastapi import APIRouter, HTTPException, Query, Body, Depends, Request
+from starlette.concurrency import run_in_threadpool
 from ..models.response import ApiResponseGeneric
 from ..models.api_interface import (
     ApiInterface, ApiInterfaceCreate, ApiInterfaceUpdate,
@@ -19,13 +21,19 @@ from ..models.api_interface import (
     ApiInterfaceTestResult, ApiBatchTestResult,
     HttpMethodOption, ApiStatusOption,
     ApiInterfaceBatchStatusResult, ApiInterfaceBatchDeleteResult,
-    ApiInterfaceExportResponse
+    ApiInterfaceExportResponse, ApiSpecImportResponse
 )
 from ..services.api_interface_service import ApiInterfaceService
-from ..utils.response import success_response, error_response
+from ..services.api_import_service import ApiImportService
+from ..services.openapi_import_service import OpenApiImportService
+from ..utils.response import success_response, error_response, trusted_response, ResponseShape
+from ..utils.export import stream_export, validate_export_format
 
 router = APIRouter(tags=["API接口管理"])
 
+# 读接口的数据由Service层产出，按模型字段投影后直接序列化，不再逐行构建ApiInterface
+_API_SHAPE = ResponseShape(ApiInterface)
+
 
 def create_query_request(
     system_id: Optional[int] = Query(None, description="系统ID筛选"),
@@ -35,7 +43,8 @@ def create_query_request(
     status: Optional[str] = Query(None, description="状态筛选"),
     enabled_only: Optional[bool] = Query(None, description="仅显示启用的"),
     page: int = Query(1, ge=1, description="页码"),
-    size: int = Query(1000, ge=1, le=1000, description="每页数量")
+    size: int = Query(1000, ge=1, le=1000, description="每页数量"),
+    fields: Optional[str] = Query(None, description="字段投影，逗号分隔（如 id,name,status），为空时返回全部字段")
 ) -> ApiInterfaceQueryRequest:
     """创建API接口查询请求对象"""
     return ApiInterfaceQueryRequest(
@@ -46,7 +55,16 @@ def create_query_request(
         status=status,
         enabled_only=enabled_only,
         page=page,
-        size=size
+        size=size,
+        fields=fields
+    )
+
+def _list_response(apis: List[dict], query_request: ApiInterfaceQueryRequest, message: str):
+    """列表响应：字段投影的行原样返回（不满足完整模型），完整行按ApiInterface模型形状投影"""
+    rows = apis if query_request.fields else _API_SHAPE.rows(apis)
+    return trusted_response(
+        data={'list': rows, 'total': len(apis), 'page': query_request.page, 'size': query_request.size},
+        message=message
     )
 
 @router.get("/api-interfaces/v1/", response_model=ApiResponseGeneric[ApiInterfaceResponse], summary="获取API接口列表")
@@ -65,15 +83,11 @@ async def get_api_interfaces(query_request: ApiInterfaceQueryRequest = Depends(c
             apis = ApiInterfaceService.search_api_interfaces(query_request)
         else:
             # 没有筛选条件时返回所有API
-            apis = ApiInterfaceService.get_api_interfaces()
+            apis = ApiInterfaceService.get_api_interfaces(query_request.fields)
         
-        response_data = ApiInterfaceResponse(
-            list=[ApiInterface(**api) for api in apis],
-            total=len(apis),
-            page=query_request.page,
-            size=query_request.size
-        )
-        return success_response(data=response_data, message="获取API接口列表成功")
+        return _list_response(apis, query_request, "获取API接口列表成功")
+    except ValueError as e:
+        return error_response(message=str(e), code=400)
     except Exception as e:
         return error_response(message=f"获取API接口列表失败: {str(e)}")
 
@@ -84,7 +98,7 @@ async def get_api_interface(api_id: int):
         api = ApiInterfaceService.get_api_interface_by_id(api_id)
         if not api:
             raise HTTPException(status_code=404, detail="API接口不存在")
-        return success_response(data=ApiInterface(**api), message="获取API接口详情成功")
+        return trusted_response(data=_API_SHAPE.row(api), message="获取API接口详情成功")
     except HTTPException:
         raise
     except Exception as e:
@@ -134,13 +148,9 @@ async def search_api_interfaces(query: ApiInterfaceQueryRequest):
     """搜索API接口"""
     try:
         apis = ApiInterfaceService.search_api_interfaces(query)
-        response_data = ApiInterfaceResponse(
-            list=[ApiInterface(**api) for api in apis],
-            total=len(apis),
-            page=query.page,
-            size=query.size
-        )
-        return success_response(data=response_data, message="搜索API接口成功")
+        return _list_response(apis, query, "搜索API接口成功")
+    except ValueError as e:
+        return error_response(message=str(e), code=400)
     except Exception as e:
         return error_response(message=f"搜索API接口失败: {str(e)}")
 
@@ -166,7 +176,7 @@ async def search_api_interfaces_simple(
             size=size
         )
         apis = ApiInterfaceService.search_api_interfaces(query_request)
-        return success_response(data=[ApiInterface(**api) for api in apis], message="搜索API接口成功")
+        return trusted_response(data=_API_SHAPE.rows(apis), message="搜索API接口成功")
     except Exception as e:
         return error_response(message=f"搜索API接口失败: {str(e)}")
 
@@ -175,7 +185,7 @@ async def get_api_interfaces_by_system(system_id: int):
     """根据系统ID获取API接口列表"""
     try:
         apis = ApiInterfaceService.get_api_interfaces_by_system(system_id)
-        return success_response(data=[ApiInterface(**api) for api in apis], message="获取系统API接口列表成功")
+        return trusted_response(data=_API_SHAPE.rows(apis), message="获取系统API接口列表成功")
     except ValueError as e:
         return error_response(message=str(e), code=400)
     except Exception as e:
@@ -186,7 +196,7 @@ async def get_api_interfaces_by_module(module_id: int):
     """根据模块ID获取API接口列表"""
     try:
         apis = ApiInterfaceService.get_api_interfaces_by_module(module_id)
-        return success_response(data=[ApiInterface(**api) for api in apis], message="获取模块API接口列表成功")
+        return trusted_response(data=_API_SHAPE.rows(apis), message="获取模块API接口列表成功")
     except ValueError as e:
         return error_response(message=str(e), code=400)
     except Exception as e:
@@ -277,50 +287,92 @@ async def export_api_interfaces(
         )
         apis = ApiInterfaceService.search_api_interfaces(query_request)
         
-        # 构建导出数据
-        export_data = ApiInterfaceExportResponse(
-            apis=[ApiInterface(**api) for api in apis],
-            total_count=len(apis)
+        # 构建导出数据（与ApiInterfaceExportResponse字段一致）
+        export_data = {
+            'apis': _API_SHAPE.rows(apis),
+            'export_time': datetime.now(),
+            'total_count': len(apis)
+        }
+        return trusted_response(data=export_data, message="导出数据成功")
+    except Exception as e:
+        return error_response(message=f"导出数据失败: {str(e)}")
+
+@router.get("/api-interfaces/v1/export/stream", summary="流式导出API接口数据（NDJSON/CSV）")
+async def export_api_interfaces_stream(
+    format: str = Query("ndjson", description="导出格式：ndjson / csv"),
+    system_id: Optional[int] = Query(None, description="系统ID"),
+    module_id: Optional[int] = Query(None, description="模块ID"),
+    status: Optional[str] = Query(None, description="状态筛选"),
+    keyword: Optional[str] = Query(None, description="搜索关键词"),
+    fields: Optional[str] = Query(None, description="字段投影，逗号分隔，为空时导出全部字段"),
+    after_id: int = Query(0, ge=0, description="键集游标：只导出ID大于该值的接口，中断后传入已收到的最后一个ID续传"),
+    limit: Optional[int] = Query(None, ge=1, description="最多导出的行数，为空时导出全部"),
+    compress: bool = Query(False, description="是否输出gzip压缩文件")
+):
+    """流式导出API接口数据，按主键顺序输出，不限行数且内存占用恒定"""
+    try:
+        validate_export_format(format)
+        columns, batches = ApiInterfaceService.iter_export_batches(
+            system_id, module_id, status, keyword, fields, after_id, limit
         )
-        return success_response(data=export_data, message="导出数据成功")
+        return stream_export(batches, format, columns, "api_interfaces", compress)
+    except ValueError as e:
+        return error_response(message=str(e), code=400)
     except Exception as e:
         return error_response(message=f"导出数据失败: {str(e)}")
 
 @router.post("/api-interfaces/v1/import/data", response_model=ApiResponseGeneric[ApiInterfaceImportResponse], summary="导入API接口数据")
-async def import_api_interfaces(apis_data: List[ApiInterfaceCreate]):
+async def import_api_interfaces(apis_data: List[ApiInterfaceCreate],
+                                overwrite: bool = Query(False, description="接口已存在时是否覆盖")):
     """批量导入API接口数据"""
     try:
-        results = []
-        success_count = 0
-        error_count = 0
-        
-        for api_data in apis_data:
-            try:
-                new_api = ApiInterfaceService.create_api_interface(api_data)
-                results.append({
-                    'name': api_data.name,
-                    'status': 'success',
-                    'id': new_api.get('id')
-                })
-                success_count += 1
-            except Exception as e:
-                results.append({
-                    'name': api_data.name,
-                    'status': 'error',
-                    'error': str(e)
-                })
-                error_count += 1
-        
-        import_result = ApiInterfaceImportResponse(
-            total=len(apis_data),
-            success_count=success_count,
-            error_count=error_count,
-            results=results
-        )
-        return success_response(data=import_result, message="导入数据完成")
+        result = ApiImportService.import_rows(apis_data, overwrite)
+        return trusted_response(data=result, message="导入数据完成")
     except Exception as e:
         return error_response(message=f"导入数据失败: {str(e)}")
 
+@router.post("/api-interfaces/v1/import/bulk", response_model=ApiResponseGeneric[ApiInterfaceImportResponse], summary="批量导入API接口（逐行校验）")
+async def import_api_interfaces_bulk(apis_data: List[Any] = Body(..., description="API接口数据列表"),
+                                     overwrite: bool = Query(False, description="接口已存在时是否覆盖")):
+    """批量导入API接口，无效行逐行报告错误，不影响其他行"""
+    try:
+        result = ApiImportService.import_rows(apis_data, overwrite)
+        return trusted_response(data=result, message="导入数据完成")
+    except Exception as e:
+        return error_response(message=f"导入数据失败: {str(e)}")
+
+@router.post("/api-interfaces/v1/import/jsonl", response_model=ApiResponseGeneric[ApiInterfaceImportResponse], summary="流式导入API接口（JSONL）")
+async def import_api_interfaces_jsonl(request: Request,
+                                      overwrite: bool = Query(False, description="接口已存在时是否覆盖")):
+    """流式上传JSONL文件（每行一个接口JSON对象），边接收边按块写入"""
+    try:
+        result = await ApiImportService.import_jsonl(request.stream(), overwrite)
+        return trusted_response(data=result, message="导入数据完成")
+    except Exception as e:
+        return error_response(message=f"导入数据失败: {str(e)}")
+
+@router.post("/api-interfaces/v1/import/openapi", response_model=ApiResponseGeneric[ApiSpecImportResponse], summary="导入OpenAPI/Swagger文档")
+async def import_openapi_spec(request: Request,
+                              system_id: int = Query(..., description="目标系统ID"),
+                              module_id: Optional[int] = Query(None, description="统一的目标模块ID，为空时按首个标签映射到同名模块"),
+                              version: str = Query("v1", description="接口版本"),
+                              base_path: Optional[str] = Query(None, description="路径前缀，为空时使用文档的 basePath / servers"),
+                              format: Optional[str] = Query(None, description="文档格式 json / yaml，为空时自动识别")):
+    """上传OpenAPI 3 / Swagger 2 文档（请求体为JSON或YAML原文），增量同步其中的操作：新增、覆盖变更、跳过未变更"""
+    try:
+        source = await OpenApiImportService.spool(request.stream())
+        try:
+            # 解析与写入为CPU/IO密集的同步操作，放到线程池中执行
+            result = await run_in_threadpool(
+                OpenApiImportService.import_spec, source, system_id, module_id, version, base_path,
+                format, request.headers.get('content-type')
+            )
+        finally:
+            source.close()
+        return trusted_response(data=result, message="导入文档完成")
+    except Exception as e:
+        return error_response(message=f"导入文档失败: {str(e)}")
+
 @router.get("/api-interfaces/v1/methods/list", response_model=ApiResponseGeneric[List[HttpMethodOption]], summary="获取HTTP方法列表")
 async def get_http_methods():
     """获取支持的HTTP方法列表"""
@@ -0,0 +1,59 @@
+"""批量执行API
+
+数据驱动的批量回归：一个计划（或一组测试API）× 一张数据表。
+- stream=true（默认）：NDJSON流，逐行推送结果，最后一行为汇总报告
+- stream=false：全部完成后返回行结果与汇总报告
+
+遵循极简控制器编码规范：
+- 控制器方法不超过5行代码
+- 只做接收请求、调用Service、返回响应
+"""
+
+from typing import Dict, Any, Optional, List
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from ..agents.admission import AdmissionRejectedError
+from ..services.bulk_execution_service import BulkExecutionService
+from ..utils.response import success_response, error_response, ndjson_lines, too_many_requests_response
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+router = APIRouter(tags=["批量执行"])
+
+
+class BulkExecutionRequest(BaseModel):
+    """批量执行请求模型"""
+    plan: Optional[Dict[str, Any]] = Field(default=None, description="执行计划")
+    flow_id: Optional[int] = Field(default=None, description="已保存的流程ID")
+    test_api_ids: Optional[List[int]] = Field(default=None, description="测试API ID列表")
+    rows: Optional[List[Dict[str, Any]]] = Field(default=None, description="数据表（对象列表）")
+    data: Optional[str] = Field(default=None, description="数据表文本（CSV或JSONL）")
+    data_format: Optional[str] = Field(default=None, description="数据表格式", pattern="^(csv|jsonl)$")
+    variables: Dict[str, Any] = Field(default_factory=dict, description="所有行共享的变量")
+    context: Dict[str, Any] = Field(default_factory=dict, description="执行上下文")
+    concurrency: Optional[int] = Field(default=None, ge=1, description="并发度")
+    stop_on_failure: bool = Field(default=False, description="出现失败后停止派发")
+    include_results: bool = Field(default=False, description="行结果中包含响应与步骤输出")
+    rate_limit_per_target: Optional[float] = Field(default=None, ge=0, description="每个目标主机的限速（次/秒，测试API模式）")
+    persist_runs: bool = Field(default=True, description="保存测试API执行记录")
+    stream: bool = Field(default=True, description="是否流式返回")
+
+
+@router.post("/bulk-executions/v1/run", summary="批量执行")
+async def run_bulk_execution(request: BulkExecutionRequest):
+    """批量执行计划或测试API"""
+    payload = request.model_dump()
+    try:
+        BulkExecutionService.check_admission(payload)
+    except AdmissionRejectedError as e:
+        return too_many_requests_response(str(e), e.retry_after)
+    if request.stream:
+        return StreamingResponse(ndjson_lines(BulkExecutionService.run(payload)), media_type="application/x-ndjson")
+    try:
+        return success_response(data=await BulkExecutionService.run_to_completion(payload), message="批量执行完成")
+    except Exception as e:
+        logger.error(f"批量执行失败: {str(e)}")
+        return error_response(message=f"批量执行失败: {str(e)}")
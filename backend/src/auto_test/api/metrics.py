@@ -0,0 +1,34 @@
+"""
+运行时指标API
+
+提供工具执行指标的导出接口：
+- /metrics: Prometheus文本格式
+- /metrics/v1/summary: JSON摘要
+
+遵循极简控制器编码规范：
+- 控制器方法不超过5行
+- 只做接收请求、调用Service、返回响应
+"""
+
+from typing import Dict, Any
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..services.metrics_service import MetricsService
+from ..utils.response import success_response
+
+router = APIRouter(tags=["运行时指标"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, summary="Prometheus指标")
+async def get_prometheus_metrics() -> PlainTextResponse:
+    """导出Prometheus文本格式指标 - 极简控制器"""
+    content = MetricsService.render_prometheus_metrics()
+    return PlainTextResponse(content, media_type="text/plain; version=0.0.4")
+
+
+@router.get("/metrics/v1/summary", response_model=dict, summary="指标摘要")
+async def get_metrics_summary() -> Dict[str, Any]:
+    """获取JSON格式指标摘要 - 极简控制器"""
+    data = MetricsService.collect_metrics_summary()
+    return success_response(data=data, message="获取指标摘要成功")
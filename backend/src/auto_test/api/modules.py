@@ -3,31 +3,32 @@
 Modules API - With Service Layer
 """
 
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query
 from ..models.module import Module, ModuleCreate, ModuleUpdate
 from ..services.module_service import ModuleService
-from ..utils.response import success_response, error_response
+from ..utils.response import success_response, error_response, trusted_response
 
 router = APIRouter(tags=["模块管理"])
 
 @router.get("/modules/v1/", response_model=dict, summary="获取模块列表")
-async def get_modules(system_id: int = Query(None, description="系统ID，可选")):
-    """获取模块列表，可按系统ID筛选"""
+async def get_modules(system_id: int = Query(None, description="系统ID，可选"),
+                      fields: Optional[str] = Query(None, description="字段投影，逗号分隔（如 id,name,status），为空时返回全部字段")):
+    """获取模块列表，可按系统ID筛选，支持 fields 字段投影"""
     try:
-        modules = ModuleService.get_modules(system_id)
-        return success_response(data=modules, message="获取模块列表成功")
+        modules = ModuleService.get_modules(system_id, fields)
+        return trusted_response(data=modules, message="获取模块列表成功")
     except ValueError as e:
         return error_response(message=str(e), code=400)
     except Exception as e:
         return error_response(message=f"获取模块列表失败: {str(e)}")
 
 @router.get("/modules/v1/by-system/{system_id}", response_model=dict, summary="根据系统ID获取模块列表")
-async def get_modules_by_system(system_id: int):
-    """根据系统ID获取模块列表"""
+async def get_modules_by_system(system_id: int, fields: Optional[str] = Query(None, description="字段投影，逗号分隔（如 id,name,status），为空时返回全部字段")):
+    """根据系统ID获取模块列表，支持 fields 字段投影"""
     try:
-        modules = ModuleService.get_modules(system_id)
-        return success_response(data=modules, message="获取模块列表成功")
+        modules = ModuleService.get_modules(system_id, fields)
+        return trusted_response(data=modules, message="获取模块列表成功")
     except ValueError as e:
         return error_response(message=str(e), code=400)
     except Exception as e:
@@ -38,7 +39,7 @@ async def get_enabled_modules(system_id: int = Query(None, description="系统ID
     """获取启用状态的模块列表（用于API管理和页面管理页面）"""
     try:
         modules = ModuleService.get_enabled_modules(system_id)
-        return success_response(data=modules, message="获取启用模块列表成功")
+        return trusted_response(data=modules, message="获取启用模块列表成功")
     except Exception as e:
         return error_response(message=f"获取启用模块列表失败: {str(e)}")
 
@@ -47,7 +48,7 @@ async def get_enabled_modules_by_system(system_id: int):
     """根据系统ID获取启用状态的模块列表"""
     try:
         modules = ModuleService.get_enabled_modules(system_id)
-        return success_response(data=modules, message="获取启用模块列表成功")
+        return trusted_response(data=modules, message="获取启用模块列表成功")
     except Exception as e:
         return error_response(message=f"获取启用模块列表失败: {str(e)}")
 
@@ -58,7 +59,7 @@ async def get_module(module_id: int):
         module = ModuleService.get_module_by_id(module_id)
         if not module:
             raise HTTPException(status_code=404, detail="模块不存在")
-        return success_response(data=module, message="获取模块详情成功")
+        return trusted_response(data=module, message="获取模块详情成功")
     except HTTPException:
         raise
     except Exception as e:
@@ -13,12 +13,15 @@
 """
 
 from typing import Dict, Any, Optional
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Depends
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Depends, Body, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
+from ..agents.admission import AdmissionRejectedError
 from ..services.orchestration_service import OrchestrationService
 from ..services.tracking_service import TrackingService
-from ..utils.response import success_response, error_response
+from ..utils.response import success_response, error_response, ndjson_lines, too_many_requests_response
+from ..utils.export import stream_export, validate_export_format
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -48,12 +51,24 @@ class PlanValidateRequest(BaseModel):
     plan: Dict[str, Any] = Field(description="执行计划")
 
 
+class FlowExecuteRequest(BaseModel):
+    """流程执行请求模型"""
+    inputs: Dict[str, Any] = Field(default_factory=dict, description="执行入参")
+    context: Dict[str, Any] = Field(default_factory=dict, description="执行上下文")
+
+
 class ExecutionValidateInputsRequest(BaseModel):
     """执行入参校验请求模型"""
     plan: Dict[str, Any] = Field(description="执行计划")
     inputs: Dict[str, Any] = Field(description="执行入参")
 
 
+def _admission_rejected(e: AdmissionRejectedError) -> JSONResponse:
+    """执行队列已满：429 + Retry-After"""
+    logger.warning(f"执行被准入控制拒绝: {str(e)}")
+    return too_many_requests_response(str(e), e.retry_after)
+
+
 # ============================================================================
 # 编排执行接口
 # ============================================================================
@@ -67,6 +82,8 @@ async def execute_orchestration(request: OrchestrationRequest):
             context=request.context
         )
         return success_response(data=result, message="编排执行成功")
+    except AdmissionRejectedError as e:
+        return _admission_rejected(e)
     except Exception as e:
         logger.error(f"编排执行失败: {str(e)}")
         return error_response(message=f"编排执行失败: {str(e)}")
@@ -106,6 +123,13 @@ async def generate_plan(request: PlanGenerateRequest):
         return error_response(message=f"计划生成失败: {str(e)}")
 
 
+@router.post("/orchestration/plan/preview/stream", summary="流式预览执行计划")
+async def stream_plan_preview(request: PlanGenerateRequest):
+    """流式预览执行计划（NDJSON，每行一个事件）"""
+    events = OrchestrationService.stream_plan_preview(request.intent_text, request.context)
+    return StreamingResponse(ndjson_lines(events), media_type="application/x-ndjson")
+
+
 @router.post("/orchestration/plan/validate", summary="校验执行计划（Step3）")
 async def validate_plan(request: PlanValidateRequest):
     """校验执行计划"""
@@ -202,6 +226,19 @@ async def update_orchestration_flow(flow_id: int, flow_data: Dict[str, Any]):
         return error_response(message=f"更新流程失败: {str(e)}")
 
 
+@router.post("/orchestration/flows/{flow_id}/execute", summary="执行已保存的流程")
+async def execute_orchestration_flow(flow_id: int, request: FlowExecuteRequest):
+    """执行已保存的流程（复用缓存的计划编译产物）"""
+    try:
+        result = await OrchestrationService.execute_flow(flow_id, request.inputs, request.context)
+        return success_response(data=result, message="流程执行成功")
+    except AdmissionRejectedError as e:
+        return _admission_rejected(e)
+    except Exception as e:
+        logger.error(f"流程执行失败: {str(e)}")
+        return error_response(message=f"流程执行失败: {str(e)}")
+
+
 # ============================================================================
 # MCP工具管理接口
 # ============================================================================
@@ -377,6 +414,26 @@ async def export_audit_report(
         return error_response(message=f"导出报告失败: {str(e)}")
 
 
+@router.post("/orchestration/tracking/export/stream", summary="流式导出审计报告（NDJSON/CSV）")
+async def export_audit_report_stream(
+    filters: Optional[Dict[str, Any]] = Body(None),
+    format: str = Query("ndjson", description="导出格式：ndjson / csv"),
+    after_id: int = Query(0, ge=0, description="键集游标：只导出ID大于该值的计划，中断后传入已收到的最后一个ID续传"),
+    limit: Optional[int] = Query(None, ge=1, description="最多导出的计划数，为空时导出全部"),
+    compress: bool = Query(False, description="是否输出gzip压缩文件")
+):
+    """流式导出审计报告，按计划ID顺序输出，不限行数且内存占用恒定"""
+    try:
+        validate_export_format(format)
+        batches = TrackingService.iter_audit_batches(filters or {}, after_id, limit)
+        return stream_export(batches, format, TrackingService.AUDIT_EXPORT_COLUMNS, "audit_report", compress)
+    except ValueError as e:
+        return error_response(message=str(e), code=400)
+    except Exception as e:
+        logger.error(f"导出报告失败: {str(e)}")
+        return error_response(message=f"导出报告失败: {str(e)}")
+
+
 # ============================================================================
 # 兼容性路由（支持前端调用）
 # ============================================================================
@@ -26,11 +26,14 @@ router = APIRouter(tags=["页面管理"])
 
 
 @router.get("/pages/v1/", response_model=dict, summary="获取页面列表")
-async def get_pages(system_id: Optional[int] = Query(None, description="系统ID")):
-    """获取页面列表"""
+async def get_pages(system_id: Optional[int] = Query(None, description="系统ID"),
+                    fields: Optional[str] = Query(None, description="字段投影，逗号分隔（如 id,name,status），为空时返回全部字段")):
+    """获取页面列表，支持 fields 字段投影"""
     try:
-        pages = PageService.get_pages(system_id)
+        pages = PageService.get_pages(system_id, fields)
         return success_response(data=pages, message="获取页面列表成功")
+    except ValueError as e:
+        return error_response(message=str(e), code=400)
     except Exception as e:
         return error_response(message=f"获取页面列表失败: {str(e)}")
 
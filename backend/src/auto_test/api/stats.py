@@ -18,7 +18,7 @@ from fastapi import APIRouter
 from typing import Dict, Any
 
 from ..services.stats_service import StatsService
-from ..utils.response import success_response
+from ..utils.response import success_response, error_response
 
 # 创建路由器
 router = APIRouter()
@@ -27,22 +27,28 @@ router = APIRouter()
 @router.get("/stats/v1/", response_model=dict, summary="获取综合统计信息")
 async def get_stats() -> Dict[str, Any]:
     """获取综合统计信息 - 极简控制器"""
-    data = StatsService.collect_stats_data()
-    return success_response(data=data, message="获取统计信息成功")
+    try:
+        return success_response(data=StatsService.collect_stats_data(), message="获取统计信息成功")
+    except Exception as e:
+        return error_response(message=f"获取统计信息失败: {str(e)}")
 
 
 @router.get("/stats/v1/systems", response_model=dict, summary="获取系统统计信息")
 async def get_systems_stats() -> Dict[str, Any]:
     """获取系统统计信息 - 极简控制器"""
-    data = StatsService.collect_systems_stats_data()
-    return success_response(data=data, message="获取系统统计信息成功")
+    try:
+        return success_response(data=StatsService.collect_systems_stats_data(), message="获取系统统计信息成功")
+    except Exception as e:
+        return error_response(message=f"获取系统统计信息失败: {str(e)}")
 
 
 @router.get("/stats/v1/modules", response_model=dict, summary="获取模块统计信息")
 async def get_modules_stats() -> Dict[str, Any]:
     """获取模块统计信息 - 极简控制器"""
-    data = StatsService.collect_modules_stats_data()
-    return success_response(data=data, message="获取模块统计信息成功")
+    try:
+        return success_response(data=StatsService.collect_modules_stats_data(), message="获取模块统计信息成功")
+    except Exception as e:
+        return error_response(message=f"获取模块统计信息失败: {str(e)}")
 
 
 @router.get("/stats/v1/workflows", response_model=dict, summary="获取工作流统计信息")
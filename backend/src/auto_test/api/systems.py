@@ -3,20 +3,22 @@
 Systems API - With Service Layer
 """
 
-from typing import List
-from fastapi import APIRouter, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
 from ..models.system import System, SystemCreate, SystemUpdate
 from ..services.system_service import SystemService
-from ..utils.response import success_response, error_response
+from ..utils.response import success_response, error_response, trusted_response
 
 router = APIRouter(tags=["系统管理"])
 
 @router.get("/systems/v1/", response_model=dict, summary="获取系统列表")
-async def get_systems():
-    """获取所有系统列表"""
+async def get_systems(fields: Optional[str] = Query(None, description="字段投影，逗号分隔（如 id,name,status），为空时返回全部字段")):
+    """获取所有系统列表，支持 fields 字段投影"""
     try:
-        systems = SystemService.get_systems()
-        return success_response(data=systems, message="获取系统列表成功")
+        systems = SystemService.get_systems(fields)
+        return trusted_response(data=systems, message="获取系统列表成功")
+    except ValueError as e:
+        return error_response(message=str(e), code=400)
     except Exception as e:
         return error_response(message=f"获取系统列表失败: {str(e)}")
 
@@ -25,7 +27,7 @@ async def get_enabled_systems():
     """获取启用状态的系统列表（用于API管理和页面管理页面）"""
     try:
         systems = SystemService.get_enabled_systems()
-        return success_response(data=systems, message="获取启用系统列表成功")
+        return trusted_response(data=systems, message="获取启用系统列表成功")
     except Exception as e:
         return error_response(message=f"获取启用系统列表失败: {str(e)}")
 
@@ -41,7 +43,7 @@ async def get_enabled_systems_by_category(category: str):
         if category not in ['backend', 'frontend']:
             raise HTTPException(status_code=400, detail="分类参数无效，只支持 'backend' 或 'frontend'")
         systems = SystemService.get_enabled_systems_by_category(category)
-        return success_response(data=systems, message=f"获取分类为 '{category}' 的启用系统列表成功")
+        return trusted_response(data=systems, message=f"获取分类为 '{category}' 的启用系统列表成功")
     except HTTPException:
         raise
     except Exception as e:
@@ -57,7 +59,7 @@ async def get_enabled_systems_tree(category: str = None):
         if category is not None and category not in ['backend', 'frontend']:
             raise HTTPException(status_code=400, detail="分类参数无效，只支持 'backend' 或 'frontend'")
         data = SystemService.get_enabled_systems_with_modules(category)
-        return success_response(data=data, message="获取启用系统树数据成功")
+        return trusted_response(data=data, message="获取启用系统树数据成功")
     except HTTPException:
         raise
     except Exception as e:
@@ -70,7 +72,7 @@ async def get_system(system_id: int):
         system = SystemService.get_system_by_id(system_id)
         if not system:
             raise HTTPException(status_code=404, detail="系统不存在")
-        return success_response(data=system, message="获取系统详情成功")
+        return trusted_response(data=system, message="获取系统详情成功")
     except HTTPException:
         raise
     except Exception as e:
@@ -5,8 +5,12 @@ API Test Scenario Management - Dialog API Module
 遵循极简控制器(API)编码规范。
 """
 
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Query, Request
+from starlette.concurrency import run_in_threadpool
 from ..services.test_api_service import TestApiService
+from ..services.openapi_import_service import OpenApiImportService
+from ..services.traffic_import_service import TrafficImportService
 from ..utils.response import success_response, error_response
 from ..models.response import ApiResponse, ApiResponseGeneric
 from ..models.test_api import (
@@ -18,6 +22,7 @@ from ..models.test_api import (
     BatchExecuteResponse,
     ImportTestApisResponse,
     ExportTestApisResponse,
+    TrafficImportResponse,
 )
 
 router = APIRouter(tags=["测试API管理-弹框"])
@@ -26,7 +31,7 @@ router = APIRouter(tags=["测试API管理-弹框"])
 @router.post("/test-apis/v1/test-apis/{test_api_id}/execute", response_model=ApiResponseGeneric[RunResult], summary="执行单个测试API")
 async def execute_test_api(test_api_id: int, payload: ExecuteTestApiRequest):
     try:
-        data = TestApiService.execute_test_api(test_api_id, payload)
+        data = await TestApiService.execute_test_api(test_api_id, payload)
         return success_response(data=data, message="执行测试API成功")
     except Exception as e:
         return error_response(message=f"执行测试API失败: {str(e)}")
@@ -35,7 +40,7 @@ async def execute_test_api(test_api_id: int, payload: ExecuteTestApiRequest):
 @router.post("/test-apis/v1/test-apis/batch-execute", response_model=ApiResponseGeneric[BatchExecuteResponse], summary="批量执行测试API")
 async def batch_execute(payload: BatchExecuteRequest):
     try:
-        data = TestApiService.batch_execute(payload)
+        data = await TestApiService.batch_execute(payload)
         return success_response(data=data, message="批量执行测试API成功")
     except Exception as e:
         return error_response(message=f"批量执行测试API失败: {str(e)}")
@@ -50,6 +55,27 @@ async def import_test_apis(payload: ImportTestApisRequest):
         return error_response(message=f"导入测试API配置失败: {str(e)}")
 
 
+@router.post("/test-apis/v1/test-apis/import/traffic", response_model=ApiResponseGeneric[TrafficImportResponse], summary="从流量记录导入测试API与编排计划")
+async def import_traffic(request: Request,
+                         format: Optional[str] = Query(None, description="流量格式 har / log，为空时自动识别"),
+                         system_id: Optional[int] = Query(None, description="只匹配该系统的接口"),
+                         emit: str = Query("test_apis", description="产出类型 test_apis / plans / both"),
+                         strip_prefix: Optional[str] = Query(None, description="匹配前去掉的路径前缀"),
+                         plan_name: Optional[str] = Query(None, description="生成计划的名称前缀")):
+    """上传HAR文件或访问日志（请求体为原文），按接口与请求形状去重后生成测试API和/或按会话生成编排计划"""
+    try:
+        source = await OpenApiImportService.spool(request.stream())
+        try:
+            data = await run_in_threadpool(
+                TrafficImportService.import_traffic, source, format, system_id, emit, strip_prefix, plan_name
+            )
+        finally:
+            source.close()
+        return success_response(data=data, message="导入流量记录成功")
+    except Exception as e:
+        return error_response(message=f"导入流量记录失败: {str(e)}")
+
+
 @router.post("/test-apis/v1/test-apis/export", response_model=ApiResponseGeneric[ExportTestApisResponse], summary="导出测试API配置")
 async def export_test_apis(payload: ExportTestApisRequest):
     try:
@@ -79,7 +79,7 @@ async def delete_test_api(test_api_id: int):
 
 
 @router.get("/test-apis/v1/test-apis/{test_api_id}/runs", response_model=ApiResponseGeneric[RunListResponse], summary="获取执行记录列表")
-async def list_runs(test_api_id: int, page: int = Query(1), size: int = Query(10)):
+async def list_runs(test_api_id: int, page: int = Query(1, ge=1), size: int = Query(10, ge=1, le=1000)):
     try:
         data = TestApiService.list_runs(test_api_id, page, size)
         return success_response(data=data, message="获取执行记录列表成功")
@@ -88,9 +88,9 @@ async def list_runs(test_api_id: int, page: int = Query(1), size: int = Query(10
 
 
 @router.get("/test-apis/v1/test-apis/{test_api_id}/reports", response_model=ApiResponseGeneric[ReportListResponse], summary="获取报告列表")
-async def list_reports(test_api_id: int):
+async def list_reports(test_api_id: int, limit: int = Query(50, ge=1, le=500)):
     try:
-        data = TestApiService.list_reports(test_api_id)
+        data = TestApiService.list_reports(test_api_id, limit)
         return success_response(data=data, message="获取报告列表成功")
     except Exception as e:
         return error_response(message=f"获取报告列表失败: {str(e)}")
\ No newline at end of file
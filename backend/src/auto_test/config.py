@@ -36,6 +36,12 @@ class Config:
     DEFAULT_LLM_MODEL: str = os.getenv("DEFAULT_LLM_MODEL", "gpt-3.5-turbo")
     LLM_TEMPERATURE: float = float(os.getenv("LLM_TEMPERATURE", "0.1"))
     
+    # LLM缓存与意图识别快速路径
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_TTL: int = int(os.getenv("LLM_CACHE_TTL", "86400"))
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+    INTENT_RULE_FAST_PATH_THRESHOLD: float = float(os.getenv("INTENT_RULE_FAST_PATH_THRESHOLD", "0.8"))
+    
     # MCP配置
     MCP_TOOLS_ENABLED: bool = os.getenv("MCP_TOOLS_ENABLED", "true").lower() == "true"
     MCP_SERVER_HOST: str = os.getenv("MCP_SERVER_HOST", "localhost")
@@ -43,9 +49,72 @@ class Config:
     
     # 执行配置
     MAX_CONCURRENT_EXECUTIONS: int = int(os.getenv("MAX_CONCURRENT_EXECUTIONS", "5"))
+    MAX_CONCURRENT_EXECUTIONS_PER_SYSTEM: int = int(os.getenv("MAX_CONCURRENT_EXECUTIONS_PER_SYSTEM", "2"))
+    EXECUTION_QUEUE_MAX_SIZE: int = int(os.getenv("EXECUTION_QUEUE_MAX_SIZE", "100"))
     EXECUTION_TIMEOUT: int = int(os.getenv("EXECUTION_TIMEOUT", "300"))
     ENABLE_EXECUTION_LOGGING: bool = os.getenv("ENABLE_EXECUTION_LOGGING", "true").lower() == "true"
-    
+    PLAN_COMPILE_CACHE_MAX_ENTRIES: int = int(os.getenv("PLAN_COMPILE_CACHE_MAX_ENTRIES", "256"))
+
+    # 实体缓存配置（系统/模块/API接口读穿缓存）
+    ENTITY_CACHE_ENABLED: bool = os.getenv("ENTITY_CACHE_ENABLED", "true").lower() == "true"
+    ENTITY_CACHE_MAX_ENTRIES: int = int(os.getenv("ENTITY_CACHE_MAX_ENTRIES", "2000"))
+    ENTITY_CACHE_TTL: float = float(os.getenv("ENTITY_CACHE_TTL", "300"))
+    ENTITY_CACHE_COHERENCE_INTERVAL: float = float(os.getenv("ENTITY_CACHE_COHERENCE_INTERVAL", "0.5"))
+    # API路由索引检查 api_interfaces 表版本的间隔（秒），0 表示每次查找前都检查
+    ROUTE_INDEX_COHERENCE_INTERVAL: float = float(os.getenv("ROUTE_INDEX_COHERENCE_INTERVAL", "0.5"))
+
+    # 工具重试与熔断配置
+    TOOL_RETRY_POLICY: str = os.getenv("TOOL_RETRY_POLICY", "exponential")
+    TOOL_RETRY_BASE_DELAY: float = float(os.getenv("TOOL_RETRY_BASE_DELAY", "0.5"))
+    TOOL_RETRY_MAX_DELAY: float = float(os.getenv("TOOL_RETRY_MAX_DELAY", "30"))
+    RETRY_BUDGET_RATIO: float = float(os.getenv("RETRY_BUDGET_RATIO", "0.2"))
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_BREAKER_RECOVERY_TIMEOUT: float = float(os.getenv("CIRCUIT_BREAKER_RECOVERY_TIMEOUT", "30"))
+
+    # 工具指标配置（api_id 维度的最大序列数，超出后归入 "other"）
+    TOOL_METRICS_MAX_API_IDS: int = int(os.getenv("TOOL_METRICS_MAX_API_IDS", "500"))
+
+    # HTTP响应缓存配置
+    HTTP_RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("HTTP_RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+    HTTP_RESPONSE_CACHE_DEFAULT_TTL: float = float(os.getenv("HTTP_RESPONSE_CACHE_DEFAULT_TTL", "30"))
+    HTTP_REQUEST_COALESCING: bool = os.getenv("HTTP_REQUEST_COALESCING", "false").lower() == "true"
+    HTTP_POOL_LIMIT: int = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+    HTTP_POOL_LIMIT_PER_HOST: int = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "30"))
+
+    # REST接口HTTP缓存配置（ETag/304与聚合接口短期响应缓存）
+    REST_CACHE_ENABLED: bool = os.getenv("REST_CACHE_ENABLED", "true").lower() == "true"
+    REST_CACHE_SERVER_TTL: float = float(os.getenv("REST_CACHE_SERVER_TTL", "5"))
+    REST_CACHE_MAX_ENTRIES: int = int(os.getenv("REST_CACHE_MAX_ENTRIES", "256"))
+
+    # 流式导出配置（每批行数与gzip压缩级别）
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+    EXPORT_GZIP_LEVEL: int = int(os.getenv("EXPORT_GZIP_LEVEL", "6"))
+
+    # 批量导入配置（每块行数：块内单事务写入）
+    IMPORT_CHUNK_SIZE: int = int(os.getenv("IMPORT_CHUNK_SIZE", "500"))
+    # 规范文档上传的内存缓冲上限（字节），超过后写入临时文件
+    IMPORT_SPOOL_MAX_SIZE: int = int(os.getenv("IMPORT_SPOOL_MAX_SIZE", str(8 * 1024 * 1024)))
+
+    # 流量回放导入配置（HAR/访问日志）
+    TRAFFIC_PARSE_WORKERS: int = int(os.getenv("TRAFFIC_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+    TRAFFIC_PARSE_BATCH: int = int(os.getenv("TRAFFIC_PARSE_BATCH", "2000"))
+    TRAFFIC_PARALLEL_MIN_BYTES: int = int(os.getenv("TRAFFIC_PARALLEL_MIN_BYTES", str(4 * 1024 * 1024)))
+    TRAFFIC_MAX_SHAPES: int = int(os.getenv("TRAFFIC_MAX_SHAPES", "10000"))
+    TRAFFIC_MAX_BODY_CHARS: int = int(os.getenv("TRAFFIC_MAX_BODY_CHARS", "4096"))
+    TRAFFIC_SESSION_GAP: float = float(os.getenv("TRAFFIC_SESSION_GAP", "1800"))
+    TRAFFIC_MAX_SESSIONS: int = int(os.getenv("TRAFFIC_MAX_SESSIONS", "200"))
+    TRAFFIC_PLAN_MAX_STEPS: int = int(os.getenv("TRAFFIC_PLAN_MAX_STEPS", "50"))
+
+    # 批量执行配置
+    BULK_EXECUTION_DEFAULT_CONCURRENCY: int = int(os.getenv("BULK_EXECUTION_DEFAULT_CONCURRENCY", "10"))
+    BULK_EXECUTION_MAX_CONCURRENCY: int = int(os.getenv("BULK_EXECUTION_MAX_CONCURRENCY", "50"))
+
+    # 测试API执行配置
+    TEST_API_RATE_LIMIT_PER_TARGET: float = float(os.getenv("TEST_API_RATE_LIMIT_PER_TARGET", "50"))
+    TEST_API_RATE_LIMIT_BURST: int = int(os.getenv("TEST_API_RATE_LIMIT_BURST", "10"))
+    TEST_API_RUN_MAX_BODY_CHARS: int = int(os.getenv("TEST_API_RUN_MAX_BODY_CHARS", "65536"))
+    TEST_API_RUN_FLUSH_SIZE: int = int(os.getenv("TEST_API_RUN_FLUSH_SIZE", "100"))
+
     # CORS配置
     CORS_ORIGINS: List[str] = field(default_factory=lambda: ["*"])
     CORS_METHODS: List[str] = field(default_factory=lambda: ["*"])
@@ -4,9 +4,12 @@
 """
 from __future__ import annotations
 
+import json
 from typing import Any, Dict, List, Optional, Tuple
 
+from ..config import get_config
 from ..repositories.test_api_repository import TestApiRepository
+from ..repositories.test_api_run_repository import TestApiRunRepository
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -22,6 +25,17 @@ class TestApiDataService:
             raise ValueError("缺少必填字段: name 或 api_id")
         return TestApiRepository.create(data)
 
+    @staticmethod
+    def bulk_create(items: List[Dict[str, Any]]) -> List[int]:
+        for data in items:
+            if not data.get("name") or not data.get("api_id"):
+                raise ValueError("缺少必填字段: name 或 api_id")
+        return TestApiRepository.bulk_create(items)
+
+    @staticmethod
+    def get_metadata_index(field: str) -> Dict[str, int]:
+        return TestApiRepository.get_metadata_index(field)
+
     @staticmethod
     def update(test_api_id: int, data: Dict[str, Any]) -> bool:
         if not data:
@@ -32,6 +46,10 @@ class TestApiDataService:
     def get_by_id(test_api_id: int) -> Optional[Dict[str, Any]]:
         return TestApiRepository.get_by_id(test_api_id)
 
+    @staticmethod
+    def get_by_ids(test_api_ids: List[int]) -> List[Dict[str, Any]]:
+        return TestApiRepository.get_by_ids(test_api_ids)
+
     @staticmethod
     def list(
         keyword: Optional[str], api_id: Optional[int], enabled_only: Optional[bool], tags: Optional[str],
@@ -41,4 +59,66 @@ class TestApiDataService:
 
     @staticmethod
     def delete(test_api_id: int) -> bool:
-        return TestApiRepository.delete(test_api_id)
\ No newline at end of file
+        return TestApiRepository.delete(test_api_id)
+
+    @staticmethod
+    def save_runs(results: List[Dict[str, Any]], batch_id: Optional[str] = None) -> int:
+        """批量保存执行结果（执行记录 + 断言报告）"""
+        if not results:
+            return 0
+        max_body = get_config().TEST_API_RUN_MAX_BODY_CHARS
+        runs, reports = [], []
+        for result in results:
+            body = TestApiDataService._dump(result.get("response_body"))
+            if body is not None and len(body) > max_body:
+                body = body[:max_body]
+            runs.append({
+                "run_id": result["run_id"],
+                "test_api_id": result["test_api_id"],
+                "api_id": result.get("api_id"),
+                "batch_id": batch_id,
+                "status": result["status"],
+                "started_at": result.get("started_at"),
+                "ended_at": result.get("ended_at"),
+                "response_status_code": result.get("response_status_code"),
+                "response_time_ms": result.get("response_time_ms"),
+                "response_headers": TestApiDataService._dump(result.get("response_headers")),
+                "response_body": body,
+                "assertions_passed": result.get("assertions_passed") or 0,
+                "assertions_total": result.get("assertions_total") or 0,
+                "error_message": result.get("error_message"),
+                "environment": TestApiDataService._dump(result.get("environment")),
+            })
+            passed = result.get("assertions_passed") or 0
+            total = result.get("assertions_total") or 0
+            reports.append({
+                "run_id": result["run_id"],
+                "test_api_id": result["test_api_id"],
+                "batch_id": batch_id,
+                "summary": TestApiDataService._dump({
+                    "status": result["status"],
+                    "passed": passed,
+                    "failed": total - passed,
+                    "total": total,
+                    "response_status_code": result.get("response_status_code"),
+                    "response_time_ms": result.get("response_time_ms"),
+                }),
+                "assertions": TestApiDataService._dump(result.get("assertions") or []),
+            })
+        return TestApiRunRepository.save_runs(runs, reports)
+
+    @staticmethod
+    def list_runs(test_api_id: int, page: int, size: int) -> Tuple[List[Dict[str, Any]], int]:
+        return TestApiRunRepository.list_runs(test_api_id, page, size)
+
+    @staticmethod
+    def list_reports(test_api_id: int, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        return TestApiRunRepository.list_reports(test_api_id, limit)
+
+    @staticmethod
+    def _dump(value: Any) -> Optional[str]:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return value
+        return json.dumps(value, ensure_ascii=False, default=str)
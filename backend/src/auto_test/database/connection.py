@@ -7,7 +7,8 @@ Database Connection Management - Simplified
 
 import sqlite3
 import logging
-from typing import Optional
+import threading
+from typing import Any, Callable, Optional
 from contextlib import contextmanager
 from ..config import get_config
 
@@ -15,9 +16,21 @@ logger = logging.getLogger(__name__)
 
 # 全局数据库连接
 _connection: Optional[sqlite3.Connection] = None
+# 线程独立连接：线程池中的长任务（文档/流量导入）使用，事务不与事件循环上的请求交错
+_thread_state = threading.local()
+
+# 维护版本计数器的表：任一行增删改时由触发器递增，供HTTP缓存计算ETag（多进程共享）
+VERSIONED_TABLES = ('systems', 'modules', 'api_interfaces', 'pages', 'page_apis', 'test_apis')
 
 def get_db_connection() -> sqlite3.Connection:
-    """获取数据库连接"""
+    """获取数据库连接（当前线程持有独立连接时返回该连接，否则返回全局共享连接）"""
+    dedicated = getattr(_thread_state, 'connection', None)
+    if dedicated is not None:
+        return dedicated
+    return get_shared_connection()
+
+def get_shared_connection() -> sqlite3.Connection:
+    """获取全局共享数据库连接"""
     global _connection
     
     if _connection is None:
@@ -46,6 +59,31 @@ def get_db_cursor():
     finally:
         cursor.close()
 
+def run_with_dedicated_connection(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    在当前线程的独立连接上执行函数（供线程池调用）
+
+    共享连接的事务是连接级的：工作线程中的 commit/rollback 会提交或丢弃事件循环上其他请求
+    尚未提交的写入。执行期间本线程内的 get_db_cursor() 都使用独立连接，结束后关闭。
+
+    Args:
+        func (Callable[..., Any]): 要执行的函数
+        *args: 位置参数
+        **kwargs: 关键字参数
+
+    Returns:
+        Any: 函数返回值
+    """
+    config = get_config()
+    conn = sqlite3.connect(config.DATABASE_PATH, timeout=30.0)
+    conn.row_factory = sqlite3.Row
+    _thread_state.connection = conn
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _thread_state.connection = None
+        conn.close()
+
 def init_database():
     """初始化数据库表结构"""
     
@@ -184,6 +222,62 @@ def init_database():
     CREATE INDEX IF NOT EXISTS idx_test_apis_created_at ON test_apis(created_at);
     """
 
+    # 测试API执行记录与断言报告
+    create_test_api_runs_table = """
+    CREATE TABLE IF NOT EXISTS test_api_runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id TEXT NOT NULL UNIQUE,
+        test_api_id INTEGER NOT NULL,
+        api_id INTEGER,
+        batch_id TEXT,
+        status TEXT NOT NULL CHECK (status IN ('success','failed')),
+        started_at DATETIME NOT NULL,
+        ended_at DATETIME,
+        response_status_code INTEGER,
+        response_time_ms INTEGER,
+        response_headers TEXT,
+        response_body TEXT,
+        assertions_passed INTEGER DEFAULT 0,
+        assertions_total INTEGER DEFAULT 0,
+        error_message TEXT,
+        environment TEXT,
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (test_api_id) REFERENCES test_apis(id) ON DELETE CASCADE
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_test_api_runs_test_api_started ON test_api_runs(test_api_id, started_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_test_api_runs_batch_id ON test_api_runs(batch_id);
+    CREATE INDEX IF NOT EXISTS idx_test_api_runs_status ON test_api_runs(status);
+
+    CREATE TABLE IF NOT EXISTS test_api_reports (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id TEXT NOT NULL UNIQUE,
+        test_api_id INTEGER NOT NULL,
+        batch_id TEXT,
+        summary TEXT NOT NULL,
+        assertions TEXT,
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (run_id) REFERENCES test_api_runs(run_id) ON DELETE CASCADE
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_test_api_reports_test_api_created ON test_api_reports(test_api_id, created_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_test_api_reports_batch_id ON test_api_reports(batch_id);
+    """
+
+    # 表版本计数器
+    create_table_versions_sql = """
+    CREATE TABLE IF NOT EXISTS table_versions (
+        table_name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    );
+    """ + "".join(f"""
+    INSERT OR IGNORE INTO table_versions (table_name) VALUES ('{table}');
+    CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.lower()} AFTER {event} ON {table}
+    BEGIN
+        UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}';
+    END;
+    """ for table in VERSIONED_TABLES for event in ('INSERT', 'UPDATE', 'DELETE'))
+
     # 初始化数据
     init_data_sql = """
     INSERT OR IGNORE INTO systems (name, description) VALUES 
@@ -213,6 +307,8 @@ def init_database():
             cursor.executescript(create_page_apis_table)
             # 新增：创建测试API配置表
             cursor.executescript(create_test_apis_table)
+            cursor.executescript(create_test_api_runs_table)
+            cursor.executescript(create_table_versions_sql)
             cursor.executescript(init_data_sql)
 
             # 补丁迁移：为已有的 systems 表增加缺失的 category 列
@@ -5,23 +5,69 @@ Data Access Object - Simplified
 提供简化的数据库操作接口
 """
 
+import hashlib
 import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from .connection import get_db_cursor
+from .entity_cache import cached, entity_cache
+from ..utils.fields import select_list
 
 logger = logging.getLogger(__name__)
 
+# 列表查询可投影的列：字段名 -> SQL表达式（按SELECT顺序）
+SYSTEM_COLUMNS = {
+    'id': 'id', 'name': 'name', 'description': 'description', 'url': 'url', 'category': 'category',
+    'status': 'status', 'created_at': 'created_at', 'updated_at': 'updated_at'
+}
+MODULE_COLUMNS = {
+    'id': 'm.id', 'system_id': 'm.system_id', 'name': 'm.name', 'description': 'm.description',
+    'status': 'm.status', 'tags': 'm.tags', 'created_at': 'm.created_at', 'updated_at': 'm.updated_at',
+    'system_name': 's.name as system_name'
+}
+API_INTERFACE_COLUMNS = {
+    'id': 'a.id', 'system_id': 'a.system_id', 'module_id': 'a.module_id', 'name': 'a.name',
+    'description': 'a.description', 'method': 'a.method', 'path': 'a.path', 'version': 'a.version',
+    'status': 'a.status', 'request_format': 'a.request_format', 'response_format': 'a.response_format',
+    'auth_required': 'a.auth_required', 'rate_limit': 'a.rate_limit', 'timeout': 'a.timeout',
+    'tags': 'a.tags', 'request_schema': 'a.request_schema', 'response_schema': 'a.response_schema',
+    'example_request': 'a.example_request', 'example_response': 'a.example_response',
+    'created_at': 'a.created_at', 'updated_at': 'a.updated_at',
+    'system_name': 's.name as system_name', 'module_name': 'm.name as module_name'
+}
+PAGE_COLUMNS = {
+    'id': 'id', 'system_id': 'system_id', 'name': 'name', 'description': 'description',
+    'route_path': 'route_path', 'page_type': 'page_type', 'status': 'status',
+    'created_at': 'created_at', 'updated_at': 'updated_at'
+}
+
+# API接口插入列（顺序与 ApiInterfaceDAO._insert_values 一致）与唯一键列
+_API_INSERT_COLUMNS = (
+    'system_id', 'module_id', 'name', 'description', 'method', 'path', 'version',
+    'status', 'request_format', 'response_format', 'auth_required', 'rate_limit', 'timeout',
+    'tags', 'request_schema', 'response_schema', 'example_request', 'example_response'
+)
+_API_UNIQUE_COLUMNS = ('system_id', 'method', 'path', 'version')
+# 批量覆盖与差异比较的列（插入列中除唯一键外的列）
+_API_UPDATE_COLUMNS = tuple(column for column in _API_INSERT_COLUMNS if column not in _API_UNIQUE_COLUMNS)
+_API_UPDATE_INDEXES = tuple(_API_INSERT_COLUMNS.index(column) for column in _API_UPDATE_COLUMNS)
+
+
+def _join_needed(alias_column: str, fields: Optional[set]) -> bool:
+    """投影未包含关联表字段时跳过对应的LEFT JOIN"""
+    return fields is None or alias_column in fields
+
 class SystemDAO:
     """系统数据访问对象"""
     
     @staticmethod
-    def get_all() -> List[Dict[str, Any]]:
-        """获取所有系统"""
+    @cached('system_list')
+    def get_all(fields: Optional[set] = None) -> List[Dict[str, Any]]:
+        """获取所有系统（fields为需要的列，为空时查询全部列）"""
         try:
             with get_db_cursor() as cursor:
-                cursor.execute("""
-                    SELECT id, name, description, url, category, status, created_at, updated_at 
+                cursor.execute(f"""
+                    SELECT {select_list(SYSTEM_COLUMNS, fields)}
                     FROM systems 
                     ORDER BY created_at DESC
                 """)
@@ -31,6 +77,7 @@ class SystemDAO:
             raise
     
     @staticmethod
+    @cached('system')
     def get_by_id(system_id: int) -> Optional[Dict[str, Any]]:
         """根据ID获取系统"""
         try:
@@ -55,7 +102,9 @@ class SystemDAO:
                     INSERT INTO systems (name, description, url) 
                     VALUES (?, ?, ?)
                 """, (name, description, url))
-                return cursor.lastrowid
+                system_id = cursor.lastrowid
+            entity_cache.invalidate('systems', [system_id])
+            return system_id
         except Exception as e:
             logger.error(f"创建系统失败: {e}")
             raise
@@ -95,7 +144,9 @@ class SystemDAO:
                     SET {', '.join(updates)} 
                     WHERE id = ?
                 """, params)
-                return cursor.rowcount > 0
+                updated = cursor.rowcount > 0
+            entity_cache.invalidate('systems', [system_id])
+            return updated
         except Exception as e:
             logger.error(f"更新系统失败: {e}")
             raise
@@ -106,7 +157,9 @@ class SystemDAO:
         try:
             with get_db_cursor() as cursor:
                 cursor.execute("DELETE FROM systems WHERE id = ?", (system_id,))
-                return cursor.rowcount > 0
+                deleted = cursor.rowcount > 0
+            entity_cache.invalidate('systems', [system_id])
+            return deleted
         except Exception as e:
             logger.error(f"删除系统失败: {e}")
             raise
@@ -134,15 +187,16 @@ class ModuleDAO:
     """模块数据访问对象"""
     
     @staticmethod
-    def get_all() -> List[Dict[str, Any]]:
-        """获取所有模块"""
+    @cached('module_list')
+    def get_all(fields: Optional[set] = None) -> List[Dict[str, Any]]:
+        """获取所有模块（fields为需要的列，为空时查询全部列）"""
         try:
+            join = "LEFT JOIN systems s ON m.system_id = s.id" if _join_needed('system_name', fields) else ""
             with get_db_cursor() as cursor:
-                cursor.execute("""
-                    SELECT m.id, m.system_id, m.name, m.description, m.status, m.tags,
-                           m.created_at, m.updated_at, s.name as system_name
+                cursor.execute(f"""
+                    SELECT {select_list(MODULE_COLUMNS, fields)}
                     FROM modules m
-                    LEFT JOIN systems s ON m.system_id = s.id
+                    {join}
                     ORDER BY m.created_at DESC
                 """)
                 return [dict(row) for row in cursor.fetchall()]
@@ -151,20 +205,22 @@ class ModuleDAO:
             raise
 
     @staticmethod
-    def get_all_modules() -> List[Dict[str, Any]]:
+    def get_all_modules(fields: Optional[set] = None) -> List[Dict[str, Any]]:
         """获取所有模块（别名方法）"""
-        return ModuleDAO.get_all()
+        return ModuleDAO.get_all(fields)
     
     @staticmethod
-    def get_by_system_id(system_id: int) -> List[Dict[str, Any]]:
-        """根据系统ID获取模块列表"""
+    @cached('module_list')
+    def get_by_system_id(system_id: int, fields: Optional[set] = None) -> List[Dict[str, Any]]:
+        """根据系统ID获取模块列表（fields为需要的列，为空时查询全部列，不含system_name）"""
         try:
+            columns = {name: expression for name, expression in MODULE_COLUMNS.items() if name != 'system_name'}
             with get_db_cursor() as cursor:
-                cursor.execute("""
-                    SELECT id, system_id, name, description, status, tags, created_at, updated_at
-                    FROM modules 
-                    WHERE system_id = ?
-                    ORDER BY created_at DESC
+                cursor.execute(f"""
+                    SELECT {select_list(columns, fields)}
+                    FROM modules m
+                    WHERE m.system_id = ?
+                    ORDER BY m.created_at DESC
                 """, (system_id,))
                 return [dict(row) for row in cursor.fetchall()]
         except Exception as e:
@@ -172,11 +228,12 @@ class ModuleDAO:
             raise
     
     @staticmethod
-    def get_modules_by_system(system_id: int) -> List[Dict[str, Any]]:
+    def get_modules_by_system(system_id: int, fields: Optional[set] = None) -> List[Dict[str, Any]]:
         """根据系统ID获取模块列表（别名方法）"""
-        return ModuleDAO.get_by_system_id(system_id)
+        return ModuleDAO.get_by_system_id(system_id, fields)
     
     @staticmethod
+    @cached('module')
     def get_by_id(module_id: int) -> Optional[Dict[str, Any]]:
         """根据ID获取模块"""
         try:
@@ -203,7 +260,9 @@ class ModuleDAO:
                     INSERT INTO modules (system_id, name, description, tags, path) 
                     VALUES (?, ?, ?, ?, ?)
                 """, (system_id, name, description, tags, path))
-                return cursor.lastrowid
+                module_id = cursor.lastrowid
+            entity_cache.invalidate('modules', [module_id])
+            return module_id
         except Exception as e:
             logger.error(f"创建模块失败: {e}")
             raise
@@ -241,7 +300,9 @@ class ModuleDAO:
                     SET {', '.join(updates)} 
                     WHERE id = ?
                 """, params)
-                return cursor.rowcount > 0
+                updated = cursor.rowcount > 0
+            entity_cache.invalidate('modules', [module_id])
+            return updated
         except Exception as e:
             logger.error(f"更新模块失败: {e}")
             raise
@@ -252,7 +313,9 @@ class ModuleDAO:
         try:
             with get_db_cursor() as cursor:
                 cursor.execute("DELETE FROM modules WHERE id = ?", (module_id,))
-                return cursor.rowcount > 0
+                deleted = cursor.rowcount > 0
+            entity_cache.invalidate('modules', [module_id])
+            return deleted
         except Exception as e:
             logger.error(f"删除模块失败: {e}")
             raise
@@ -278,6 +341,7 @@ class ModuleDAO:
             raise
     
     @staticmethod
+    @cached('module_count')
     def count_by_system_id(system_id: int) -> int:
         """根据系统ID统计模块数量"""
         try:
@@ -330,20 +394,15 @@ class ApiInterfaceDAO:
     """API接口数据访问对象"""
     
     @staticmethod
-    def get_all() -> List[Dict[str, Any]]:
-        """获取所有API接口"""
+    @cached('api_interface_list')
+    def get_all(fields: Optional[set] = None) -> List[Dict[str, Any]]:
+        """获取所有API接口（fields为需要的列，为空时查询全部列）"""
         try:
             with get_db_cursor() as cursor:
-                cursor.execute("""
-                    SELECT a.id, a.system_id, a.module_id, a.name, a.description, 
-                           a.method, a.path, a.version, a.status,
-                           a.request_format, a.response_format, a.auth_required, a.rate_limit, a.timeout,
-                           a.tags, a.request_schema, a.response_schema, a.example_request, a.example_response,
-                           a.created_at, a.updated_at,
-                           s.name as system_name, m.name as module_name
+                cursor.execute(f"""
+                    SELECT {select_list(API_INTERFACE_COLUMNS, fields)}
                     FROM api_interfaces a
-                    LEFT JOIN systems s ON a.system_id = s.id
-                    LEFT JOIN modules m ON a.module_id = m.id
+                    {ApiInterfaceDAO._joins(fields)}
                     ORDER BY a.created_at DESC
                 """)
                 return [dict(row) for row in cursor.fetchall()]
@@ -352,6 +411,7 @@ class ApiInterfaceDAO:
             raise
     
     @staticmethod
+    @cached('api_interface')
     def get_by_id(api_id: int) -> Optional[Dict[str, Any]]:
         """根据ID获取API接口"""
         try:
@@ -375,6 +435,7 @@ class ApiInterfaceDAO:
             raise
     
     @staticmethod
+    @cached('api_interface_list')
     def get_by_system_id(system_id: int) -> List[Dict[str, Any]]:
         """根据系统ID获取API接口列表"""
         try:
@@ -393,6 +454,7 @@ class ApiInterfaceDAO:
             raise
     
     @staticmethod
+    @cached('api_interface_list')
     def get_by_module_id(module_id: int) -> List[Dict[str, Any]]:
         """根据模块ID获取API接口列表"""
         try:
@@ -420,64 +482,203 @@ class ApiInterfaceDAO:
         """创建API接口"""
         try:
             with get_db_cursor() as cursor:
-                # 处理状态字段
-                status = api_data.get('status', 'active')
-                if 'enabled' in api_data:
-                    # 将enabled字段转换为status字段
-                    status = 'active' if api_data['enabled'] else 'inactive'
-                
-                # 处理JSON字段
-                request_schema = api_data.get('request_schema') or api_data.get('request_params')
-                if request_schema and isinstance(request_schema, (dict, list)):
-                    request_schema = json.dumps(request_schema, ensure_ascii=False)
-                
-                response_schema = api_data.get('response_schema') or api_data.get('response_example')
-                if response_schema and isinstance(response_schema, (dict, list)):
-                    response_schema = json.dumps(response_schema, ensure_ascii=False)
-                
-                example_request = api_data.get('example_request')
-                if example_request and isinstance(example_request, (dict, list)):
-                    example_request = json.dumps(example_request, ensure_ascii=False)
-                
-                example_response = api_data.get('example_response')
-                if example_response and isinstance(example_response, (dict, list)):
-                    example_response = json.dumps(example_response, ensure_ascii=False)
-                
-                tags = api_data.get('tags')
-                if tags and isinstance(tags, list):
-                    tags = json.dumps(tags, ensure_ascii=False)
-                
-                cursor.execute("""
-                    INSERT INTO api_interfaces (
-                        system_id, module_id, name, description, method, path, version,
-                        status, request_format, response_format, auth_required, rate_limit, timeout,
-                        tags, request_schema, response_schema, example_request, example_response
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    api_data.get('system_id'),
-                    api_data.get('module_id'),
-                    api_data.get('name'),
-                    api_data.get('description'),
-                    api_data.get('method'),
-                    api_data.get('path'),
-                    api_data.get('version', 'v1'),
-                    status,
-                    api_data.get('request_format', 'json'),
-                    api_data.get('response_format', 'json'),
-                    api_data.get('auth_required', 1),
-                    api_data.get('rate_limit', 1000),
-                    api_data.get('timeout', 30),
-                    tags,
-                    request_schema,
-                    response_schema,
-                    example_request,
-                    example_response
-                ))
-                return cursor.lastrowid
+                cursor.execute(f"""
+                    INSERT INTO api_interfaces ({', '.join(_API_INSERT_COLUMNS)})
+                    VALUES ({', '.join('?' for _ in _API_INSERT_COLUMNS)})
+                """, ApiInterfaceDAO._insert_values(api_data))
+                api_id = cursor.lastrowid
+            entity_cache.invalidate('api_interfaces', [api_id])
+            return api_id
         except Exception as e:
             logger.error(f"创建API接口失败: {e}")
             raise
     
+    @staticmethod
+    def bulk_insert(apis: List[Dict[str, Any]]) -> Dict[Tuple[int, str, str, str], int]:
+        """
+        批量创建API接口（单事务 executemany）
+        
+        任一行违反约束时整批回滚并抛出异常，由调用方决定是否逐行重试。
+        
+        Args:
+            apis (List[Dict[str, Any]]): API接口数据（同create）
+            
+        Returns:
+            Dict[Tuple[int, str, str, str], int]: 唯一键 (system_id, method, path, version) -> 新ID
+        """
+        if not apis:
+            return {}
+        try:
+            with get_db_cursor() as cursor:
+                cursor.execute("SELECT COALESCE(MAX(id), 0) FROM api_interfaces")
+                max_id = cursor.fetchone()[0]
+                cursor.executemany(f"""
+                    INSERT INTO api_interfaces ({', '.join(_API_INSERT_COLUMNS)})
+                    VALUES ({', '.join('?' for _ in _API_INSERT_COLUMNS)})
+                """, [ApiInterfaceDAO._insert_values(api) for api in apis])
+                # 新行的ID均大于插入前的最大ID，按唯一键回查
+                cursor.execute("""
+                    SELECT id, system_id, method, path, version FROM api_interfaces WHERE id > ?
+                """, (max_id,))
+                created = {(row['system_id'], row['method'], row['path'], row['version']): row['id']
+                           for row in cursor.fetchall()}
+            entity_cache.invalidate('api_interfaces', created.values())
+            return created
+        except Exception as e:
+            logger.error(f"批量创建API接口失败: {e}")
+            raise
+    
+    @staticmethod
+    def bulk_update(apis: List[Dict[str, Any]]) -> int:
+        """
+        按ID批量覆盖API接口的非唯一键字段（单事务 executemany）
+        
+        Args:
+            apis (List[Dict[str, Any]]): 含id的API接口数据（同create），唯一键字段不更新
+            
+        Returns:
+            int: 更新的行数
+        """
+        if not apis:
+            return 0
+        try:
+            with get_db_cursor() as cursor:
+                params = []
+                for api in apis:
+                    values = ApiInterfaceDAO._insert_values(api)
+                    params.append([values[index] for index in _API_UPDATE_INDEXES] + [api['id']])
+                cursor.executemany(f"""
+                    UPDATE api_interfaces
+                    SET {', '.join(f'{column} = ?' for column in _API_UPDATE_COLUMNS)}, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """, params)
+                updated = cursor.rowcount
+            entity_cache.invalidate('api_interfaces', [api['id'] for api in apis])
+            return updated
+        except Exception as e:
+            logger.error(f"批量更新API接口失败: {e}")
+            raise
+    
+    @staticmethod
+    def get_unique_keys(system_ids: Iterable[int]) -> Dict[Tuple[int, str, str, str], int]:
+        """
+        获取指定系统下全部API接口的唯一键（批量导入查重，一次集合查询）
+        
+        Args:
+            system_ids (Iterable[int]): 系统ID
+            
+        Returns:
+            Dict[Tuple[int, str, str, str], int]: 唯一键 (system_id, method, path, version) -> ID
+        """
+        system_ids = list(system_ids)
+        if not system_ids:
+            return {}
+        try:
+            with get_db_cursor() as cursor:
+                placeholders = ','.join(['?' for _ in system_ids])
+                cursor.execute(f"""
+                    SELECT id, system_id, method, path, version FROM api_interfaces
+                    WHERE system_id IN ({placeholders})
+                """, system_ids)
+                return {(row['system_id'], row['method'], row['path'], row['version']): row['id']
+                        for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"获取API接口唯一键失败: {e}")
+            raise
+    
+    @staticmethod
+    def get_key_digests(system_ids: Iterable[int]) -> Dict[Tuple[int, str, str, str], Tuple[int, str]]:
+        """
+        获取指定系统下全部API接口的唯一键与内容摘要（增量同步比较差异，逐行计算摘要不保留原始行）
+        
+        Args:
+            system_ids (Iterable[int]): 系统ID
+            
+        Returns:
+            Dict[Tuple[int, str, str, str], Tuple[int, str]]: 唯一键 -> (ID, 非唯一键列的内容摘要)
+        """
+        system_ids = list(system_ids)
+        if not system_ids:
+            return {}
+        try:
+            with get_db_cursor() as cursor:
+                placeholders = ','.join(['?' for _ in system_ids])
+                cursor.execute(f"""
+                    SELECT id, {', '.join(_API_UNIQUE_COLUMNS)}, {', '.join(_API_UPDATE_COLUMNS)}
+                    FROM api_interfaces
+                    WHERE system_id IN ({placeholders})
+                """, system_ids)
+                digests = {}
+                for row in cursor:
+                    key = (row['system_id'], row['method'], row['path'], row['version'])
+                    digests[key] = (row['id'], ApiInterfaceDAO._digest([row[column] for column in _API_UPDATE_COLUMNS]))
+                return digests
+        except Exception as e:
+            logger.error(f"获取API接口内容摘要失败: {e}")
+            raise
+    
+    @staticmethod
+    def row_digest(api_data: Dict[str, Any]) -> str:
+        """按写入后的列值计算API接口内容摘要（与 get_key_digests 可比较）"""
+        values = ApiInterfaceDAO._insert_values(api_data)
+        return ApiInterfaceDAO._digest([values[index] for index in _API_UPDATE_INDEXES])
+    
+    @staticmethod
+    def _digest(values: List[Any]) -> str:
+        return hashlib.blake2b(json.dumps(values, ensure_ascii=False, default=str).encode('utf-8'),
+                               digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _insert_values(api_data: Dict[str, Any]) -> Tuple[Any, ...]:
+        """按 _API_INSERT_COLUMNS 顺序构建插入参数（enabled转status，JSON字段与标签列表序列化）"""
+        # 处理状态字段
+        status = api_data.get('status', 'active')
+        if 'enabled' in api_data:
+            # 将enabled字段转换为status字段
+            status = 'active' if api_data['enabled'] else 'inactive'
+        
+        # 处理JSON字段
+        request_schema = api_data.get('request_schema') or api_data.get('request_params')
+        if request_schema and isinstance(request_schema, (dict, list)):
+            request_schema = json.dumps(request_schema, ensure_ascii=False)
+        
+        response_schema = api_data.get('response_schema') or api_data.get('response_example')
+        if response_schema and isinstance(response_schema, (dict, list)):
+            response_schema = json.dumps(response_schema, ensure_ascii=False)
+        
+        example_request = api_data.get('example_request')
+        if example_request and isinstance(example_request, (dict, list)):
+            example_request = json.dumps(example_request, ensure_ascii=False)
+        
+        example_response = api_data.get('example_response')
+        if example_response and isinstance(example_response, (dict, list)):
+            example_response = json.dumps(example_response, ensure_ascii=False)
+        
+        tags = api_data.get('tags')
+        if tags and isinstance(tags, list):
+            tags = json.dumps(tags, ensure_ascii=False)
+        
+        return (
+            api_data.get('system_id'),
+            api_data.get('module_id'),
+            api_data.get('name'),
+            api_data.get('description'),
+            api_data.get('method'),
+            api_data.get('path'),
+            api_data.get('version', 'v1'),
+            status,
+            api_data.get('request_format', 'json'),
+            api_data.get('response_format', 'json'),
+            api_data.get('auth_required', 1),
+            api_data.get('rate_limit', 1000),
+            api_data.get('timeout', 30),
+            tags,
+            request_schema,
+            response_schema,
+            example_request,
+            example_response
+        )
+    
     @staticmethod
     def update(api_id: int, api_data: Dict[str, Any]) -> bool:
         """更新API接口"""
@@ -549,7 +750,9 @@ class ApiInterfaceDAO:
 
                 sql = f"UPDATE api_interfaces SET {', '.join(update_fields)} WHERE id = ?"
                 cursor.execute(sql, update_values)
-                return cursor.rowcount > 0
+                updated = cursor.rowcount > 0
+            entity_cache.invalidate('api_interfaces', [api_id])
+            return updated
         except Exception as e:
             logger.error(f"更新API接口失败: {e}")
             raise
@@ -560,58 +763,26 @@ class ApiInterfaceDAO:
         try:
             with get_db_cursor() as cursor:
                 cursor.execute("DELETE FROM api_interfaces WHERE id = ?", (api_id,))
-                return cursor.rowcount > 0
+                deleted = cursor.rowcount > 0
+            entity_cache.invalidate('api_interfaces', [api_id])
+            return deleted
         except Exception as e:
             logger.error(f"删除API接口失败: {e}")
             raise
     
     @staticmethod
-    def search(keyword: str, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """搜索API接口"""
+    def search(keyword: str, filters: Optional[Dict[str, Any]] = None,
+               fields: Optional[set] = None) -> List[Dict[str, Any]]:
+        """搜索API接口（fields为需要的列，为空时查询全部列）"""
         try:
             with get_db_cursor() as cursor:
-                where_conditions = []
-                params = []
-                
-                # 关键词搜索
-                if keyword:
-                    where_conditions.append("""
-                        (a.name LIKE ? OR a.description LIKE ? OR a.path LIKE ? OR a.tags LIKE ?)
-                    """)
-                    keyword_param = f"%{keyword}%"
-                    params.extend([keyword_param, keyword_param, keyword_param, keyword_param])
-                
-                # 过滤条件
-                if filters:
-                    if filters.get('system_id'):
-                        where_conditions.append("a.system_id = ?")
-                        params.append(filters['system_id'])
-                    
-                    if filters.get('module_id'):
-                        where_conditions.append("a.module_id = ?")
-                        params.append(filters['module_id'])
-                    
-                    if filters.get('method'):
-                        where_conditions.append("a.method = ?")
-                        params.append(filters['method'])
-                    
-                    if filters.get('status'):
-                        where_conditions.append("a.status = ?")
-                        params.append(filters['status'])
-                
+                where_conditions, params = ApiInterfaceDAO._search_conditions(keyword, filters)
                 where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
                 
                 cursor.execute(f"""
-                    SELECT a.id, a.system_id, a.module_id, a.name, a.description, 
-                           a.method, a.path, a.version, a.status, a.request_format,
-                           a.response_format, a.auth_required, a.rate_limit, a.timeout,
-                           a.tags, a.request_schema, a.response_schema, 
-                           a.example_request, a.example_response,
-                           a.created_at, a.updated_at,
-                           s.name as system_name, m.name as module_name
+                    SELECT {select_list(API_INTERFACE_COLUMNS, fields)}
                     FROM api_interfaces a
-                    LEFT JOIN systems s ON a.system_id = s.id
-                    LEFT JOIN modules m ON a.module_id = m.id
+                    {ApiInterfaceDAO._joins(fields)}
                     WHERE {where_clause}
                     ORDER BY a.created_at DESC
                 """, params)
@@ -620,6 +791,101 @@ class ApiInterfaceDAO:
             logger.error(f"搜索API接口失败: {e}")
             raise
     
+    @staticmethod
+    def iter_batches(keyword: str = "", filters: Optional[Dict[str, Any]] = None, fields: Optional[set] = None,
+                     after_id: int = 0, batch_size: int = 500,
+                     limit: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        按主键键集分批读取API接口（流式导出）
+        
+        每批是一次独立的短查询（a.id > 上一批最后的ID ORDER BY a.id LIMIT n），不在共享连接上
+        长期持有游标；内存只与批大小相关。中断后以已收到的最后一行ID作为after_id即可续传。
+        
+        Args:
+            keyword (str): 搜索关键词
+            filters (Optional[Dict[str, Any]]): 过滤条件（system_id / module_id / method / status）
+            fields (Optional[set]): 需要的列，为空时查询全部列（始终包含id）
+            after_id (int): 键集游标，只读取ID大于该值的行
+            batch_size (int): 每批行数
+            limit (Optional[int]): 最多读取的行数，为空时读取全部
+            
+        Yields:
+            List[Dict[str, Any]]: 一批API接口原始数据
+        """
+        where_conditions, params = ApiInterfaceDAO._search_conditions(keyword, filters)
+        where_conditions.append("a.id > ?")
+        columns = set(fields) | {'id'} if fields is not None else None
+        sql = f"""
+            SELECT {select_list(API_INTERFACE_COLUMNS, columns)}
+            FROM api_interfaces a
+            {ApiInterfaceDAO._joins(columns)}
+            WHERE {" AND ".join(where_conditions)}
+            ORDER BY a.id
+            LIMIT ?
+        """
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            try:
+                with get_db_cursor() as cursor:
+                    cursor.execute(sql, params + [after_id, size])
+                    batch = [dict(row) for row in cursor.fetchall()]
+            except Exception as e:
+                logger.error(f"分批读取API接口失败: {e}")
+                raise
+            if not batch:
+                return
+            yield batch
+            if len(batch) < size:
+                return
+            after_id = batch[-1]['id']
+            if remaining is not None:
+                remaining -= len(batch)
+    
+    @staticmethod
+    def _search_conditions(keyword: str, filters: Optional[Dict[str, Any]]) -> Tuple[List[str], List[Any]]:
+        """构建搜索的WHERE条件与参数"""
+        where_conditions = []
+        params = []
+        
+        # 关键词搜索
+        if keyword:
+            where_conditions.append("""
+                (a.name LIKE ? OR a.description LIKE ? OR a.path LIKE ? OR a.tags LIKE ?)
+            """)
+            keyword_param = f"%{keyword}%"
+            params.extend([keyword_param, keyword_param, keyword_param, keyword_param])
+        
+        # 过滤条件
+        if filters:
+            if filters.get('system_id'):
+                where_conditions.append("a.system_id = ?")
+                params.append(filters['system_id'])
+            
+            if filters.get('module_id'):
+                where_conditions.append("a.module_id = ?")
+                params.append(filters['module_id'])
+            
+            if filters.get('method'):
+                where_conditions.append("a.method = ?")
+                params.append(filters['method'])
+            
+            if filters.get('status'):
+                where_conditions.append("a.status = ?")
+                params.append(filters['status'])
+        
+        return where_conditions, params
+    
+    @staticmethod
+    def _joins(fields: Optional[set]) -> str:
+        """按投影字段决定需要的LEFT JOIN"""
+        joins = []
+        if _join_needed('system_name', fields):
+            joins.append("LEFT JOIN systems s ON a.system_id = s.id")
+        if _join_needed('module_name', fields):
+            joins.append("LEFT JOIN modules m ON a.module_id = m.id")
+        return "\n".join(joins)
+    
     @staticmethod
     def get_stats() -> Dict[str, Any]:
         """获取API接口统计信息"""
@@ -676,7 +942,9 @@ class ApiInterfaceDAO:
                     SET status = ?, updated_at = CURRENT_TIMESTAMP 
                     WHERE id IN ({placeholders})
                 """, [status] + api_ids)
-                return cursor.rowcount
+                updated_count = cursor.rowcount
+            entity_cache.invalidate('api_interfaces', api_ids)
+            return updated_count
         except Exception as e:
             logger.error(f"批量更新API接口状态失败: {e}")
             raise
@@ -688,7 +956,9 @@ class ApiInterfaceDAO:
             with get_db_cursor() as cursor:
                 placeholders = ','.join(['?' for _ in api_ids])
                 cursor.execute(f"DELETE FROM api_interfaces WHERE id IN ({placeholders})", api_ids)
-                return cursor.rowcount
+                deleted_count = cursor.rowcount
+            entity_cache.invalidate('api_interfaces', api_ids)
+            return deleted_count
         except Exception as e:
             logger.error(f"批量删除API接口失败: {e}")
             raise
@@ -716,6 +986,27 @@ class ApiInterfaceDAO:
             logger.error(f"检查API路径方法是否存在失败: {e}")
             raise
 
+    @staticmethod
+    def get_route_entries(api_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """获取路由索引所需的精简字段（不做JOIN，不取schema等大字段）"""
+        try:
+            with get_db_cursor() as cursor:
+                sql = """
+                    SELECT id, system_id, module_id, name, method, path, version, status, updated_at
+                    FROM api_interfaces
+                """
+                if api_ids is not None:
+                    if not api_ids:
+                        return []
+                    placeholders = ','.join(['?' for _ in api_ids])
+                    cursor.execute(f"{sql} WHERE id IN ({placeholders})", api_ids)
+                else:
+                    cursor.execute(sql)
+                return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"获取API路由索引数据失败: {e}")
+            raise
+
     @staticmethod
     def get_by_path_method(path: str, method: str, system_id: int, exclude_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """获取指定路径和方法的API接口详细信息"""
@@ -740,26 +1031,46 @@ class ApiInterfaceDAO:
             raise
 
 
+class TableVersionDAO:
+    """表版本计数器数据访问对象（计数器由触发器在写入时递增）"""
+    
+    @staticmethod
+    def get_versions(tables: Iterable[str]) -> Dict[str, int]:
+        """获取指定表的当前版本（表名 -> 版本号）"""
+        tables = list(tables)
+        if not tables:
+            return {}
+        try:
+            with get_db_cursor() as cursor:
+                placeholders = ','.join(['?' for _ in tables])
+                cursor.execute(f"""
+                    SELECT table_name, version FROM table_versions WHERE table_name IN ({placeholders})
+                """, tables)
+                return {row['table_name']: row['version'] for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"获取表版本失败: {e}")
+            raise
+
+
 class PageDAO:
     """页面数据访问对象"""
     
     @staticmethod
-    def get_all(system_id: Optional[int] = None) -> List[Dict[str, Any]]:
-        """获取页面列表"""
+    def get_all(system_id: Optional[int] = None, fields: Optional[set] = None) -> List[Dict[str, Any]]:
+        """获取页面列表（fields为需要的列，为空时查询全部列）"""
         try:
+            columns = select_list(PAGE_COLUMNS, fields)
             with get_db_cursor() as cursor:
                 if system_id:
-                    cursor.execute("""
-                        SELECT id, system_id, name, description, route_path, page_type, status, 
-                               created_at, updated_at 
+                    cursor.execute(f"""
+                        SELECT {columns}
                         FROM pages 
                         WHERE system_id = ?
                         ORDER BY created_at DESC
                     """, (system_id,))
                 else:
-                    cursor.execute("""
-                        SELECT id, system_id, name, description, route_path, page_type, status, 
-                               created_at, updated_at 
+                    cursor.execute(f"""
+                        SELECT {columns}
                         FROM pages 
                         ORDER BY created_at DESC
                     """)
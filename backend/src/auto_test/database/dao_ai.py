@@ -5,11 +5,12 @@
 - AI执行记录管理
 - 编排计划管理
 - 执行步骤和日志管理
+- LLM响应缓存
 """
 
 import json
 import uuid
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime
 import logging
 
@@ -200,18 +201,35 @@ class AIExecutionDAO:
 class OrchestrationPlanDAO:
     """编排计划数据访问对象"""
     
+    _compile_columns_ready = False
+    
+    @staticmethod
+    def _ensure_compile_columns(cursor) -> None:
+        """确保计划编译产物字段存在（兼容未执行新版初始化脚本的数据库）"""
+        if OrchestrationPlanDAO._compile_columns_ready:
+            return
+        cursor.execute("PRAGMA table_info(api_orchestration_plans)")
+        columns = {row['name'] for row in cursor.fetchall()}
+        if 'plan_hash' not in columns:
+            cursor.execute("ALTER TABLE api_orchestration_plans ADD COLUMN plan_hash TEXT NULL")
+        if 'compiled_plan' not in columns:
+            cursor.execute("ALTER TABLE api_orchestration_plans ADD COLUMN compiled_plan TEXT NULL")
+        OrchestrationPlanDAO._compile_columns_ready = True
+    
     @staticmethod
     def create_plan(plan_data: Dict[str, Any]) -> Dict[str, Any]:
         """创建编排计划"""
         try:
             with get_db_cursor() as cursor:
+                OrchestrationPlanDAO._ensure_compile_columns(cursor)
                 plan_id = int(datetime.now().timestamp() * 1000000)
                 
                 cursor.execute("""
                     INSERT INTO api_orchestration_plans 
                     (id, plan_name, description, intent_text, execution_plan, 
-                     graph_json, metadata, preferences, status, tags, created_by, is_template)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                     graph_json, metadata, preferences, status, tags, created_by, is_template,
+                     plan_hash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     plan_id,
                     plan_data['plan_name'],
@@ -224,17 +242,36 @@ class OrchestrationPlanDAO:
                     plan_data.get('status', 'draft'),
                     json.dumps(plan_data.get('tags'), ensure_ascii=False) if plan_data.get('tags') else None,
                     plan_data.get('created_by'),
-                    plan_data.get('is_template', False)
+                    plan_data.get('is_template', False),
+                    plan_data.get('plan_hash')
                 ))
                 
                 # 返回创建的记录
                 cursor.execute("SELECT * FROM api_orchestration_plans WHERE id = ?", (plan_id,))
-                return dict(cursor.fetchone())
+                result = dict(cursor.fetchone())
+                result.pop('compiled_plan', None)
+                return result
                 
         except Exception as e:
             logger.error(f"创建编排计划失败: {e}")
             raise
     
+    @staticmethod
+    def get_metadata_index(field: str) -> Dict[str, int]:
+        """按元数据字段建立索引：字段值 -> 计划ID（只包含元数据中有该字段的计划）"""
+        try:
+            with get_db_cursor() as cursor:
+                cursor.execute("""
+                    SELECT id, json_extract(metadata, '$.' || ?) AS value
+                    FROM api_orchestration_plans
+                    WHERE metadata IS NOT NULL AND json_valid(metadata)
+                      AND json_extract(metadata, '$.' || ?) IS NOT NULL
+                """, (field, field))
+                return {str(row['value']): row['id'] for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"获取编排计划元数据索引失败: {e}")
+            raise
+    
     @staticmethod
     def get_by_id(plan_id: int) -> Optional[Dict[str, Any]]:
         """根据ID获取编排计划"""
@@ -244,6 +281,8 @@ class OrchestrationPlanDAO:
                 row = cursor.fetchone()
                 if row:
                     result = dict(row)
+                    # 编译产物只在执行时使用
+                    result.pop('compiled_plan', None)
                     # 解析JSON字段
                     json_fields = ['execution_plan', 'graph_json', 'metadata', 'preferences', 'tags']
                     for field in json_fields:
@@ -255,31 +294,42 @@ class OrchestrationPlanDAO:
             logger.error(f"获取编排计划失败: {e}")
             raise
     
+    @staticmethod
+    def get_compile_state(plan_id: int) -> Optional[Dict[str, Any]]:
+        """获取计划的内容哈希与编译产物（均为原始文本，不解析JSON）"""
+        try:
+            with get_db_cursor() as cursor:
+                OrchestrationPlanDAO._ensure_compile_columns(cursor)
+                cursor.execute("""
+                    SELECT id, status, execution_plan, plan_hash, compiled_plan
+                    FROM api_orchestration_plans WHERE id = ?
+                """, (plan_id,))
+                row = cursor.fetchone()
+                return dict(row) if row else None
+        except Exception as e:
+            logger.error(f"获取计划编译产物失败: {e}")
+            raise
+    
+    @staticmethod
+    def save_compiled_plan(plan_id: int, plan_hash: str, compiled_plan: str) -> None:
+        """保存计划的内容哈希与编译产物"""
+        try:
+            with get_db_cursor() as cursor:
+                OrchestrationPlanDAO._ensure_compile_columns(cursor)
+                cursor.execute("""
+                    UPDATE api_orchestration_plans
+                    SET plan_hash = ?, compiled_plan = ?
+                    WHERE id = ?
+                """, (plan_hash, compiled_plan, plan_id))
+        except Exception as e:
+            logger.error(f"保存计划编译产物失败: {e}")
+    
     @staticmethod
     def search_plans(filters: Dict[str, Any], page: int = 1, size: int = 10) -> List[Dict[str, Any]]:
         """搜索编排计划"""
         try:
             with get_db_cursor() as cursor:
-                where_conditions = []
-                params = []
-                
-                # 构建筛选条件
-                if filters.get('keyword'):
-                    where_conditions.append("(plan_name LIKE ? OR description LIKE ?)")
-                    keyword = f"%{filters['keyword']}%"
-                    params.extend([keyword, keyword])
-                
-                if filters.get('status'):
-                    where_conditions.append("status = ?")
-                    params.append(filters['status'])
-                
-                if filters.get('created_by'):
-                    where_conditions.append("created_by = ?")
-                    params.append(filters['created_by'])
-                
-                if filters.get('is_template') is not None:
-                    where_conditions.append("is_template = ?")
-                    params.append(filters['is_template'])
+                where_conditions, params = OrchestrationPlanDAO._plan_conditions(filters)
                 
                 # 构建查询
                 where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
@@ -292,24 +342,97 @@ class OrchestrationPlanDAO:
                     LIMIT ? OFFSET ?
                 """, params + [size, offset])
                 
-                results = []
-                for row in cursor.fetchall():
-                    result = dict(row)
-                    # 解析JSON字段
-                    json_fields = ['execution_plan', 'graph_json', 'metadata', 'preferences', 'tags']
-                    for field in json_fields:
-                        if result.get(field):
-                            try:
-                                result[field] = json.loads(result[field])
-                            except json.JSONDecodeError:
-                                result[field] = None
-                    results.append(result)
-                
-                return results
+                return [OrchestrationPlanDAO._parse_plan_row(row) for row in cursor.fetchall()]
                 
         except Exception as e:
             logger.error(f"搜索编排计划失败: {e}")
             raise
+    
+    @staticmethod
+    def iter_batches(filters: Dict[str, Any], after_id: int = 0, batch_size: int = 500,
+                     limit: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        按主键键集分批读取编排计划（审计报告流式导出）
+        
+        每批是一次独立的短查询（id > 上一批最后的ID ORDER BY id LIMIT n），计划ID按创建时间生成，
+        键集顺序即创建顺序。中断后以已收到的最后一个计划ID作为after_id即可续传。
+        
+        Args:
+            filters (Dict[str, Any]): 筛选条件（keyword / status / created_by / is_template）
+            after_id (int): 键集游标，只读取ID大于该值的计划
+            batch_size (int): 每批行数
+            limit (Optional[int]): 最多读取的行数，为空时读取全部
+            
+        Yields:
+            List[Dict[str, Any]]: 一批编排计划（JSON字段已解析）
+        """
+        where_conditions, params = OrchestrationPlanDAO._plan_conditions(filters)
+        where_conditions.append("id > ?")
+        sql = f"""
+            SELECT * FROM api_orchestration_plans
+            WHERE {" AND ".join(where_conditions)}
+            ORDER BY id
+            LIMIT ?
+        """
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            try:
+                with get_db_cursor() as cursor:
+                    cursor.execute(sql, params + [after_id, size])
+                    batch = [OrchestrationPlanDAO._parse_plan_row(row) for row in cursor.fetchall()]
+            except Exception as e:
+                logger.error(f"分批读取编排计划失败: {e}")
+                raise
+            if not batch:
+                return
+            yield batch
+            if len(batch) < size:
+                return
+            after_id = batch[-1]['id']
+            if remaining is not None:
+                remaining -= len(batch)
+    
+    @staticmethod
+    def _plan_conditions(filters: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """构建计划搜索的WHERE条件与参数"""
+        where_conditions = []
+        params = []
+        
+        # 构建筛选条件
+        if filters.get('keyword'):
+            where_conditions.append("(plan_name LIKE ? OR description LIKE ?)")
+            keyword = f"%{filters['keyword']}%"
+            params.extend([keyword, keyword])
+        
+        if filters.get('status'):
+            where_conditions.append("status = ?")
+            params.append(filters['status'])
+        
+        if filters.get('created_by'):
+            where_conditions.append("created_by = ?")
+            params.append(filters['created_by'])
+        
+        if filters.get('is_template') is not None:
+            where_conditions.append("is_template = ?")
+            params.append(filters['is_template'])
+        
+        return where_conditions, params
+    
+    @staticmethod
+    def _parse_plan_row(row) -> Dict[str, Any]:
+        """计划行转为字典：去掉编译产物，解析JSON字段"""
+        result = dict(row)
+        result.pop('compiled_plan', None)
+        # 解析JSON字段
+        json_fields = ['execution_plan', 'graph_json', 'metadata', 'preferences', 'tags']
+        for field in json_fields:
+            if result.get(field):
+                try:
+                    result[field] = json.loads(result[field])
+                except json.JSONDecodeError:
+                    result[field] = None
+        return result
 
 
 class ExecutionStepDAO:
@@ -416,4 +539,118 @@ class ExecutionStepDAO:
                 
         except Exception as e:
             logger.error(f"获取执行步骤失败: {e}")
-            raise
\ No newline at end of file
+            raise
+
+
+class LLMCacheDAO:
+    """LLM响应缓存数据访问对象"""
+    
+    _table_ready = False
+    
+    @staticmethod
+    def _ensure_table(cursor) -> None:
+        """确保缓存表存在（兼容未执行新版初始化脚本的数据库）"""
+        if LLMCacheDAO._table_ready:
+            return
+        cursor.executescript("""
+            CREATE TABLE IF NOT EXISTS llm_response_cache (
+                cache_key TEXT PRIMARY KEY,
+                model_name TEXT NOT NULL,
+                temperature REAL NOT NULL,
+                prompt_hash TEXT NOT NULL,
+                response_text TEXT NOT NULL,
+                hit_count INTEGER DEFAULT 0,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                last_accessed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE INDEX IF NOT EXISTS idx_llm_response_cache_created_at
+                ON llm_response_cache(created_at);
+            CREATE INDEX IF NOT EXISTS idx_llm_response_cache_last_accessed_at
+                ON llm_response_cache(last_accessed_at);
+        """)
+        LLMCacheDAO._table_ready = True
+    
+    @staticmethod
+    def get(cache_key: str, ttl_seconds: int) -> Optional[str]:
+        """获取未过期的缓存响应，命中时更新访问时间与命中次数"""
+        try:
+            with get_db_cursor() as cursor:
+                LLMCacheDAO._ensure_table(cursor)
+                cursor.execute("""
+                    SELECT response_text FROM llm_response_cache
+                    WHERE cache_key = ?
+                      AND created_at >= datetime('now', ?)
+                """, (cache_key, f"-{int(ttl_seconds)} seconds"))
+                row = cursor.fetchone()
+                if not row:
+                    return None
+                
+                cursor.execute("""
+                    UPDATE llm_response_cache
+                    SET hit_count = hit_count + 1, last_accessed_at = CURRENT_TIMESTAMP
+                    WHERE cache_key = ?
+                """, (cache_key,))
+                return row['response_text']
+        except Exception as e:
+            logger.error(f"读取LLM缓存失败: {e}")
+            return None
+    
+    @staticmethod
+    def put(cache_data: Dict[str, Any]) -> None:
+        """写入缓存响应"""
+        try:
+            with get_db_cursor() as cursor:
+                LLMCacheDAO._ensure_table(cursor)
+                cursor.execute("""
+                    INSERT OR REPLACE INTO llm_response_cache
+                    (cache_key, model_name, temperature, prompt_hash, response_text,
+                     hit_count, created_at, last_accessed_at)
+                    VALUES (?, ?, ?, ?, ?, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                """, (
+                    cache_data['cache_key'],
+                    cache_data['model_name'],
+                    cache_data['temperature'],
+                    cache_data['prompt_hash'],
+                    cache_data['response_text']
+                ))
+        except Exception as e:
+            logger.error(f"写入LLM缓存失败: {e}")
+    
+    @staticmethod
+    def evict(ttl_seconds: int, max_entries: int) -> int:
+        """淘汰过期条目，并按最近访问时间保留最多max_entries条"""
+        try:
+            with get_db_cursor() as cursor:
+                LLMCacheDAO._ensure_table(cursor)
+                cursor.execute(
+                    "DELETE FROM llm_response_cache WHERE created_at < datetime('now', ?)",
+                    (f"-{int(ttl_seconds)} seconds",)
+                )
+                removed = cursor.rowcount
+                cursor.execute("""
+                    DELETE FROM llm_response_cache
+                    WHERE cache_key IN (
+                        SELECT cache_key FROM llm_response_cache
+                        ORDER BY last_accessed_at DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                """, (max_entries,))
+                return removed + cursor.rowcount
+        except Exception as e:
+            logger.error(f"淘汰LLM缓存失败: {e}")
+            return 0
+    
+    @staticmethod
+    def get_stats() -> Dict[str, Any]:
+        """获取缓存统计"""
+        try:
+            with get_db_cursor() as cursor:
+                LLMCacheDAO._ensure_table(cursor)
+                cursor.execute("""
+                    SELECT COUNT(*) AS entries, COALESCE(SUM(hit_count), 0) AS total_hits
+                    FROM llm_response_cache
+                """)
+                return dict(cursor.fetchone())
+        except Exception as e:
+            logger.error(f"获取LLM缓存统计失败: {e}")
+            return {'entries': 0, 'total_hits': 0}
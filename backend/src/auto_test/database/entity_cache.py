@@ -0,0 +1,232 @@
+"""
+实体读穿缓存
+Entity Read-Through Cache
+
+系统、模块、API接口定义很少变化却被频繁读取（每个HTTP步骤按ID取接口定义、
+追踪/规划循环内按ID查系统与模块），DAO的按ID查询与列表查询经由本缓存读取：
+- 每个命名空间独立的LRU + TTL，容量与过期时间可配置
+- DAO的增删改/批量方法写入成功后按表失效：本表的按ID条目只失效受影响的ID，
+  列表条目与JOIN了该表的其他命名空间整体失效
+- 多进程一致性：定期检查 SQLite `PRAGMA data_version`，其他连接（其他uvicorn worker）
+  提交写入后该值变化，此时清空全部缓存
+- 返回值为缓存行的浅拷贝，调用方原地增强不会污染缓存
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from ..config import get_config
+from .connection import get_shared_connection
+
+# 命名空间 -> 缓存值依赖的表（按ID查询与列表查询JOIN了系统/模块表）
+_NAMESPACE_TABLES: Dict[str, Tuple[str, ...]] = {
+    'system': ('systems',),
+    'system_list': ('systems',),
+    'module': ('modules', 'systems'),
+    'module_list': ('modules', 'systems'),
+    'module_count': ('modules',),
+    'api_interface': ('api_interfaces', 'systems', 'modules'),
+    'api_interface_list': ('api_interfaces', 'systems', 'modules')
+}
+
+# 表 -> 以该表主键为键的按ID命名空间
+_ID_NAMESPACES = {
+    'systems': 'system',
+    'modules': 'module',
+    'api_interfaces': 'api_interface'
+}
+
+
+def _copy(value: Any) -> Any:
+    """复制缓存值（数据行为标量字段，浅拷贝即可）"""
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return [dict(item) if isinstance(item, dict) else item for item in value]
+    return value
+
+
+class EntityCache:
+    """实体读穿缓存（按命名空间的LRU + TTL）"""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None,
+                 coherence_interval: Optional[float] = None, enabled: Optional[bool] = None):
+        config = get_config()
+        self.enabled = config.ENTITY_CACHE_ENABLED if enabled is None else enabled
+        self.max_entries = max_entries or config.ENTITY_CACHE_MAX_ENTRIES
+        self.ttl = config.ENTITY_CACHE_TTL if ttl is None else ttl
+        self.coherence_interval = (config.ENTITY_CACHE_COHERENCE_INTERVAL
+                                   if coherence_interval is None else coherence_interval)
+        self._namespaces: Dict[str, "OrderedDict[Hashable, Tuple[float, Any]]"] = {
+            namespace: OrderedDict() for namespace in _NAMESPACE_TABLES
+        }
+        # 命名空间失效代数：加载期间发生失效时丢弃加载结果
+        self._generations = {namespace: 0 for namespace in _NAMESPACE_TABLES}
+        self._lock = threading.Lock()
+        self._data_version: Optional[int] = None
+        self._checked_at = 0.0
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0,
+                       'invalidations': 0, 'remote_invalidations': 0}
+        self._namespace_stats = {namespace: {'hits': 0, 'misses': 0} for namespace in _NAMESPACE_TABLES}
+
+    def get_or_load(self, namespace: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        读穿查询：命中时返回缓存值的拷贝，未命中时调用loader加载并缓存（None不缓存）
+
+        Args:
+            namespace (str): 命名空间（如 'api_interface'）
+            key (Hashable): 缓存键（ID，或列表查询的参数元组）
+            loader (Callable[[], Any]): 未命中时的加载函数（DAO查询）
+
+        Returns:
+            Any: 数据行或数据行列表
+        """
+        if not self.enabled:
+            return loader()
+
+        self._ensure_coherent()
+        now = time.monotonic()
+        with self._lock:
+            entries = self._namespaces[namespace]
+            entry = entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    self._namespace_stats[namespace]['hits'] += 1
+                    return _copy(entry[1])
+                del entries[key]
+                self._stats['expired'] += 1
+            self._stats['misses'] += 1
+            self._namespace_stats[namespace]['misses'] += 1
+            generation = self._generations[namespace]
+
+        value = loader()
+        if value is None:
+            return None
+
+        with self._lock:
+            # 加载期间发生了失效（本进程写入或其他进程写入）时不写入，避免缓存旧值
+            if generation == self._generations[namespace]:
+                entries = self._namespaces[namespace]
+                entries[key] = (time.monotonic() + self.ttl, value)
+                entries.move_to_end(key)
+                while len(entries) > self.max_entries:
+                    entries.popitem(last=False)
+                    self._stats['evictions'] += 1
+        return _copy(value)
+
+    def invalidate(self, table: str, ids: Optional[Iterable[int]] = None) -> None:
+        """
+        表写入后失效相关缓存
+
+        Args:
+            table (str): 被写入的表（systems / modules / api_interfaces）
+            ids (Optional[Iterable[int]]): 受影响的主键，为空时失效该表的全部按ID条目
+        """
+        id_namespace = _ID_NAMESPACES.get(table)
+        ids = list(ids) if ids is not None else None
+        with self._lock:
+            self._stats['invalidations'] += 1
+            for namespace, tables in _NAMESPACE_TABLES.items():
+                if table not in tables:
+                    continue
+                self._generations[namespace] += 1
+                if namespace == id_namespace and ids is not None:
+                    entries = self._namespaces[namespace]
+                    for entity_id in ids:
+                        entries.pop(_id_key(entity_id), None)
+                else:
+                    self._namespaces[namespace].clear()
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._clear_locked()
+
+    def _clear_locked(self) -> None:
+        for namespace, entries in self._namespaces.items():
+            entries.clear()
+            self._generations[namespace] += 1
+
+    def _ensure_coherent(self) -> None:
+        """按间隔检查共享连接的 data_version，其他连接（含线程独立连接）提交过写入时清空缓存"""
+        now = time.monotonic()
+        if now - self._checked_at < self.coherence_interval:
+            return
+        self._checked_at = now
+        try:
+            data_version = get_shared_connection().execute("PRAGMA data_version").fetchone()[0]
+        except Exception:
+            return
+        with self._lock:
+            if self._data_version is not None and data_version != self._data_version:
+                self._clear_locked()
+                self._stats['remote_invalidations'] += 1
+            self._data_version = data_version
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats['hits'] + stats['misses']
+            return {
+                'enabled': self.enabled,
+                'entries': {namespace: len(entries) for namespace, entries in self._namespaces.items()},
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hit_ratio': round(stats['hits'] / lookups, 4) if lookups else 0.0,
+                'by_namespace': {namespace: dict(counts) for namespace, counts in self._namespace_stats.items()},
+                **stats
+            }
+
+
+# 全局实体缓存
+entity_cache = EntityCache()
+
+
+def _id_key(value: Any) -> Any:
+    """按ID条目的键统一为int：调用方可能传入字符串ID（如计划/模板中的 api_id），须与按int失效的键一致"""
+    if isinstance(value, str) and value.strip().lstrip('-').isdigit():
+        return int(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _cache_key(args: tuple, kwargs: Dict[str, Any]) -> Hashable:
+    """由DAO方法参数构建缓存键：单个位置参数直接作为键（按ID失效），集合参数转为frozenset"""
+    if len(args) == 1 and not kwargs:
+        value = args[0]
+        return frozenset(value) if isinstance(value, (set, frozenset)) else value
+    values = list(args) + [item for pair in sorted(kwargs.items()) for item in pair]
+    return tuple(frozenset(value) if isinstance(value, (set, frozenset)) else value for value in values)
+
+
+def cached(namespace: str) -> Callable:
+    """
+    DAO读方法装饰器：经实体缓存读取
+
+    Args:
+        namespace (str): 命名空间
+
+    Returns:
+        Callable: 装饰器
+    """
+    def decorator(func: Callable) -> Callable:
+        # 列表命名空间内多个方法共用，键带上方法名；按ID命名空间的键即为ID
+        by_id = namespace in _ID_NAMESPACES.values()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _cache_key(args, kwargs)
+            if by_id:
+                key = _id_key(key)
+            else:
+                key = (func.__name__, key)
+            return entity_cache.get_or_load(namespace, key, lambda: func(*args, **kwargs))
+        return wrapper
+    return decorator
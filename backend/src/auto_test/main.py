@@ -7,6 +7,7 @@ AI Auto Test Platform - Simplified Main Application Entry
 
 import logging
 import uvicorn
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Dict, Any
 
@@ -17,7 +18,10 @@ from fastapi.middleware.gzip import GZipMiddleware
 # 简化的配置和数据库导入
 from .config import Config
 from .database.connection import init_database
+from .mcp.tools.http_pool import http_session_pool
+from .utils.http_cache import HttpCacheMiddleware
 from .utils.logger import get_logger
+from .utils.response import FastJSONResponse
 
 # 导入路由
 from .api.systems import router as systems_router
@@ -28,6 +32,8 @@ from .api.scenarios import router as scenarios_router
 from .api.api_interfaces import router as api_interfaces_router
 from .api.logs import router as logs_router
 from .api.pages import router as pages_router
+from .api.metrics import router as metrics_router
+from .api.bulk_executions import router as bulk_executions_router
 # 尝试导入编排路由（依赖可能缺失时跳过）
 try:
     from .api.orchestration import router as orchestration_router
@@ -41,6 +47,21 @@ from .api.test_apis_dialog import router as test_apis_dialog_router
 # 设置日志
 logger = get_logger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：启动时创建共享的Agent池，关闭时释放LLM连接与HTTP连接池"""
+    agent_pool = None
+    if orchestration_router is not None:
+        from .agents.pool import agent_pool
+        agent_pool.start()
+        app.state.agent_pool = agent_pool
+    try:
+        yield
+    finally:
+        if agent_pool is not None:
+            await agent_pool.close()
+        await http_session_pool.close()
+
 def create_app() -> FastAPI:
     """创建FastAPI应用实例 - 极简版"""
     
@@ -53,9 +74,15 @@ def create_app() -> FastAPI:
         description="AI Auto Test Platform - Simplified Architecture",
         version="4.0.0",
         docs_url="/docs",
-        redoc_url="/redoc"
+        redoc_url="/redoc",
+        # orjson序列化全部响应；读接口经 trusted_response 跳过response_model二次校验
+        default_response_class=FastJSONResponse,
+        lifespan=lifespan
     )
     
+    # HTTP缓存中间件（ETag/304）：最先注册即位于最内层，304响应仍带CORS头，响应体仍经GZip压缩
+    app.add_middleware(HttpCacheMiddleware)
+    
     # 配置CORS中间件
     app.add_middleware(
         CORSMiddleware,
@@ -90,6 +117,9 @@ def create_app() -> FastAPI:
         app.include_router(orchestration_router, prefix="/api", tags=["AI Orchestration"])
     app.include_router(test_apis_page_router, prefix="/api", tags=["Test APIs Management - Page"])
     app.include_router(test_apis_dialog_router, prefix="/api", tags=["Test APIs Management - Dialog"])
+    app.include_router(bulk_executions_router, prefix="/api", tags=["Bulk Execution"])
+    # 指标接口挂载在根路径，便于Prometheus抓取 /metrics
+    app.include_router(metrics_router, tags=["Metrics"])
     
     # 根路径
     @app.get("/")
@@ -11,17 +11,28 @@ MCP工具层是AI编排模块的核心基础设施，提供：
 - ToolRegistry: 工具注册表，管理所有可用工具
 - BaseTools: 基础工具集合，提供常用工具实现
 - ToolExecutor: 工具执行器，负责工具的实际执行
+- RetryPolicy/CircuitBreaker: 工具执行的重试策略与按主机熔断
 """
 
 from .client import MCPClient
 from .registry import ToolRegistry
 from .executor import ToolExecutor
+from .resilience import (
+    RetryPolicy, FixedDelayRetryPolicy, ExponentialBackoffRetryPolicy,
+    CircuitBreaker, CircuitOpenError, RetryBudget
+)
 from .tools import *
 
 __all__ = [
     'MCPClient',
     'ToolRegistry', 
     'ToolExecutor',
+    'RetryPolicy',
+    'FixedDelayRetryPolicy',
+    'ExponentialBackoffRetryPolicy',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'RetryBudget',
     'HttpTools',
     'ValidationTools',
     'UtilityTools'
@@ -119,6 +119,8 @@ class MCPClient:
             if not tool_def:
                 raise ValueError(f"工具不存在: {tool_name}")
             
+            await self.registry.update_tool_stats(tool_name)
+            
             # 验证参数
             validated_params = await self._validate_parameters(tool_def, parameters)
             
@@ -2,18 +2,24 @@
 
 负责MCP工具的实际执行，包括：
 - 工具调用的安全执行
-- 超时控制和重试机制
+- 超时控制和重试机制（可插拔重试策略、重试预算、按主机熔断）
 - 执行结果的标准化处理
-- 执行日志和监控
+- 执行日志和监控（延迟直方图、在途数、重试/超时计数）
 """
 
 import asyncio
 import time
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Union
 from datetime import datetime
 import logging
 
+from ..config import get_config
 from ..utils.logger import get_logger
+from .resilience import (
+    RetryPolicy, CircuitOpenError, create_retry_policy,
+    resilience_registry, resolve_target_host
+)
+from .metrics import tool_metrics
 
 logger = get_logger(__name__)
 
@@ -24,7 +30,8 @@ class ToolExecutor:
     提供安全、可控的工具执行环境，支持：
     - 异步工具执行
     - 超时控制
-    - 重试机制
+    - 重试机制（指数退避+抖动、HTTP状态码重试、重试预算）
+    - 按主机熔断
     - 执行监控
     - 错误处理
     """
@@ -33,22 +40,71 @@ class ToolExecutor:
         """初始化工具执行器
         
         Args:
-            config: 执行器配置
+            config: 执行器配置，支持：
+                - default_timeout / max_retries / retry_delay
+                - retry_policy: 默认重试策略配置，如 {'type': 'exponential', 'base_delay': 0.5}
+                - retry_policies: 按工具名配置的重试策略 {tool_name: spec | RetryPolicy}
         """
         self.config = config or {}
         self.default_timeout = self.config.get('default_timeout', 30)
         self.max_retries = self.config.get('max_retries', 3)
         self.retry_delay = self.config.get('retry_delay', 1)
         
+        # 重试策略
+        self.default_retry_policy = self._build_default_policy()
+        self.retry_policies: Dict[str, RetryPolicy] = {}
+        for tool_name, spec in self.config.get('retry_policies', {}).items():
+            self.set_retry_policy(tool_name, spec)
+        
+        # 熔断器与重试预算、执行指标（进程内共享）
+        self.resilience = resilience_registry
+        self.metrics = tool_metrics
+        
         # 执行统计
-        self._execution_stats = {
+        self._execution_stats = self._empty_stats()
+    
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {
             'total_executions': 0,
             'successful_executions': 0,
             'failed_executions': 0,
             'timeout_executions': 0,
-            'retry_executions': 0
+            'retry_executions': 0,
+            'retry_budget_exhausted': 0,
+            'circuit_open_rejections': 0,
+            'retryable_status_results': 0
         }
     
+    def _build_default_policy(self) -> RetryPolicy:
+        """构建默认重试策略"""
+        spec = dict(self.config.get('retry_policy') or {})
+        spec.setdefault('type', get_config().TOOL_RETRY_POLICY)
+        spec.setdefault('max_retries', self.max_retries)
+        if spec['type'] == 'fixed':
+            spec.setdefault('delay', self.retry_delay)
+        return create_retry_policy(spec)
+    
+    def set_retry_policy(self, tool_name: str, policy: Union[RetryPolicy, Dict[str, Any]]) -> None:
+        """为指定工具设置重试策略
+        
+        Args:
+            tool_name: 工具名称
+            policy: 重试策略实例或策略配置
+        """
+        if not isinstance(policy, RetryPolicy):
+            policy = create_retry_policy(policy)
+        self.retry_policies[tool_name] = policy
+    
+    def _resolve_retry_policy(self, tool_name: str, context: Dict[str, Any]) -> RetryPolicy:
+        """解析本次调用使用的重试策略（上下文 > 工具配置 > 默认）"""
+        spec = context.get('retry_policy')
+        if isinstance(spec, RetryPolicy):
+            return spec
+        if isinstance(spec, dict):
+            return create_retry_policy(spec)
+        return self.retry_policies.get(tool_name, self.default_retry_policy)
+    
     async def execute_tool(self, tool_name: str, tool_def: Dict[str, Any], 
                           parameters: Dict[str, Any], context: Dict[str, Any]) -> Any:
         """执行工具
@@ -57,16 +113,37 @@ class ToolExecutor:
             tool_name: 工具名称
             tool_def: 工具定义
             parameters: 工具参数
-            context: 执行上下文
+            context: 执行上下文（timeout、max_retries、retry_policy、retry_non_idempotent可按调用覆盖）
             
         Returns:
             Any: 工具执行结果
             
         Raises:
+            CircuitOpenError: 目标主机处于熔断状态
             Exception: 工具执行失败时抛出异常
         """
         self._execution_stats['total_executions'] += 1
         
+        host = resolve_target_host(parameters, context)
+        api_id = parameters.get('api_id') if isinstance(parameters, dict) else None
+        
+        # 指标采集：按工具/主机/API接口记录在途数、耗时与结果
+        series = self.metrics.begin(tool_name, host, api_id)
+        start = time.perf_counter()
+        success = False
+        try:
+            result = await self._execute_with_retries(
+                tool_name, tool_def, parameters, context, host, series
+            )
+            success = not (isinstance(result, dict) and result.get('success') is False)
+            return result
+        finally:
+            self.metrics.end(series, time.perf_counter() - start, success)
+    
+    async def _execute_with_retries(self, tool_name: str, tool_def: Dict[str, Any],
+                                    parameters: Dict[str, Any], context: Dict[str, Any],
+                                    host: Optional[str], series: tuple) -> Any:
+        """按重试策略执行工具（带熔断与重试预算）"""
         # 获取工具实现
         tool_impl = tool_def.get('implementation')
         if not tool_impl:
@@ -78,38 +155,96 @@ class ToolExecutor:
         
         # 获取执行配置
         timeout = context.get('timeout', self.default_timeout)
-        max_retries = context.get('max_retries', self.max_retries)
+        policy = self._resolve_retry_policy(tool_name, context)
+        max_retries = context.get('max_retries', policy.max_retries)
+        allow_non_idempotent = bool(context.get('retry_non_idempotent', False))
+        
+        # 目标主机的熔断器与重试预算
+        breaker = self.resilience.get_breaker(host) if host else None
+        budget = self.resilience.get_budget(host) if host else None
+        if budget:
+            budget.record_request()
         
         # 执行工具（带重试）
         last_exception = None
+        last_result = None
         for attempt in range(max_retries + 1):
+            if attempt > 0:
+                if budget and not budget.try_acquire():
+                    self._execution_stats['retry_budget_exhausted'] += 1
+                    logger.warning(f"重试预算耗尽，停止重试: {tool_name}, host: {host}")
+                    break
+                self._execution_stats['retry_executions'] += 1
+                self.metrics.record_retry(series)
+                delay = policy.compute_delay(attempt)
+                logger.info(f"重试执行工具: {tool_name}, 第{attempt}次重试, 等待{delay:.2f}秒")
+                await asyncio.sleep(delay)
+            
+            if breaker and not breaker.allow_request():
+                self._execution_stats['circuit_open_rejections'] += 1
+                if last_result is None:
+                    last_exception = CircuitOpenError(host, breaker.retry_after())
+                logger.warning(f"熔断拒绝执行: {tool_name}, host: {host}")
+                break
+            
             try:
-                if attempt > 0:
-                    self._execution_stats['retry_executions'] += 1
-                    logger.info(f"重试执行工具: {tool_name}, 第{attempt}次重试")
-                    await asyncio.sleep(self.retry_delay * attempt)
-                
                 # 执行工具（带超时）
                 result = await self._execute_with_timeout(
                     tool_impl, parameters, context, timeout
                 )
                 
+                if policy.is_retryable_status(result):
+                    # HTTP层面的可重试失败（如5xx/429/连接错误）
+                    self._execution_stats['retryable_status_results'] += 1
+                    if breaker:
+                        breaker.record_failure()
+                    last_result = result
+                    last_exception = None
+                    if not policy.allows_method(result, allow_non_idempotent):
+                        # 非幂等请求可能已被服务端处理，未显式开启时不重放
+                        logger.warning(f"非幂等请求不重试: {tool_name}, method: {result.get('method')}, "
+                                       f"status: {result.get('status_code')}")
+                        break
+                    logger.warning(f"工具返回可重试状态: {tool_name}, status: {result.get('status_code')}, "
+                                   f"尝试 {attempt + 1}/{max_retries + 1}")
+                    continue
+                
+                if breaker:
+                    breaker.record_success()
                 self._execution_stats['successful_executions'] += 1
                 logger.debug(f"工具执行成功: {tool_name}")
                 return result
                 
             except asyncio.TimeoutError as e:
                 self._execution_stats['timeout_executions'] += 1
+                self.metrics.record_timeout(series)
+                if breaker:
+                    breaker.record_failure()
                 last_exception = e
+                last_result = None
                 logger.warning(f"工具执行超时: {tool_name}, 尝试 {attempt + 1}/{max_retries + 1}")
                 
             except Exception as e:
                 last_exception = e
+                last_result = None
                 logger.warning(f"工具执行失败: {tool_name}, 尝试 {attempt + 1}/{max_retries + 1}, 错误: {e}")
                 
                 # 某些错误不需要重试
                 if self._is_non_retryable_error(e):
                     break
+                if breaker:
+                    breaker.record_failure()
+
+            finally:
+                # 归还未记录结果的探测名额（不可重试错误、取消）；已记录成功/失败时为空操作
+                if breaker:
+                    breaker.release()
+        
+        # 重试耗尽后仍为HTTP失败结果：原样返回，由上层判定
+        if last_result is not None:
+            self._execution_stats['failed_executions'] += 1
+            logger.error(f"工具执行重试耗尽: {tool_name}, status: {last_result.get('status_code')}")
+            return last_result
         
         # 所有重试都失败了
         self._execution_stats['failed_executions'] += 1
@@ -199,6 +334,7 @@ class ToolExecutor:
         """
         # 参数错误、权限错误等不需要重试
         non_retryable_types = (
+            CircuitOpenError,
             ValueError,
             TypeError,
             KeyError,
@@ -226,15 +362,14 @@ class ToolExecutor:
             stats['failure_rate'] = 0
             stats['timeout_rate'] = 0
         
+        # 重试策略、熔断器与重试预算状态
+        stats['retry_policy'] = self.default_retry_policy.to_dict()
+        stats['hosts'] = self.resilience.snapshot()
+        stats['metrics'] = self.metrics.summary()
+        
         return stats
     
     def reset_stats(self) -> None:
         """重置执行统计"""
-        self._execution_stats = {
-            'total_executions': 0,
-            'successful_executions': 0,
-            'failed_executions': 0,
-            'timeout_executions': 0,
-            'retry_executions': 0
-        }
+        self._execution_stats = self._empty_stats()
         logger.info("执行统计已重置")
\ No newline at end of file
@@ -0,0 +1,246 @@
+"""工具执行指标
+
+为MCP工具执行提供常驻的轻量级指标采集，包括：
+- 按工具、目标主机、API接口ID三个维度的调用/错误/重试/超时计数
+- 在途调用数（in-flight）
+- 对数分桶的延迟直方图（兼容Prometheus histogram格式）
+
+设计约束：
+- 指标对象与每个 (tool, host, api_id) 组合的序列元组在首次出现时创建并缓存，
+  之后每次记录只做字典查找与整数自增，不分配新对象
+- api_id 维度的序列数有上限，超出后归入 "other"，避免标签基数无限增长
+- 所有记录都在事件循环线程中完成，无需加锁
+"""
+
+import math
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Tuple
+
+from ..config import get_config
+
+# 延迟分桶上界（秒）：1ms 起按 √2 倍递增，约到 65s，共33个桶
+LATENCY_BUCKETS: Tuple[float, ...] = tuple(
+    round(0.001 * math.pow(2, i / 2), 6) for i in range(33)
+)
+
+
+class LatencyHistogram:
+    """对数分桶延迟直方图"""
+
+    __slots__ = ('counts', 'count', 'total')
+
+    def __init__(self):
+        # 最后一个桶为 +Inf
+        self.counts: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """记录一次耗时"""
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float:
+        """按分桶估算分位数（返回桶上界）"""
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else float('inf')
+        return float('inf')
+
+    def cumulative_buckets(self) -> List[Tuple[str, int]]:
+        """导出累计分桶（Prometheus le 语义）"""
+        result = []
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            le = repr(LATENCY_BUCKETS[index]) if index < len(LATENCY_BUCKETS) else '+Inf'
+            result.append((le, cumulative))
+        return result
+
+
+class ToolSeries:
+    """单个维度取值的指标序列"""
+
+    __slots__ = ('calls', 'errors', 'retries', 'timeouts', 'in_flight', 'latency')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.latency = LatencyHistogram()
+
+    def summary(self) -> Dict[str, Any]:
+        """导出JSON摘要"""
+        latency = self.latency
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'retries': self.retries,
+            'timeouts': self.timeouts,
+            'in_flight': self.in_flight,
+            'error_rate': self.errors / self.calls if self.calls else 0,
+            'latency_ms': {
+                'avg': round(latency.total / latency.count * 1000, 2) if latency.count else 0,
+                'p50': round(latency.quantile(0.50) * 1000, 2),
+                'p90': round(latency.quantile(0.90) * 1000, 2),
+                'p99': round(latency.quantile(0.99) * 1000, 2)
+            }
+        }
+
+
+class ToolMetrics:
+    """工具执行指标注册表
+
+    维度：
+    - tool: 工具名称
+    - host: 目标主机（仅HTTP类工具）
+    - api_id: 已注册API接口ID（仅api_call）
+    """
+
+    DIMENSIONS = ('tool', 'host', 'api_id')
+    OVERFLOW_API_ID = 'other'
+
+    def __init__(self, max_api_ids: Optional[int] = None):
+        self.max_api_ids = max_api_ids or get_config().TOOL_METRICS_MAX_API_IDS
+        self._series: Dict[str, Dict[Any, ToolSeries]] = {
+            dimension: {} for dimension in self.DIMENSIONS
+        }
+        # tool -> host -> api_id -> 序列元组
+        self._combos: Dict[str, Dict[Optional[str], Dict[Any, Tuple[ToolSeries, ...]]]] = {}
+
+    def _get(self, dimension: str, key: Any) -> ToolSeries:
+        table = self._series[dimension]
+        series = table.get(key)
+        if series is None:
+            series = table[key] = ToolSeries()
+        return series
+
+    def begin(self, tool_name: str, host: Optional[str] = None,
+              api_id: Optional[Any] = None) -> Tuple[ToolSeries, ...]:
+        """开始一次工具调用，返回本次调用涉及的指标序列
+
+        Args:
+            tool_name: 工具名称
+            host: 目标主机
+            api_id: API接口ID
+
+        Returns:
+            Tuple[ToolSeries, ...]: 指标序列，用于后续记录
+        """
+        host = host or None
+        if api_id is not None and api_id not in self._series['api_id'] \
+                and len(self._series['api_id']) >= self.max_api_ids:
+            api_id = self.OVERFLOW_API_ID
+
+        by_host = self._combos.get(tool_name)
+        if by_host is None:
+            by_host = self._combos[tool_name] = {}
+        by_api = by_host.get(host)
+        if by_api is None:
+            by_api = by_host[host] = {}
+        series = by_api.get(api_id)
+        if series is None:
+            series = by_api[api_id] = self._build(tool_name, host, api_id)
+
+        for item in series:
+            item.calls += 1
+            item.in_flight += 1
+        return series
+
+    def _build(self, tool_name: str, host: Optional[str], api_id: Optional[Any]) -> Tuple[ToolSeries, ...]:
+        """创建某个 (tool, host, api_id) 组合的序列元组"""
+        series = [self._get('tool', tool_name)]
+        if host:
+            series.append(self._get('host', host))
+        if api_id is not None:
+            series.append(self._get('api_id', api_id))
+        return tuple(series)
+
+    @staticmethod
+    def record_retry(series: Tuple[ToolSeries, ...]) -> None:
+        """记录一次重试"""
+        for item in series:
+            item.retries += 1
+
+    @staticmethod
+    def record_timeout(series: Tuple[ToolSeries, ...]) -> None:
+        """记录一次超时"""
+        for item in series:
+            item.timeouts += 1
+
+    @staticmethod
+    def end(series: Tuple[ToolSeries, ...], duration: float, success: bool) -> None:
+        """结束一次工具调用
+
+        Args:
+            series: begin返回的指标序列
+            duration: 总耗时（秒，含重试）
+            success: 是否成功
+        """
+        for item in series:
+            item.in_flight -= 1
+            item.latency.observe(duration)
+            if not success:
+                item.errors += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """导出JSON摘要"""
+        return {
+            dimension: {str(key): series.summary() for key, series in table.items()}
+            for dimension, table in self._series.items()
+        }
+
+    def render_prometheus(self, prefix: str = 'auto_test') -> str:
+        """导出Prometheus文本格式"""
+        lines: List[str] = []
+
+        for dimension, table in self._series.items():
+            if not table:
+                continue
+            name = f"{prefix}_{dimension}"
+            counters = (
+                ('calls_total', 'counter', 'calls', '工具调用次数'),
+                ('errors_total', 'counter', 'errors', '工具调用失败次数'),
+                ('retries_total', 'counter', 'retries', '工具重试次数'),
+                ('timeouts_total', 'counter', 'timeouts', '工具超时次数'),
+                ('in_flight', 'gauge', 'in_flight', '在途工具调用数')
+            )
+            for suffix, metric_type, attr, help_text in counters:
+                lines.append(f"# HELP {name}_{suffix} {help_text}")
+                lines.append(f"# TYPE {name}_{suffix} {metric_type}")
+                for key, series in table.items():
+                    lines.append(f'{name}_{suffix}{{{dimension}="{_escape(key)}"}} {getattr(series, attr)}')
+
+            lines.append(f"# HELP {name}_duration_seconds 工具调用耗时")
+            lines.append(f"# TYPE {name}_duration_seconds histogram")
+            for key, series in table.items():
+                label = f'{dimension}="{_escape(key)}"'
+                for le, cumulative in series.latency.cumulative_buckets():
+                    lines.append(f'{name}_duration_seconds_bucket{{{label},le="{le}"}} {cumulative}')
+                lines.append(f'{name}_duration_seconds_sum{{{label}}} {series.latency.total}')
+                lines.append(f'{name}_duration_seconds_count{{{label}}} {series.latency.count}')
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """清空所有指标"""
+        for table in self._series.values():
+            table.clear()
+        self._combos.clear()
+
+
+def _escape(value: Any) -> str:
+    """转义Prometheus标签值"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# 全局工具指标（跨执行共享）
+tool_metrics = ToolMetrics()
@@ -141,14 +141,15 @@ class ToolRegistry:
     async def update_tool_stats(self, tool_name: str) -> None:
         """更新工具调用统计
         
+        每次工具调用都会触发，只做字段自增，不加锁（仅在事件循环线程中调用）。
+        
         Args:
             tool_name: 工具名称
         """
-        async with self._lock:
-            if tool_name in self._tools:
-                tool_def = self._tools[tool_name]
-                tool_def['call_count'] = tool_def.get('call_count', 0) + 1
-                tool_def['last_called'] = datetime.now().isoformat()
+        tool_def = self._tools.get(tool_name)
+        if tool_def is not None:
+            tool_def['call_count'] = tool_def.get('call_count', 0) + 1
+            tool_def['last_called'] = datetime.now().isoformat()
     
     async def enable_tool(self, tool_name: str) -> bool:
         """启用工具
@@ -0,0 +1,457 @@
+"""工具执行弹性策略
+
+为ToolExecutor提供可插拔的重试与熔断机制，包括：
+- 重试策略：固定间隔、指数退避+全抖动，支持按HTTP状态码类别重试（仅幂等方法）
+- 重试预算：按目标主机限制重试比例，避免故障期间放大下游负载
+- 熔断器：按目标主机熔断，状态在所有执行之间共享
+- 限速器：按目标主机的令牌桶限速，批量执行时避免压垮单个下游
+"""
+
+import asyncio
+import random
+import time
+from typing import Dict, Any, Optional, Iterable, List
+from urllib.parse import urlparse
+
+from ..config import get_config
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """熔断器处于打开状态时拒绝调用"""
+
+    def __init__(self, host: str, retry_after: float):
+        self.host = host
+        self.retry_after = retry_after
+        super().__init__(f"目标主机已熔断: {host}, {retry_after:.1f}秒后重试")
+
+
+class RetryPolicy:
+    """重试策略基类
+
+    子类通过重写 `compute_delay` 决定退避时间；
+    `retry_on_status` 决定哪些HTTP结果视为可重试失败。
+    HTTP结果只对幂等方法重试，非幂等请求（如POST）需显式开启 `retry_non_idempotent`，
+    避免服务端已处理的请求被重复提交。
+    """
+
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'})
+
+    def __init__(self, max_retries: int = 3,
+                 retry_on_status: Optional[Iterable[Any]] = None,
+                 retry_non_idempotent: bool = False):
+        """初始化重试策略
+
+        Args:
+            max_retries: 最大重试次数（不含首次执行）
+            retry_on_status: 可重试的HTTP状态，支持具体状态码(503)或类别('5xx')，
+                状态码0表示连接层错误
+            retry_non_idempotent: 是否允许对非幂等方法的HTTP结果重试
+        """
+        self.max_retries = max_retries
+        self.retry_on_status = list(retry_on_status if retry_on_status is not None
+                                    else ['5xx', 429, 0])
+        self.retry_non_idempotent = retry_non_idempotent
+
+    def compute_delay(self, attempt: int) -> float:
+        """计算第attempt次重试前的等待时间（秒），attempt从1开始"""
+        raise NotImplementedError
+
+    def is_retryable_result(self, result: Any, allow_non_idempotent: bool = False) -> bool:
+        """判断工具结果是否为可重试的HTTP失败
+
+        Args:
+            result: 工具执行结果
+            allow_non_idempotent: 本次调用是否允许重试非幂等请求（步骤级开关）
+
+        Returns:
+            bool: 是否需要重试
+        """
+        return (self.is_retryable_status(result)
+                and self.allows_method(result, allow_non_idempotent))
+
+    def allows_method(self, result: Dict[str, Any], allow_non_idempotent: bool = False) -> bool:
+        """判断HTTP结果的请求方法是否允许重试（缺少方法时按非幂等处理）"""
+        if self.retry_non_idempotent or allow_non_idempotent:
+            return True
+        return str(result.get('method') or '').upper() in self.IDEMPOTENT_METHODS
+
+    def is_retryable_status(self, result: Any) -> bool:
+        """判断工具结果是否为可重试状态码的HTTP失败（不考虑请求方法）"""
+        if not isinstance(result, dict) or 'status_code' not in result:
+            return False
+
+        status = result.get('status_code')
+        if not isinstance(status, int):
+            return False
+
+        for rule in self.retry_on_status:
+            if isinstance(rule, int) and status == rule:
+                return True
+            if isinstance(rule, str) and len(rule) == 3 and rule[1:].lower() == 'xx':
+                if rule[0].isdigit() and status // 100 == int(rule[0]):
+                    return True
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """导出策略配置"""
+        return {
+            'policy': self.__class__.__name__,
+            'max_retries': self.max_retries,
+            'retry_on_status': self.retry_on_status,
+            'retry_non_idempotent': self.retry_non_idempotent
+        }
+
+
+class FixedDelayRetryPolicy(RetryPolicy):
+    """线性退避策略（兼容旧行为：delay * attempt）"""
+
+    def __init__(self, delay: float = 1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+
+    def compute_delay(self, attempt: int) -> float:
+        return self.delay * attempt
+
+
+class ExponentialBackoffRetryPolicy(RetryPolicy):
+    """指数退避 + 全抖动策略
+
+    delay = random(0, min(max_delay, base_delay * 2^(attempt-1)))，
+    避免大量执行在同一时刻同步重试。
+    """
+
+    def __init__(self, base_delay: float = 0.5, max_delay: float = 30.0,
+                 jitter: bool = True, **kwargs):
+        super().__init__(**kwargs)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def compute_delay(self, attempt: int) -> float:
+        cap = min(self.max_delay, self.base_delay * (2 ** max(attempt - 1, 0)))
+        return random.uniform(0, cap) if self.jitter else cap
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        data.update({
+            'base_delay': self.base_delay,
+            'max_delay': self.max_delay,
+            'jitter': self.jitter
+        })
+        return data
+
+
+def create_retry_policy(spec: Optional[Dict[str, Any]] = None) -> RetryPolicy:
+    """根据配置创建重试策略
+
+    Args:
+        spec: 策略配置，如 {'type': 'exponential', 'max_retries': 3, 'base_delay': 0.5}
+
+    Returns:
+        RetryPolicy: 重试策略实例
+    """
+    config = get_config()
+    spec = dict(spec or {})
+    policy_type = spec.pop('type', 'exponential')
+
+    if policy_type == 'fixed':
+        spec.setdefault('delay', config.TOOL_RETRY_BASE_DELAY)
+        return FixedDelayRetryPolicy(**spec)
+
+    if policy_type == 'exponential':
+        spec.setdefault('base_delay', config.TOOL_RETRY_BASE_DELAY)
+        spec.setdefault('max_delay', config.TOOL_RETRY_MAX_DELAY)
+        return ExponentialBackoffRetryPolicy(**spec)
+
+    raise ValueError(f"未知重试策略类型: {policy_type}")
+
+
+class RetryBudget:
+    """重试预算（令牌桶）
+
+    每次首次请求存入 `ratio` 个令牌，每次重试消耗1个令牌，
+    从而把重试流量限制在正常流量的固定比例内。
+    """
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 10, max_tokens: float = 100):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = float(min_tokens)
+        self.retries_granted = 0
+        self.retries_denied = 0
+
+    def record_request(self) -> None:
+        """记录一次首次请求"""
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        """尝试申请一次重试
+
+        Returns:
+            bool: 预算是否允许重试
+        """
+        if self._tokens >= 1:
+            self._tokens -= 1
+            self.retries_granted += 1
+            return True
+        self.retries_denied += 1
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'available_tokens': round(self._tokens, 2),
+            'retries_granted': self.retries_granted,
+            'retries_denied': self.retries_denied
+        }
+
+
+class CircuitBreaker:
+    """熔断器
+
+    状态流转：
+    - closed: 正常放行，连续失败达到阈值后转为open
+    - open: 拒绝调用，经过recovery_timeout后转为half_open
+    - half_open: 放行有限的探测请求，成功则closed，失败则重新open；
+      探测未记录结果就结束（不可重试错误、取消）时须调用release()归还名额，
+      名额被占满超过recovery_timeout时视为探测已丢失，重新放行探测
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._probe_started_at = 0.0
+
+        # 统计
+        self.total_successes = 0
+        self.total_failures = 0
+        self.rejected_calls = 0
+        self.times_opened = 0
+
+    def allow_request(self) -> bool:
+        """判断当前是否允许调用"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self.state = self.HALF_OPEN
+                self._half_open_calls = 0
+            else:
+                self.rejected_calls += 1
+                return False
+
+        if self.state == self.HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                if time.monotonic() - self._probe_started_at < self.recovery_timeout:
+                    self.rejected_calls += 1
+                    return False
+                self._half_open_calls = 0
+            self._half_open_calls += 1
+            self._probe_started_at = time.monotonic()
+
+        return True
+
+    def release(self) -> None:
+        """归还未记录结果的探测名额（成功/失败已记录时为空操作）"""
+        if self.state == self.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def retry_after(self) -> float:
+        """距离下一次允许探测的剩余秒数"""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self) -> None:
+        """记录一次成功调用"""
+        self.total_successes += 1
+        self._consecutive_failures = 0
+        if self.state == self.HALF_OPEN:
+            self.state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """记录一次失败调用"""
+        self.total_failures += 1
+        self._consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            self._trip()
+
+    def _trip(self) -> None:
+        if self.state != self.OPEN:
+            self.times_opened += 1
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._half_open_calls = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'consecutive_failures': self._consecutive_failures,
+            'total_successes': self.total_successes,
+            'total_failures': self.total_failures,
+            'rejected_calls': self.rejected_calls,
+            'times_opened': self.times_opened,
+            'retry_after': round(self.retry_after(), 2)
+        }
+
+
+class ResilienceRegistry:
+    """按主机维护熔断器与重试预算
+
+    进程内共享，使同一目标主机的健康状态在所有执行、所有ToolExecutor之间一致。
+    """
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._budgets: Dict[str, RetryBudget] = {}
+
+    def get_breaker(self, host: str) -> CircuitBreaker:
+        """获取（必要时创建）主机熔断器"""
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            config = get_config()
+            breaker = CircuitBreaker(
+                failure_threshold=config.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                recovery_timeout=config.CIRCUIT_BREAKER_RECOVERY_TIMEOUT
+            )
+            self._breakers[host] = breaker
+        return breaker
+
+    def get_budget(self, host: str) -> RetryBudget:
+        """获取（必要时创建）主机重试预算"""
+        budget = self._budgets.get(host)
+        if budget is None:
+            config = get_config()
+            budget = RetryBudget(ratio=config.RETRY_BUDGET_RATIO)
+            self._budgets[host] = budget
+        return budget
+
+    def snapshot(self) -> Dict[str, Any]:
+        """导出所有主机的熔断与预算状态"""
+        hosts: List[str] = sorted(set(self._breakers) | set(self._budgets))
+        return {
+            host: {
+                'circuit_breaker': self._breakers[host].to_dict() if host in self._breakers else None,
+                'retry_budget': self._budgets[host].to_dict() if host in self._budgets else None
+            }
+            for host in hosts
+        }
+
+    def reset(self) -> None:
+        """清空所有状态"""
+        self._breakers.clear()
+        self._budgets.clear()
+
+
+class RateLimiter:
+    """令牌桶限速器（异步）
+
+    以 `rate` 个/秒补充令牌，最多积累 `burst` 个。令牌不足时预占令牌并等待，
+    并发的调用方按到达顺序依次获得发送时间，不会同时醒来再次争抢。
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self.acquired = 0
+        self.delayed = 0
+        self.wait_seconds = 0.0
+
+    def reserve(self) -> float:
+        """预占一个令牌
+
+        Returns:
+            float: 需要等待的秒数（0表示可立即发送）
+        """
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        self.acquired += 1
+        if self._tokens >= 0:
+            return 0.0
+        delay = -self._tokens / self.rate
+        self.delayed += 1
+        self.wait_seconds += delay
+        return delay
+
+    async def acquire(self) -> float:
+        """获取一个令牌（必要时等待），返回等待秒数"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rate': self.rate,
+            'burst': self.burst,
+            'acquired': self.acquired,
+            'delayed': self.delayed,
+            'wait_seconds': round(self.wait_seconds, 3)
+        }
+
+
+class TargetRateLimiter:
+    """按目标主机维护令牌桶
+
+    rate为0或负数时不限速。全局实例按配置限速，批量执行可按请求创建独立实例。
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[int] = None):
+        config = get_config()
+        self.rate = config.TEST_API_RATE_LIMIT_PER_TARGET if rate is None else rate
+        self.burst = config.TEST_API_RATE_LIMIT_BURST if burst is None else burst
+        self._limiters: Dict[str, RateLimiter] = {}
+
+    async def acquire(self, host: Optional[str]) -> float:
+        """为目标主机获取一个令牌，返回等待秒数"""
+        if not host or self.rate <= 0:
+            return 0.0
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = RateLimiter(self.rate, self.burst)
+            self._limiters[host] = limiter
+        return await limiter.acquire()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """导出各主机的限速统计"""
+        return {
+            'rate': self.rate,
+            'burst': self.burst,
+            'targets': {host: limiter.to_dict() for host, limiter in sorted(self._limiters.items())}
+        }
+
+
+def resolve_target_host(parameters: Dict[str, Any], context: Dict[str, Any]) -> Optional[str]:
+    """解析工具调用的目标主机
+
+    http_request 使用参数中的url；api_call 使用上下文中的base_url。
+    非HTTP工具返回None，不参与熔断与预算控制。
+    """
+    url = parameters.get('url') if isinstance(parameters, dict) else None
+    if not url and isinstance(parameters, dict) and ('api_id' in parameters or 'path' in parameters):
+        url = context.get('base_url', 'http://localhost:8002')
+    if not url or not isinstance(url, str):
+        return None
+    return urlparse(url).netloc or None
+
+
+# 全局弹性状态注册表（跨执行共享）
+resilience_registry = ResilienceRegistry()
+
+# 全局目标主机限速器（测试API执行共享）
+target_rate_limiter = TargetRateLimiter()
@@ -0,0 +1,76 @@
+"""共享HTTP连接池
+
+HTTP工具此前每次请求都新建ClientSession与连接器，无法复用TCP/TLS连接。
+连接池按（事件循环, 是否校验SSL）维护长期存活的ClientSession：
+- 同一事件循环内的所有请求共享连接，批量执行时连接数受limit/limit_per_host约束
+- 超时、请求头在每次请求时指定，会话本身不携带请求级配置
+- 不保存Cookie（DummyCookieJar）：会话跨执行、跨用户共享，与此前每次新建会话一样，
+  响应设置的Cookie不会带到后续请求
+- 应用关闭时统一释放
+"""
+
+import asyncio
+from typing import Dict, Any, Optional, Tuple
+
+import aiohttp
+
+from ...config import get_config
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class HttpSessionPool:
+    """ClientSession池"""
+
+    def __init__(self, limit: Optional[int] = None, limit_per_host: Optional[int] = None):
+        config = get_config()
+        self.limit = limit or config.HTTP_POOL_LIMIT
+        self.limit_per_host = limit_per_host or config.HTTP_POOL_LIMIT_PER_HOST
+        # (事件循环ID, 是否校验SSL) -> (所属事件循环, 会话)；事件循环ID可能被复用，取用时比对循环对象
+        self._sessions: Dict[Tuple[int, bool], Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+        self.sessions_created = 0
+        self.requests = 0
+
+    def get(self, verify_ssl: bool = True) -> aiohttp.ClientSession:
+        """获取当前事件循环的共享会话（不存在或已关闭时创建）"""
+        loop = asyncio.get_running_loop()
+        key = (id(loop), bool(verify_ssl))
+        owner, session = self._sessions.get(key, (None, None))
+        if session is None or session.closed or owner is not loop:
+            connector = aiohttp.TCPConnector(
+                ssl=None if verify_ssl else False,
+                limit=self.limit,
+                limit_per_host=self.limit_per_host
+            )
+            session = aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar())
+            self._sessions[key] = (loop, session)
+            self.sessions_created += 1
+        self.requests += 1
+        return session
+
+    async def close(self) -> None:
+        """关闭全部会话（应用关闭时调用）"""
+        sessions = [session for _, session in self._sessions.values()]
+        self._sessions.clear()
+        for session in sessions:
+            if session.closed:
+                continue
+            try:
+                await session.close()
+            except Exception as e:
+                logger.warning(f"关闭HTTP会话失败: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取连接池统计"""
+        return {
+            'sessions': sum(1 for _, session in self._sessions.values() if not session.closed),
+            'sessions_created': self.sessions_created,
+            'requests': self.requests,
+            'limit': self.limit,
+            'limit_per_host': self.limit_per_host
+        }
+
+
+# 全局HTTP连接池
+http_session_pool = HttpSessionPool()
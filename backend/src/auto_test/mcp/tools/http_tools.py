@@ -4,6 +4,9 @@
 - HTTP请求工具
 - API调用工具
 - 响应处理工具
+- 幂等请求响应缓存（见 response_cache）
+- 并发相同请求合并（见 single_flight）
+- 共享连接池（见 http_pool）
 """
 
 import aiohttp
@@ -13,7 +16,13 @@ from typing import Dict, Any, Optional
 from urllib.parse import urljoin, urlparse
 import logging
 
+from ...config import get_config
 from ...utils.logger import get_logger
+from .response_cache import (
+    ResponseCache, CACHEABLE_METHODS, build_cache_key, cached_result, response_cache
+)
+from .single_flight import http_single_flight
+from .http_pool import http_session_pool
 
 logger = get_logger(__name__)
 
@@ -94,6 +103,15 @@ class HttpTools:
                         "type": "boolean",
                         "default": True,
                         "description": "是否验证SSL证书"
+                    },
+                    "cache": {
+                        "type": ["boolean", "object"],
+                        "description": "响应缓存（仅GET/HEAD）：true 或 {scope: execution|global, ttl: 秒, vary_headers: [请求头]}",
+                        "default": False
+                    },
+                    "coalesce": {
+                        "type": "boolean",
+                        "description": "并发的相同GET/HEAD请求是否合并为一次实际请求（默认取全局配置）"
                     }
                 },
                 "required": ["method", "url"]
@@ -113,7 +131,19 @@ class HttpTools:
                 "properties": {
                     "api_id": {
                         "type": "integer",
-                        "description": "API接口ID"
+                        "description": "API接口ID（与method+path二选一）"
+                    },
+                    "method": {
+                        "type": "string",
+                        "description": "HTTP方法，未提供api_id时与path一起通过路由索引匹配接口"
+                    },
+                    "path": {
+                        "type": "string",
+                        "description": "请求路径或URL（如 /users/42），按已注册接口的路径模板匹配"
+                    },
+                    "system_id": {
+                        "type": "integer",
+                        "description": "按路径匹配时限定系统"
                     },
                     "path_params": {
                         "type": "object",
@@ -138,9 +168,18 @@ class HttpTools:
                         "type": "number",
                         "default": 30,
                         "description": "超时时间(秒)"
+                    },
+                    "cache": {
+                        "type": ["boolean", "object"],
+                        "description": "响应缓存（仅GET/HEAD）：true 或 {scope: execution|global, ttl: 秒, vary_headers: [请求头]}",
+                        "default": False
+                    },
+                    "coalesce": {
+                        "type": "boolean",
+                        "description": "并发的相同GET/HEAD请求是否合并为一次实际请求（默认取全局配置）"
                     }
                 },
-                "required": ["api_id"]
+                "required": []
             }
         }
     
@@ -164,6 +203,97 @@ class HttpTools:
         follow_redirects = parameters.get('follow_redirects', True)
         verify_ssl = parameters.get('verify_ssl', True)
         
+        # 响应缓存（可选，仅幂等方法）
+        cache_options = ResponseCache.resolve_options(parameters.get('cache'), context)
+        cache_key = None
+        cache_entry = None
+        if cache_options and method in CACHEABLE_METHODS:
+            cache_key = build_cache_key(
+                method, url, params, headers,
+                cache_options['vary_headers'], cache_options['scope']
+            )
+            cache_entry = response_cache.lookup(cache_key)
+            if cache_entry and cache_entry.is_fresh():
+                cache_info = response_cache.record(cache_options['scope'], 'hit')
+                logger.info(f"HTTP缓存命中: {method} {url}")
+                return cached_result(cache_entry, cache_info)
+        
+        # 过期但持有验证器的缓存条目：发送条件请求
+        request_headers = dict(headers)
+        if cache_entry:
+            request_headers.update(ResponseCache.conditional_headers(cache_entry))
+        
+        async def send() -> Dict[str, Any]:
+            return await HttpTools._perform_request(
+                method, url, request_headers, body, params,
+                timeout, follow_redirects, verify_ssl
+            )
+        
+        # 请求合并：并发的相同幂等请求共享一次实际请求
+        coalesced = False
+        if HttpTools._should_coalesce(method, parameters):
+            flight_key = build_cache_key(
+                method, url, params, request_headers, list(request_headers), 'single_flight'
+            )
+            result, coalesced = await http_single_flight.do(flight_key, send)
+        else:
+            result = await send()
+        
+        if coalesced:
+            result['coalesced'] = True
+            logger.info(f"HTTP请求已合并: {method} {url}")
+        
+        if cache_key:
+            # 合并的follower共享leader的请求，缓存的刷新、写入与统计只由leader完成
+            shared_info = {'status': 'coalesced', 'scope': cache_options['scope']} if coalesced else None
+            if result['status_code'] == 304 and cache_entry:
+                # 条件请求验证通过，复用缓存内容
+                if shared_info is None:
+                    cache_entry.refresh(cache_options['ttl'] or response_cache.default_ttl)
+                cache_info = shared_info or response_cache.record(cache_options['scope'], 'revalidated')
+                response_time = result['response_time_ms']
+                result = cached_result(cache_entry, cache_info)
+                result['response_time_ms'] = response_time
+            elif shared_info is None:
+                response_cache.store(cache_key, result, cache_options['scope'], cache_options['ttl'])
+                result['cache'] = response_cache.record(cache_options['scope'], 'miss')
+            else:
+                result['cache'] = shared_info
+        elif cache_options:
+            result['cache'] = response_cache.record(cache_options['scope'], 'bypass')
+        
+        return result
+    
+    @staticmethod
+    def _should_coalesce(method: str, parameters: Dict[str, Any]) -> bool:
+        """判断本次请求是否参与合并（仅幂等方法，可按调用关闭）"""
+        if method not in CACHEABLE_METHODS:
+            return False
+        option = parameters.get('coalesce')
+        if option is None:
+            return get_config().HTTP_REQUEST_COALESCING
+        return bool(option)
+    
+    @staticmethod
+    async def _perform_request(method: str, url: str, headers: Dict[str, Any],
+                               body: Any, params: Optional[Dict[str, Any]],
+                               timeout: float, follow_redirects: bool,
+                               verify_ssl: bool) -> Dict[str, Any]:
+        """发送HTTP请求并构建标准结果
+        
+        Args:
+            method: HTTP方法
+            url: 请求URL
+            headers: 请求头
+            body: 请求体
+            params: 查询参数
+            timeout: 超时时间(秒)
+            follow_redirects: 是否跟随重定向
+            verify_ssl: 是否验证SSL证书
+            
+        Returns:
+            Dict[str, Any]: 请求结果
+        """
         start_time = time.time()
         
         try:
@@ -174,70 +304,60 @@ class HttpTools:
             }
             default_headers.update(headers)
             
-            # 创建连接器配置
-            connector = aiohttp.TCPConnector(
-                verify_ssl=verify_ssl,
-                limit=100,
-                limit_per_host=30
-            )
-            
-            # 创建超时配置
+            # 复用共享连接池中的会话，超时与请求头按请求指定
+            session = http_session_pool.get(verify_ssl)
             timeout_config = aiohttp.ClientTimeout(total=timeout)
             
-            async with aiohttp.ClientSession(
-                connector=connector,
-                timeout=timeout_config,
-                headers=default_headers
-            ) as session:
+            # 准备请求参数
+            request_kwargs = {
+                'url': url,
+                'headers': default_headers,
+                'timeout': timeout_config,
+                'allow_redirects': follow_redirects
+            }
+            
+            # 添加查询参数
+            if params:
+                request_kwargs['params'] = params
+            
+            # 添加请求体
+            if body and method in ['POST', 'PUT', 'PATCH']:
+                if isinstance(body, dict):
+                    request_kwargs['json'] = body
+                else:
+                    request_kwargs['data'] = body
+            
+            # 执行请求
+            async with session.request(method, **request_kwargs) as response:
+                end_time = time.time()
+                response_time = round((end_time - start_time) * 1000, 2)  # 毫秒
                 
-                # 准备请求参数
-                request_kwargs = {
-                    'url': url,
-                    'allow_redirects': follow_redirects
-                }
+                # 读取响应内容
+                response_text = await response.text()
                 
-                # 添加查询参数
-                if params:
-                    request_kwargs['params'] = params
+                # 尝试解析JSON
+                try:
+                    response_data = json.loads(response_text)
+                except json.JSONDecodeError:
+                    response_data = response_text
                 
-                # 添加请求体
-                if body and method in ['POST', 'PUT', 'PATCH']:
-                    if isinstance(body, dict):
-                        request_kwargs['json'] = body
-                    else:
-                        request_kwargs['data'] = body
+                # 构建结果
+                result = {
+                    'status_code': response.status,
+                    'status_text': response.reason,
+                    'headers': dict(response.headers),
+                    'body': response_data,
+                    'url': str(response.url),
+                    'method': method,
+                    'response_time_ms': response_time,
+                    'success': 200 <= response.status < 300,
+                    'content_type': response.headers.get('content-type', ''),
+                    'content_length': len(response_text)
+                }
+                
+                logger.info(f"HTTP请求完成: {method} {url} -> {response.status} ({response_time}ms)")
+                return result
                 
-                # 执行请求
-                async with session.request(method, **request_kwargs) as response:
-                    end_time = time.time()
-                    response_time = round((end_time - start_time) * 1000, 2)  # 毫秒
-                    
-                    # 读取响应内容
-                    response_text = await response.text()
-                    
-                    # 尝试解析JSON
-                    try:
-                        response_data = json.loads(response_text)
-                    except json.JSONDecodeError:
-                        response_data = response_text
-                    
-                    # 构建结果
-                    result = {
-                        'status_code': response.status,
-                        'status_text': response.reason,
-                        'headers': dict(response.headers),
-                        'body': response_data,
-                        'url': str(response.url),
-                        'method': method,
-                        'response_time_ms': response_time,
-                        'success': 200 <= response.status < 300,
-                        'content_type': response.headers.get('content-type', ''),
-                        'content_length': len(response_text)
-                    }
-                    
-                    logger.info(f"HTTP请求完成: {method} {url} -> {response.status} ({response_time}ms)")
-                    return result
-                    
         except aiohttp.ClientError as e:
             end_time = time.time()
             response_time = round((end_time - start_time) * 1000, 2)
@@ -257,9 +377,6 @@ class HttpTools:
             }
         
         except Exception as e:
-            end_time = time.time()
-            response_time = round((end_time - start_time) * 1000, 2)
-            
             logger.error(f"HTTP请求异常: {method} {url} -> {str(e)}")
             raise
     
@@ -275,17 +392,30 @@ class HttpTools:
             Dict[str, Any]: 调用结果
         """
         from ...services.api_interface_service import ApiInterfaceService
+        from ...services.route_index import api_route_index, fill_path_params
         
-        api_id = parameters['api_id']
-        path_params = parameters.get('path_params', {})
+        api_id = parameters.get('api_id')
+        path_params = dict(parameters.get('path_params', {}))
         query_params = parameters.get('query_params', {})
         body = parameters.get('body')
         extra_headers = parameters.get('headers', {})
         timeout = parameters.get('timeout', 30)
         
         try:
+            # 未指定api_id时按方法和路径匹配已注册接口，路径中的参数值作为path_params默认值
+            if api_id is None:
+                if not parameters.get('path'):
+                    raise ValueError("api_call需要api_id或method+path")
+                matched = api_route_index.match(
+                    parameters.get('method'), parameters['path'], system_id=parameters.get('system_id')
+                )
+                if not matched:
+                    raise ValueError(f"未匹配到已注册的API接口: {parameters.get('method')} {parameters['path']}")
+                api_id = matched['api']['id']
+                path_params = {**matched['path_params'], **path_params}
+            
             # 获取API接口定义
-            api_interface = ApiInterfaceService.get_api_interface_by_id(api_id)
+            api_interface = ApiInterfaceService.get_api_interface_raw(api_id)
             if not api_interface:
                 raise ValueError(f"API接口不存在: {api_id}")
             
@@ -293,9 +423,8 @@ class HttpTools:
             base_url = context.get('base_url', 'http://localhost:8002')
             api_path = api_interface['path']
             
-            # 替换路径参数
-            for param_name, param_value in path_params.items():
-                api_path = api_path.replace(f'{{{param_name}}}', str(param_value))
+            # 替换路径参数（{id}、:id、<int:id> 等形式，与路由索引的参数段规则一致）
+            api_path = fill_path_params(api_path, path_params)
             
             url = urljoin(base_url, api_path)
             
@@ -324,6 +453,12 @@ class HttpTools:
             if body:
                 http_params['body'] = body
             
+            # 透传缓存与合并选项
+            if parameters.get('cache'):
+                http_params['cache'] = parameters['cache']
+            if 'coalesce' in parameters:
+                http_params['coalesce'] = parameters['coalesce']
+            
             # 执行HTTP请求
             result = await HttpTools.http_request(http_params, context)
             
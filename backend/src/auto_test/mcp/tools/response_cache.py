@@ -0,0 +1,283 @@
+"""HTTP响应缓存
+
+为HTTP工具提供可选的幂等请求结果缓存，包括：
+- 缓存键：method + URL + 规范化查询参数 + 指定请求头
+- 遵循响应的 Cache-Control（no-store / no-cache / max-age）
+- 基于 ETag / Last-Modified 的条件请求重新验证
+- 作用域：单次执行（execution）或全局（global）
+- TTL过期 + 容量受限的LRU淘汰
+- 命中率统计
+"""
+
+import copy
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from ...config import get_config
+
+# 可缓存的幂等方法
+CACHEABLE_METHODS = ('GET', 'HEAD')
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Any]:
+    """解析 Cache-Control 响应头
+
+    Args:
+        value: 响应头值，如 "public, max-age=60"
+
+    Returns:
+        Dict[str, Any]: 指令字典，无值的指令为True
+    """
+    directives: Dict[str, Any] = {}
+    if not value:
+        return directives
+    for part in value.split(','):
+        part = part.strip().lower()
+        if not part:
+            continue
+        if '=' in part:
+            name, _, arg = part.partition('=')
+            directives[name.strip()] = arg.strip().strip('"')
+        else:
+            directives[part] = True
+    return directives
+
+
+def build_cache_key(method: str, url: str, params: Optional[Dict[str, Any]],
+                    headers: Dict[str, Any], vary_headers: List[str], scope: str) -> str:
+    """构建缓存键
+
+    URL中的查询参数与params合并后按键排序，请求头只取vary_headers中声明的部分，
+    保证参数顺序不同的等价请求命中同一缓存。
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        for name, value in params.items():
+            if isinstance(value, (list, tuple)):
+                query.extend((name, str(item)) for item in value)
+            else:
+                query.append((name, str(value)))
+    normalized_url = urlunsplit((
+        parts.scheme.lower(), parts.netloc.lower(), parts.path or '/',
+        urlencode(sorted(query)), ''
+    ))
+
+    lowered = {str(k).lower(): v for k, v in headers.items()}
+    selected = [(name.lower(), str(lowered.get(name.lower(), ''))) for name in sorted(vary_headers)]
+
+    raw = json.dumps([scope, method.upper(), normalized_url, selected], ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class CacheEntry:
+    """缓存条目"""
+
+    __slots__ = ('result', 'expires_at', 'etag', 'last_modified', 'must_revalidate', 'scope')
+
+    def __init__(self, result: Dict[str, Any], ttl: float, scope: str,
+                 etag: Optional[str] = None, last_modified: Optional[str] = None,
+                 must_revalidate: bool = False):
+        self.result = result
+        self.expires_at = time.monotonic() + ttl
+        self.scope = scope
+        self.etag = etag
+        self.last_modified = last_modified
+        self.must_revalidate = must_revalidate
+
+    def is_fresh(self) -> bool:
+        """是否可以不经验证直接使用"""
+        return not self.must_revalidate and time.monotonic() < self.expires_at
+
+    def can_revalidate(self) -> bool:
+        """是否持有可用于条件请求的验证器"""
+        return bool(self.etag or self.last_modified)
+
+    def refresh(self, ttl: float) -> None:
+        """重新验证成功后刷新过期时间"""
+        self.expires_at = time.monotonic() + ttl
+
+
+class ResponseCache:
+    """HTTP响应缓存（LRU + TTL）"""
+
+    def __init__(self, max_entries: Optional[int] = None, default_ttl: Optional[float] = None):
+        config = get_config()
+        self.max_entries = max_entries or config.HTTP_RESPONSE_CACHE_MAX_ENTRIES
+        self.default_ttl = default_ttl if default_ttl is not None else config.HTTP_RESPONSE_CACHE_DEFAULT_TTL
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def resolve_options(option: Any, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """解析工具调用中的cache参数
+
+        Args:
+            option: True / False / {'scope': 'execution'|'global', 'ttl': 60, 'vary_headers': [...]}
+            context: 执行上下文
+
+        Returns:
+            Optional[Dict[str, Any]]: 规范化的缓存选项，未启用时返回None
+        """
+        if not option:
+            return None
+        options = dict(option) if isinstance(option, dict) else {}
+        if options.get('enabled') is False:
+            return None
+
+        scope = options.get('scope', 'execution')
+        if scope == 'execution':
+            execution_id = context.get('execution_id')
+            # 没有执行ID时退化为全局作用域
+            scope_key = ResponseCache.execution_scope(execution_id) if execution_id else 'global'
+        else:
+            scope_key = 'global'
+
+        return {
+            'scope': scope_key,
+            'ttl': options.get('ttl'),
+            'vary_headers': list(options.get('vary_headers', ['Authorization', 'Accept']))
+        }
+
+    @staticmethod
+    def execution_scope(execution_id: str) -> str:
+        """单次执行作用域键"""
+        return f"execution:{execution_id}"
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """查找缓存条目（过期且不可重新验证的条目会被移除）"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not entry.is_fresh() and not entry.can_revalidate():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key: str, result: Dict[str, Any], scope: str,
+              ttl: Optional[float] = None) -> Optional[CacheEntry]:
+        """按响应头决定是否写入缓存
+
+        Args:
+            key: 缓存键
+            result: http_request结果
+            scope: 作用域键
+            ttl: 调用方指定的TTL（响应的max-age优先）
+
+        Returns:
+            Optional[CacheEntry]: 写入的条目，不可缓存时返回None
+        """
+        if not (200 <= result.get('status_code', 0) < 300):
+            return None
+
+        headers = {str(k).lower(): v for k, v in (result.get('headers') or {}).items()}
+        directives = parse_cache_control(headers.get('cache-control'))
+        if 'no-store' in directives or ('private' in directives and scope == 'global'):
+            return None
+
+        effective_ttl = ttl if ttl is not None else self.default_ttl
+        if 'max-age' in directives:
+            try:
+                effective_ttl = min(effective_ttl, float(directives['max-age']))
+            except ValueError:
+                pass
+
+        entry = CacheEntry(
+            result=copy.deepcopy(result),
+            ttl=effective_ttl,
+            scope=scope,
+            etag=headers.get('etag'),
+            last_modified=headers.get('last-modified'),
+            must_revalidate='no-cache' in directives or effective_ttl <= 0
+        )
+        if entry.must_revalidate and not entry.can_revalidate():
+            return None
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry: CacheEntry) -> Dict[str, str]:
+        """生成条件请求头"""
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def record(self, scope: str, outcome: str) -> Dict[str, Any]:
+        """记录一次缓存结果并返回写入步骤元数据的命中信息
+
+        Args:
+            scope: 作用域键
+            outcome: hit / revalidated / miss / bypass
+
+        Returns:
+            Dict[str, Any]: 缓存元数据
+        """
+        for bucket in (scope, '__all__'):
+            stats = self._stats.setdefault(bucket, {'hit': 0, 'revalidated': 0, 'miss': 0, 'bypass': 0})
+            stats[outcome] += 1
+
+        return {
+            'status': outcome,
+            'scope': scope,
+            'hit_ratio': self.hit_ratio(scope),
+            'global_hit_ratio': self.hit_ratio('__all__')
+        }
+
+    def hit_ratio(self, scope: str = '__all__') -> float:
+        """命中率（重新验证成功也视为命中）"""
+        stats = self._stats.get(scope)
+        if not stats:
+            return 0.0
+        served = stats['hit'] + stats['revalidated']
+        total = served + stats['miss']
+        return round(served / total, 4) if total else 0.0
+
+    def clear_scope(self, scope: str) -> int:
+        """清理某个作用域的全部条目与统计（执行结束时调用）
+
+        Returns:
+            int: 清理的条目数
+        """
+        keys = [key for key, entry in self._entries.items() if entry.scope == scope]
+        for key in keys:
+            del self._entries[key]
+        self._stats.pop(scope, None)
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hit_ratio': self.hit_ratio(),
+            'totals': dict(self._stats.get('__all__', {}))
+        }
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._entries.clear()
+        self._stats.clear()
+
+
+def cached_result(entry: CacheEntry, cache_info: Dict[str, Any]) -> Dict[str, Any]:
+    """基于缓存条目构建返回结果（深拷贝，避免调用方修改缓存内容）"""
+    result = copy.deepcopy(entry.result)
+    result['response_time_ms'] = 0
+    result['cache'] = cache_info
+    return result
+
+
+# 全局响应缓存实例
+response_cache = ResponseCache()
@@ -0,0 +1,96 @@
+"""请求合并（single-flight）
+
+并发的相同幂等请求只向目标发出一次，其余调用等待并共享同一结果，
+用于DAG并行调度、批量执行时对同一参考数据接口的集中访问。
+"""
+
+import asyncio
+import copy
+from typing import Dict, Any, Callable, Awaitable, Optional, Tuple
+
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _Flight:
+    """一次进行中的合并调用"""
+
+    __slots__ = ('task', 'followers')
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """按键合并并发调用
+
+    首个调用者（leader）发起请求，在请求完成前到达的相同键调用（follower）共享同一结果：
+    - 请求在独立任务中执行，所有调用方经 shield 等待：任一调用方（含leader）被取消时，
+      请求继续执行，其他调用方照常拿到结果
+    - 有follower时结果以深拷贝分发（leader也取副本），调用方之间的修改互不影响
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, _Flight] = {}
+        self.leader_calls = 0
+        self.coalesced_calls = 0
+
+    async def do(self, key: str,
+                 fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """执行或加入一次合并调用
+
+        Args:
+            key: 合并键，相同键的并发调用共享结果
+            fn: 实际执行请求的协程函数
+
+        Returns:
+            Tuple[Any, bool]: (结果, 是否为共享结果)
+        """
+        flight = self._inflight.get(key)
+        if flight is not None:
+            self.coalesced_calls += 1
+            flight.followers += 1
+            result = await asyncio.shield(flight.task)
+            return copy.deepcopy(result), True
+
+        flight = _Flight()
+        self._inflight[key] = flight
+        self.leader_calls += 1
+        flight.task = asyncio.ensure_future(self._run(key, fn))
+        flight.task.add_done_callback(_consume_exception)
+        result = await asyncio.shield(flight.task)
+        # 任务结束前已移出进行中列表，此时follower数已确定
+        return (copy.deepcopy(result) if flight.followers else result), False
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            return await fn()
+        finally:
+            self._inflight.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取合并统计"""
+        total = self.leader_calls + self.coalesced_calls
+        return {
+            'in_flight': len(self._inflight),
+            'leader_calls': self.leader_calls,
+            'coalesced_calls': self.coalesced_calls,
+            'coalesce_ratio': round(self.coalesced_calls / total, 4) if total else 0.0
+        }
+
+    def reset_stats(self) -> None:
+        """重置统计"""
+        self.leader_calls = 0
+        self.coalesced_calls = 0
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    """标记任务异常已被读取，避免调用方均已取消时产生告警日志"""
+    if not task.cancelled():
+        task.exception()
+
+
+# 全局HTTP请求合并器
+http_single_flight = SingleFlight()
@@ -135,6 +135,7 @@ class ApiInterfaceQueryRequest(BaseModel):
     keyword: Optional[str] = Field(None, description="关键词搜索")
     tags: Optional[str] = Field(None, description="标签筛选")
     enabled_only: Optional[bool] = Field(None, description="仅显示启用的")
+    fields: Optional[str] = Field(None, description="字段投影，逗号分隔，为空时返回全部字段")
 
 
 class ApiInterfaceResponse(BaseModel):
@@ -184,20 +185,32 @@ class DeleteApiInterfaceResponse(BaseModel):
 
 
 class ApiInterfaceImportResponseItem(BaseModel):
-    name: str = Field(..., description="接口名称")
-    status: str = Field(..., description="导入状态: success/error")
-    id: Optional[int] = Field(None, description="创建成功的ID")
+    name: Optional[str] = Field(None, description="接口名称")
+    status: str = Field(..., description="导入状态: success/updated/unchanged/skipped/error")
+    id: Optional[int] = Field(None, description="创建或覆盖的ID")
     error: Optional[str] = Field(None, description="错误信息")
+    index: Optional[int] = Field(None, description="行号（请求数组下标或JSONL行号，从1开始）")
 
 
 class ApiInterfaceImportResponse(BaseModel):
     """API接口导入结果响应模型"""
     total: int = Field(0, description="导入总数")
-    success_count: int = Field(0, description="成功数量")
+    success_count: int = Field(0, description="成功数量（新建）")
+    updated_count: int = Field(0, description="覆盖更新数量（overwrite=true时的已存在接口）")
+    unchanged_count: int = Field(0, description="内容未变更而未写入的数量（增量同步）")
+    skipped_count: int = Field(0, description="跳过数量（如不支持的HTTP方法）")
     error_count: int = Field(0, description="失败数量")
     results: List[ApiInterfaceImportResponseItem] = Field(default_factory=list, description="逐项导入结果")
 
 
+class ApiSpecImportResponse(ApiInterfaceImportResponse):
+    """OpenAPI/Swagger 文档导入结果响应模型"""
+    spec_type: Optional[str] = Field(None, description="文档类型与版本，如 openapi 3.0.3 / swagger 2.0")
+    spec_title: Optional[str] = Field(None, description="文档标题（info.title）")
+    spec_version: Optional[str] = Field(None, description="文档版本（info.version）")
+    created_modules: List[str] = Field(default_factory=list, description="按标签新建的模块")
+
+
 class ApiInterfaceBatchStatusResult(BaseModel):
     """批量更新状态结果模型"""
     updated_count: int = Field(..., description="更新数量")
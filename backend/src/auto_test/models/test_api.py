@@ -115,6 +115,7 @@ class RunResult(BaseModel):
     assertions_total: Optional[int] = Field(None, description="断言总数")
     error_message: Optional[str] = Field(None, description="错误消息")
     environment: Optional[Dict[str, Any]] = Field(None, description="环境信息")
+    batch_id: Optional[str] = Field(None, description="所属批次ID")
 
 
 class BatchExecuteItem(BaseModel):
@@ -127,6 +128,7 @@ class BatchExecuteItem(BaseModel):
 class BatchExecuteResponse(BaseModel):
     """批量执行响应模型"""
     items: List[BatchExecuteItem] = Field(default_factory=list, description="批量执行结果项列表")
+    report: Optional[Dict[str, Any]] = Field(None, description="批量执行汇总报告")
 
 
 class BatchExecuteRequest(BaseModel):
@@ -158,6 +160,35 @@ class ImportTestApisResponse(BaseModel):
     count: int = Field(..., description="导入数量")
 
 
+class TrafficUnmatchedPath(BaseModel):
+    """未匹配到接口的请求路径统计"""
+    method: str = Field(..., description="请求方法")
+    path: str = Field(..., description="路径模板（ID类路径段替换为 {id}）")
+    count: int = Field(..., description="请求数")
+
+
+class TrafficImportResponse(BaseModel):
+    """流量回放导入响应"""
+    format: str = Field(..., description="流量格式 har / log")
+    total: int = Field(0, description="读取的请求总数")
+    invalid: int = Field(0, description="无法解析的条目数")
+    matched: int = Field(0, description="匹配到已注册接口的请求数")
+    unmatched: int = Field(0, description="未匹配的请求数")
+    shapes: int = Field(0, description="不同请求形状数")
+    duplicates: int = Field(0, description="按形状去重的请求数")
+    shapes_dropped: int = Field(0, description="超过形状上限而丢弃的新形状请求数")
+    test_apis_created: int = Field(0, description="新建的测试API数量")
+    test_apis_existing: int = Field(0, description="此前导入过的形状数量")
+    test_api_ids: List[int] = Field(default_factory=list, description="新建的测试API ID列表")
+    sessions: int = Field(0, description="切分出的会话数")
+    plans_created: int = Field(0, description="新建的编排计划数量")
+    plans_existing: int = Field(0, description="步骤序列重复而跳过的计划数量")
+    plan_ids: List[int] = Field(default_factory=list, description="新建的编排计划ID列表")
+    top_unmatched: List[TrafficUnmatchedPath] = Field(default_factory=list, description="请求数最多的未匹配路径")
+    workers: int = Field(1, description="解析进程数")
+    elapsed_ms: float = Field(0, description="耗时（毫秒）")
+
+
 class ExportTestApisResponse(BaseModel):
     """导出测试API响应"""
     exported: bool = Field(..., description="是否导出成功")
@@ -183,6 +214,10 @@ class ReportItem(BaseModel):
     report_id: int = Field(..., description="报告ID")
     run_id: str = Field(..., description="运行ID")
     summary: Dict[str, Any] = Field(default_factory=dict, description="报告摘要")
+    test_api_id: Optional[int] = Field(None, description="测试API ID")
+    batch_id: Optional[str] = Field(None, description="所属批次ID")
+    assertions: Optional[List[AssertionResult]] = Field(None, description="断言结果列表")
+    created_at: Optional[datetime] = Field(None, description="创建时间")
 
 
 class ReportListResponse(BaseModel):
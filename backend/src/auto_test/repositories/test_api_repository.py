@@ -67,6 +67,64 @@ class TestApiRepository:
             )
             return cursor.lastrowid
 
+    @staticmethod
+    def bulk_create(items: List[Dict[str, Any]]) -> List[int]:
+        """批量创建测试API（单事务 executemany）
+        Args:
+            items: 数据字典列表（同create）
+        Returns:
+            新记录的ID列表（与传入顺序一致）
+        """
+        if not items:
+            return []
+        params = []
+        for data in items:
+            enabled = data.get("enabled")
+            params.append((
+                data.get("api_id"),
+                data.get("name"),
+                data.get("description"),
+                0 if enabled is False or enabled == 0 else 1,
+                data.get("tags"),
+                TestApiRepository._to_json_text(data.get("request_config")),
+                TestApiRepository._to_json_text(data.get("execution_config")),
+                TestApiRepository._to_json_text(data.get("expected_response")),
+                TestApiRepository._to_json_text(data.get("metadata")),
+            ))
+        with get_db_cursor() as cursor:
+            # 先取得写锁再读最大ID：其他连接无法在读取与插入之间插入新行
+            if not cursor.connection.in_transaction:
+                cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM test_apis")
+            max_id = cursor.fetchone()[0]
+            cursor.executemany(
+                """
+                INSERT INTO test_apis (
+                    api_id, name, description, enabled, tags,
+                    request_config, execution_config, expected_response, metadata
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                params,
+            )
+            # 新行的ID均大于插入前的最大ID，自增ID按插入顺序分配
+            cursor.execute("SELECT id FROM test_apis WHERE id > ? ORDER BY id", (max_id,))
+            return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def get_metadata_index(field: str) -> Dict[str, int]:
+        """按元数据字段建立索引：字段值 -> 测试API ID（只包含元数据中有该字段的记录）"""
+        with get_db_cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT id, json_extract(metadata, '$.' || ?) AS value
+                FROM test_apis
+                WHERE metadata IS NOT NULL AND json_valid(metadata)
+                  AND json_extract(metadata, '$.' || ?) IS NOT NULL
+                """,
+                (field, field),
+            )
+            return {str(row["value"]): row["id"] for row in cursor.fetchall()}
+
     @staticmethod
     def update(test_api_id: int, data: Dict[str, Any]) -> bool:
         """更新测试API，支持部分字段更新"""
@@ -151,6 +209,36 @@ class TestApiRepository:
             result["enabled"] = bool(result.get("enabled", 1))
             return result
 
+    @staticmethod
+    def get_by_ids(test_api_ids: List[int]) -> List[Dict[str, Any]]:
+        """批量获取测试API详情（一次查询，按传入ID顺序返回，不存在的ID被忽略）"""
+        if not test_api_ids:
+            return []
+        placeholders = ",".join("?" for _ in test_api_ids)
+        with get_db_cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT id, api_id, name, description, enabled, tags,
+                       request_config, execution_config, expected_response, metadata,
+                       created_at, updated_at
+                FROM test_apis
+                WHERE id IN ({placeholders})
+                """,
+                list(test_api_ids),
+            )
+            rows = {}
+            for row in cursor.fetchall():
+                result = dict(row)
+                for key in ["request_config", "execution_config", "expected_response", "metadata"]:
+                    if result.get(key):
+                        try:
+                            result[key] = json.loads(result[key])
+                        except Exception:
+                            pass
+                result["enabled"] = bool(result.get("enabled", 1))
+                rows[result["id"]] = result
+        return [rows[test_api_id] for test_api_id in test_api_ids if test_api_id in rows]
+
     @staticmethod
     def list(
         keyword: Optional[str], api_id: Optional[int], enabled_only: Optional[bool], tags: Optional[str],
@@ -0,0 +1,128 @@
+"""
+测试API执行记录仓储层
+Repository for Test API runs and reports: persistence against SQLite.
+遵循：禁止业务逻辑，仅做数据库访问与事务管理。
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..database.connection import get_db_cursor
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_RUN_COLUMNS = (
+    "run_id", "test_api_id", "api_id", "batch_id", "status", "started_at", "ended_at",
+    "response_status_code", "response_time_ms", "response_headers", "response_body",
+    "assertions_passed", "assertions_total", "error_message", "environment",
+)
+_REPORT_COLUMNS = ("run_id", "test_api_id", "batch_id", "summary", "assertions")
+
+
+class TestApiRunRepository:
+    """测试API执行记录仓储层（Repository）
+    - 负责对 test_api_runs / test_api_reports 表的写入与查询
+    - 不包含任何业务逻辑
+    """
+
+    @staticmethod
+    def save_runs(runs: List[Dict[str, Any]], reports: List[Dict[str, Any]]) -> int:
+        """批量写入执行记录与报告（同一事务内各一次executemany）
+        Args:
+            runs: 执行记录列表，JSON字段已序列化
+            reports: 报告列表，JSON字段已序列化
+        Returns:
+            写入的执行记录数
+        """
+        if not runs:
+            return 0
+        run_sql = (
+            f"INSERT INTO test_api_runs ({', '.join(_RUN_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in _RUN_COLUMNS)})"
+        )
+        report_sql = (
+            f"INSERT INTO test_api_reports ({', '.join(_REPORT_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in _REPORT_COLUMNS)})"
+        )
+        with get_db_cursor() as cursor:
+            cursor.executemany(run_sql, [tuple(run.get(col) for col in _RUN_COLUMNS) for run in runs])
+            if reports:
+                cursor.executemany(
+                    report_sql, [tuple(report.get(col) for col in _REPORT_COLUMNS) for report in reports]
+                )
+        return len(runs)
+
+    @staticmethod
+    def list_runs(test_api_id: int, page: int, size: int) -> Tuple[List[Dict[str, Any]], int]:
+        """分页查询执行记录（按开始时间倒序，命中 test_api_id + started_at 复合索引）"""
+        offset = max(page - 1, 0) * size
+        with get_db_cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT r.run_id, r.test_api_id, r.api_id, r.batch_id, r.status, r.started_at, r.ended_at,
+                       r.response_status_code, r.response_time_ms, r.response_headers, r.response_body,
+                       r.assertions_passed, r.assertions_total, r.error_message, r.environment,
+                       p.assertions
+                FROM test_api_runs r
+                LEFT JOIN test_api_reports p ON p.run_id = r.run_id
+                WHERE r.test_api_id = ?
+                ORDER BY r.started_at DESC
+                LIMIT ? OFFSET ?
+                """,
+                (test_api_id, size, offset),
+            )
+            items = [
+                TestApiRunRepository._load_json(dict(row), ("response_headers", "response_body", "environment", "assertions"))
+                for row in cursor.fetchall()
+            ]
+            cursor.execute("SELECT COUNT(*) FROM test_api_runs WHERE test_api_id = ?", (test_api_id,))
+            total = cursor.fetchone()[0]
+        return items, total
+
+    @staticmethod
+    def list_reports(test_api_id: int, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        """查询最近的报告（按创建时间倒序）"""
+        with get_db_cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT id AS report_id, run_id, test_api_id, batch_id, summary, assertions, created_at
+                FROM test_api_reports
+                WHERE test_api_id = ?
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+                """,
+                (test_api_id, limit),
+            )
+            items = [
+                TestApiRunRepository._load_json(dict(row), ("summary", "assertions"))
+                for row in cursor.fetchall()
+            ]
+            cursor.execute("SELECT COUNT(*) FROM test_api_reports WHERE test_api_id = ?", (test_api_id,))
+            total = cursor.fetchone()[0]
+        return items, total
+
+    @staticmethod
+    def get_run(run_id: str) -> Optional[Dict[str, Any]]:
+        """根据运行ID获取执行记录"""
+        with get_db_cursor() as cursor:
+            cursor.execute(
+                f"SELECT {', '.join(_RUN_COLUMNS)} FROM test_api_runs WHERE run_id = ?",
+                (run_id,),
+            )
+            row = cursor.fetchone()
+        if not row:
+            return None
+        return TestApiRunRepository._load_json(dict(row), ("response_headers", "response_body", "environment"))
+
+    @staticmethod
+    def _load_json(row: Dict[str, Any], keys: Tuple[str, ...]) -> Dict[str, Any]:
+        for key in keys:
+            if row.get(key):
+                try:
+                    row[key] = json.loads(row[key])
+                except Exception:
+                    # 保持原样（容错处理）
+                    pass
+        return row
@@ -0,0 +1,319 @@
+"""
+API接口批量导入服务
+API Interface Bulk Import Service
+
+逐条调用 create_api_interface 时每行都要做外键与查重查询并单独提交，导入数千个接口需要数分钟。
+批量导入按块处理：
+- 在内存中完成模型校验、路径/外键校验与导入数据内部查重（外键按不同ID查询一次，经实体缓存）
+- 每块对新出现的系统执行一次集合查询，取出唯一键 (system_id, method, path, version) 查重
+- 新接口以 executemany 单事务插入，overwrite 时已存在的接口以 executemany 单事务覆盖；
+  整块因约束冲突失败时回退为逐行写入，定位出错的行
+- 写入后按ID增量刷新路由索引，实体缓存由DAO失效
+- 支持逐行解析的JSONL流式上传，内存只与块大小相关（逐行结果除外）
+- skip_unchanged（增量同步）时按内容摘要比较已存在的接口，内容未变的行不写入
+"""
+
+import json
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from ..config import get_config
+from ..database.dao import ApiInterfaceDAO, SystemDAO, ModuleDAO
+from ..models.api_interface import ApiInterfaceCreate
+from ..utils.logger import get_logger
+from .route_index import api_route_index
+
+logger = get_logger(__name__)
+
+# 唯一键：(system_id, method, path, version)
+ApiKey = Tuple[int, str, str, str]
+
+
+class ImportState:
+    """一次批量导入的状态：跨块共享的查重集合、外键缓存、计数与逐行结果"""
+
+    __slots__ = ('overwrite', 'digests', 'existing', 'loaded_systems', 'seen', 'systems', 'modules',
+                 'total', 'success_count', 'updated_count', 'unchanged_count', 'skipped_count',
+                 'error_count', 'results')
+
+    def __init__(self, overwrite: bool = False, skip_unchanged: bool = False):
+        self.overwrite = overwrite
+        # 唯一键 -> 内容摘要，仅 skip_unchanged 时加载
+        self.digests: Optional[Dict[ApiKey, str]] = {} if skip_unchanged else None
+        self.existing: Dict[ApiKey, int] = {}
+        self.loaded_systems: set = set()
+        self.seen: set = set()
+        self.systems: Dict[int, bool] = {}
+        self.modules: Dict[int, Optional[int]] = {}
+        self.total = 0
+        self.success_count = 0
+        self.updated_count = 0
+        self.unchanged_count = 0
+        self.skipped_count = 0
+        self.error_count = 0
+        self.results: List[Dict[str, Any]] = []
+
+    def record(self, index: int, name: Optional[str], status: str, api_id: Optional[int] = None,
+               error: Optional[str] = None) -> None:
+        """记录单行结果"""
+        if status == 'success':
+            self.success_count += 1
+        elif status == 'updated':
+            self.updated_count += 1
+        elif status == 'unchanged':
+            self.unchanged_count += 1
+        elif status == 'skipped':
+            self.skipped_count += 1
+        else:
+            self.error_count += 1
+        item = {'index': index, 'name': name, 'status': status, 'id': api_id}
+        if error is not None:
+            item['error'] = error
+        self.results.append(item)
+
+    def summary(self) -> Dict[str, Any]:
+        """导入结果（按行号排序）"""
+        self.results.sort(key=lambda item: item['index'])
+        return {
+            'total': self.total,
+            'success_count': self.success_count,
+            'updated_count': self.updated_count,
+            'unchanged_count': self.unchanged_count,
+            'skipped_count': self.skipped_count,
+            'error_count': self.error_count,
+            'results': self.results
+        }
+
+
+class ApiImportService:
+    """API接口批量导入服务"""
+
+    @staticmethod
+    def import_rows(rows: Iterable[Any], overwrite: bool = False, start: int = 1) -> Dict[str, Any]:
+        """
+        批量导入API接口
+
+        Args:
+            rows (Iterable[Any]): 接口数据（字典或ApiInterfaceCreate），无效行记录为错误
+            overwrite (bool): 唯一键已存在时是否覆盖，为False时记录为错误
+            start (int): 首行的行号
+
+        Returns:
+            Dict[str, Any]: 导入结果（total / success_count / updated_count / error_count / results）
+        """
+        state = ImportState(overwrite)
+        chunk_size = get_config().IMPORT_CHUNK_SIZE
+        chunk: List[Tuple[int, Any]] = []
+        for index, row in enumerate(rows, start):
+            chunk.append((index, row))
+            if len(chunk) >= chunk_size:
+                ApiImportService.import_chunk(chunk, state)
+                chunk = []
+        if chunk:
+            ApiImportService.import_chunk(chunk, state)
+        ApiImportService.log_summary(state)
+        return state.summary()
+
+    @staticmethod
+    async def import_jsonl(chunks: AsyncIterator[bytes], overwrite: bool = False) -> Dict[str, Any]:
+        """
+        流式导入JSONL（每行一个接口JSON对象），边接收边按块写入
+
+        Args:
+            chunks (AsyncIterator[bytes]): 请求体字节流
+            overwrite (bool): 唯一键已存在时是否覆盖
+
+        Returns:
+            Dict[str, Any]: 导入结果，行号为JSONL的行号（空行计入行号但不计入总数）
+        """
+        state = ImportState(overwrite)
+        chunk_size = get_config().IMPORT_CHUNK_SIZE
+        chunk: List[Tuple[int, Any]] = []
+        async for index, line in ApiImportService._jsonl_lines(chunks):
+            chunk.append((index, ApiImportService._parse_line(line)))
+            if len(chunk) >= chunk_size:
+                ApiImportService.import_chunk(chunk, state)
+                chunk = []
+        if chunk:
+            ApiImportService.import_chunk(chunk, state)
+        ApiImportService.log_summary(state)
+        return state.summary()
+
+    @staticmethod
+    def import_chunk(chunk: List[Tuple[int, Any]], state: ImportState) -> None:
+        """
+        导入一块数据：内存校验 -> 集合查重 -> 单事务批量写入
+
+        Args:
+            chunk (List[Tuple[int, Any]]): (行号, 接口数据) 列表
+            state (ImportState): 导入状态
+        """
+        state.total += len(chunk)
+        valid: List[Tuple[int, Dict[str, Any]]] = []
+        for index, row in chunk:
+            try:
+                valid.append((index, ApiImportService._validate(row)))
+            except ValueError as e:
+                state.record(index, row.get('name') if isinstance(row, dict) else None, 'error', error=str(e))
+
+        ApiImportService._load_references(valid, state)
+
+        to_insert: List[Tuple[int, Dict[str, Any]]] = []
+        to_update: List[Tuple[int, Dict[str, Any]]] = []
+        for index, api in valid:
+            error = ApiImportService._check_references(api, state)
+            key = ApiImportService.unique_key(api)
+            if error is None and key in state.seen:
+                error = f"导入数据中重复的接口: {api['method']} {api['path']} ({api['version']})"
+            if error is not None:
+                state.record(index, api['name'], 'error', error=error)
+                continue
+            state.seen.add(key)
+            existing_id = state.existing.get(key)
+            if existing_id is None:
+                to_insert.append((index, api))
+            elif state.digests is not None and state.digests.get(key) == ApiInterfaceDAO.row_digest(api):
+                state.record(index, api['name'], 'unchanged', existing_id)
+            elif state.overwrite:
+                to_update.append((index, dict(api, id=existing_id)))
+            else:
+                state.record(index, api['name'], 'error', existing_id,
+                             f"接口已存在: {api['method']} {api['path']} ({api['version']}) ID:{existing_id}")
+
+        changed_ids = ApiImportService._insert(to_insert, state) + ApiImportService._update(to_update, state)
+        if changed_ids:
+            api_route_index.refresh(changed_ids)
+
+    @staticmethod
+    def unique_key(api: Dict[str, Any]) -> ApiKey:
+        """接口的唯一键 (system_id, method, path, version)"""
+        return api['system_id'], api['method'], api['path'], api.get('version') or 'v1'
+
+    @staticmethod
+    def _validate(row: Any) -> Dict[str, Any]:
+        """模型校验与路径校验，返回规范化后的接口数据"""
+        if isinstance(row, Exception):
+            raise ValueError(str(row))
+        if isinstance(row, ApiInterfaceCreate):
+            api = row.model_dump()
+        elif isinstance(row, dict):
+            try:
+                api = ApiInterfaceCreate.model_validate(row).model_dump()
+            except ValidationError as e:
+                raise ValueError('; '.join(
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+                ))
+        else:
+            raise ValueError("每行必须是JSON对象")
+        if not api['path'].startswith('/'):
+            raise ValueError("API路径必须以 '/' 开头")
+        return api
+
+    @staticmethod
+    def _load_references(valid: List[Tuple[int, Dict[str, Any]]], state: ImportState) -> None:
+        """按不同ID加载系统/模块（经实体缓存），并对新出现的系统一次性取出已有唯一键"""
+        system_ids = {api['system_id'] for _, api in valid}
+        for system_id in system_ids - state.systems.keys():
+            state.systems[system_id] = SystemDAO.get_by_id(system_id) is not None
+        for module_id in {api['module_id'] for _, api in valid} - state.modules.keys():
+            module = ModuleDAO.get_by_id(module_id)
+            state.modules[module_id] = module.get('system_id') if module else None
+
+        new_systems = {system_id for system_id in system_ids if state.systems[system_id]} - state.loaded_systems
+        if new_systems:
+            if state.digests is None:
+                state.existing.update(ApiInterfaceDAO.get_unique_keys(new_systems))
+            else:
+                for key, (api_id, digest) in ApiInterfaceDAO.get_key_digests(new_systems).items():
+                    state.existing[key] = api_id
+                    state.digests[key] = digest
+            state.loaded_systems |= new_systems
+
+    @staticmethod
+    def _check_references(api: Dict[str, Any], state: ImportState) -> Optional[str]:
+        """校验系统存在、模块存在且属于该系统，返回错误信息"""
+        if not state.systems.get(api['system_id']):
+            return f"系统不存在: ID {api['system_id']}"
+        module_system_id = state.modules.get(api['module_id'])
+        if module_system_id is None:
+            return f"模块不存在: ID {api['module_id']}"
+        if module_system_id != api['system_id']:
+            return f"模块 ID {api['module_id']} 不属于系统 ID {api['system_id']}"
+        return None
+
+    @staticmethod
+    def _insert(rows: List[Tuple[int, Dict[str, Any]]], state: ImportState) -> List[int]:
+        """单事务批量插入，整块失败时逐行插入定位错误行"""
+        if not rows:
+            return []
+        try:
+            created = ApiInterfaceDAO.bulk_insert([api for _, api in rows])
+        except Exception as e:
+            logger.warning(f"批量插入失败，逐行重试: {e}")
+            created = {}
+            for index, api in rows:
+                try:
+                    created.update(ApiInterfaceDAO.bulk_insert([api]))
+                except Exception as row_error:
+                    state.record(index, api['name'], 'error', error=f"写入失败: {row_error}")
+        ids = []
+        for index, api in rows:
+            key = ApiImportService.unique_key(api)
+            api_id = created.get(key)
+            if api_id is not None:
+                state.existing[key] = api_id
+                state.record(index, api['name'], 'success', api_id)
+                ids.append(api_id)
+        return ids
+
+    @staticmethod
+    def _update(rows: List[Tuple[int, Dict[str, Any]]], state: ImportState) -> List[int]:
+        """单事务批量覆盖，整块失败时逐行覆盖定位错误行"""
+        if not rows:
+            return []
+        try:
+            ApiInterfaceDAO.bulk_update([api for _, api in rows])
+            updated = rows
+        except Exception as e:
+            logger.warning(f"批量覆盖失败，逐行重试: {e}")
+            updated = []
+            for index, api in rows:
+                try:
+                    ApiInterfaceDAO.bulk_update([api])
+                    updated.append((index, api))
+                except Exception as row_error:
+                    state.record(index, api['name'], 'error', api['id'], f"写入失败: {row_error}")
+        for index, api in updated:
+            state.record(index, api['name'], 'updated', api['id'])
+        return [api['id'] for _, api in updated]
+
+    @staticmethod
+    async def _jsonl_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+        """将字节流切分为 (行号, 非空行)"""
+        buffer = b''
+        line_number = 0
+        async for data in chunks:
+            buffer += data
+            *lines, buffer = buffer.split(b'\n')
+            for line in lines:
+                line_number += 1
+                if line.strip():
+                    yield line_number, line
+        if buffer.strip():
+            yield line_number + 1, buffer
+
+    @staticmethod
+    def _parse_line(line: bytes) -> Any:
+        """解析JSONL单行，解析失败时返回异常对象（记录为该行的错误）"""
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            return ValueError(f"JSON解析失败: {e}")
+
+    @staticmethod
+    def log_summary(state: ImportState) -> None:
+        """记录导入汇总日志"""
+        logger.info(f"批量导入API接口完成: 共 {state.total} 行，新建 {state.success_count}，"
+                    f"覆盖 {state.updated_count}，未变更 {state.unchanged_count}，"
+                    f"跳过 {state.skipped_count}，失败 {state.error_count}")
@@ -10,44 +10,158 @@ API接口业务服务层
 - 统一异常处理
 """
 
+import json
 import logging
 import asyncio
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from ..database.dao import ApiInterfaceDAO, SystemDAO, ModuleDAO
+from typing import List, Dict, Any, FrozenSet, Iterator, Optional, Tuple
+from ..config import get_config
+from ..database.dao import ApiInterfaceDAO, SystemDAO, ModuleDAO, API_INTERFACE_COLUMNS
 from ..models.api_interface import (
     ApiInterface, ApiInterfaceCreate, ApiInterfaceUpdate, 
     ApiInterfaceQueryRequest, ApiInterfaceStats,
     ApiInterfaceBatchRequest
 )
 from ..utils.logger import get_logger
+from ..utils.fields import parse_fields, expand_fields, validate_fields, project
+from ..transforms import ComputedFieldRegistry, LazyRow
+from .route_index import api_route_index
 from ..mcp.tools.http_tools import HttpTools
 from ..mcp.tools.validation_tools import ValidationTools
 
 logger = get_logger(__name__)
 
+# 流式导出的默认字段（与导出接口的 ApiInterface 模型字段一致）
+EXPORT_FIELDS = (
+    'id', 'system_id', 'module_id', 'name', 'description', 'method', 'path', 'version', 'status',
+    'request_format', 'response_format', 'auth_required', 'rate_limit', 'timeout', 'tags',
+    'request_schema', 'response_schema', 'example_request', 'example_response',
+    'created_at', 'updated_at', 'system_name', 'module_name', 'enabled'
+)
+
+# 业务计算字段注册表：请求/响应模式原地解析JSON列，未请求时保留原始字符串
+_COMPUTED = ComputedFieldRegistry()
+
+
+@_COMPUTED.computes('enabled', 'status_label', depends=('status',))
+def _compute_status(api: Dict[str, Any], context: Dict[str, Any]) -> None:
+    # 如果有status字段，转换为enabled
+    status = api.get('status', 'inactive')
+    api['enabled'] = status == 'active'
+    
+    # 添加状态标签
+    api['status_label'] = {
+        'active': '启用',
+        'inactive': '禁用',
+        'deprecated': '已废弃',
+        'testing': '测试中'
+    }.get(status, '未知')
+
+
+@_COMPUTED.computes('method_color', depends=('method',))
+def _compute_method_color(api: Dict[str, Any], context: Dict[str, Any]) -> None:
+    api['method_color'] = {
+        'GET': 'success',
+        'POST': 'primary',
+        'PUT': 'warning',
+        'DELETE': 'danger',
+        'PATCH': 'info'
+    }.get(api.get('method', 'GET'), 'default')
+
+
+@_COMPUTED.computes('tags_list', depends=('tags',))
+def _compute_tags_list(api: Dict[str, Any], context: Dict[str, Any]) -> None:
+    tags = api.get('tags')
+    if tags and isinstance(tags, str):
+        try:
+            api['tags_list'] = json.loads(tags)
+        except:
+            api['tags_list'] = [tag.strip() for tag in tags.split(',') if tag.strip()]
+    else:
+        api['tags_list'] = []
+
+
+@_COMPUTED.computes('request_schema', depends=('request_schema',))
+def _compute_request_schema(api: Dict[str, Any], context: Dict[str, Any]) -> None:
+    # 优先使用 request_schema，兼容旧字段 request_params
+    request_schema = api.get('request_schema')
+    if isinstance(request_schema, str):
+        try:
+            api['request_schema'] = json.loads(request_schema)
+        except Exception:
+            api['request_schema'] = {}
+    elif request_schema is None:
+        request_params = api.get('request_params')
+        if isinstance(request_params, str):
+            try:
+                api['request_schema'] = json.loads(request_params)
+            except Exception:
+                api['request_schema'] = {}
+        else:
+            api['request_schema'] = request_params or {}
+
+
+@_COMPUTED.computes('response_schema', depends=('response_schema', 'example_response'))
+def _compute_response_schema(api: Dict[str, Any], context: Dict[str, Any]) -> None:
+    # 优先使用 response_schema，兼容字段 example_response 作为回退
+    response_schema = api.get('response_schema')
+    if isinstance(response_schema, str):
+        try:
+            api['response_schema'] = json.loads(response_schema)
+        except Exception:
+            api['response_schema'] = {}
+    elif response_schema is None or response_schema == {}:
+        example_response = api.get('example_response')
+        if isinstance(example_response, str):
+            try:
+                api['response_schema'] = json.loads(example_response)
+            except Exception:
+                api['response_schema'] = {}
+        else:
+            api['response_schema'] = example_response or {}
+
+
+@_COMPUTED.computes('full_url', depends=('path',))
+def _compute_full_url(api: Dict[str, Any], context: Dict[str, Any]) -> None:
+    path = api.get('path', '')
+    if not path.startswith('/'):
+        path = '/' + path
+    api['full_url'] = path
+
+
+# 导出列顺序：数据库列在前，计算字段在后
+_EXPORT_ORDER = tuple(API_INTERFACE_COLUMNS) + tuple(sorted(_COMPUTED.names - API_INTERFACE_COLUMNS.keys()))
+
 
 class ApiInterfaceService:
     """API接口业务服务类"""
     
+    # 计算字段注册表，用于字段投影与按需计算
+    COMPUTED_FIELDS = _COMPUTED
+    
     @staticmethod
-    def get_api_interfaces() -> List[Dict[str, Any]]:
+    def get_api_interfaces(fields: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         获取所有API接口列表
         
+        Args:
+            fields (Optional[str]): 逗号分隔的字段投影（如 "id,name,method,path"），为空时返回全部字段
+            
         Returns:
             List[Dict[str, Any]]: API接口列表，包含业务转换后的数据
         """
         try:
+            selected, needed = ApiInterfaceService._resolve_fields(fields)
+            
             # 调用DAO层获取原始数据
-            raw_apis = ApiInterfaceDAO.get_all()
+            raw_apis = ApiInterfaceDAO.get_all(ApiInterfaceService._columns(needed))
             logger.info(f"获取所有API接口列表，共 {len(raw_apis)} 个接口")
             
             # 应用业务规则和数据增强
             enhanced_apis = []
             for api in raw_apis:
-                enhanced_api = ApiInterfaceService._apply_business_rules(api)
-                enhanced_apis.append(enhanced_api)
+                enhanced_api = ApiInterfaceService._apply_business_rules(api, needed)
+                enhanced_apis.append(project(enhanced_api, selected))
             
             return enhanced_apis
             
@@ -164,6 +278,7 @@ class ApiInterfaceService:
             
             # 创建API接口
             api_id = ApiInterfaceDAO.create(api_data.dict())
+            api_route_index.refresh([api_id])
             created_api = ApiInterfaceDAO.get_by_id(api_id)
             
             logger.info(f"API接口创建成功: {api_data.name} (ID: {api_id})")
@@ -222,6 +337,7 @@ class ApiInterfaceService:
             # 更新API接口
             success = ApiInterfaceDAO.update(api_id, update_dict)
             if success:
+                api_route_index.refresh([api_id])
                 updated_api = ApiInterfaceDAO.get_by_id(api_id)
                 logger.info(f"API接口更新成功: ID {api_id}")
                 return ApiInterfaceService._apply_business_rules(updated_api)
@@ -250,6 +366,7 @@ class ApiInterfaceService:
             
             success = ApiInterfaceDAO.delete(api_id)
             if success:
+                api_route_index.remove([api_id])
                 logger.info(f"API接口删除成功: ID {api_id}")
             return success
             
@@ -258,12 +375,30 @@ class ApiInterfaceService:
             raise
     
     @staticmethod
-    def search_api_interfaces(query_request: ApiInterfaceQueryRequest) -> List[Dict[str, Any]]:
+    def get_api_interface_raw(api_id: int) -> Optional[LazyRow]:
+        """
+        根据ID获取API接口原始数据（内部调用快速路径）
+        
+        只查询数据库行，不解析JSON列；计算字段（如 tags_list、full_url）在首次访问时才计算。
+        供只读取 path/method/request_headers 等原始列的内部调用方（执行、规划）使用。
+        
+        Args:
+            api_id (int): API接口ID
+            
+        Returns:
+            Optional[LazyRow]: API接口数据，不存在时返回None
+        """
+        api = ApiInterfaceDAO.get_by_id(api_id)
+        return _COMPUTED.lazy(api) if api else None
+    
+    @staticmethod
+    def search_api_interfaces(query_request: ApiInterfaceQueryRequest, raw: bool = False) -> List[Dict[str, Any]]:
         """
         搜索API接口
         
         Args:
             query_request (ApiInterfaceQueryRequest): 查询请求参数
+            raw (bool): 是否返回原始数据（LazyRow，计算字段按需计算），供内部调用方使用
             
         Returns:
             List[Dict[str, Any]]: 搜索结果
@@ -282,21 +417,26 @@ class ApiInterfaceService:
             if query_request.enabled_only:
                 filters['status'] = 'active'  # enabled_only为True时只显示active状态的API
             
+            selected, needed = ApiInterfaceService._resolve_fields(query_request.fields)
+            
             # 执行搜索
-            raw_apis = ApiInterfaceDAO.search(query_request.keyword or "", filters)
+            raw_apis = ApiInterfaceDAO.search(query_request.keyword or "", filters, ApiInterfaceService._columns(needed))
             logger.info(f"搜索API接口，关键词: '{query_request.keyword}', 结果数: {len(raw_apis)}")
             
-            # 应用业务规则
-            enhanced_apis = []
-            for api in raw_apis:
-                enhanced_api = ApiInterfaceService._apply_business_rules(api)
-                enhanced_apis.append(enhanced_api)
-            
-            # 应用分页
+            # 先分页再应用业务规则，分页外的行无需增强
             if query_request.page and query_request.size:
                 start = (query_request.page - 1) * query_request.size
                 end = start + query_request.size
-                enhanced_apis = enhanced_apis[start:end]
+                raw_apis = raw_apis[start:end]
+            
+            if raw:
+                return [_COMPUTED.lazy(api) for api in raw_apis]
+            
+            # 应用业务规则
+            enhanced_apis = []
+            for api in raw_apis:
+                enhanced_api = ApiInterfaceService._apply_business_rules(api, needed)
+                enhanced_apis.append(project(enhanced_api, selected))
             
             return enhanced_apis
             
@@ -304,6 +444,41 @@ class ApiInterfaceService:
             logger.error(f"搜索API接口失败: {str(e)}")
             raise
     
+    @staticmethod
+    def iter_export_batches(system_id: Optional[int] = None, module_id: Optional[int] = None,
+                            status: Optional[str] = None, keyword: Optional[str] = None,
+                            fields: Optional[str] = None, after_id: int = 0,
+                            limit: Optional[int] = None) -> Tuple[List[str], Iterator[List[Dict[str, Any]]]]:
+        """
+        流式导出API接口：按主键键集分批读取并应用业务规则，内存只与批大小相关
+        
+        Args:
+            system_id (Optional[int]): 系统ID筛选
+            module_id (Optional[int]): 模块ID筛选
+            status (Optional[str]): 状态筛选
+            keyword (Optional[str]): 搜索关键词
+            fields (Optional[str]): 逗号分隔的字段投影，为空时导出 EXPORT_FIELDS
+            after_id (int): 键集游标，只导出ID大于该值的接口（断点续传）
+            limit (Optional[int]): 最多导出的行数，为空时导出全部
+            
+        Returns:
+            Tuple: (导出列名, 按批产出的数据行生成器)
+            
+        Raises:
+            ValueError: 字段投影包含未知字段（在开始输出前抛出）
+        """
+        selected, needed = ApiInterfaceService._resolve_fields(fields or ','.join(EXPORT_FIELDS))
+        columns = [name for name in _EXPORT_ORDER if name in selected]
+        filters = {'system_id': system_id, 'module_id': module_id, 'status': status}
+        
+        def batches() -> Iterator[List[Dict[str, Any]]]:
+            for raw_apis in ApiInterfaceDAO.iter_batches(keyword or "", filters, ApiInterfaceService._columns(needed),
+                                                         after_id, get_config().EXPORT_BATCH_SIZE, limit):
+                yield [project(ApiInterfaceService._apply_business_rules(api, needed), selected)
+                       for api in raw_apis]
+        
+        return columns, batches()
+    
     @staticmethod
     def get_api_interface_stats() -> Dict[str, Any]:
         """
@@ -342,6 +517,7 @@ class ApiInterfaceService:
                 raise ValueError("API接口ID列表不能为空")
             
             updated_count = ApiInterfaceDAO.batch_update_status(batch_request.api_ids, batch_request.status)
+            api_route_index.refresh(batch_request.api_ids)
             logger.info(f"批量更新API接口状态成功，更新数量: {updated_count}")
             
             return {
@@ -371,6 +547,7 @@ class ApiInterfaceService:
                 raise ValueError("API接口ID列表不能为空")
             
             deleted_count = ApiInterfaceDAO.batch_delete(api_ids)
+            api_route_index.remove(api_ids)
             logger.info(f"批量删除API接口成功，删除数量: {deleted_count}")
             
             return {
@@ -495,12 +672,36 @@ class ApiInterfaceService:
     
     # 私有方法
     @staticmethod
-    def _apply_business_rules(api: Dict[str, Any]) -> Dict[str, Any]:
+    def _resolve_fields(fields: Optional[str]) -> Tuple[Optional[FrozenSet[str]], Optional[FrozenSet[str]]]:
+        """
+        解析字段投影
+        
+        Args:
+            fields (Optional[str]): 逗号分隔的字段投影
+            
+        Returns:
+            Tuple: (请求的字段, 按依赖展开后的字段)，未指定投影时均为None
+        """
+        selected = parse_fields(fields)
+        if selected is None:
+            return None, None
+        dependencies = _COMPUTED.dependencies()
+        validate_fields(selected, API_INTERFACE_COLUMNS.keys() | dependencies.keys())
+        return selected, expand_fields(selected, dependencies)
+    
+    @staticmethod
+    def _columns(needed: Optional[FrozenSet[str]]) -> Optional[FrozenSet[str]]:
+        """展开后的字段中需要DAO查询的列"""
+        return needed & API_INTERFACE_COLUMNS.keys() if needed is not None else None
+    
+    @staticmethod
+    def _apply_business_rules(api: Dict[str, Any], fields: Optional[FrozenSet[str]] = None) -> Dict[str, Any]:
         """
         应用业务规则
         
         Args:
             api (Dict[str, Any]): 原始API接口数据
+            fields (Optional[FrozenSet[str]]): 字段投影（已按依赖展开），为空时应用全部规则
             
         Returns:
             Dict[str, Any]: 应用业务规则后的数据
@@ -515,86 +716,8 @@ class ApiInterfaceService:
             else:
                 api['status'] = 'active' if enabled == 1 else 'inactive'
         
-        # 如果有status字段，转换为enabled
-        status = api.get('status', 'inactive')
-        api['enabled'] = status == 'active'
-        
-        # 添加状态标签
-        api['status_label'] = {
-            'active': '启用',
-            'inactive': '禁用',
-            'deprecated': '已废弃',
-            'testing': '测试中'
-        }.get(status, '未知')
-        
-        # 添加方法标签颜色
-        method = api.get('method', 'GET')
-        api['method_color'] = {
-            'GET': 'success',
-            'POST': 'primary',
-            'PUT': 'warning',
-            'DELETE': 'danger',
-            'PATCH': 'info'
-        }.get(method, 'default')
-        
-        # 处理标签
-        tags = api.get('tags')
-        if tags and isinstance(tags, str):
-            try:
-                import json
-                api['tags_list'] = json.loads(tags)
-            except:
-                api['tags_list'] = [tag.strip() for tag in tags.split(',') if tag.strip()]
-        else:
-            api['tags_list'] = []
-        
-        # 处理请求模式（优先使用 request_schema，兼容旧字段 request_params）
-        import json
-        request_schema = api.get('request_schema')
-        if isinstance(request_schema, str):
-            try:
-                api['request_schema'] = json.loads(request_schema)
-            except Exception:
-                api['request_schema'] = {}
-        elif request_schema is None:
-            # 兼容旧字段 request_params
-            request_params = api.get('request_params')
-            if isinstance(request_params, str):
-                try:
-                    api['request_schema'] = json.loads(request_params)
-                except Exception:
-                    api['request_schema'] = {}
-            else:
-                api['request_schema'] = request_params or {}
-        else:
-            api['request_schema'] = request_schema
-
-        # 处理响应模式（优先使用 response_schema，兼容字段 example_response 作为回退）
-        response_schema = api.get('response_schema')
-        if isinstance(response_schema, str):
-            try:
-                api['response_schema'] = json.loads(response_schema)
-            except Exception:
-                api['response_schema'] = {}
-        elif response_schema is None or response_schema == {}:
-            example_response = api.get('example_response')
-            if isinstance(example_response, str):
-                try:
-                    api['response_schema'] = json.loads(example_response)
-                except Exception:
-                    api['response_schema'] = {}
-            else:
-                api['response_schema'] = example_response or {}
-        else:
-            api['response_schema'] = response_schema
-        
-        # 添加完整URL
-        path = api.get('path', '')
-        if not path.startswith('/'):
-            path = '/' + path
-        api['full_url'] = path
-        
-        return api
+        # 状态标签、方法颜色、标签、请求/响应模式、完整URL（由计算字段注册表按需计算）
+        return _COMPUTED.evaluate(api, fields)
     
     @staticmethod
     def _validate_api_interface_data(api_data: Dict[str, Any], is_update: bool = False) -> None:
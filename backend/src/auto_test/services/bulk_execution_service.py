@@ -0,0 +1,407 @@
+"""批量执行服务
+
+数据驱动的批量回归：一个计划（或一组测试API）× 一张数据表（CSV / JSONL，每行一组输入变量）。
+- 计划只编译一次（复用计划编译缓存），测试API只编译一次，每行只做变量渲染
+- 固定数量的worker从有界队列中取任务，并发度有上限，数据表按需逐行读取
+- 计划模式的每一行都经执行准入控制启动，受全局与按系统并发上限约束，队列已满时该行被拒绝
+- 所有请求共享HTTP连接池；整个批次共用一个执行作用域，作用域内的HTTP缓存在批次间共享
+- 每完成一行立即产出结果事件，最后产出汇总报告
+- 测试API模式按目标主机限速，执行记录与断言报告分批写入test_api_runs/test_api_reports
+"""
+
+import asyncio
+import csv
+import io
+import json
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterable, Iterator, AsyncGenerator, Tuple
+
+from ..agents.admission import execution_admission
+from ..config import get_config
+from ..mcp.metrics import LatencyHistogram
+from ..mcp.resilience import TargetRateLimiter, target_rate_limiter
+from ..mcp.tools.response_cache import ResponseCache, response_cache
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 报告中保留的失败样本数
+MAX_FAILURE_SAMPLES = 20
+
+
+def coerce_cell(value: Any) -> Any:
+    """CSV单元格类型还原：数字、布尔、null与JSON对象/数组按JSON解析，其余保持字符串"""
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    if not text:
+        return value
+    if text[0] in '{["-0123456789' or text in ('true', 'false', 'null'):
+        try:
+            return json.loads(text)
+        except ValueError:
+            return value
+    return value
+
+
+def iter_data_rows(content: str, data_format: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """逐行读取数据表
+
+    Args:
+        content: 数据表文本
+        data_format: csv / jsonl，为空时按首个非空字符推断（'{'为JSONL）
+
+    Yields:
+        Dict[str, Any]: 一行输入变量
+    """
+    if not data_format:
+        data_format = 'jsonl' if content.lstrip().startswith('{') else 'csv'
+
+    if data_format == 'jsonl':
+        for line_no, line in enumerate(io.StringIO(content), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"JSONL第{line_no}行格式错误: {e}")
+            if not isinstance(row, dict):
+                raise ValueError(f"JSONL第{line_no}行必须是对象")
+            yield row
+    elif data_format == 'csv':
+        for row in csv.DictReader(io.StringIO(content)):
+            yield {key: coerce_cell(value) for key, value in row.items() if key}
+    else:
+        raise ValueError(f"不支持的数据格式: {data_format}")
+
+
+class BulkReport:
+    """批量执行汇总"""
+
+    def __init__(self, bulk_id: str, mode: str):
+        self.bulk_id = bulk_id
+        self.mode = mode
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self.total = 0
+        self.passed = 0
+        self.failed = 0
+        self.latency = LatencyHistogram()
+        self.min_ms: Optional[float] = None
+        self.max_ms = 0.0
+        # 目标（步骤ID或测试API ID）-> {'passed', 'failed'}
+        self.targets: Dict[str, Dict[str, int]] = {}
+        self.failures: List[Dict[str, Any]] = []
+        self.stopped_early = False
+
+    def record(self, row: Dict[str, Any]) -> None:
+        """记录一行结果"""
+        self.total += 1
+        duration_ms = row.get('duration_ms') or 0
+        self.latency.observe(duration_ms / 1000)
+        self.min_ms = duration_ms if self.min_ms is None else min(self.min_ms, duration_ms)
+        self.max_ms = max(self.max_ms, duration_ms)
+
+        if row['status'] == 'success':
+            self.passed += 1
+        else:
+            self.failed += 1
+            if len(self.failures) < MAX_FAILURE_SAMPLES:
+                self.failures.append({
+                    key: row.get(key) for key in ('row_index', 'test_api_id', 'error', 'failed_step')
+                    if row.get(key) is not None
+                })
+
+        for target, passed in row.get('targets', {}).items():
+            stats = self.targets.setdefault(target, {'passed': 0, 'failed': 0})
+            stats['passed' if passed else 'failed'] += 1
+
+    def _quantile_ms(self, q: float) -> float:
+        # 分桶估算值为桶上界，不超过实际最大值
+        return round(min(self.latency.quantile(q) * 1000, self.max_ms), 2)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """导出报告"""
+        elapsed = time.perf_counter() - self._started
+        count = self.latency.count
+        return {
+            'bulk_id': self.bulk_id,
+            'mode': self.mode,
+            'total': self.total,
+            'passed': self.passed,
+            'failed': self.failed,
+            'pass_rate': round(self.passed / self.total, 4) if self.total else 0.0,
+            'stopped_early': self.stopped_early,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': datetime.now().isoformat(),
+            'elapsed_seconds': round(elapsed, 3),
+            'throughput_per_second': round(self.total / elapsed, 2) if elapsed > 0 else 0.0,
+            'latency_ms': {
+                'min': round(self.min_ms or 0.0, 2),
+                'avg': round(self.latency.total * 1000 / count, 2) if count else 0.0,
+                'p50': self._quantile_ms(0.5),
+                'p95': self._quantile_ms(0.95),
+                'p99': self._quantile_ms(0.99),
+                'max': round(self.max_ms, 2)
+            },
+            'targets': self.targets,
+            'failures': self.failures
+        }
+
+
+class BulkExecutionService:
+    """批量执行服务"""
+
+    @staticmethod
+    def resolve_concurrency(requested: Optional[int]) -> int:
+        """并发度：未指定时取默认值，并限制在[1, 上限]之间"""
+        config = get_config()
+        value = requested or config.BULK_EXECUTION_DEFAULT_CONCURRENCY
+        return max(1, min(int(value), config.BULK_EXECUTION_MAX_CONCURRENCY))
+
+    @staticmethod
+    def check_admission(request: Dict[str, Any]) -> None:
+        """计划模式下检查执行队列，已满时抛出AdmissionRejectedError（之后每行仍单独申请准入）"""
+        if not request.get('test_api_ids'):
+            execution_admission.ensure_capacity()
+
+    @staticmethod
+    def resolve_rows(request: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+        """请求中的数据表：rows（对象列表）或 data（CSV/JSONL文本），都没有时为单行空变量"""
+        if request.get('rows') is not None:
+            return request['rows']
+        if request.get('data'):
+            return iter_data_rows(request['data'], request.get('data_format'))
+        return [{}]
+
+    @staticmethod
+    async def run(request: Dict[str, Any]) -> AsyncGenerator[Dict[str, Any], None]:
+        """执行批量任务并流式产出事件
+
+        Args:
+            request: 批量请求
+                - plan / flow_id / test_api_ids：三选一的执行目标
+                - rows 或 data + data_format：数据表
+                - variables：所有行共享的变量（被行内变量覆盖）
+                - context：执行上下文（如base_url）
+                - concurrency：并发度
+                - stop_on_failure：出现失败后不再派发新任务
+                - include_results：行结果中是否包含响应/步骤输出
+                - rate_limit_per_target：测试API模式下每个目标主机的限速（次/秒），为空时使用全局限速
+                - persist_runs：测试API模式下是否保存执行记录（默认保存）
+
+        Yields:
+            Dict[str, Any]: started / row / report / error 事件
+        """
+        bulk_id = str(uuid.uuid4())
+        try:
+            mode, run_job, jobs, finish = await BulkExecutionService._prepare(request, bulk_id)
+        except Exception as e:
+            logger.error(f"批量执行准备失败: {e}")
+            yield {'type': 'error', 'bulk_id': bulk_id, 'error': str(e)}
+            return
+
+        concurrency = BulkExecutionService.resolve_concurrency(request.get('concurrency'))
+        stop_on_failure = bool(request.get('stop_on_failure'))
+        include_results = bool(request.get('include_results'))
+        report = BulkReport(bulk_id, mode)
+        yield {'type': 'started', 'bulk_id': bulk_id, 'mode': mode, 'concurrency': concurrency}
+
+        pending: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        completed: asyncio.Queue = asyncio.Queue()
+        stop = asyncio.Event()
+        done_marker = object()
+
+        async def produce() -> None:
+            try:
+                for job in jobs:
+                    if stop.is_set():
+                        break
+                    await pending.put(job)
+            except Exception as e:
+                await completed.put({'type': 'error', 'bulk_id': bulk_id, 'error': str(e)})
+            finally:
+                for _ in range(concurrency):
+                    await pending.put(None)
+
+        async def work() -> None:
+            while True:
+                job = await pending.get()
+                if job is None:
+                    await completed.put(done_marker)
+                    return
+                if stop.is_set():
+                    continue
+                try:
+                    row = await run_job(job)
+                except Exception as e:
+                    logger.error(f"批量执行任务异常: {bulk_id}, {e}")
+                    row = {'row_index': job[0], 'status': 'failed', 'duration_ms': 0, 'error': str(e)}
+                if not include_results:
+                    row.pop('result', None)
+                await completed.put(row)
+
+        tasks = [asyncio.create_task(produce())]
+        tasks.extend(asyncio.create_task(work()) for _ in range(concurrency))
+        try:
+            finished = 0
+            while finished < concurrency:
+                item = await completed.get()
+                if item is done_marker:
+                    finished += 1
+                    continue
+                if item.get('type') == 'error':
+                    stop.set()
+                    report.stopped_early = True
+                    yield item
+                    continue
+                report.record(item)
+                if stop_on_failure and item['status'] != 'success' and not stop.is_set():
+                    stop.set()
+                    report.stopped_early = True
+                item.pop('targets', None)
+                yield {'type': 'row', 'bulk_id': bulk_id, **item}
+            yield {'type': 'report', 'bulk_id': bulk_id, 'report': report.to_dict()}
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            if finish is not None:
+                try:
+                    finish()
+                except Exception as e:
+                    logger.error(f"批量执行收尾失败: {bulk_id}, {e}")
+            response_cache.clear_scope(ResponseCache.execution_scope(bulk_id))
+            logger.info(f"批量执行结束: {bulk_id}, 共{report.total}行, 失败{report.failed}行")
+
+    @staticmethod
+    async def run_to_completion(request: Dict[str, Any]) -> Dict[str, Any]:
+        """执行批量任务并返回全部行结果与汇总报告（非流式）"""
+        rows, report, errors = [], None, []
+        async for event in BulkExecutionService.run(request):
+            if event['type'] == 'row':
+                rows.append({key: value for key, value in event.items() if key != 'type'})
+            elif event['type'] == 'report':
+                report = event['report']
+            elif event['type'] == 'error':
+                errors.append(event['error'])
+        if report is None:
+            raise ValueError('; '.join(errors) or '批量执行失败')
+        return {'items': rows, 'report': report, 'errors': errors}
+
+    @staticmethod
+    async def _prepare(request: Dict[str, Any], bulk_id: str) -> Tuple[str, Any, Iterable[Any], Any]:
+        """编译执行目标，返回(模式, 单任务执行函数, 任务迭代器, 收尾函数)"""
+        from ..agents.pool import agent_pool
+
+        base_variables = dict(request.get('variables') or {})
+        context = {**(request.get('context') or {}), 'execution_id': bulk_id}
+        rows = BulkExecutionService.resolve_rows(request)
+
+        if request.get('test_api_ids'):
+            from ..data_services.test_api_data_service import TestApiDataService
+            from .test_api_runner import TestApiRunner
+
+            test_apis = TestApiDataService.get_by_ids(list(request['test_api_ids']))
+            if not test_apis:
+                raise ValueError("测试API不存在")
+            prepared = [TestApiRunner.prepare(test_api) for test_api in test_apis]
+            mcp_client = agent_pool.mcp_client
+            await mcp_client.initialize()
+
+            rate = request.get('rate_limit_per_target')
+            limiter = target_rate_limiter if rate is None else TargetRateLimiter(rate=rate)
+            persist = request.get('persist_runs', True)
+            flush_size = get_config().TEST_API_RUN_FLUSH_SIZE
+            environment = request.get('context') or None
+            buffer: List[Dict[str, Any]] = []
+
+            def flush() -> None:
+                if buffer:
+                    batch = buffer[:]
+                    buffer.clear()
+                    TestApiDataService.save_runs(batch, bulk_id)
+
+            def test_api_jobs() -> Iterator[Tuple[int, Dict[str, Any], Any]]:
+                for index, row in enumerate(rows):
+                    for item in prepared:
+                        yield index, row, item
+
+            async def run_test_api(job) -> Dict[str, Any]:
+                index, row, item = job
+                result = await TestApiRunner.run(item, mcp_client, {**base_variables, **row}, context, limiter)
+                if persist:
+                    result['environment'] = environment
+                    buffer.append(result)
+                    if len(buffer) >= flush_size:
+                        flush()
+                return {
+                    'row_index': index,
+                    'test_api_id': item.test_api_id,
+                    'run_id': result['run_id'],
+                    'status': result['status'],
+                    'duration_ms': result.get('response_time_ms') or 0,
+                    'response_status_code': result.get('response_status_code'),
+                    'assertions_passed': result.get('assertions_passed'),
+                    'assertions_total': result.get('assertions_total'),
+                    'error': result.get('error_message'),
+                    'targets': {f"test_api:{item.test_api_id}": result['status'] == 'success'},
+                    'result': result
+                }
+
+            return 'test_apis', run_test_api, test_api_jobs(), flush if persist else None
+
+        from .orchestration_service import OrchestrationService
+
+        if request.get('flow_id') is not None:
+            compiled = await OrchestrationService.load_compiled_flow(int(request['flow_id']))
+            if compiled is None:
+                raise ValueError(f"流程不存在: {request['flow_id']}")
+        elif request.get('plan'):
+            compiled = await OrchestrationService.compile_plan(request['plan'])
+        else:
+            raise ValueError("需要指定plan、flow_id或test_api_ids")
+        if not compiled.ok:
+            raise ValueError(f"计划校验失败: {'; '.join(compiled.validation.get('issues', []))}")
+
+        engine = agent_pool.execution_engine
+        system_ids = engine._resolve_system_ids(compiled.plan)
+
+        async def run_plan(job) -> Dict[str, Any]:
+            index, row = job
+            started = time.perf_counter()
+            try:
+                outcome = await execution_admission.run(
+                    f"{bulk_id}:{index}",
+                    lambda: engine.run_inline(compiled.plan, {**base_variables, **row}, compiled.templates, context),
+                    priority=context.get('priority'),
+                    system_ids=system_ids
+                )
+                error = None
+            except Exception as e:
+                outcome = {'success': False, 'steps': []}
+                error = str(e)
+            failed_step = next(
+                (step for step in outcome['steps'] if step['status'] == 'failed'), None
+            )
+            return {
+                'row_index': index,
+                'status': 'success' if outcome['success'] and error is None else 'failed',
+                'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+                'steps': [
+                    {key: value for key, value in step.items() if key != 'result'}
+                    for step in outcome['steps']
+                ],
+                'failed_step': failed_step['step_id'] if failed_step else None,
+                'error': error or (failed_step or {}).get('error'),
+                'targets': {
+                    f"step:{step['step_id']}": step['status'] == 'completed'
+                    for step in outcome['steps'] if step['status'] != 'skipped'
+                },
+                'result': outcome
+            }
+
+        return 'plan', run_plan, enumerate(rows), None
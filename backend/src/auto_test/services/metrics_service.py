@@ -0,0 +1,59 @@
+"""
+指标服务层
+
+负责运行时指标的收集与组装，包括：
+- MCP工具执行指标（按工具/主机/API接口）
+- 熔断器与重试预算状态
+- HTTP响应缓存命中率与请求合并统计
+- API路由索引状态
+- 实体读穿缓存命中率与失效统计
+- REST接口ETag/304与服务端响应缓存统计
+
+遵循Service层设计原则：
+- 数据收集与组装
+- 不直接操作基础设施
+- 使用静态方法
+"""
+
+from datetime import datetime
+from typing import Dict, Any
+
+from ..database.entity_cache import entity_cache
+from ..mcp.metrics import tool_metrics
+from ..mcp.resilience import resilience_registry, target_rate_limiter
+from ..mcp.tools.http_pool import http_session_pool
+from ..mcp.tools.response_cache import response_cache
+from ..mcp.tools.single_flight import http_single_flight
+from ..utils.http_cache import get_http_cache_stats
+from .plan_cache import plan_compile_cache
+from .route_index import api_route_index
+
+
+class MetricsService:
+    """指标服务类 - 使用静态方法"""
+
+    @staticmethod
+    def render_prometheus_metrics() -> str:
+        """导出Prometheus文本格式指标"""
+        return tool_metrics.render_prometheus()
+
+    @staticmethod
+    def collect_metrics_summary() -> Dict[str, Any]:
+        """收集JSON格式的指标摘要"""
+        # 准入控制器属于执行引擎（agents包），按需导入，指标接口不依赖Agent组件的加载
+        from ..agents.admission import execution_admission
+
+        return {
+            'tools': tool_metrics.summary(),
+            'admission': execution_admission.get_stats(),
+            'resilience': resilience_registry.snapshot(),
+            'rate_limits': target_rate_limiter.get_stats(),
+            'http_cache': response_cache.get_stats(),
+            'http_coalescing': http_single_flight.get_stats(),
+            'http_pool': http_session_pool.get_stats(),
+            'route_index': api_route_index.get_stats(),
+            'plan_cache': plan_compile_cache.get_stats(),
+            'entity_cache': entity_cache.get_stats(),
+            'rest_cache': get_http_cache_stats(),
+            'timestamp': datetime.now().isoformat()
+        }
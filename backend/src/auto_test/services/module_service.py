@@ -5,24 +5,45 @@
 
 import logging
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from ..database.dao import ModuleDAO, SystemDAO
-from ..transforms import ModuleTransform
+from typing import List, Dict, Any, FrozenSet, Optional
+from ..database.dao import ModuleDAO, SystemDAO, MODULE_COLUMNS
+from ..transforms import ComputedFieldRegistry, LazyRow, ModuleTransform
+from ..utils.fields import parse_fields, expand_fields, validate_fields, project
 from ..models.module import ModuleCreate, ModuleUpdate
+from .route_index import api_route_index
 
 logger = logging.getLogger(__name__)
 
+# 业务计算字段注册表（基于Transform层注册表，可依赖其计算字段）
+_COMPUTED = ComputedFieldRegistry(base=ModuleTransform.COMPUTED_FIELDS)
+
+
+@_COMPUTED.computes('can_edit', 'can_delete', depends=('status',))
+def _compute_permissions(module: Dict[str, Any], context: Dict[str, Any]) -> None:
+    status = module.get('status')
+    module['can_edit'] = status != 'deprecated'
+    module['can_delete'] = status in ['inactive', 'development']
+
+
+@_COMPUTED.computes('risk_level', depends=('status', 'has_description'))
+def _compute_risk_level(module: Dict[str, Any], context: Dict[str, Any]) -> None:
+    module['risk_level'] = ModuleService._assess_risk_level(module)
+
 
 class ModuleService:
     """模块业务服务类"""
     
+    # 计算字段注册表（含Transform层字段），用于字段投影与按需计算
+    COMPUTED_FIELDS = _COMPUTED
+    
     @staticmethod
-    def get_modules(system_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_modules(system_id: Optional[int] = None, fields: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         获取模块列表
         
         Args:
             system_id (Optional[int]): 系统ID，如果提供则筛选该系统的模块
+            fields (Optional[str]): 逗号分隔的字段投影（如 "id,name,status"），为空时返回全部字段
             
         Returns:
             List[Dict[str, Any]]: 模块列表
@@ -30,58 +51,77 @@ class ModuleService:
         try:
             logger.info(f"获取模块列表，系统ID: {system_id}")
             
+            # 字段投影：只查询需要的列，只计算请求的字段
+            selected = parse_fields(fields)
+            needed = None
+            if selected is not None:
+                dependencies = _COMPUTED.dependencies()
+                validate_fields(selected, MODULE_COLUMNS.keys() | dependencies.keys())
+                needed = expand_fields(selected, dependencies)
+            columns = needed & MODULE_COLUMNS.keys() if needed is not None else None
+            
             # 调用DAO层获取原始数据
             if system_id:
-                raw_modules = ModuleDAO.get_modules_by_system(system_id)
+                raw_modules = ModuleDAO.get_modules_by_system(system_id, columns)
             else:
-                raw_modules = ModuleDAO.get_all_modules()
+                raw_modules = ModuleDAO.get_all_modules(columns)
             
             # 使用Transform层转换数据
-            transformed_modules = ModuleTransform.to_list_response(raw_modules)
+            transformed_modules = ModuleTransform.to_list_response(raw_modules, needed)
             
             # 应用业务规则
             processed_modules = []
             for module in transformed_modules:
-                # 应用业务验证和增强
-                processed_module = ModuleService._apply_business_rules(module)
-                processed_modules.append(processed_module)
+                # 应用业务验证和增强（响应行由转换器新建，直接写入）
+                module = ModuleService._apply_business_rules(module, in_place=True, fields=needed)
+                processed_modules.append(project(module, selected))
             
             logger.info(f"成功获取 {len(processed_modules)} 个模块")
             return processed_modules
             
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"获取模块列表失败: {str(e)}")
             raise Exception(f"获取模块列表失败: {str(e)}")
     
     @staticmethod
-    def _apply_business_rules(module: Dict[str, Any]) -> Dict[str, Any]:
+    def _apply_business_rules(module: Dict[str, Any], in_place: bool = False,
+                              fields: Optional[FrozenSet[str]] = None) -> Dict[str, Any]:
         """
         应用业务规则和验证
         
         Args:
             module (Dict[str, Any]): 转换后的模块数据
+            in_place (bool): 是否直接修改传入的数据（用于转换器刚构建的响应行，避免再次复制）
+            fields (Optional[FrozenSet[str]]): 字段投影（已按依赖展开），为空时应用全部规则
             
         Returns:
             Dict[str, Any]: 应用业务规则后的模块数据
         """
-        enhanced = module.copy()
+        enhanced = module if in_place else module.copy()
+        ModuleService._normalize(enhanced, fields)
+        
+        # 业务规则3-4: 权限标识、风险评估（由计算字段注册表按需计算）
+        return _COMPUTED.evaluate(enhanced, fields)
+    
+    @staticmethod
+    def _normalize(module: Dict[str, Any], fields: Optional[FrozenSet[str]] = None) -> None:
+        """
+        规范化状态与名称（直接修改传入的数据）
         
+        Args:
+            module (Dict[str, Any]): 模块数据
+            fields (Optional[FrozenSet[str]]): 字段投影，为空时规范化全部字段
+        """
         # 业务规则1: 检查模块状态有效性
-        if enhanced.get('status') not in ['active', 'inactive', 'development', 'testing', 'production', 'deprecated']:
-            enhanced['status'] = 'active'  # 默认状态
+        if (fields is None or 'status' in fields) and \
+                module.get('status') not in ['active', 'inactive', 'development', 'testing', 'production', 'deprecated']:
+            module['status'] = 'active'  # 默认状态
         
         # 业务规则2: 确保模块名称不为空
-        if not enhanced.get('name') or not enhanced.get('name').strip():
-            enhanced['name'] = f"模块_{enhanced.get('id', 'unknown')}"
-        
-        # 业务规则3: 添加权限检查标识
-        enhanced['can_edit'] = enhanced.get('status') != 'deprecated'
-        enhanced['can_delete'] = enhanced.get('status') in ['inactive', 'development']
-        
-        # 业务规则4: 添加风险评估
-        enhanced['risk_level'] = ModuleService._assess_risk_level(enhanced)
-        
-        return enhanced
+        if (fields is None or 'name' in fields) and (not module.get('name') or not module.get('name').strip()):
+            module['name'] = f"模块_{module.get('id', 'unknown')}"
     
     @staticmethod
     def _assess_risk_level(module: Dict[str, Any]) -> str:
@@ -144,6 +184,23 @@ class ModuleService:
             logger.error(f"获取模块详情失败: {str(e)}")
             raise
     
+    @staticmethod
+    def get_module_raw(module_id: int) -> Optional[LazyRow]:
+        """
+        根据ID获取模块原始数据（内部调用快速路径）
+        
+        只查询数据库行，不做转换与系统信息补充；计算字段（如 tags_list、risk_level）
+        在首次访问时才计算。供只读取 id/name/system_id 等原始列的内部调用方使用。
+        
+        Args:
+            module_id (int): 模块ID
+            
+        Returns:
+            Optional[LazyRow]: 模块数据，不存在时返回None
+        """
+        module = ModuleDAO.get_by_id(module_id)
+        return _COMPUTED.lazy(module) if module else None
+    
     @staticmethod
     def create_module(module_data: ModuleCreate) -> Dict[str, Any]:
         """
@@ -241,6 +298,8 @@ class ModuleService:
             # 删除模块
             success = ModuleDAO.delete(module_id)
             if success:
+                # 级联影响API接口的模块/系统归属
+                api_route_index.invalidate()
                 logger.info(f"模块删除成功: ID {module_id}")
             return success
         except Exception as e:
@@ -375,8 +434,16 @@ class ModuleService:
             List[Dict[str, Any]]: 模块数据列表
         """
         try:
-            # 获取所有模块数据
-            modules = ModuleService.get_modules(system_id)
+            # 统计只读取状态、名称等原始列：包装为LazyRow，计算字段按需计算
+            if system_id:
+                raw_modules = ModuleDAO.get_modules_by_system(system_id)
+            else:
+                raw_modules = ModuleDAO.get_all_modules()
+            modules = []
+            for raw_module in raw_modules:
+                module = _COMPUTED.lazy(raw_module)
+                ModuleService._normalize(module)
+                modules.append(module)
             
             # 应用筛选条件
             if status:
@@ -0,0 +1,727 @@
+"""
+OpenAPI/Swagger 规范导入服务
+OpenAPI/Swagger Spec Import Service
+
+将 OpenAPI 3.x / Swagger 2.0 文档（JSON或YAML）中的操作映射为API接口并增量同步：
+- 文档按事件流增量解析（JSON: ijson，YAML: PyYAML事件API），不构建整个文档对象：
+  第一遍只构建 paths 以外的顶层节（components / definitions 等，供 $ref 展开），
+  第二遍逐个构建 paths 下的路径项，映射后按块交给批量导入管道
+- 上传内容先写入临时文件（超过 IMPORT_SPOOL_MAX_SIZE 落盘）以便两遍读取，
+  内存只与被引用的组件、单个路径项与块大小相关
+- 本地 $ref 展开（循环引用保留为 $ref，展开结果缓存），外部引用原样保留
+- 以唯一键 (system_id, method, path, version) 比较内容摘要，只写入新增与变更的接口
+- 按操作的首个标签映射到系统下的同名模块（不存在时创建），也可指定统一的模块
+"""
+
+import json
+import tempfile
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from ..config import get_config
+from ..database.connection import run_with_dedicated_connection
+from ..database.dao import SystemDAO, ModuleDAO
+from ..utils.logger import get_logger
+from .api_import_service import ApiImportService, ImportState
+
+try:
+    import ijson
+except ImportError:  # ijson为可选依赖，缺失时JSON文档回退为一次性解析
+    ijson = None
+
+try:
+    import yaml
+except ImportError:  # PyYAML为可选依赖，缺失时不支持YAML文档
+    yaml = None
+
+logger = get_logger(__name__)
+
+# 规范中的操作方法（路径项中的其余键为 parameters / summary 等）
+_SPEC_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+# api_interfaces 表 method 列的约束
+_SUPPORTED_METHODS = {'GET', 'POST', 'PUT', 'DELETE', 'PATCH'}
+# 未打标签的操作归入的模块
+DEFAULT_MODULE_NAME = '未分组'
+# $ref 嵌套展开的最大深度
+_MAX_REF_DEPTH = 32
+# 单个操作展开 $ref 后的节点总数上限：同一引用可被多次内联，展开规模随引用链层数指数增长
+_MAX_REF_NODES = 20000
+# YAML别名重放的事件总数上限：别名可嵌套引用锚点，展开规模随嵌套层数指数增长（billion laughs）
+_MAX_ALIAS_EVENTS = 1000000
+
+_STARTS = ('start_map', 'start_array')
+_ENDS = ('end_map', 'end_array')
+
+
+# ---------------------------------------------------------------------------
+# 事件流：统一为 (event, value)，event 为 start_map / map_key / end_map /
+# start_array / end_array / scalar
+# ---------------------------------------------------------------------------
+
+def detect_format(head: bytes, content_type: Optional[str] = None) -> str:
+    """
+    识别文档格式
+
+    Args:
+        head (bytes): 文档开头的字节
+        content_type (Optional[str]): 请求的Content-Type
+
+    Returns:
+        str: json / yaml
+    """
+    content_type = (content_type or '').lower()
+    if 'yaml' in content_type or 'yml' in content_type:
+        return 'yaml'
+    if 'json' in content_type:
+        return 'json'
+    stripped = head.lstrip(b'\xef\xbb\xbf \t\r\n')
+    return 'json' if stripped[:1] in (b'{', b'[') else 'yaml'
+
+
+def _json_events(source: BinaryIO) -> Iterator[Tuple[str, Any]]:
+    if ijson is None:
+        yield from _object_events(json.load(source))
+        return
+    for event, value in ijson.basic_parse(source, use_float=True):
+        if event in _STARTS or event in _ENDS or event == 'map_key':
+            yield event, value
+        else:
+            yield 'scalar', value
+
+
+def _object_events(value: Any) -> Iterator[Tuple[str, Any]]:
+    """已解析对象的事件流（无ijson时的JSON回退）"""
+    if isinstance(value, dict):
+        yield 'start_map', None
+        for key, item in value.items():
+            yield 'map_key', key
+            yield from _object_events(item)
+        yield 'end_map', None
+    elif isinstance(value, list):
+        yield 'start_array', None
+        for item in value:
+            yield from _object_events(item)
+        yield 'end_array', None
+    else:
+        yield 'scalar', value
+
+
+def _yaml_events(source: BinaryIO) -> Iterator[Tuple[str, Any]]:
+    """YAML事件流：展开锚点别名，映射内的键转为 map_key（保留原文，如 200 / on），值按类型解析"""
+    if yaml is None:
+        raise ValueError("解析YAML文档需要安装PyYAML")
+    # 每层容器：[是否映射, 下一个是否为键]
+    stack: List[List[bool]] = []
+    for event, value in _yaml_raw_events(source):
+        if stack and stack[-1][0]:
+            if stack[-1][1]:
+                if event == 'end_map':
+                    stack.pop()
+                    yield event, value
+                    continue
+                if event != 'scalar':
+                    raise ValueError("不支持以对象或数组作为YAML映射的键")
+                stack[-1][1] = False
+                yield 'map_key', value[1]
+                continue
+            stack[-1][1] = True
+        if event == 'scalar':
+            value = value[0]
+        elif event in _STARTS:
+            stack.append([event == 'start_map', True])
+        elif event in _ENDS:
+            stack.pop()
+        yield event, value
+
+
+def _yaml_raw_events(source: BinaryIO) -> Iterator[Tuple[str, Any]]:
+    """PyYAML事件 -> 与上下文无关的事件（标量值为 (解析值, 原文)，锚点节点记录后在别名处重放）"""
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    resolver = yaml.resolver.Resolver()
+    constructor = yaml.constructor.SafeConstructor()
+    anchors: Dict[str, List[Tuple[str, Any]]] = {}
+    # 正在记录的锚点：[名称, 事件列表, 嵌套深度]
+    recordings: List[list] = []
+    replayed = 0
+
+    def emit(item: Tuple[str, Any]) -> Iterator[Tuple[str, Any]]:
+        for recording in list(recordings):
+            recording[1].append(item)
+            if item[0] in _STARTS:
+                recording[2] += 1
+            elif item[0] in _ENDS:
+                recording[2] -= 1
+            if recording[2] == 0:
+                anchors[recording[0]] = recording[1]
+                recordings.remove(recording)
+        yield item
+
+    for event in yaml.parse(source, Loader=loader):
+        if isinstance(event, yaml.DocumentEndEvent):
+            return
+        if isinstance(event, yaml.AliasEvent):
+            if event.anchor not in anchors:
+                raise ValueError(f"YAML别名未定义: {event.anchor}")
+            replayed += len(anchors[event.anchor])
+            if replayed > _MAX_ALIAS_EVENTS:
+                raise ValueError(f"YAML别名展开超过上限（{_MAX_ALIAS_EVENTS}个节点），疑似别名嵌套炸弹")
+            for item in anchors[event.anchor]:
+                yield from emit(item)
+        elif isinstance(event, yaml.ScalarEvent):
+            item = ('scalar', (_yaml_scalar(event, resolver, constructor), event.value))
+            if event.anchor:
+                anchors[event.anchor] = [item]
+            yield from emit(item)
+        elif isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            if event.anchor:
+                recordings.append([event.anchor, [], 0])
+            yield from emit(('start_map' if isinstance(event, yaml.MappingStartEvent) else 'start_array', None))
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            yield from emit(('end_map' if isinstance(event, yaml.MappingEndEvent) else 'end_array', None))
+
+
+def _yaml_scalar(event: Any, resolver: Any, constructor: Any) -> Any:
+    """按YAML 1.1核心规则解析标量（时间戳与二进制保留原始字符串，保持可JSON序列化）"""
+    tag = event.tag
+    if tag is None or tag == '!':
+        tag = resolver.resolve(yaml.ScalarNode, event.value, event.implicit)
+    if tag in ('tag:yaml.org,2002:str', 'tag:yaml.org,2002:timestamp', 'tag:yaml.org,2002:binary'):
+        return event.value
+    construct = constructor.yaml_constructors.get(tag)
+    if construct is None:
+        return event.value
+    return construct(constructor, yaml.ScalarNode(tag, event.value, style=event.style))
+
+
+def _build(events: Iterator[Tuple[str, Any]], event: str, value: Any) -> Any:
+    """由事件流构建以 (event, value) 开始的值"""
+    if event == 'scalar':
+        return value
+    if event == 'start_map':
+        obj = {}
+        merges = []
+        for event, key in events:
+            if event == 'end_map':
+                # YAML合并键：显式声明的键优先
+                for merged in merges:
+                    for merged_key, merged_value in merged.items():
+                        obj.setdefault(merged_key, merged_value)
+                return obj
+            value = _build(events, *next(events))
+            if key == '<<' and isinstance(value, (dict, list)):
+                merges.extend(item for item in (value if isinstance(value, list) else [value])
+                              if isinstance(item, dict))
+            else:
+                obj[key] = value
+    elif event == 'start_array':
+        items = []
+        for event, item in events:
+            if event == 'end_array':
+                return items
+            items.append(_build(events, event, item))
+    raise ValueError(f"文档结构无效: {event}")
+
+
+def _skip(events: Iterator[Tuple[str, Any]], event: str) -> None:
+    """跳过以 event 开始的值而不构建"""
+    if event not in _STARTS:
+        return
+    depth = 1
+    for event, _ in events:
+        if event in _STARTS:
+            depth += 1
+        elif event in _ENDS:
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def _expect_document(events: Iterator[Tuple[str, Any]]) -> None:
+    event, _ = next(events, ('', None))
+    if event != 'start_map':
+        raise ValueError("文档顶层必须是对象")
+
+
+def read_sections(events: Iterator[Tuple[str, Any]]) -> Dict[str, Any]:
+    """第一遍：构建 paths 以外的全部顶层节"""
+    _expect_document(events)
+    sections = {}
+    for event, key in events:
+        if event == 'end_map':
+            break
+        event, value = next(events)
+        if key == 'paths':
+            _skip(events, event)
+        else:
+            sections[key] = _build(events, event, value)
+    return sections
+
+
+def iter_path_items(events: Iterator[Tuple[str, Any]]) -> Iterator[Tuple[str, Any]]:
+    """第二遍：逐个构建 paths 下的 (路径, 路径项)，paths 结束后停止读取"""
+    _expect_document(events)
+    for event, key in events:
+        if event == 'end_map':
+            return
+        event, value = next(events)
+        if key != 'paths':
+            _skip(events, event)
+            continue
+        if event != 'start_map':
+            raise ValueError("paths 必须是对象")
+        for event, path in events:
+            if event == 'end_map':
+                return
+            yield path, _build(events, *next(events))
+
+
+# ---------------------------------------------------------------------------
+# $ref 展开与操作映射
+# ---------------------------------------------------------------------------
+
+class RefResolver:
+    """本地 $ref 展开（JSON Pointer），循环引用、超出深度或节点预算的引用保留为 $ref"""
+
+    def __init__(self, document: Dict[str, Any], max_nodes: int = _MAX_REF_NODES):
+        self.document = document
+        self.max_nodes = max_nodes
+        # ref -> (展开结果, 节点数)
+        self._cache: Dict[str, Tuple[Any, int]] = {}
+        self._cuts = 0
+        self._nodes = 0
+
+    def resolve(self, node: Any) -> Any:
+        """
+        展开节点中的本地引用，每次调用有独立的节点预算
+
+        Args:
+            node (Any): 文档节点
+
+        Returns:
+            Any: 展开后的节点（可能与其他节点共享子对象，只读使用）
+        """
+        self._nodes = 0
+        return self._resolve(node, ())
+
+    def deref(self, node: Any) -> Any:
+        """只跟随顶层的 $ref 链，不展开子节点"""
+        seen = set()
+        while isinstance(node, dict) and isinstance(node.get('$ref'), str) and node['$ref'].startswith('#/'):
+            if node['$ref'] in seen:
+                return node
+            seen.add(node['$ref'])
+            target = self._lookup(node['$ref'])
+            if target is None:
+                return node
+            node = target
+        return node
+
+    def _resolve(self, node: Any, stack: Tuple[str, ...]) -> Any:
+        self._nodes += 1
+        if isinstance(node, list):
+            return [self._resolve(item, stack) for item in node]
+        if not isinstance(node, dict):
+            return node
+        ref = node.get('$ref')
+        if not isinstance(ref, str):
+            return {key: self._resolve(value, stack) for key, value in node.items()}
+        if not ref.startswith('#/'):
+            return node
+        cached = self._cache.get(ref)
+        if ref in stack or len(stack) >= _MAX_REF_DEPTH or self._nodes + (cached[1] if cached else 0) > self.max_nodes:
+            self._cuts += 1
+            return {'$ref': ref}
+        if cached is None:
+            target = self._lookup(ref)
+            if target is None:
+                return node
+            cuts, nodes = self._cuts, self._nodes
+            resolved = self._resolve(target, stack + (ref,))
+            # 展开结果不含截断时与上下文无关，可以缓存
+            if cuts == self._cuts:
+                self._cache[ref] = (resolved, self._nodes - nodes)
+        else:
+            resolved, size = cached
+            self._nodes += size
+        siblings = {key: self._resolve(value, stack) for key, value in node.items() if key != '$ref'}
+        if siblings and isinstance(resolved, dict):
+            return {**resolved, **siblings}
+        return resolved
+
+    def _lookup(self, ref: str) -> Any:
+        node: Any = self.document
+        for part in ref[2:].split('/'):
+            part = unquote(part).replace('~1', '/').replace('~0', '~')
+            if isinstance(node, dict):
+                node = node.get(part)
+            elif isinstance(node, list) and part.isdigit() and int(part) < len(node):
+                node = node[int(part)]
+            else:
+                return None
+        return node
+
+
+def _format_of(media_type: Optional[str], response: bool = False) -> str:
+    """媒体类型 -> request_format (json/form/xml) 或 response_format (json/xml/text)"""
+    media_type = (media_type or '').lower()
+    if not media_type or 'json' in media_type:
+        return 'json'
+    if 'xml' in media_type:
+        return 'xml'
+    if not response and 'form' in media_type:
+        return 'form'
+    return 'text' if response else 'json'
+
+
+def _pick_media(media_types: List[str]) -> Optional[str]:
+    """优先选择JSON媒体类型"""
+    for media_type in media_types:
+        if 'json' in media_type.lower():
+            return media_type
+    return media_types[0] if media_types else None
+
+
+def _example_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _content_example(content: Dict[str, Any]) -> Any:
+    """OpenAPI 3 媒体类型对象的示例：example > examples 首项 > schema.example"""
+    if not isinstance(content, dict):
+        return None
+    if 'example' in content:
+        return content['example']
+    examples = content.get('examples')
+    if isinstance(examples, dict):
+        for example in examples.values():
+            if isinstance(example, dict) and 'value' in example:
+                return example['value']
+    schema = content.get('schema')
+    return schema.get('example') if isinstance(schema, dict) else None
+
+
+class SpecMapper:
+    """OpenAPI 3 / Swagger 2 操作 -> API接口数据"""
+
+    def __init__(self, sections: Dict[str, Any], system_id: int, version: str = 'v1',
+                 base_path: Optional[str] = None):
+        if str(sections.get('openapi', '')).startswith('3'):
+            self.spec_type = f"openapi {sections['openapi']}"
+            self.is_v3 = True
+        elif str(sections.get('swagger', '')).startswith('2'):
+            self.spec_type = f"swagger {sections['swagger']}"
+            self.is_v3 = False
+        else:
+            raise ValueError("不是有效的OpenAPI 3 / Swagger 2 文档（缺少 openapi 或 swagger 版本字段）")
+        self.system_id = system_id
+        self.version = version or 'v1'
+        self.resolver = RefResolver(sections)
+        info = sections.get('info') if isinstance(sections.get('info'), dict) else {}
+        self.title = info.get('title')
+        self.spec_version = info.get('version')
+        self.base_path = (self._spec_base_path(sections) if base_path is None else base_path).rstrip('/')
+        self.security = sections.get('security') or []
+        self.consumes = sections.get('consumes') or []
+        self.produces = sections.get('produces') or []
+        self.tag_descriptions = {tag.get('name'): tag.get('description') for tag in sections.get('tags') or []
+                                 if isinstance(tag, dict)}
+
+    def _spec_base_path(self, sections: Dict[str, Any]) -> str:
+        """Swagger 2 的 basePath，或 OpenAPI 3 首个 server URL 的路径部分（变量取默认值）"""
+        if not self.is_v3:
+            return sections.get('basePath') or ''
+        servers = sections.get('servers') or []
+        if not servers or not isinstance(servers[0], dict):
+            return ''
+        url = servers[0].get('url') or ''
+        for name, variable in (servers[0].get('variables') or {}).items():
+            if isinstance(variable, dict):
+                url = url.replace(f'{{{name}}}', str(variable.get('default', '')))
+        return urlparse(url).path if '://' in url else url
+
+    def iter_operations(self, path: str, item: Any) -> Iterator[Tuple[Optional[Dict[str, Any]], str, str]]:
+        """
+        映射路径项下的全部操作
+
+        Args:
+            path (str): 规范中的路径
+            item (Any): 路径项
+
+        Yields:
+            Tuple[Optional[Dict[str, Any]], str, str]: (接口数据, 名称, 跳过原因)，不支持的方法接口数据为None
+        """
+        item = self.resolver.deref(item)
+        if not isinstance(item, dict):
+            return
+        full_path = self.base_path + (path if path.startswith('/') else f'/{path}')
+        shared = self.resolver.resolve(item.get('parameters') or [])
+        for method in _SPEC_METHODS:
+            operation = self.resolver.deref(item.get(method))
+            if not isinstance(operation, dict):
+                continue
+            operation = self.resolver.resolve(operation)
+            name = (operation.get('summary') or operation.get('operationId') or f"{method.upper()} {full_path}").strip()
+            if method.upper() not in _SUPPORTED_METHODS:
+                yield None, name, f"不支持的HTTP方法: {method.upper()} {full_path}"
+                continue
+            yield self._map(method.upper(), full_path, name, operation, shared), name, ''
+
+    def _map(self, method: str, path: str, name: str, operation: Dict[str, Any],
+             shared: List[Any]) -> Dict[str, Any]:
+        parameters = {}
+        for parameter in list(shared) + list(operation.get('parameters') or []):
+            if isinstance(parameter, dict):
+                parameters[(parameter.get('name'), parameter.get('in'))] = parameter
+        if self.is_v3:
+            request = self._request_v3(operation, list(parameters.values()))
+            response = self._response_v3(operation)
+        else:
+            request = self._request_v2(operation, list(parameters.values()))
+            response = self._response_v2(operation)
+        security = operation['security'] if 'security' in operation else self.security
+        tags = [str(tag) for tag in operation.get('tags') or []]
+        return {
+            'system_id': self.system_id,
+            'name': name,
+            'description': operation.get('description') or operation.get('summary'),
+            'method': method,
+            'path': path,
+            'version': self.version,
+            'status': 'deprecated' if operation.get('deprecated') else 'active',
+            'request_format': request['format'],
+            'response_format': response['format'],
+            'auth_required': 1 if any(requirement for requirement in security or []) else 0,
+            'tags': ','.join(tags) or None,
+            'request_schema': request['schema'],
+            'response_schema': response['schema'],
+            'example_request': _example_text(request['example']),
+            'example_response': _example_text(response['example'])
+        }
+
+    def _request_v3(self, operation: Dict[str, Any], parameters: List[Dict[str, Any]]) -> Dict[str, Any]:
+        schema: Dict[str, Any] = {}
+        if parameters:
+            schema['parameters'] = parameters
+        body = operation.get('requestBody')
+        content = body.get('content') if isinstance(body, dict) else None
+        media_type = _pick_media(list(content)) if isinstance(content, dict) else None
+        example = None
+        if media_type:
+            media = content[media_type] if isinstance(content[media_type], dict) else {}
+            schema['content_type'] = media_type
+            if media.get('schema') is not None:
+                schema['body'] = media['schema']
+            if body.get('required'):
+                schema['body_required'] = True
+            example = _content_example(media)
+        return {'format': _format_of(media_type), 'schema': schema or None, 'example': example}
+
+    def _response_v3(self, operation: Dict[str, Any]) -> Dict[str, Any]:
+        response = self._success_response(operation)
+        content = response.get('content') if isinstance(response, dict) else None
+        media_type = _pick_media(list(content)) if isinstance(content, dict) else None
+        if not media_type:
+            return {'format': 'json', 'schema': None, 'example': None}
+        media = content[media_type] if isinstance(content[media_type], dict) else {}
+        schema = media.get('schema')
+        return {'format': _format_of(media_type, response=True),
+                'schema': schema if isinstance(schema, dict) else None,
+                'example': _content_example(media)}
+
+    def _request_v2(self, operation: Dict[str, Any], parameters: List[Dict[str, Any]]) -> Dict[str, Any]:
+        schema: Dict[str, Any] = {}
+        plain = [parameter for parameter in parameters if parameter.get('in') not in ('body', 'formData')]
+        if plain:
+            schema['parameters'] = plain
+        media_type = _pick_media(operation.get('consumes') or self.consumes)
+        example = None
+        body = next((parameter for parameter in parameters if parameter.get('in') == 'body'), None)
+        form = [parameter for parameter in parameters if parameter.get('in') == 'formData']
+        if body is not None:
+            if body.get('schema') is not None:
+                schema['body'] = body['schema']
+            if body.get('required'):
+                schema['body_required'] = True
+            example = body.get('x-example')
+            if example is None and isinstance(body.get('schema'), dict):
+                example = body['schema'].get('example')
+        elif form:
+            schema['body'] = {
+                'type': 'object',
+                'properties': {parameter.get('name'): {key: value for key, value in parameter.items()
+                                                       if key not in ('name', 'in', 'required')}
+                               for parameter in form},
+                'required': [parameter.get('name') for parameter in form if parameter.get('required')]
+            }
+            if not media_type or 'json' in media_type.lower():
+                media_type = 'application/x-www-form-urlencoded'
+        if media_type and 'body' in schema:
+            schema['content_type'] = media_type
+        return {'format': _format_of(media_type if 'body' in schema else None), 'schema': schema or None,
+                'example': example}
+
+    def _response_v2(self, operation: Dict[str, Any]) -> Dict[str, Any]:
+        response = self._success_response(operation)
+        if not isinstance(response, dict):
+            return {'format': 'json', 'schema': None, 'example': None}
+        produces = operation.get('produces') or self.produces
+        examples = response.get('examples') if isinstance(response.get('examples'), dict) else {}
+        media_type = _pick_media(list(examples) or produces)
+        example = examples.get(media_type) if media_type in examples else None
+        schema = response.get('schema')
+        if example is None and isinstance(schema, dict):
+            example = schema.get('example')
+        return {'format': _format_of(media_type, response=True),
+                'schema': schema if isinstance(schema, dict) else None,
+                'example': example}
+
+    @staticmethod
+    def _success_response(operation: Dict[str, Any]) -> Any:
+        """首个2xx响应，缺省时为 default"""
+        responses = operation.get('responses')
+        if not isinstance(responses, dict):
+            return None
+        for code in sorted(responses):
+            if code.startswith('2'):
+                return responses[code]
+        return responses.get('default')
+
+
+class ModuleMapper:
+    """操作标签 -> 系统下的同名模块（不存在时创建）"""
+
+    def __init__(self, system_id: int, tag_descriptions: Dict[str, Optional[str]],
+                 module_id: Optional[int] = None):
+        self.system_id = system_id
+        self.module_id = module_id
+        self.tag_descriptions = tag_descriptions
+        self.created: List[str] = []
+        self._modules: Optional[Dict[str, int]] = None
+
+    def module_for(self, tags: Optional[str]) -> int:
+        """按首个标签取模块ID"""
+        if self.module_id is not None:
+            return self.module_id
+        if self._modules is None:
+            self._modules = {}
+            for module in ModuleDAO.get_by_system_id(self.system_id, {'id', 'name'}):
+                self._modules.setdefault(module['name'], module['id'])
+        name = tags.split(',')[0] if tags else DEFAULT_MODULE_NAME
+        module_id = self._modules.get(name)
+        if module_id is None:
+            module_id = ModuleDAO.create(self.system_id, name, description=self.tag_descriptions.get(name))
+            self._modules[name] = module_id
+            self.created.append(name)
+        return module_id
+
+
+# ---------------------------------------------------------------------------
+# 导入服务
+# ---------------------------------------------------------------------------
+
+class OpenApiImportService:
+    """OpenAPI/Swagger 规范导入服务"""
+
+    @staticmethod
+    async def spool(chunks: AsyncIterator[bytes]) -> BinaryIO:
+        """
+        将上传的字节流写入临时文件（小文件留在内存，超过 IMPORT_SPOOL_MAX_SIZE 落盘）
+
+        Args:
+            chunks (AsyncIterator[bytes]): 请求体字节流
+
+        Returns:
+            BinaryIO: 已定位到开头的临时文件，调用方负责关闭
+        """
+        spooled = tempfile.SpooledTemporaryFile(max_size=get_config().IMPORT_SPOOL_MAX_SIZE)
+        async for data in chunks:
+            spooled.write(data)
+        spooled.seek(0)
+        return spooled
+
+    @staticmethod
+    def import_spec(source: BinaryIO, system_id: int, module_id: Optional[int] = None, version: str = 'v1',
+                    base_path: Optional[str] = None, spec_format: Optional[str] = None,
+                    content_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        导入OpenAPI/Swagger文档中的全部操作（增量同步：新增、覆盖变更、跳过未变更）
+
+        Args:
+            source (BinaryIO): 可重复读取（seek）的文档字节流
+            system_id (int): 目标系统ID
+            module_id (Optional[int]): 统一的目标模块ID，为空时按首个标签映射到同名模块
+            version (str): 接口版本（唯一键的一部分）
+            base_path (Optional[str]): 路径前缀，为空时使用文档的 basePath / servers
+            spec_format (Optional[str]): json / yaml，为空时自动识别
+            content_type (Optional[str]): 上传的Content-Type（辅助识别格式）
+
+        Returns:
+            Dict[str, Any]: 文档信息与导入结果（逐项结果的 index 为操作在文档中的序号）
+
+        Raises:
+            ValueError: 系统或模块无效、文档格式无效
+        """
+        # 接口层在线程池中调用：分块事务使用本线程独立连接，提交/回滚不影响共享连接上其他请求的写入
+        return run_with_dedicated_connection(
+            OpenApiImportService._import_spec, source, system_id, module_id, version, base_path,
+            spec_format, content_type
+        )
+
+    @staticmethod
+    def _import_spec(source: BinaryIO, system_id: int, module_id: Optional[int], version: str,
+                     base_path: Optional[str], spec_format: Optional[str],
+                     content_type: Optional[str]) -> Dict[str, Any]:
+        if SystemDAO.get_by_id(system_id) is None:
+            raise ValueError(f"系统不存在: ID {system_id}")
+        if module_id is not None:
+            module = ModuleDAO.get_by_id(module_id)
+            if module is None or module.get('system_id') != system_id:
+                raise ValueError(f"模块 ID {module_id} 不属于系统 ID {system_id}")
+
+        spec_format = (spec_format or '').lower() or detect_format(source.read(64), content_type)
+        if spec_format not in ('json', 'yaml'):
+            raise ValueError(f"不支持的文档格式: {spec_format}，支持: json, yaml")
+
+        source.seek(0)
+        mapper = SpecMapper(read_sections(OpenApiImportService._events(source, spec_format)),
+                            system_id, version, base_path)
+        modules = ModuleMapper(system_id, mapper.tag_descriptions, module_id)
+
+        source.seek(0)
+        state = ImportState(overwrite=True, skip_unchanged=True)
+        chunk_size = get_config().IMPORT_CHUNK_SIZE
+        chunk: List[Tuple[int, Any]] = []
+        index = 0
+        for path, item in iter_path_items(OpenApiImportService._events(source, spec_format)):
+            for api, name, reason in mapper.iter_operations(path, item):
+                index += 1
+                if api is None:
+                    state.total += 1
+                    state.record(index, name, 'skipped', error=reason)
+                    continue
+                api['module_id'] = modules.module_for(api['tags'])
+                chunk.append((index, api))
+                if len(chunk) >= chunk_size:
+                    ApiImportService.import_chunk(chunk, state)
+                    chunk = []
+        if chunk:
+            ApiImportService.import_chunk(chunk, state)
+
+        ApiImportService.log_summary(state)
+        logger.info(f"导入 {mapper.spec_type} 文档 {mapper.title or ''}: 共 {index} 个操作，"
+                    f"新建模块 {len(modules.created)} 个")
+        return {
+            'spec_type': mapper.spec_type,
+            'spec_title': mapper.title,
+            'spec_version': None if mapper.spec_version is None else str(mapper.spec_version),
+            'created_modules': modules.created,
+            **state.summary()
+        }
+
+    @staticmethod
+    def _events(source: BinaryIO, spec_format: str) -> Iterator[Tuple[str, Any]]:
+        return _json_events(source) if spec_format == 'json' else _yaml_events(source)
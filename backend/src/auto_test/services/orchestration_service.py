@@ -14,17 +14,18 @@
 """
 
 import asyncio
+import json
 import uuid
 from typing import Dict, Any, List, Optional, AsyncGenerator
 from datetime import datetime
 
-from ..agents.intent_parser import IntentParser
-from ..agents.flow_planner import FlowPlanner
-from ..agents.execution_engine import ExecutionEngine
-from ..mcp.client import MCPClient
+from ..agents.admission import AdmissionRejectedError, execution_admission
+from ..agents.pool import agent_pool
+from ..agents.plan_graph import PlanGraph
+from ..agents.param_template import PlanTemplates
 from ..database.dao_ai import AIExecutionDAO, OrchestrationPlanDAO, ExecutionStepDAO
+from .plan_cache import CompiledPlan, plan_compile_cache, plan_content_hash
 from ..utils.logger import get_logger
-from ..config import Config
 
 logger = get_logger(__name__)
 
@@ -46,21 +47,23 @@ class OrchestrationService:
         Returns:
             Dict[str, Any]: 执行结果
         """
-        config = Config()
         execution_id = str(uuid.uuid4())
         
         try:
             logger.info(f"开始执行编排任务: {execution_id}")
             
+            # 0. 准入检查（执行队列已满时在意图理解前拒绝）
+            execution_admission.ensure_capacity()
+            
             # 1. 意图理解
-            intent_parser = IntentParser(config)
+            intent_parser = agent_pool.intent_parser
             intent_result = await intent_parser.run({"user_input": user_input})
             
             if not intent_result['success']:
                 raise Exception(f"意图理解失败: {intent_result.get('error', '未知错误')}")
             
             # 2. 流程规划
-            flow_planner = FlowPlanner(config)
+            flow_planner = agent_pool.flow_planner
             planning_result = await flow_planner.run({
                 "intent_result": intent_result['result'],
                 "context": context or {}
@@ -79,12 +82,13 @@ class OrchestrationService:
                 if validation_result['issues']:
                     raise Exception(f"计划校验失败: {'; '.join(validation_result['issues'])}")
             
-            # 4. 执行引擎启动
-            execution_engine = ExecutionEngine(config)
-            execution_result = await execution_engine.run({
+            # 4. 执行引擎启动（优先级取自意图上下文，调用方上下文优先）
+            intent_context = intent_result['result'].get('context') or {}
+            execution_result = await OrchestrationService._start_execution({
                 "execution_plan": execution_plan,
                 "context": {
                     "execution_id": execution_id,
+                    "priority": intent_context.get('priority'),
                     **(context or {})
                 }
             })
@@ -92,8 +96,8 @@ class OrchestrationService:
             logger.info(f"编排任务启动成功: {execution_id}")
             
             return {
-                "execution_id": execution_id,
-                "status": "started",
+                "execution_id": OrchestrationService._started_execution_id(execution_result) or execution_id,
+                "status": OrchestrationService._started_status(execution_result),
                 "intent_result": intent_result['result'],
                 "execution_plan": execution_plan,
                 "plan_summary": planning_result['result'].get('plan_summary', {}),
@@ -118,18 +122,17 @@ class OrchestrationService:
         Returns:
             Dict[str, Any]: 生成结果
         """
-        config = Config()
         
         try:
             # 1. 意图理解
-            intent_parser = IntentParser(config)
+            intent_parser = agent_pool.intent_parser
             intent_result = await intent_parser.run({"user_input": intent_text})
             
             if not intent_result['success']:
                 raise Exception(f"意图理解失败: {intent_result.get('error', '未知错误')}")
             
             # 2. 流程规划
-            flow_planner = FlowPlanner(config)
+            flow_planner = agent_pool.flow_planner
             planning_result = await flow_planner.run({
                 "intent_result": intent_result['result'],
                 "context": context
@@ -159,6 +162,95 @@ class OrchestrationService:
             logger.error(f"计划生成失败: {str(e)}")
             raise
     
+    @staticmethod
+    async def stream_plan_preview(intent_text: str, context: Dict[str, Any]) -> AsyncGenerator[Dict[str, Any], None]:
+        """流式生成计划预览
+        
+        意图理解的actions每完成一个即推送，并立即在后台解析其API接口；
+        意图理解结束后复用已解析的接口完成规划，最后推送完整计划。
+        
+        Args:
+            intent_text: 意图文本
+            context: 上下文信息
+            
+        Yields:
+            Dict[str, Any]: 事件，event取值 action / interface / intent / plan / error
+        """
+        intent_parser = agent_pool.intent_parser
+        flow_planner = agent_pool.flow_planner
+        pending: Dict[int, asyncio.Task] = {}
+        resolved_interfaces: Dict[Any, Any] = {}
+        
+        def drain(done_only: bool) -> List[Dict[str, Any]]:
+            events = []
+            for index in [i for i, task in pending.items() if task.done() or not done_only]:
+                task = pending.pop(index)
+                if task.cancelled() or task.exception() is not None:
+                    continue
+                key, api_info = task.result()
+                resolved_interfaces[key] = api_info
+                events.append({
+                    "event": "interface",
+                    "index": index,
+                    "data": OrchestrationService._interface_preview(api_info)
+                })
+            return events
+        
+        try:
+            intent_result = None
+            async for item in intent_parser.process_stream({"user_input": intent_text, "context": context}):
+                if item['type'] == 'action':
+                    action = item['data']
+                    if action.get('action') in ('api_call', 'api_test'):
+                        pending[item['index']] = asyncio.create_task(
+                            flow_planner.prefetch_action_interface(action)
+                        )
+                    yield {"event": "action", "index": item['index'], "data": action}
+                else:
+                    intent_result = item['data']
+                    yield {"event": "intent", "data": intent_result}
+                for event in drain(done_only=True):
+                    yield event
+            
+            # 等待剩余的接口解析
+            if pending:
+                await asyncio.wait(list(pending.values()))
+            for event in drain(done_only=False):
+                yield event
+            
+            planning_result = await flow_planner.run({
+                "intent_result": intent_result,
+                "context": context,
+                "resolved_interfaces": resolved_interfaces
+            })
+            if not planning_result['success']:
+                raise Exception(f"流程规划失败: {planning_result.get('error', '未知错误')}")
+            
+            execution_plan = planning_result['result']['execution_plan']
+            yield {
+                "event": "plan",
+                "data": {
+                    "plan": execution_plan,
+                    "unresolved_inputs": OrchestrationService._extract_unresolved_inputs(execution_plan),
+                    "plan_summary": planning_result['result'].get('plan_summary', {})
+                }
+            }
+            
+        except Exception as e:
+            logger.error(f"流式计划预览失败: {str(e)}")
+            yield {"event": "error", "message": str(e)}
+        finally:
+            for task in pending.values():
+                task.cancel()
+    
+    @staticmethod
+    def _interface_preview(api_info: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """精简API接口信息用于预览推送"""
+        if not api_info:
+            return None
+        fields = ('id', 'name', 'method', 'path', 'system_id', 'module_id')
+        return {field: api_info.get(field) for field in fields}
+    
     @staticmethod
     async def validate_plan(plan: Dict[str, Any]) -> Dict[str, Any]:
         """校验执行计划（Step3）
@@ -214,12 +306,13 @@ class OrchestrationService:
                         issues.append(f"步骤{step_id}依赖不存在的步骤: {dep}")
             
             # 4. 循环依赖检查
-            if OrchestrationService._has_circular_dependency(steps):
-                issues.append("检测到循环依赖")
+            graph = PlanGraph.from_steps(step for step in steps if isinstance(step, dict))
+            cycle = graph.find_cycle()
+            if cycle:
+                issues.append(f"检测到循环依赖: {' -> '.join(cycle)}")
             
             # 5. 工具可用性检查
-            config = Config()
-            mcp_client = MCPClient(config)
+            mcp_client = agent_pool.mcp_client
             await mcp_client.initialize()
             
             available_tools = await mcp_client.list_tools()
@@ -230,8 +323,9 @@ class OrchestrationService:
                 if tool_name and tool_name not in available_tool_names:
                     warnings.append(f"步骤{step.get('step_id')}使用的工具不可用: {tool_name}")
             
-            # 6. 超时设置检查
-            total_timeout = sum(step.get('timeout', 30) for step in steps)
+            # 6. 超时设置检查（执行引擎按顺序执行，按总超时累加）
+            total_timeout = sum(graph.durations)
+            critical_duration, critical_path = graph.critical_path()
             if total_timeout > 600:  # 10分钟
                 warnings.append(f"总超时时间过长: {total_timeout}秒")
             
@@ -242,6 +336,9 @@ class OrchestrationService:
                 "metadata": {
                     "total_steps": len(steps),
                     "total_timeout": total_timeout,
+                    "critical_path": critical_path,
+                    "critical_path_duration": critical_duration,
+                    "parallel_waves": len(graph.waves()),
                     "validated_at": datetime.now().isoformat()
                 }
             }
@@ -273,21 +370,12 @@ class OrchestrationService:
             required_params = set()
             optional_params = set()
             
-            steps = plan.get('steps', [])
-            for step in steps:
-                parameters = step.get('parameters', {})
-                
-                # 查找占位符参数
-                import re
-                for key, value in parameters.items():
-                    if isinstance(value, str):
-                        # 查找 {{param_name}} 格式的占位符
-                        placeholders = re.findall(r'\{\{(\w+)\}\}', value)
-                        for placeholder in placeholders:
-                            if placeholder.startswith('required_'):
-                                required_params.add(placeholder)
-                            else:
-                                optional_params.add(placeholder)
+            templates = PlanTemplates.compile(plan)
+            for placeholder in templates.variables - templates.produced:
+                if placeholder.startswith('required_'):
+                    required_params.add(placeholder)
+                else:
+                    optional_params.add(placeholder)
             
             # 2. 检查必需参数
             for param in required_params:
@@ -346,8 +434,7 @@ class OrchestrationService:
             Optional[Dict[str, Any]]: 执行状态信息
         """
         try:
-            config = Config()
-            execution_engine = ExecutionEngine(config)
+            execution_engine = agent_pool.execution_engine
             return await execution_engine.get_execution_status(execution_id)
             
         except Exception as e:
@@ -365,8 +452,7 @@ class OrchestrationService:
             执行事件
         """
         try:
-            config = Config()
-            execution_engine = ExecutionEngine(config)
+            execution_engine = agent_pool.execution_engine
             
             async for event in execution_engine.subscribe_events(execution_id):
                 yield event
@@ -426,7 +512,8 @@ class OrchestrationService:
                 if field not in flow_data:
                     raise ValueError(f"缺少必需字段: {field}")
             
-            # 创建流程
+            # 创建流程（记录内容哈希，用于编译产物缓存）
+            flow_data = {**flow_data, 'plan_hash': plan_content_hash(flow_data['execution_plan'])}
             flow = OrchestrationPlanDAO.create_plan(flow_data)
             
             logger.info(f"创建编排流程成功: {flow['id']}")
@@ -485,6 +572,138 @@ class OrchestrationService:
             logger.error(f"更新流程失败: {str(e)}")
             raise
     
+    @staticmethod
+    async def compile_plan(plan: Dict[str, Any], plan_hash: Optional[str] = None) -> CompiledPlan:
+        """编译执行计划（按内容哈希命中缓存时跳过校验、图分析与API解析）
+        
+        Args:
+            plan: 执行计划
+            plan_hash: 计划内容哈希，为空时现场计算
+            
+        Returns:
+            CompiledPlan: 编译产物
+        """
+        plan_hash = plan_hash or plan_content_hash(plan)
+        compiled = plan_compile_cache.get(plan_hash)
+        if compiled is not None:
+            return compiled
+        
+        plan_compile_cache.record_miss()
+        validation = await OrchestrationService.validate_plan(plan)
+        compiled = CompiledPlan.build(plan, plan_hash, validation)
+        plan_compile_cache.put(compiled)
+        return compiled
+    
+    @staticmethod
+    async def load_compiled_flow(flow_id: int) -> Optional[CompiledPlan]:
+        """获取已保存流程的编译产物
+        
+        依次尝试内存缓存、持久化的编译产物，都不可用时重新编译并持久化。
+        
+        Args:
+            flow_id: 流程ID
+            
+        Returns:
+            Optional[CompiledPlan]: 编译产物，流程不存在时返回None
+        """
+        state = OrchestrationPlanDAO.get_compile_state(flow_id)
+        if not state:
+            return None
+        
+        plan_hash = state.get('plan_hash')
+        if plan_hash:
+            compiled = plan_compile_cache.get(plan_hash)
+            if compiled is not None:
+                return compiled
+        
+        plan = json.loads(state['execution_plan'])
+        if not plan_hash:
+            plan_hash = plan_content_hash(plan)
+        else:
+            compiled = plan_compile_cache.load(state.get('compiled_plan'), plan_hash, plan)
+            if compiled is not None:
+                return compiled
+        
+        compiled = await OrchestrationService.compile_plan(plan, plan_hash)
+        OrchestrationPlanDAO.save_compiled_plan(
+            flow_id, plan_hash, json.dumps(compiled.to_dict(), ensure_ascii=False)
+        )
+        return compiled
+    
+    @staticmethod
+    async def execute_flow(flow_id: int, inputs: Dict[str, Any] = None,
+                          context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """执行已保存的流程
+        
+        Args:
+            flow_id: 流程ID
+            inputs: 执行入参（作为计划变量）
+            context: 执行上下文
+            
+        Returns:
+            Dict[str, Any]: 执行结果
+        """
+        inputs = inputs or {}
+        compiled = await OrchestrationService.load_compiled_flow(flow_id)
+        if compiled is None:
+            raise ValueError(f"流程不存在: {flow_id}")
+        if not compiled.ok:
+            raise ValueError(f"计划校验失败: {'; '.join(compiled.validation.get('issues', []))}")
+        
+        missing = [name for name in compiled.templates.unresolved_inputs(inputs)
+                   if name.startswith('required_')]
+        if missing:
+            raise ValueError(f"缺少必需参数: {', '.join(missing)}")
+        
+        execution_result = await OrchestrationService._start_execution({
+            "execution_plan": compiled.plan,
+            "templates": compiled.templates,
+            "context": {
+                **(context or {}),
+                "variables": dict(inputs)
+            }
+        })
+        # 执行记录与状态查询使用执行引擎生成的ID
+        execution_id = OrchestrationService._started_execution_id(execution_result)
+        
+        logger.info(f"流程执行启动成功: {flow_id}, {execution_id}")
+        return {
+            "execution_id": execution_id,
+            "flow_id": flow_id,
+            "status": OrchestrationService._started_status(execution_result),
+            "plan_hash": compiled.plan_hash,
+            "compiled_at": compiled.compiled_at,
+            "validation_result": compiled.validation,
+            "execution_result": execution_result
+        }
+    
+    @staticmethod
+    async def _start_execution(payload: Dict[str, Any]) -> Dict[str, Any]:
+        """经执行引擎启动执行，准入控制拒绝时抛出AdmissionRejectedError
+
+        Args:
+            payload: 执行引擎输入（execution_plan / templates / context）
+
+        Returns:
+            Dict[str, Any]: 执行引擎结果
+        """
+        execution_admission.ensure_capacity()
+        execution_result = await agent_pool.execution_engine.run(payload)
+        if not execution_result['success'] and execution_result.get('error_type') == AdmissionRejectedError.__name__:
+            raise AdmissionRejectedError(execution_admission.queue_depth, execution_admission.retry_after())
+        return execution_result
+    
+    @staticmethod
+    def _started_execution_id(execution_result: Dict[str, Any]) -> Optional[str]:
+        """执行引擎生成的执行ID（执行记录、状态查询与取消均使用该ID）"""
+        return (execution_result.get('result') or {}).get('execution_id')
+    
+    @staticmethod
+    def _started_status(execution_result: Dict[str, Any]) -> str:
+        """启动结果状态：排队中为queued，否则为started"""
+        result = execution_result.get('result') or {}
+        return "queued" if result.get('status') == 'queued' else "started"
+    
     @staticmethod
     async def get_available_tools(tool_type: Optional[str] = None, 
                                 enabled_only: bool = True) -> List[Dict[str, Any]]:
@@ -498,8 +717,7 @@ class OrchestrationService:
             List[Dict[str, Any]]: 工具列表
         """
         try:
-            config = Config()
-            mcp_client = MCPClient(config)
+            mcp_client = agent_pool.mcp_client
             await mcp_client.initialize()
             
             return await mcp_client.list_tools(tool_type, enabled_only)
@@ -519,8 +737,7 @@ class OrchestrationService:
             Optional[Dict[str, Any]]: 工具Schema
         """
         try:
-            config = Config()
-            mcp_client = MCPClient(config)
+            mcp_client = agent_pool.mcp_client
             await mcp_client.initialize()
             
             return await mcp_client.get_tool_schema(tool_name)
@@ -562,7 +779,8 @@ class OrchestrationService:
                 "performance": {
                     "avg_execution_time": 0,
                     "success_rate": 0
-                }
+                },
+                "agents": agent_pool.get_stats()
             }
             
             return stats
@@ -573,56 +791,5 @@ class OrchestrationService:
     
     @staticmethod
     def _extract_unresolved_inputs(plan: Dict[str, Any]) -> List[str]:
-        """提取未解决的输入参数"""
-        unresolved = []
-        
-        steps = plan.get('steps', [])
-        for step in steps:
-            parameters = step.get('parameters', {})
-            
-            # 查找占位符参数
-            import re
-            for key, value in parameters.items():
-                if isinstance(value, str):
-                    # 查找 {{param_name}} 格式的占位符
-                    placeholders = re.findall(r'\{\{(\w+)\}\}', value)
-                    unresolved.extend(placeholders)
-        
-        return list(set(unresolved))  # 去重
-    
-    @staticmethod
-    def _has_circular_dependency(steps: List[Dict[str, Any]]) -> bool:
-        """检查是否存在循环依赖"""
-        # 构建邻接表
-        graph = {}
-        for step in steps:
-            step_id = step.get('step_id')
-            dependencies = step.get('dependencies', [])
-            graph[step_id] = dependencies
-        
-        # DFS检查循环
-        visited = set()
-        rec_stack = set()
-        
-        def dfs(node):
-            if node in rec_stack:
-                return True
-            if node in visited:
-                return False
-            
-            visited.add(node)
-            rec_stack.add(node)
-            
-            for neighbor in graph.get(node, []):
-                if dfs(neighbor):
-                    return True
-            
-            rec_stack.remove(node)
-            return False
-        
-        for step_id in graph:
-            if step_id not in visited:
-                if dfs(step_id):
-                    return True
-        
-        return False
\ No newline at end of file
+        """提取未解决的输入参数（含嵌套参数中的引用，排除由前序步骤产出的变量）"""
+        return PlanTemplates.compile(plan).unresolved_inputs()
@@ -13,9 +13,10 @@ import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
-from ..database.dao import PageDAO, PageApiDAO, SystemDAO, ApiInterfaceDAO
+from ..database.dao import PageDAO, PageApiDAO, SystemDAO, ApiInterfaceDAO, PAGE_COLUMNS
 from ..models.page import PageCreate, PageUpdate, PageApiCreate, PageApiUpdate
 from ..utils.logger import get_logger
+from ..utils.fields import parse_fields, expand_fields, validate_fields, project
 
 logger = get_logger(__name__)
 
@@ -23,29 +24,54 @@ logger = get_logger(__name__)
 class PageService:
     """页面管理服务"""
     
+    # 业务字段 -> 依赖的原始列，用于字段投影
+    FIELD_DEPENDENCIES = {
+        'status_display': ('status',),
+        'page_type_display': ('page_type',),
+        'created_at_formatted': ('created_at',),
+        'updated_at_formatted': ('updated_at',),
+        'has_route': ('route_path',),
+        'can_edit': (),
+        'can_delete': (),
+        'apis': ('id',),
+        'api_count': ('id',)
+    }
+    
     @staticmethod
-    def get_pages(system_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_pages(system_id: Optional[int] = None, fields: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         获取页面列表
         
         Args:
             system_id (Optional[int]): 系统ID，如果提供则只获取该系统的页面
+            fields (Optional[str]): 逗号分隔的字段投影（如 "id,name,route_path"），为空时返回全部字段
             
         Returns:
             List[Dict[str, Any]]: 页面列表
         """
         try:
-            raw_pages = PageDAO.get_all(system_id)
+            # 字段投影：只查询需要的列；未请求apis/api_count时不再逐页查询关联API
+            selected = parse_fields(fields)
+            columns = None
+            with_apis = True
+            if selected is not None:
+                validate_fields(selected, PAGE_COLUMNS.keys() | PageService.FIELD_DEPENDENCIES.keys())
+                needed = expand_fields(selected, PageService.FIELD_DEPENDENCIES)
+                columns = needed & PAGE_COLUMNS.keys()
+                with_apis = 'apis' in needed or 'api_count' in needed
+            
+            raw_pages = PageDAO.get_all(system_id, columns)
             logger.info(f"获取页面列表，共 {len(raw_pages)} 个页面")
             
             enhanced_pages = []
             for page in raw_pages:
                 enhanced_page = PageService._transform_page_output(page)
-                # 获取页面关联的API列表
-                page_apis = PageApiDAO.get_by_page_id(page['id'])
-                enhanced_page['apis'] = [PageService._transform_page_api_output(api) for api in page_apis]
-                enhanced_page['api_count'] = len(page_apis)
-                enhanced_pages.append(enhanced_page)
+                if with_apis:
+                    # 获取页面关联的API列表
+                    page_apis = PageApiDAO.get_by_page_id(page['id'])
+                    enhanced_page['apis'] = [PageService._transform_page_api_output(api) for api in page_apis]
+                    enhanced_page['api_count'] = len(page_apis)
+                enhanced_pages.append(project(enhanced_page, selected))
             
             return enhanced_pages
             
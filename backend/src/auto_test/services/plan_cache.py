@@ -0,0 +1,213 @@
+"""执行计划编译缓存
+
+已保存的计划每次执行都要重新解析、校验、做依赖图分析和API解析。
+编译产物（校验结果、依赖图分析、API接口绑定、参数模板与变量提取器）按计划内容哈希缓存：
+- 内存中LRU缓存，命中时跳过全部编译工作
+- 持久化到api_orchestration_plans.compiled_plan，进程重启后跳过校验与图分析
+- 绑定的api_interfaces发生变化（增删改、状态变更）时按指纹失效
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from ..agents.param_template import PlanTemplates
+from ..agents.plan_graph import PlanGraph
+from ..config import get_config
+from .route_index import api_route_index
+
+# 编译产物格式版本，结构变化时递增使旧产物失效
+COMPILED_PLAN_VERSION = 1
+
+# 参与指纹计算的接口字段
+_FINGERPRINT_FIELDS = ('id', 'system_id', 'method', 'path', 'version', 'status', 'updated_at')
+
+
+def plan_content_hash(plan: Dict[str, Any]) -> str:
+    """计划内容哈希（键排序后的规范JSON）"""
+    raw = json.dumps(plan, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def api_fingerprint(api_ids: List[int]) -> str:
+    """按路由索引中接口的当前状态计算指纹，任一接口变化或被删除都会改变指纹"""
+    parts = []
+    for api_id in sorted(set(api_ids)):
+        entry = api_route_index.get(api_id)
+        parts.append([api_id] if entry is None else [entry.get(field) for field in _FINGERPRINT_FIELDS])
+    raw = json.dumps(parts, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class CompiledPlan:
+    """计划编译产物"""
+
+    def __init__(self, plan_hash: str, plan: Dict[str, Any], validation: Dict[str, Any],
+                 analysis: Dict[str, Any], api_bindings: Dict[str, Dict[str, Any]],
+                 fingerprint: str, compiled_at: Optional[str] = None,
+                 templates: Optional[PlanTemplates] = None):
+        self.plan_hash = plan_hash
+        self.plan = plan
+        self.validation = validation
+        # 依赖图分析：order / waves / critical_path / critical_path_duration
+        self.analysis = analysis
+        # 步骤ID -> 绑定的API接口
+        self.api_bindings = api_bindings
+        self.fingerprint = fingerprint
+        self.compiled_at = compiled_at or datetime.now().isoformat()
+        self.templates = templates or PlanTemplates.compile(plan)
+
+    @classmethod
+    def build(cls, plan: Dict[str, Any], plan_hash: str, validation: Dict[str, Any]) -> 'CompiledPlan':
+        """编译计划
+
+        Args:
+            plan: 执行计划
+            plan_hash: 计划内容哈希
+            validation: 计划校验结果
+
+        Returns:
+            CompiledPlan: 编译产物
+        """
+        steps = [step for step in plan.get('steps', []) if isinstance(step, dict)]
+        graph = PlanGraph.from_steps(steps)
+        duration, path = graph.critical_path()
+        analysis = {
+            'order': graph.topological_order() if not graph.has_cycle() else [],
+            'waves': graph.waves(),
+            'critical_path': path,
+            'critical_path_duration': duration
+        }
+
+        api_bindings = {}
+        for step in steps:
+            api_id = (step.get('parameters') or {}).get('api_id')
+            if api_id is None or not step.get('step_id'):
+                continue
+            entry = api_route_index.get(api_id) or {}
+            api_bindings[step['step_id']] = {
+                'api_id': api_id,
+                'method': entry.get('method'),
+                'path': entry.get('path'),
+                'system_id': entry.get('system_id'),
+                'status': entry.get('status')
+            }
+
+        fingerprint = api_fingerprint([binding['api_id'] for binding in api_bindings.values()])
+        return cls(plan_hash, plan, validation, analysis, api_bindings, fingerprint)
+
+    @property
+    def ok(self) -> bool:
+        """计划校验是否通过"""
+        return bool(self.validation.get('ok'))
+
+    def is_current(self) -> bool:
+        """绑定的API接口自编译以来未发生变化"""
+        api_ids = [binding['api_id'] for binding in self.api_bindings.values()]
+        return api_fingerprint(api_ids) == self.fingerprint
+
+    def to_dict(self) -> Dict[str, Any]:
+        """持久化表示（参数模板由计划在加载时重建，不持久化）"""
+        return {
+            'version': COMPILED_PLAN_VERSION,
+            'plan_hash': self.plan_hash,
+            'validation': self.validation,
+            'analysis': self.analysis,
+            'api_bindings': self.api_bindings,
+            'fingerprint': self.fingerprint,
+            'compiled_at': self.compiled_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], plan: Dict[str, Any]) -> Optional['CompiledPlan']:
+        """从持久化表示恢复，格式版本不一致时返回None"""
+        if data.get('version') != COMPILED_PLAN_VERSION:
+            return None
+        return cls(
+            data['plan_hash'], plan, data['validation'], data['analysis'],
+            data.get('api_bindings') or {}, data['fingerprint'], data.get('compiled_at')
+        )
+
+
+class PlanCompileCache:
+    """计划编译缓存（内存LRU，按计划内容哈希索引）"""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or get_config().PLAN_COMPILE_CACHE_MAX_ENTRIES
+        self._entries: "OrderedDict[str, CompiledPlan]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'persisted_hits': 0, 'misses': 0, 'stale': 0, 'compiles': 0}
+
+    def get(self, plan_hash: str) -> Optional[CompiledPlan]:
+        """获取内存中的有效编译产物（绑定接口变化时移除）"""
+        with self._lock:
+            compiled = self._entries.get(plan_hash)
+            if compiled is None:
+                return None
+            if not compiled.is_current():
+                del self._entries[plan_hash]
+                self._stats['stale'] += 1
+                return None
+            self._entries.move_to_end(plan_hash)
+            self._stats['hits'] += 1
+            return compiled
+
+    def load(self, raw: Optional[str], plan_hash: str, plan: Dict[str, Any]) -> Optional[CompiledPlan]:
+        """从持久化的编译产物恢复，哈希不一致、格式过期或绑定接口已变化时返回None"""
+        if not raw:
+            return None
+        try:
+            compiled = CompiledPlan.from_dict(json.loads(raw), plan)
+        except (ValueError, KeyError, TypeError):
+            return None
+        if compiled is None or compiled.plan_hash != plan_hash:
+            return None
+        if not compiled.is_current():
+            with self._lock:
+                self._stats['stale'] += 1
+            return None
+        with self._lock:
+            self._stats['persisted_hits'] += 1
+        self._store(compiled)
+        return compiled
+
+    def put(self, compiled: CompiledPlan) -> None:
+        """写入新编译的产物"""
+        with self._lock:
+            self._stats['compiles'] += 1
+        self._store(compiled)
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self._stats['misses'] += 1
+
+    def _store(self, compiled: CompiledPlan) -> None:
+        with self._lock:
+            self._entries[compiled.plan_hash] = compiled
+            self._entries.move_to_end(compiled.plan_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats['hits'] + stats['persisted_hits'] + stats['misses']
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_ratio': round((stats['hits'] + stats['persisted_hits']) / lookups, 4) if lookups else 0.0,
+                **stats
+            }
+
+
+# 全局计划编译缓存
+plan_compile_cache = PlanCompileCache()
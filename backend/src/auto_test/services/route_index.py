@@ -0,0 +1,377 @@
+"""API路由索引
+
+在内存中维护api_interfaces的编译路由索引，供流程规划、api_call工具、
+流量导入等高频匹配场景使用，避免LIKE全表扫描与逐条字符串比较。
+
+- 按路径段组织的基数树（radix trie），支持 {id} / :id / <id> 形式的路径参数段
+- match(method, url) 的复杂度与路径段数成正比，与接口总数无关
+- 静态段优先于参数段匹配（/users/me 优先于 /users/{id}）
+- 首次使用时一次性加载；API接口增删改后按ID增量更新
+- 多进程一致性：查找前按间隔检查 api_interfaces 的表版本（table_versions，写入时由触发器递增），
+  与加载时不同（其他uvicorn worker或线程独立连接写入过）时整体重建
+"""
+
+import re
+import threading
+import time
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+from urllib.parse import urlsplit
+
+from ..config import get_config
+from ..database.dao import ApiInterfaceDAO, TableVersionDAO
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 整段路径参数：{id}、:id、<id>、<int:id>
+_PARAM_SEGMENT = re.compile(r'^(?:\{([^{}/]+)\}|:([A-Za-z_]\w*)|<(?:\w+:)?([A-Za-z_]\w*)>)$')
+
+
+def normalize_path(url: str) -> str:
+    """规范化路径：去掉协议、主机、查询串和片段，合并重复斜杠，去掉末尾斜杠"""
+    if '://' in url:
+        url = urlsplit(url).path
+    else:
+        url = url.split('?', 1)[0].split('#', 1)[0]
+    url = re.sub(r'/{2,}', '/', url or '/')
+    if not url.startswith('/'):
+        url = '/' + url
+    if len(url) > 1 and url.endswith('/'):
+        url = url.rstrip('/') or '/'
+    return url
+
+
+def split_path(path: str) -> List[str]:
+    """将规范化路径拆分为路径段"""
+    stripped = path.strip('/')
+    return stripped.split('/') if stripped else []
+
+
+def param_name(segment: str) -> Optional[str]:
+    """路径参数段的参数名，非参数段返回None"""
+    matched = _PARAM_SEGMENT.match(segment)
+    if not matched:
+        return None
+    return next(group for group in matched.groups() if group)
+
+
+def fill_path_params(path: str, params: Dict[str, Any]) -> str:
+    """
+    将路径模板中的参数段替换为参数值
+
+    整段参数按与路由匹配相同的规则识别（{id}、:id、<id>、<int:id>）；
+    段内嵌入的 {name}（如 /files/{name}.json）按原样替换。
+
+    Args:
+        path (str): 接口路径模板
+        params (Dict[str, Any]): 路径参数
+
+    Returns:
+        str: 替换后的路径（未提供值的参数段保持原样）
+    """
+    if not params:
+        return path
+    segments = []
+    for segment in path.split('/'):
+        name = param_name(segment)
+        if name is not None and name in params:
+            segment = str(params[name])
+        elif '{' in segment:
+            for key, value in params.items():
+                segment = segment.replace(f'{{{key}}}', str(value))
+        segments.append(segment)
+    return '/'.join(segments)
+
+
+class _RouteNode:
+    """路由树节点"""
+
+    __slots__ = ('static', 'param', 'routes')
+
+    def __init__(self):
+        self.static: Dict[str, '_RouteNode'] = {}
+        self.param: Optional['_RouteNode'] = None
+        # 方法 -> 挂在该节点上的接口
+        self.routes: Dict[str, List[Dict[str, Any]]] = {}
+
+    def is_empty(self) -> bool:
+        return not self.static and self.param is None and not self.routes
+
+
+class ApiRouteIndex:
+    """API路由索引"""
+
+    # 未指定方法时的通配符
+    ANY_METHOD = '*'
+    # 索引依赖的表
+    TABLE = 'api_interfaces'
+
+    def __init__(self, coherence_interval: Optional[float] = None):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self.coherence_interval = (get_config().ROUTE_INDEX_COHERENCE_INTERVAL
+                                   if coherence_interval is None else coherence_interval)
+        # 加载时的表版本与上次检查时间
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._root = _RouteNode()
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        # 接口ID -> 路径参数名（按出现顺序）
+        self._param_names: Dict[int, List[str]] = {}
+        self._by_name: Dict[str, List[Dict[str, Any]]] = {}
+        self.loads = 0
+        self.incremental_updates = 0
+        self.version_reloads = 0
+
+    # ------------------------------------------------------------------
+    # 构建与增量维护
+    # ------------------------------------------------------------------
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            self._check_version()
+            if self._loaded:
+                return
+        with self._lock:
+            if self._loaded:
+                return
+            # 先取版本再加载：加载期间发生的写入会在下次检查时触发重建
+            version = self._current_version()
+            self._root = _RouteNode()
+            self._by_id, self._param_names, self._by_name = {}, {}, {}
+            entries = ApiInterfaceDAO.get_route_entries()
+            for entry in entries:
+                self._insert(entry)
+            self._version = version
+            self._checked_at = time.monotonic()
+            self._loaded = True
+            self.loads += 1
+            logger.info(f"API路由索引加载完成: {len(entries)}个接口")
+
+    def _check_version(self) -> None:
+        """按间隔检查表版本，与加载时不同则标记索引失效
+
+        本进程共享连接上的写入已经按ID增量更新过，这里同样会看到版本变化并重建一次，
+        以免漏掉同一时间段内其他进程的写入。
+        """
+        now = time.monotonic()
+        if now - self._checked_at < self.coherence_interval:
+            return
+        self._checked_at = now
+        version = self._current_version()
+        if version is not None and version != self._version:
+            self._loaded = False
+            self.version_reloads += 1
+
+    def _current_version(self) -> Optional[int]:
+        try:
+            return TableVersionDAO.get_versions([self.TABLE]).get(self.TABLE)
+        except Exception:
+            return None
+
+    def _insert(self, entry: Dict[str, Any]) -> None:
+        entry['method'] = (entry.get('method') or '').upper()
+
+        node = self._root
+        names = []
+        for segment in split_path(normalize_path(entry.get('path') or '/')):
+            name = param_name(segment)
+            if name is not None:
+                names.append(name)
+                if node.param is None:
+                    node.param = _RouteNode()
+                node = node.param
+            else:
+                node = node.static.setdefault(segment, _RouteNode())
+        node.routes.setdefault(entry['method'], []).append(entry)
+
+        self._by_id[entry['id']] = entry
+        self._param_names[entry['id']] = names
+        if entry.get('name'):
+            self._by_name.setdefault(entry['name'].strip().lower(), []).append(entry)
+
+    def _remove(self, api_id: int) -> None:
+        entry = self._by_id.pop(api_id, None)
+        self._param_names.pop(api_id, None)
+        if entry is None:
+            return
+
+        # 沿路径下降并记录经过的节点，删除后自底向上剪除空节点
+        trail: List[Tuple[_RouteNode, Optional[str]]] = []
+        node = self._root
+        for segment in split_path(normalize_path(entry.get('path') or '/')):
+            if param_name(segment) is not None:
+                trail.append((node, None))
+                node = node.param
+            else:
+                trail.append((node, segment))
+                node = node.static.get(segment)
+            if node is None:
+                return
+
+        routes = node.routes.get(entry['method'], [])
+        node.routes[entry['method']] = [item for item in routes if item['id'] != api_id]
+        if not node.routes[entry['method']]:
+            del node.routes[entry['method']]
+
+        for parent, segment in reversed(trail):
+            if not node.is_empty():
+                break
+            if segment is None:
+                parent.param = None
+            else:
+                parent.static.pop(segment, None)
+            node = parent
+
+        if entry.get('name'):
+            key = entry['name'].strip().lower()
+            remaining = [item for item in self._by_name.get(key, []) if item['id'] != api_id]
+            if remaining:
+                self._by_name[key] = remaining
+            else:
+                self._by_name.pop(key, None)
+
+    def refresh(self, api_ids: Iterable[int]) -> None:
+        """按ID增量刷新（创建、更新、状态变更后调用）
+
+        索引尚未加载时不做任何事，首次使用时会整体加载最新数据。
+        """
+        if not self._loaded:
+            return
+        api_ids = list(api_ids)
+        entries = ApiInterfaceDAO.get_route_entries(api_ids)
+        with self._lock:
+            for api_id in api_ids:
+                self._remove(api_id)
+            for entry in entries:
+                self._insert(entry)
+            self.incremental_updates += 1
+
+    def remove(self, api_ids: Iterable[int]) -> None:
+        """按ID增量删除"""
+        if not self._loaded:
+            return
+        with self._lock:
+            for api_id in api_ids:
+                self._remove(api_id)
+            self.incremental_updates += 1
+
+    def invalidate(self) -> None:
+        """标记索引整体失效（影响范围无法确定的级联写操作后调用）"""
+        self._loaded = False
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    def match(self, method: Optional[str], url: str, system_id: Optional[int] = None,
+              version: Optional[str] = None, active_only: bool = True) -> Optional[Dict[str, Any]]:
+        """将请求匹配到已注册的接口
+
+        Args:
+            method: HTTP方法，为空或'*'时匹配任意方法
+            url: 请求URL或路径（可含主机与查询串）
+            system_id: 限定系统
+            version: 限定版本
+            active_only: 只匹配启用的接口
+
+        Returns:
+            Optional[Dict[str, Any]]: {'api': 接口, 'path_params': 路径参数}，未匹配返回None
+        """
+        self._ensure_loaded()
+        method = (method or self.ANY_METHOD).upper()
+        segments = split_path(normalize_path(url))
+        captured: List[str] = []
+
+        # 深度优先：静态段优先，失败时回溯尝试参数段
+        stack: List[Tuple[_RouteNode, int, int, bool]] = [(self._root, 0, 0, False)]
+        while stack:
+            node, depth, captured_len, via_param = stack.pop()
+            del captured[captured_len:]
+            if via_param:
+                captured.append(segments[depth - 1])
+
+            if depth == len(segments):
+                entry = self._select(node, method, system_id, version, active_only)
+                if entry is not None:
+                    names = self._param_names.get(entry['id'], [])
+                    return {'api': entry, 'path_params': dict(zip(names, captured))}
+                continue
+
+            segment = segments[depth]
+            if node.param is not None:
+                stack.append((node.param, depth + 1, len(captured), True))
+            child = node.static.get(segment)
+            if child is not None:
+                stack.append((child, depth + 1, len(captured), False))
+        return None
+
+    def _select(self, node: _RouteNode, method: str, system_id: Optional[int],
+                version: Optional[str], active_only: bool) -> Optional[Dict[str, Any]]:
+        if method == self.ANY_METHOD:
+            candidates = [entry for entries in node.routes.values() for entry in entries]
+        else:
+            candidates = node.routes.get(method, [])
+        for entry in candidates:
+            if active_only and entry.get('status') != 'active':
+                continue
+            if system_id is not None and entry.get('system_id') != system_id:
+                continue
+            if version is not None and entry.get('version') != version:
+                continue
+            return entry
+        return None
+
+    def get(self, api_id: int) -> Optional[Dict[str, Any]]:
+        """按ID获取"""
+        self._ensure_loaded()
+        return self._by_id.get(api_id)
+
+    def lookup(self, method: Optional[str], path: str) -> Optional[Dict[str, Any]]:
+        """按方法和路径查找启用的接口（支持路径参数）"""
+        matched = self.match(method, path)
+        return matched['api'] if matched else None
+
+    def lookup_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """按名称精确查找启用的接口（忽略大小写）"""
+        self._ensure_loaded()
+        for entry in self._by_name.get(name.strip().lower(), []):
+            if entry.get('status') == 'active':
+                return entry
+        return None
+
+    def lookup_many(self, keys: Iterable[Tuple]) -> Dict[Tuple, Dict[str, Any]]:
+        """批量查找
+
+        Args:
+            keys: ('path', method, path) 或 ('name', name) 形式的查找键
+
+        Returns:
+            Dict[Tuple, Dict[str, Any]]: 命中的查找键 -> 接口，未命中的键不出现在结果中
+        """
+        self._ensure_loaded()
+        found = {}
+        for key in keys:
+            if key[0] == 'path':
+                entry = self.lookup(key[1], key[2])
+            elif key[0] == 'name':
+                entry = self.lookup_name(key[1])
+            else:
+                entry = None
+            if entry is not None:
+                found[key] = entry
+        return found
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取索引统计"""
+        return {
+            'loaded': self._loaded,
+            'interfaces': len(self._by_id),
+            'loads': self.loads,
+            'incremental_updates': self.incremental_updates,
+            'version_reloads': self.version_reloads
+        }
+
+
+# 全局API路由索引
+api_route_index = ApiRouteIndex()
@@ -8,7 +8,7 @@
 - 数据收集与组装
 - 业务流程协调  
 - 基础设施调用封装
-- 统一异常处理
+- 统一异常处理（数据库统计失败时抛出，由API层返回错误响应，不以全零默认值冒充成功）
 """
 
 from typing import Dict, Any
@@ -45,7 +45,7 @@ class StatsService:
             
         except Exception as e:
             logger.error(f"收集综合统计数据失败: {e}")
-            return StatsConverter.to_default_stats()
+            raise
     
     @staticmethod
     def collect_systems_stats_data() -> Dict[str, Any]:
@@ -59,7 +59,7 @@ class StatsService:
             
         except Exception as e:
             logger.error(f"收集系统统计数据失败: {e}")
-            return StatsConverter.to_default_systems_stats()
+            raise
     
     @staticmethod
     def collect_modules_stats_data() -> Dict[str, Any]:
@@ -73,7 +73,7 @@ class StatsService:
             
         except Exception as e:
             logger.error(f"收集模块统计数据失败: {e}")
-            return StatsConverter.to_default_modules_stats()
+            raise
     
     @staticmethod
     def collect_workflows_stats_data() -> Dict[str, Any]:
@@ -4,30 +4,71 @@
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, FrozenSet, Optional
 from datetime import datetime
 
-from ..database.dao import SystemDAO, ModuleDAO, SystemCategoryDAO
+from ..database.dao import SystemDAO, ModuleDAO, SystemCategoryDAO, SYSTEM_COLUMNS
 from ..models.system import System, SystemCreate, SystemUpdate
 from ..utils.logger import get_logger
-from ..transforms import SystemTransform
+from ..utils.fields import parse_fields, expand_fields, validate_fields, project
+from ..transforms import ComputedFieldRegistry, LazyRow, SystemTransform
 from ..services.module_service import ModuleService
+from .route_index import api_route_index
 
 logger = get_logger(__name__)
 
+# 业务计算字段注册表（基于Transform层注册表，可依赖其计算字段）
+_COMPUTED = ComputedFieldRegistry(base=SystemTransform.COMPUTED_FIELDS)
+
+
+@_COMPUTED.computes('module_count', 'has_modules', 'system_scale', depends=('id',))
+def _compute_module_count(system: Dict[str, Any], context: Dict[str, Any]) -> None:
+    module_count = ModuleDAO.count_by_system_id(system.get('id', 0))
+    SystemTransform.with_module_count(system, module_count, in_place=True)
+
+
+@_COMPUTED.computes('can_edit', depends=('status',))
+def _compute_can_edit(system: Dict[str, Any], context: Dict[str, Any]) -> None:
+    system['can_edit'] = system.get('status') != 'deprecated'
+
+
+@_COMPUTED.computes('can_delete', depends=('status', 'module_count'))
+def _compute_can_delete(system: Dict[str, Any], context: Dict[str, Any]) -> None:
+    system['can_delete'] = system.get('status') in ['inactive', 'development'] and system.get('module_count', 0) == 0
+
+
+@_COMPUTED.computes('importance_level', depends=('status', 'module_count', 'system_age_days'))
+def _compute_importance_level(system: Dict[str, Any], context: Dict[str, Any]) -> None:
+    system['importance_level'] = SystemService._assess_importance_level(system)
+
+
+@_COMPUTED.computes('status_recommendation', depends=('status', 'module_count', 'system_age_days'))
+def _compute_status_recommendation(system: Dict[str, Any], context: Dict[str, Any]) -> None:
+    system['status_recommendation'] = SystemService._get_status_recommendation(system)
+
 
 class SystemService:
     """系统业务服务类"""
     
+    # 计算字段注册表（含Transform层字段），用于字段投影与按需计算
+    COMPUTED_FIELDS = _COMPUTED
+    
     @staticmethod
-    def get_systems() -> List[Dict[str, Any]]:
+    def get_systems(fields: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         获取所有系统列表
         
+        Args:
+            fields (Optional[str]): 逗号分隔的字段投影（如 "id,name,status"），为空时返回全部字段
+            
         Returns:
             List[Dict[str, Any]]: 系统列表，包含业务转换后的数据
         """
         try:
+            selected = parse_fields(fields)
+            if selected is not None:
+                return SystemService._get_systems_projected(selected)
+            
             # 调用DAO层获取原始数据
             raw_systems = SystemDAO.get_all()
             logger.info(f"获取所有系统列表，共 {len(raw_systems)} 个系统")
@@ -35,23 +76,34 @@ class SystemService:
             # 使用Transform层转换数据
             transformed_systems = SystemTransform.to_list_response(raw_systems)
             
-            # 为每个系统添加模块数量统计和业务规则
-            enhanced_systems = []
-            for system in transformed_systems:
-                # 获取该系统的模块数量
-                module_count = ModuleDAO.count_by_system_id(system.get('id', 0))
-                # 添加模块数量信息
-                enhanced_system = SystemTransform.with_module_count(system, module_count)
-                # 应用业务规则
-                enhanced_system = SystemService._apply_business_rules(enhanced_system)
-                enhanced_systems.append(enhanced_system)
-            
-            return enhanced_systems
+            # 响应行由转换器新建，模块数量统计与业务规则直接写入，不再复制
+            return [SystemService._apply_business_rules(system, in_place=True) for system in transformed_systems]
             
         except Exception as e:
             logger.error(f"获取系统列表失败: {str(e)}")
             raise
     
+    @staticmethod
+    def _get_systems_projected(selected: FrozenSet[str]) -> List[Dict[str, Any]]:
+        """
+        按字段投影获取系统列表：只查询需要的列，只计算请求的字段，
+        未请求模块数量相关字段时不再逐个系统统计模块
+        
+        Args:
+            selected (FrozenSet[str]): 请求的字段
+            
+        Returns:
+            List[Dict[str, Any]]: 只包含请求字段的系统列表
+        """
+        dependencies = _COMPUTED.dependencies()
+        validate_fields(selected, SYSTEM_COLUMNS.keys() | dependencies.keys())
+        needed = expand_fields(selected, dependencies)
+        
+        raw_systems = SystemDAO.get_all(needed & SYSTEM_COLUMNS.keys())
+        systems = SystemTransform.to_list_response(raw_systems, needed)
+        return [project(SystemService._apply_business_rules(system, in_place=True, fields=needed), selected)
+                for system in systems]
+    
     @staticmethod
     def get_system_by_id(system_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -72,6 +124,23 @@ class SystemService:
             logger.error(f"获取系统详情失败: {str(e)}")
             raise
     
+    @staticmethod
+    def get_system_raw(system_id: int) -> Optional[LazyRow]:
+        """
+        根据ID获取系统原始数据（内部调用快速路径）
+        
+        只查询数据库行，不做转换与业务增强；计算字段（如 health_score、importance_level）
+        在首次访问时才计算。供只读取 id/name/category 等原始列的内部调用方使用。
+        
+        Args:
+            system_id (int): 系统ID
+            
+        Returns:
+            Optional[LazyRow]: 系统数据，不存在时返回None
+        """
+        system = SystemDAO.get_by_id(system_id)
+        return _COMPUTED.lazy(system) if system else None
+    
     @staticmethod
     def create_system(system_data: SystemCreate) -> Dict[str, Any]:
         """
@@ -184,6 +253,8 @@ class SystemService:
             # 删除系统
             success = SystemDAO.delete(system_id)
             if success:
+                # 级联影响API接口的模块/系统归属
+                api_route_index.invalidate()
                 logger.info(f"系统删除成功: ID {system_id}")
             return success
         except Exception as e:
@@ -240,38 +311,42 @@ class SystemService:
         return transformed
     
     @staticmethod
-    def _apply_business_rules(system: Dict[str, Any]) -> Dict[str, Any]:
+    def _apply_business_rules(system: Dict[str, Any], in_place: bool = False,
+                              fields: Optional[FrozenSet[str]] = None) -> Dict[str, Any]:
         """
         应用业务规则和验证
         
         Args:
             system (Dict[str, Any]): 转换后的系统数据
+            in_place (bool): 是否直接修改传入的数据（用于转换器刚构建的响应行，避免再次复制）
+            fields (Optional[FrozenSet[str]]): 字段投影（已按依赖展开），为空时应用全部规则
             
         Returns:
             Dict[str, Any]: 应用业务规则后的系统数据
         """
-        enhanced = system.copy()
+        enhanced = system if in_place else system.copy()
+        SystemService._normalize(enhanced, fields)
         
+        # 业务规则3-5: 模块数量、权限标识、重要性评估、状态建议（由计算字段注册表按需计算）
+        return _COMPUTED.evaluate(enhanced, fields)
+    
+    @staticmethod
+    def _normalize(system: Dict[str, Any], fields: Optional[FrozenSet[str]] = None) -> None:
+        """
+        规范化状态与名称（直接修改传入的数据）
+        
+        Args:
+            system (Dict[str, Any]): 系统数据
+            fields (Optional[FrozenSet[str]]): 字段投影，为空时规范化全部字段
+        """
         # 业务规则1: 检查系统状态有效性
         valid_statuses = ['active', 'inactive', 'development', 'testing', 'production', 'maintenance', 'deprecated']
-        if enhanced.get('status') not in valid_statuses:
-            enhanced['status'] = 'active'  # 默认状态
+        if (fields is None or 'status' in fields) and system.get('status') not in valid_statuses:
+            system['status'] = 'active'  # 默认状态
         
         # 业务规则2: 确保系统名称不为空
-        if not enhanced.get('name') or not enhanced.get('name').strip():
-            enhanced['name'] = f"系统_{enhanced.get('id', 'unknown')}"
-        
-        # 业务规则3: 添加权限检查标识
-        enhanced['can_edit'] = enhanced.get('status') != 'deprecated'
-        enhanced['can_delete'] = enhanced.get('status') in ['inactive', 'development'] and enhanced.get('module_count', 0) == 0
-        
-        # 业务规则4: 添加系统重要性评估
-        enhanced['importance_level'] = SystemService._assess_importance_level(enhanced)
-        
-        # 业务规则5: 添加系统状态建议
-        enhanced['status_recommendation'] = SystemService._get_status_recommendation(enhanced)
-        
-        return enhanced
+        if (fields is None or 'name' in fields) and (not system.get('name') or not system.get('name').strip()):
+            system['name'] = f"系统_{system.get('id', 'unknown')}"
     
     @staticmethod
     def _assess_importance_level(system: Dict[str, Any]) -> str:
@@ -380,8 +455,13 @@ class SystemService:
             List[Dict[str, Any]]: 系统数据列表
         """
         try:
-            # 获取所有系统数据
-            systems = SystemService.get_systems()
+            # 统计只读取状态、名称等原始列：包装为LazyRow，计算字段（含逐个系统的模块统计）按需计算
+            context = {'now': datetime.now()}
+            systems = []
+            for raw_system in SystemDAO.get_all():
+                system = _COMPUTED.lazy(raw_system, context)
+                SystemService._normalize(system)
+                systems.append(system)
             
             # 应用筛选条件
             if status:
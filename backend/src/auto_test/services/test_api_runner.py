@@ -0,0 +1,236 @@
+"""测试API执行器
+
+将test_apis记录转换为一次MCP工具调用与响应断言：
+- request_config中给出绝对URL时使用http_request，否则按api_id使用api_call
+- 请求配置预编译为参数模板，数据驱动执行时每行只做变量渲染
+- expected_response转换为validate_response规则；未配置时以2xx作为通过条件
+- 发送前按目标主机限速，限速等待不计入响应耗时
+"""
+
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from ..agents.param_template import ParamTemplate
+from ..mcp.resilience import TargetRateLimiter, resolve_target_host
+from ..mcp.tools.validation_tools import ValidationTools
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 测试API断言操作符 -> validate_response操作符
+_OPERATOR_ALIASES = {'neq': 'ne', 'match': 'matches'}
+# 测试API断言类型 -> validate_response规则类型
+_TYPE_ALIASES = {'jsonpath': 'json_path'}
+
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, 'value', value)
+
+
+class PreparedTestApi:
+    """编译后的测试API"""
+
+    __slots__ = ('test_api_id', 'api_id', 'name', 'tool_name', 'template', 'rules', 'variables')
+
+    def __init__(self, test_api: Dict[str, Any], tool_name: str, template: ParamTemplate,
+                 rules: List[Dict[str, Any]], variables: Dict[str, Any]):
+        self.test_api_id = test_api.get('id')
+        self.api_id = test_api.get('api_id')
+        self.name = test_api.get('name')
+        self.tool_name = tool_name
+        self.template = template
+        self.rules = rules
+        # execution_config.variables中的默认变量
+        self.variables = variables
+
+
+class TestApiRunner:
+    """测试API执行器"""
+
+    @staticmethod
+    def prepare(test_api: Dict[str, Any],
+                overrides: Optional[Dict[str, Any]] = None,
+                expected_response: Optional[Dict[str, Any]] = None) -> PreparedTestApi:
+        """编译测试API
+
+        Args:
+            test_api: test_apis记录（JSON字段已解析）
+            overrides: 请求覆盖项（与request_config同结构）
+            expected_response: 覆盖记录中的期望响应
+
+        Returns:
+            PreparedTestApi: 编译结果
+        """
+        request_config = dict(test_api.get('request_config') or {})
+        for key, value in (overrides or {}).items():
+            if value is not None:
+                request_config[key] = value
+        execution_config = test_api.get('execution_config') or {}
+
+        params = request_config.get('params') or request_config.get('query_params')
+        url = request_config.get('url') or ''
+        if url.startswith(('http://', 'https://')):
+            tool_name = 'http_request'
+            parameters = {
+                'method': (request_config.get('method') or 'GET').upper(),
+                'url': url,
+                'headers': request_config.get('headers') or {},
+                'timeout': request_config.get('timeout') or 30
+            }
+            if params:
+                parameters['params'] = params
+            if request_config.get('body') is not None:
+                parameters['body'] = request_config['body']
+            if request_config.get('follow_redirects') is not None:
+                parameters['follow_redirects'] = request_config['follow_redirects']
+            if request_config.get('validate_ssl') is not None:
+                parameters['verify_ssl'] = request_config['validate_ssl']
+        else:
+            tool_name = 'api_call'
+            parameters = {
+                'api_id': test_api.get('api_id'),
+                'headers': request_config.get('headers') or {},
+                'timeout': request_config.get('timeout') or 30
+            }
+            if params:
+                parameters['query_params'] = params
+            if request_config.get('body') is not None:
+                parameters['body'] = request_config['body']
+
+        rules = TestApiRunner.build_rules(
+            expected_response if expected_response is not None else test_api.get('expected_response')
+        )
+        return PreparedTestApi(
+            test_api, tool_name, ParamTemplate.compile(parameters), rules,
+            dict(execution_config.get('variables') or {})
+        )
+
+    @staticmethod
+    def build_rules(expected_response: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """将期望响应转换为validate_response规则"""
+        expected_response = expected_response or {}
+        rules = []
+        if expected_response.get('status_code') is not None:
+            rules.append({
+                'name': 'status_code', 'type': 'status_code',
+                'operator': 'eq', 'value': expected_response['status_code']
+            })
+
+        for index, assertion in enumerate(expected_response.get('assertions') or []):
+            assertion_type = _enum_value(assertion.get('type'))
+            assertion_type = _TYPE_ALIASES.get(assertion_type, assertion_type)
+            operator = _enum_value(assertion.get('operator')) or 'eq'
+            operator = _OPERATOR_ALIASES.get(operator, operator)
+            field = assertion.get('path')
+            if assertion_type == 'json_path' and field and field.startswith('$.'):
+                field = field[2:]
+            if assertion_type == 'regex':
+                # 正则断言：path/value为模式，默认断言能匹配到
+                field = field or assertion.get('value')
+                if operator == 'eq':
+                    operator = 'exists'
+            rules.append({
+                'name': f"{assertion_type}:{assertion.get('path') or index}",
+                'type': assertion_type,
+                'field': field,
+                'operator': operator,
+                'value': assertion.get('value')
+            })
+        return rules
+
+    @staticmethod
+    async def run(prepared: PreparedTestApi, mcp_client, variables: Optional[Dict[str, Any]] = None,
+                  context: Optional[Dict[str, Any]] = None,
+                  rate_limiter: Optional[TargetRateLimiter] = None) -> Dict[str, Any]:
+        """执行一次测试API
+
+        Args:
+            prepared: 编译后的测试API
+            mcp_client: MCP客户端
+            variables: 本次执行的变量（覆盖默认变量）
+            context: 工具调用上下文（base_url等）
+            rate_limiter: 目标主机限速器，为空时不限速
+
+        Returns:
+            Dict[str, Any]: 与RunResult对齐的执行结果
+        """
+        merged = {**prepared.variables, **(variables or {})}
+        parameters = prepared.template.render(merged)
+        if prepared.tool_name == 'api_call':
+            # 变量同时作为路径参数候选，未出现在路径中的变量会被忽略
+            parameters['path_params'] = {
+                key: value for key, value in merged.items() if isinstance(value, (str, int, float))
+            }
+        if rate_limiter is not None:
+            await rate_limiter.acquire(resolve_target_host(parameters, context or {}))
+
+        started_at = datetime.now()
+        started = time.perf_counter()
+        result = {
+            'run_id': uuid.uuid4().hex,
+            'test_api_id': prepared.test_api_id,
+            'api_id': prepared.api_id,
+            'started_at': started_at.isoformat(),
+            'assertions': [],
+            'assertions_passed': 0,
+            'assertions_total': 0
+        }
+
+        try:
+            tool_result = await mcp_client.call_tool(prepared.tool_name, parameters, context or {})
+        except Exception as e:
+            tool_result = {'success': False, 'error': str(e)}
+        result['ended_at'] = datetime.now().isoformat()
+
+        if not tool_result.get('success'):
+            result.update({
+                'status': 'failed',
+                'error_message': tool_result.get('error') or '请求执行失败',
+                'response_time_ms': int((time.perf_counter() - started) * 1000)
+            })
+            return result
+
+        response = tool_result.get('result') or {}
+        result.update({
+            'response_status_code': response.get('status_code'),
+            'response_time_ms': int(response.get('response_time_ms') or 0),
+            'response_headers': response.get('headers'),
+            'response_body': response.get('body')
+        })
+
+        if prepared.rules:
+            validation = await ValidationTools.validate_response(
+                {'response': response, 'rules': prepared.rules}, {}
+            )
+            assertions = [
+                {
+                    'name': item['rule'].get('name') or item['rule'].get('type'),
+                    'passed': item['passed'],
+                    'details': {
+                        'actual': item.get('actual_value'),
+                        'expected': item.get('expected_value'),
+                        'message': item.get('message')
+                    }
+                }
+                for item in validation.get('results', [])
+            ]
+        else:
+            status_code = response.get('status_code') or 0
+            assertions = [{
+                'name': 'status_code',
+                'passed': 200 <= status_code < 300,
+                'details': {'actual': status_code, 'expected': '2xx'}
+            }]
+
+        passed = sum(1 for item in assertions if item['passed'])
+        result.update({
+            'status': 'success' if passed == len(assertions) else 'failed',
+            'assertions': assertions,
+            'assertions_passed': passed,
+            'assertions_total': len(assertions)
+        })
+        if response.get('error'):
+            result['error_message'] = response['error']
+        return result
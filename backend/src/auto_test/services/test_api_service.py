@@ -1,7 +1,7 @@
 """
-API测试场景管理 Service 层占位实现
-遵循：业务编排、规则复用、事务控制（后续接入仓储层）。
-当前为骨架实现，返回示例数据结构以便前端联调。
+API测试场景管理 Service 层
+遵循：业务编排、规则复用、事务控制（数据访问经由DataService/Repository）。
+执行类接口通过测试API执行器发起真实请求，执行记录与断言报告持久化到 test_api_runs / test_api_reports。
 """
 
 from typing import Optional, Dict, Any, List, Any
@@ -64,49 +64,61 @@ class TestApiService:
     @staticmethod
     def list_runs(test_api_id: int, page: int, size: int) -> Dict[str, Any]:
         logger.info("List runs for test_api_id=%s", test_api_id)
-        items = [
-            {
-                "run_id": "101",
-                "status": "success",
-                "started_at": "2024-01-02T10:00:00Z",
-                "ended_at": "2024-01-02T10:00:05Z",
-            }
-        ]
-        return {"items": items, "page": page, "size": size, "total": 1}
+        from ..data_services.test_api_data_service import TestApiDataService
+        items, total = TestApiDataService.list_runs(test_api_id, page, size)
+        return {"items": items, "page": page, "size": size, "total": total}
 
     @staticmethod
-    def list_reports(test_api_id: int) -> Dict[str, Any]:
+    def list_reports(test_api_id: int, limit: int = 50) -> Dict[str, Any]:
         logger.info("List reports for test_api_id=%s", test_api_id)
-        items = [
-            {
-                "report_id": 201,
-                "run_id": "101",
-                "summary": {"passed": 5, "failed": 0},
-            }
-        ]
-        return {"items": items, "total": 1}
+        from ..data_services.test_api_data_service import TestApiDataService
+        items, total = TestApiDataService.list_reports(test_api_id, limit)
+        return {"items": items, "total": total}
 
     @staticmethod
-    def execute_test_api(test_api_id: int, payload: Any) -> Dict[str, Any]:
+    async def execute_test_api(test_api_id: int, payload: Any) -> Dict[str, Any]:
+        """执行单个测试API并保存执行记录与断言报告"""
         data = TestApiService._to_dict(payload)
         logger.info("Execute test api id=%s, payload=%s", test_api_id, data)
-        return {
-            "run_id": "301",
-            "status": "success",
-            "assertions": [{"name": "status_code", "passed": True}],
-            "response_status_code": 200,
-            "response_time_ms": 42,
-        }
+        from ..agents.pool import agent_pool
+        from ..data_services.test_api_data_service import TestApiDataService
+        from ..mcp.resilience import target_rate_limiter
+        from .test_api_runner import TestApiRunner
+
+        test_api = TestApiDataService.get_by_id(test_api_id)
+        if not test_api:
+            raise ValueError(f"测试API不存在: {test_api_id}")
+        overrides = {k: v for k, v in (data.get("request_overrides") or {}).items() if v is not None}
+        prepared = TestApiRunner.prepare(test_api, overrides, data.get("expected_response"))
+
+        environment = data.get("environment") or {}
+        variables = (data.get("execution_config") or {}).get("variables") or {}
+        mcp_client = agent_pool.mcp_client
+        await mcp_client.initialize()
+        result = await TestApiRunner.run(prepared, mcp_client, variables, environment, target_rate_limiter)
+        result["environment"] = environment or None
+        TestApiDataService.save_runs([result])
+        return result
 
     @staticmethod
-    def batch_execute(payload: Any) -> Dict[str, Any]:
+    async def batch_execute(payload: Any) -> Dict[str, Any]:
+        """批量执行测试API（基于批量执行服务，variables作为单行数据）"""
         data = TestApiService._to_dict(payload)
-        logger.info("Batch execute, payload=%s", data)
+        logger.info("Batch execute, test_api_ids=%s", data.get("test_api_ids"))
+        from .bulk_execution_service import BulkExecutionService
+        environment = data.get("environment") or {}
+        result = await BulkExecutionService.run_to_completion({
+            "test_api_ids": data.get("test_api_ids") or [],
+            "variables": data.get("variables") or {},
+            "context": environment,
+            "concurrency": None if data.get("parallel") else 1,
+            "stop_on_failure": data.get("continue_on_failure") is False,
+        })
         items = [
-            {"test_api_id": tid, "run_id": str(300 + idx), "status": "success"}
-            for idx, tid in enumerate(data.get("test_api_ids", [1, 2, 3]))
+            {"test_api_id": row["test_api_id"], "run_id": row["run_id"], "status": row["status"]}
+            for row in result["items"]
         ]
-        return {"items": items}
+        return {"items": items, "report": result["report"]}
 
     @staticmethod
     def import_test_apis(payload: Any) -> Dict[str, Any]:
@@ -12,10 +12,11 @@
 - 基础设施调用封装
 """
 
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, Iterator, List, Optional, Set
 from datetime import datetime
 import json
 
+from ..config import get_config
 from ..database.dao_ai import OrchestrationPlanDAO, ExecutionStepDAO
 from ..services.api_interface_service import ApiInterfaceService
 from ..services.system_service import SystemService
@@ -28,6 +29,13 @@ logger = get_logger(__name__)
 class TrackingService:
     """跨系统/模块追踪服务"""
     
+    # 审计报告CSV导出的列（a.b 为嵌套字段）
+    AUDIT_EXPORT_COLUMNS = (
+        'id', 'plan_name', 'description', 'status', 'created_by', 'is_template', 'tags',
+        'display_info.system_names', 'display_info.module_names',
+        'created_at', 'updated_at', 'last_executed_at', 'last_execution_status'
+    )
+    
     @staticmethod
     async def aggregate_plan_metadata(plan_id: int) -> Dict[str, Any]:
         """聚合计划的系统/模块元数据
@@ -70,7 +78,7 @@ class TrackingService:
             # 获取系统和模块详细信息
             systems_info = []
             for system_id in involved_system_ids:
-                system = SystemService.get_system_by_id(system_id)
+                system = SystemService.get_system_raw(system_id)
                 if system:
                     systems_info.append({
                         'id': system['id'],
@@ -80,7 +88,7 @@ class TrackingService:
             
             modules_info = []
             for module_id in involved_module_ids:
-                module = ModuleService.get_module_by_id(module_id)
+                module = ModuleService.get_module_raw(module_id)
                 if module:
                     modules_info.append({
                         'id': module['id'],
@@ -171,55 +179,12 @@ class TrackingService:
             
             # 如果有系统/模块筛选，进行二次过滤
             if system_ids or module_ids:
-                filtered_plans = []
-                
-                for plan in plans:
-                    metadata = plan.get('metadata', {})
-                    if isinstance(metadata, str):
-                        metadata = json.loads(metadata)
-                    
-                    plan_system_ids = set(metadata.get('involved_system_ids', []))
-                    plan_module_ids = set(metadata.get('involved_module_ids', []))
-                    
-                    # 检查系统筛选
-                    if system_ids:
-                        if not any(sid in plan_system_ids for sid in system_ids):
-                            continue
-                    
-                    # 检查模块筛选
-                    if module_ids:
-                        if not any(mid in plan_module_ids for mid in module_ids):
-                            continue
-                    
-                    filtered_plans.append(plan)
-                
-                plans = filtered_plans
+                plans = [plan for plan in plans
+                         if TrackingService._matches_scope(plan, system_ids, module_ids)]
             
             # 添加聚合信息
             for plan in plans:
-                metadata = plan.get('metadata', {})
-                if isinstance(metadata, str):
-                    metadata = json.loads(metadata)
-                
-                # 获取系统/模块名称
-                system_names = []
-                for system_id in metadata.get('involved_system_ids', []):
-                    system = SystemService.get_system_by_id(system_id)
-                    if system:
-                        system_names.append(system['name'])
-                
-                module_names = []
-                for module_id in metadata.get('involved_module_ids', []):
-                    module = ModuleService.get_module_by_id(module_id)
-                    if module:
-                        module_names.append(module['name'])
-                
-                plan['display_info'] = {
-                    'system_names': system_names,
-                    'module_names': module_names,
-                    'total_systems': len(system_names),
-                    'total_modules': len(module_names)
-                }
+                TrackingService._add_display_info(plan)
             
             return {
                 'plans': plans,
@@ -239,6 +204,88 @@ class TrackingService:
             logger.error(f"获取筛选计划失败: {e}")
             raise
     
+    @staticmethod
+    def iter_audit_batches(filters: Dict[str, Any], after_id: int = 0,
+                           limit: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """按批产出审计报告数据（流式导出），内存只与批大小相关
+        
+        Args:
+            filters: 筛选条件（同 get_filtered_plans）
+            after_id: 键集游标，只导出ID大于该值的计划（断点续传）
+            limit: 最多导出的计划数（按数据库读取行数计），为空时导出全部
+            
+        Yields:
+            List[Dict[str, Any]]: 一批计划数据（含 display_info）
+        """
+        system_ids = filters.get('system_ids', [])
+        module_ids = filters.get('module_ids', [])
+        base_filters = {
+            'keyword': filters.get('keyword'),
+            'status': filters.get('status'),
+            'created_by': filters.get('created_by'),
+            'is_template': filters.get('is_template')
+        }
+        
+        for plans in OrchestrationPlanDAO.iter_batches(base_filters, after_id, get_config().EXPORT_BATCH_SIZE, limit):
+            if system_ids or module_ids:
+                plans = [plan for plan in plans
+                         if TrackingService._matches_scope(plan, system_ids, module_ids)]
+            for plan in plans:
+                TrackingService._add_display_info(plan)
+            yield plans
+    
+    @staticmethod
+    def _plan_metadata(plan: Dict[str, Any]) -> Dict[str, Any]:
+        """读取计划元数据（兼容未解析的JSON字符串）"""
+        metadata = plan.get('metadata') or {}
+        if isinstance(metadata, str):
+            metadata = json.loads(metadata)
+        return metadata
+    
+    @staticmethod
+    def _matches_scope(plan: Dict[str, Any], system_ids: List[int], module_ids: List[int]) -> bool:
+        """计划是否涉及任一筛选的系统与任一筛选的模块"""
+        metadata = TrackingService._plan_metadata(plan)
+        
+        # 检查系统筛选
+        if system_ids:
+            plan_system_ids = set(metadata.get('involved_system_ids', []))
+            if not any(sid in plan_system_ids for sid in system_ids):
+                return False
+        
+        # 检查模块筛选
+        if module_ids:
+            plan_module_ids = set(metadata.get('involved_module_ids', []))
+            if not any(mid in plan_module_ids for mid in module_ids):
+                return False
+        
+        return True
+    
+    @staticmethod
+    def _add_display_info(plan: Dict[str, Any]) -> None:
+        """添加系统/模块名称等展示信息"""
+        metadata = TrackingService._plan_metadata(plan)
+        
+        # 获取系统/模块名称
+        system_names = []
+        for system_id in metadata.get('involved_system_ids', []):
+            system = SystemService.get_system_raw(system_id)
+            if system:
+                system_names.append(system['name'])
+        
+        module_names = []
+        for module_id in metadata.get('involved_module_ids', []):
+            module = ModuleService.get_module_raw(module_id)
+            if module:
+                module_names.append(module['name'])
+        
+        plan['display_info'] = {
+            'system_names': system_names,
+            'module_names': module_names,
+            'total_systems': len(system_names),
+            'total_modules': len(module_names)
+        }
+    
     @staticmethod
     async def get_system_module_stats() -> Dict[str, Any]:
         """获取系统/模块统计信息
@@ -270,7 +317,7 @@ class TrackingService:
             # 获取系统/模块详细信息
             system_stats = []
             for system_id, count in system_usage.items():
-                system = SystemService.get_system_by_id(system_id)
+                system = SystemService.get_system_raw(system_id)
                 if system:
                     system_stats.append({
                         'id': system_id,
@@ -281,7 +328,7 @@ class TrackingService:
             
             module_stats = []
             for module_id, count in module_usage.items():
-                module = ModuleService.get_module_by_id(module_id)
+                module = ModuleService.get_module_raw(module_id)
                 if module:
                     module_stats.append({
                         'id': module_id,
@@ -534,7 +581,7 @@ class TrackingService:
             # 获取系统名称映射
             system_names = {}
             for system_id in set().union(*[list(pattern) for pattern in cross_system_patterns.keys()]):
-                system = SystemService.get_system_by_id(system_id)
+                system = SystemService.get_system_raw(system_id)
                 if system:
                     system_names[system_id] = system['name']
             
@@ -613,13 +660,10 @@ class TrackingService:
                 'data': filtered_data['plans']
             }
             
-            # 根据格式处理
-            if format == 'csv':
-                # 这里可以实现CSV导出逻辑
-                audit_report['export_url'] = '/api/orchestration/export/audit.csv'
-            elif format == 'excel':
-                # 这里可以实现Excel导出逻辑
-                audit_report['export_url'] = '/api/orchestration/export/audit.xlsx'
+            # 根据格式处理：CSV/Excel/NDJSON 由流式导出接口提供完整数据（CSV带BOM，Excel可直接打开）
+            if format in ('csv', 'excel', 'ndjson'):
+                stream_format = 'ndjson' if format == 'ndjson' else 'csv'
+                audit_report['export_url'] = f'/api/orchestration/tracking/export/stream?format={stream_format}'
             
             return audit_report
             
@@ -0,0 +1,433 @@
+"""
+流量回放导入服务
+Traffic Replay Import Service
+
+从HAR文件或访问日志（可达数百万行）构建回归用例：
+- 流式读取：HAR按 log.entries 逐条解析（ijson），访问日志逐行读取；按批交给进程池解析，
+  在途批次数有上限（worker数的2倍），内存与文件大小无关
+- 解析在子进程中完成（utils.traffic.parse_batch），匹配与去重在主进程：
+  请求经路由索引 match() 匹配到已注册接口，未匹配的请求按路径模板统计
+- 按规范化形状去重：(接口, 响应状态码, 查询参数名, 请求体骨架)，每种形状保留首个样本
+- 产出测试API（每种新形状一条，含请求配置、路径参数、期望状态码与响应字段断言）
+  和/或编排计划（按会话：HAR的pageref / 日志的客户端IP，按空闲间隔切分，步骤为api_call）
+- 与历史导入去重：测试API按元数据 traffic_shape、计划按元数据 traffic_signature
+"""
+
+import hashlib
+import json
+import multiprocessing
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..config import get_config
+from ..data_services.test_api_data_service import TestApiDataService
+from ..database.connection import run_with_dedicated_connection
+from ..database.dao_ai import OrchestrationPlanDAO
+from ..utils.logger import get_logger
+from ..utils.traffic import parse_batch, template_path
+from .route_index import api_route_index, normalize_path
+
+try:
+    import ijson
+except ImportError:  # ijson为可选依赖，缺失时HAR文件回退为一次性解析
+    ijson = None
+
+logger = get_logger(__name__)
+
+# 产出类型
+EMIT_OPTIONS = ('test_apis', 'plans', 'both')
+# 计划至少包含的步骤数（单个请求已由测试API覆盖）
+_MIN_PLAN_STEPS = 2
+# 报告中保留的未匹配路径数，以及统计的不同路径上限
+_TOP_UNMATCHED = 20
+_MAX_UNMATCHED_KEYS = 2000
+# 为响应体顶层字段生成的存在性断言上限
+_MAX_FIELD_ASSERTIONS = 10
+# 子进程使用spawn启动，不继承父进程的数据库连接与线程
+_START_METHOD = 'spawn'
+
+
+def detect_traffic_format(head: bytes) -> str:
+    """
+    识别流量文件格式
+
+    Args:
+        head (bytes): 文件开头的字节
+
+    Returns:
+        str: har（JSON对象且首个键为 log）/ log（访问日志，含JSON结构化日志）
+    """
+    text = head.lstrip(b'\xef\xbb\xbf \t\r\n')
+    if text.startswith(b'{') and text[1:].lstrip().startswith(b'"log"'):
+        return 'har'
+    return 'log'
+
+
+class TrafficImportState:
+    """一次流量导入的状态：形状样本、会话、计数"""
+
+    def __init__(self, system_id: Optional[int], emit: str, strip_prefix: Optional[str], plan_name: Optional[str]):
+        config = get_config()
+        self.system_id = system_id
+        self.emit_test_apis = emit in ('test_apis', 'both')
+        self.emit_plans = emit in ('plans', 'both')
+        self.strip_prefix = (strip_prefix or '').rstrip('/')
+        self.plan_name = plan_name or '流量回放'
+        self.max_shapes = config.TRAFFIC_MAX_SHAPES
+        self.session_gap = config.TRAFFIC_SESSION_GAP
+        self.max_sessions = config.TRAFFIC_MAX_SESSIONS
+        self.max_steps = config.TRAFFIC_PLAN_MAX_STEPS
+        # 形状键 -> 样本（新形状）；历史导入已有的形状只计数
+        self.shapes: Dict[str, Dict[str, Any]] = {}
+        self.existing_shapes = TestApiDataService.get_metadata_index('traffic_shape') if self.emit_test_apis else {}
+        self.seen_existing: set = set()
+        self.existing_plans = OrchestrationPlanDAO.get_metadata_index('traffic_signature') if self.emit_plans else {}
+        self.seen_plans: set = set()
+        # 会话键 -> 会话（按最近活动排序，超过上限时关闭最久未活动的会话）
+        self.sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.unmatched_paths: Dict[Tuple[str, str], int] = {}
+        self.total = 0
+        self.invalid = 0
+        self.matched = 0
+        self.unmatched = 0
+        self.duplicates = 0
+        self.shapes_dropped = 0
+        self.sessions_closed = 0
+        self.plans_created = 0
+        self.plans_existing = 0
+        self.plan_ids: List[int] = []
+        self.test_api_ids: List[int] = []
+
+    def note_unmatched(self, method: str, path: str) -> None:
+        """统计未匹配的请求（按方法与路径模板）"""
+        self.unmatched += 1
+        key = (method, template_path(path))
+        if key in self.unmatched_paths or len(self.unmatched_paths) < _MAX_UNMATCHED_KEYS:
+            self.unmatched_paths[key] = self.unmatched_paths.get(key, 0) + 1
+
+    def summary(self) -> Dict[str, Any]:
+        """导入结果"""
+        top = sorted(self.unmatched_paths.items(), key=lambda item: item[1], reverse=True)[:_TOP_UNMATCHED]
+        return {
+            'total': self.total,
+            'invalid': self.invalid,
+            'matched': self.matched,
+            'unmatched': self.unmatched,
+            'shapes': len(self.shapes) + len(self.seen_existing),
+            'duplicates': self.duplicates,
+            'shapes_dropped': self.shapes_dropped,
+            'test_apis_created': len(self.test_api_ids),
+            'test_apis_existing': len(self.seen_existing),
+            'test_api_ids': self.test_api_ids,
+            'sessions': self.sessions_closed,
+            'plans_created': self.plans_created,
+            'plans_existing': self.plans_existing,
+            'plan_ids': self.plan_ids,
+            'top_unmatched': [{'method': method, 'path': path, 'count': count} for (method, path), count in top]
+        }
+
+
+class TrafficImportService:
+    """流量回放导入服务"""
+
+    @staticmethod
+    def import_traffic(source: BinaryIO, traffic_format: Optional[str] = None, system_id: Optional[int] = None,
+                       emit: str = 'test_apis', strip_prefix: Optional[str] = None,
+                       plan_name: Optional[str] = None, workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        导入HAR文件或访问日志，生成测试API和/或编排计划
+
+        Args:
+            source (BinaryIO): 可定位（seek）的文件字节流
+            traffic_format (Optional[str]): har / log，为空时自动识别
+            system_id (Optional[int]): 只匹配该系统的接口
+            emit (str): test_apis / plans / both
+            strip_prefix (Optional[str]): 匹配前去掉的路径前缀（如网关前缀 /gateway）
+            plan_name (Optional[str]): 生成计划的名称前缀
+            workers (Optional[int]): 解析进程数，为空时使用配置；文件小于 TRAFFIC_PARALLEL_MIN_BYTES 时在本进程解析
+
+        Returns:
+            Dict[str, Any]: 导入结果（计数、生成的测试API/计划ID、未匹配路径统计）
+
+        Raises:
+            ValueError: 格式或产出类型无效
+        """
+        # 接口层在线程池中调用：读写使用本线程独立连接，提交/回滚不影响共享连接上其他请求的写入
+        return run_with_dedicated_connection(
+            TrafficImportService._import_traffic, source, traffic_format, system_id, emit, strip_prefix,
+            plan_name, workers
+        )
+
+    @staticmethod
+    def _import_traffic(source: BinaryIO, traffic_format: Optional[str], system_id: Optional[int], emit: str,
+                        strip_prefix: Optional[str], plan_name: Optional[str],
+                        workers: Optional[int]) -> Dict[str, Any]:
+        if emit not in EMIT_OPTIONS:
+            raise ValueError(f"不支持的产出类型: {emit}，支持: {', '.join(EMIT_OPTIONS)}")
+        traffic_format = (traffic_format or '').lower() or detect_traffic_format(source.read(256))
+        if traffic_format not in ('har', 'log'):
+            raise ValueError(f"不支持的流量格式: {traffic_format}，支持: har, log")
+
+        config = get_config()
+        source.seek(0, 2)
+        size = source.tell()
+        source.seek(0)
+        workers = config.TRAFFIC_PARSE_WORKERS if workers is None else workers
+        if size < config.TRAFFIC_PARALLEL_MIN_BYTES:
+            workers = 1
+
+        started = time.perf_counter()
+        state = TrafficImportState(system_id, emit, strip_prefix, plan_name)
+        for records, invalid in TrafficImportService._parsed_batches(source, traffic_format, workers):
+            state.total += len(records) + invalid
+            state.invalid += invalid
+            for record in records:
+                TrafficImportService._accept(record, state)
+
+        for session in list(state.sessions.values()):
+            TrafficImportService._close_session(session, state)
+        state.sessions.clear()
+        if state.emit_test_apis:
+            TrafficImportService._write_test_apis(state)
+
+        result = state.summary()
+        result.update({'format': traffic_format, 'workers': workers,
+                       'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)})
+        logger.info(f"流量导入完成({traffic_format}): 共 {state.total} 条，匹配 {state.matched}，"
+                    f"未匹配 {state.unmatched}，无效 {state.invalid}，新形状 {len(state.shapes)}，"
+                    f"测试API {len(state.test_api_ids)}，计划 {state.plans_created}，耗时 {result['elapsed_ms']}ms")
+        return result
+
+    @staticmethod
+    def _parsed_batches(source: BinaryIO, traffic_format: str,
+                        workers: int) -> Iterator[Tuple[List[Dict[str, Any]], int]]:
+        """按批解析；多进程时按提交顺序产出，在途批次数不超过 worker数 × 2"""
+        config = get_config()
+        batches = TrafficImportService._batches(
+            TrafficImportService._iter_items(source, traffic_format), config.TRAFFIC_PARSE_BATCH
+        )
+        max_body_chars = config.TRAFFIC_MAX_BODY_CHARS
+        if workers <= 1:
+            for batch in batches:
+                yield parse_batch(traffic_format, batch, max_body_chars)
+            return
+
+        context = multiprocessing.get_context(_START_METHOD)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            pending = deque()
+            for batch in batches:
+                pending.append(pool.submit(parse_batch, traffic_format, batch, max_body_chars))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    @staticmethod
+    def _iter_items(source: BinaryIO, traffic_format: str) -> Iterator[Any]:
+        """HAR逐条产出 log.entries 中的条目，访问日志逐行产出非空行"""
+        if traffic_format == 'har':
+            if ijson is None:
+                yield from (json.load(source).get('log') or {}).get('entries') or []
+            else:
+                yield from ijson.items(source, 'log.entries.item', use_float=True)
+            return
+        for line in source:
+            if line.strip():
+                yield line
+
+    @staticmethod
+    def _batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _accept(record: Dict[str, Any], state: TrafficImportState) -> None:
+        """匹配接口、按形状去重，并追加到所属会话"""
+        path = normalize_path(record['url'])
+        if state.strip_prefix and (path == state.strip_prefix or path.startswith(state.strip_prefix + '/')):
+            path = path[len(state.strip_prefix):] or '/'
+        matched = api_route_index.match(record['method'], path, state.system_id)
+        if matched is None:
+            state.note_unmatched(record['method'], path)
+            return
+        state.matched += 1
+        api = matched['api']
+        shape_key = f"{api['id']}:{record['status']}:{record['shape']}"
+
+        if state.emit_test_apis:
+            shape = state.shapes.get(shape_key)
+            if shape is not None:
+                shape['count'] += 1
+                state.duplicates += 1
+            elif shape_key in state.existing_shapes:
+                if shape_key in state.seen_existing:
+                    state.duplicates += 1
+                state.seen_existing.add(shape_key)
+            elif len(state.shapes) >= state.max_shapes:
+                state.shapes_dropped += 1
+            else:
+                state.shapes[shape_key] = {'api': api, 'path_params': matched['path_params'],
+                                           'record': record, 'count': 1}
+
+        if state.emit_plans:
+            TrafficImportService._add_step(record, api, matched['path_params'], shape_key, state)
+
+    @staticmethod
+    def _add_step(record: Dict[str, Any], api: Dict[str, Any], path_params: Dict[str, Any], shape_key: str,
+                  state: TrafficImportState) -> None:
+        """追加会话步骤：空闲超过 TRAFFIC_SESSION_GAP 时切分会话，连续相同形状的请求只保留一步"""
+        session_key = str(record.get('session') or record.get('client') or 'default')
+        timestamp = record.get('timestamp')
+        session = state.sessions.get(session_key)
+        if (session is not None and timestamp is not None and session['last_ts'] is not None
+                and timestamp - session['last_ts'] > state.session_gap):
+            TrafficImportService._close_session(state.sessions.pop(session_key), state)
+            session = None
+        if session is None:
+            session = {'key': session_key, 'steps': [], 'first_ts': timestamp, 'last_ts': timestamp, 'requests': 0}
+            state.sessions[session_key] = session
+            if len(state.sessions) > state.max_sessions:
+                TrafficImportService._close_session(state.sessions.popitem(last=False)[1], state)
+        state.sessions.move_to_end(session_key)
+
+        session['requests'] += 1
+        session['last_ts'] = timestamp if timestamp is not None else session['last_ts']
+        if not session['steps'] or session['steps'][-1]['shape'] != shape_key:
+            session['steps'].append({'shape': shape_key, 'api': api, 'path_params': path_params, 'record': record})
+        if len(session['steps']) >= state.max_steps:
+            TrafficImportService._close_session(state.sessions.pop(session_key), state)
+
+    @staticmethod
+    def _close_session(session: Dict[str, Any], state: TrafficImportState) -> None:
+        """会话结束：步骤数足够且步骤形状序列未导入过时写入编排计划"""
+        state.sessions_closed += 1
+        steps = session['steps']
+        if len(steps) < _MIN_PLAN_STEPS:
+            return
+        signature = hashlib.blake2b('|'.join(step['shape'] for step in steps).encode('utf-8'),
+                                    digest_size=12).hexdigest()
+        if signature in state.seen_plans or signature in state.existing_plans:
+            state.plans_existing += 1
+            return
+        state.seen_plans.add(signature)
+        plan_data = TrafficImportService._build_plan(session, signature, state)
+        try:
+            plan = OrchestrationPlanDAO.create_plan(plan_data)
+            state.plan_ids.append(plan['id'])
+            state.plans_created += 1
+        except Exception as e:
+            logger.error(f"写入流量回放计划失败: {e}")
+
+    @staticmethod
+    def _build_plan(session: Dict[str, Any], signature: str, state: TrafficImportState) -> Dict[str, Any]:
+        # 计划缓存模块依赖Agent组件，延迟导入
+        from .plan_cache import plan_content_hash
+
+        steps = []
+        for index, step in enumerate(session['steps'], 1):
+            api, record = step['api'], step['record']
+            parameters = {
+                'api_id': api['id'],
+                'path_params': step['path_params'],
+                'query_params': record['query'],
+                'headers': record['headers']
+            }
+            if record['request_body'] is not None:
+                parameters['body'] = record['request_body']
+            steps.append({
+                'step_id': f"step_{index}",
+                'step_name': f"{api['method']} {api['path']}",
+                'step_type': 'api_call',
+                'tool_name': 'api_call',
+                'parameters': parameters,
+                'dependencies': [f"step_{index - 1}"] if index > 1 else [],
+                'timeout': 30,
+                'retry_count': 0,
+                'system_id': api.get('system_id'),
+                'module_id': api.get('module_id'),
+                'api_interface_id': api['id']
+            })
+        name = f"{state.plan_name} - {session['key']} ({len(steps)}步)"
+        execution_plan = {
+            'plan_id': f"traffic_{signature}",
+            'plan_name': name,
+            'description': f"由流量回放生成：会话 {session['key']} 的 {session['requests']} 个请求",
+            'steps': steps,
+            'metadata': {'source': 'traffic'},
+            'estimated_duration': 0
+        }
+        return {
+            'plan_name': name,
+            'description': execution_plan['description'],
+            'intent_text': f"回放会话 {session['key']} 的请求序列",
+            'execution_plan': execution_plan,
+            'metadata': {
+                'source': 'traffic',
+                'traffic_signature': signature,
+                'session': session['key'],
+                'request_count': session['requests'],
+                'started_at': TrafficImportService._format_time(session['first_ts']),
+                'ended_at': TrafficImportService._format_time(session['last_ts']),
+                'involved_system_ids': sorted({step['system_id'] for step in steps if step['system_id'] is not None}),
+                'involved_module_ids': sorted({step['module_id'] for step in steps if step['module_id'] is not None})
+            },
+            'tags': ['traffic_replay'],
+            'plan_hash': plan_content_hash(execution_plan)
+        }
+
+    @staticmethod
+    def _write_test_apis(state: TrafficImportState) -> None:
+        """按块批量写入每种新形状的测试API"""
+        chunk_size = get_config().IMPORT_CHUNK_SIZE
+        items = [TrafficImportService._build_test_api(key, shape) for key, shape in state.shapes.items()]
+        for start in range(0, len(items), chunk_size):
+            state.test_api_ids.extend(TestApiDataService.bulk_create(items[start:start + chunk_size]))
+
+    @staticmethod
+    def _build_test_api(shape_key: str, shape: Dict[str, Any]) -> Dict[str, Any]:
+        api, record = shape['api'], shape['record']
+        request_config = {'method': api['method'], 'params': record['query'], 'headers': record['headers']}
+        if record['request_body'] is not None:
+            request_config['body'] = record['request_body']
+            request_config['body_type'] = record['body_type']
+        expected = {}
+        if record['status'] is not None:
+            expected['status_code'] = record['status']
+        response_body = record['response_body']
+        if isinstance(response_body, dict):
+            expected['assertions'] = [
+                {'type': 'jsonpath', 'path': f"$.{field}", 'operator': 'exists'}
+                for field in list(response_body)[:_MAX_FIELD_ASSERTIONS] if str(field).isidentifier()
+            ]
+        status = record['status'] if record['status'] is not None else '-'
+        return {
+            'api_id': api['id'],
+            'name': f"回放 {api['method']} {api['path']} [{status}]",
+            'description': f"由流量回放生成，同形状请求 {shape['count']} 个，样本: {record['method']} {record['url']}",
+            'enabled': True,
+            'tags': 'traffic_replay',
+            'request_config': request_config,
+            'execution_config': {'variables': shape['path_params']} if shape['path_params'] else None,
+            'expected_response': expected or None,
+            'metadata': {
+                'source': 'traffic',
+                'traffic_shape': shape_key,
+                'sample_count': shape['count'],
+                'sample_url': record['url'],
+                'captured_at': TrafficImportService._format_time(record['timestamp']),
+                'response_example': response_body
+            }
+        }
+
+    @staticmethod
+    def _format_time(timestamp: Optional[float]) -> Optional[str]:
+        return datetime.fromtimestamp(timestamp).isoformat() if timestamp is not None else None
@@ -9,19 +9,23 @@ Transform层 - 数据转换层
 - 职责单一
 """
 
+from .computed import ComputedFieldRegistry, LazyRow
 from .module_transform import ModuleTransform
 from .system_transform import SystemTransform
 from .utils import (
-    pipe, format_datetime, safe_get, safe_int, safe_str,
+    pipe, format_datetime, parse_datetime, safe_get, safe_int, safe_str,
     parse_tags, create_key, add_field, remove_field,
     transform_field, merge_data
 )
 
 __all__ = [
+    'ComputedFieldRegistry',
+    'LazyRow',
     'ModuleTransform',
     'SystemTransform', 
     'pipe',
     'format_datetime',
+    'parse_datetime',
     'safe_get',
     'safe_int',
     'safe_str',
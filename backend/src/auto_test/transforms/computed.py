@@ -0,0 +1,170 @@
+"""
+计算字段注册表
+派生字段（健康度、风险等级、状态标签等）只在注册表中声明一次，并声明其输入依赖：
+- evaluate：按字段投影计算需要的字段（列表接口、完整响应）
+- lazy：包装为LazyRow，访问时才计算（内部调用方只读原始列时不做任何增强）
+- dependencies：供字段投影展开DAO需要查询的列
+
+一个计算器可以同时产出多个字段（如状态的显示名称/颜色/图标），共享中间结果。
+计算器按注册顺序执行，依赖其他计算字段的计算器需在其后注册。
+"""
+
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+# 计算器：读取数据行与上下文，将产出字段写入数据行
+Producer = Callable[[Dict[str, Any], Dict[str, Any]], None]
+
+
+class ComputedField:
+    """计算器声明"""
+
+    __slots__ = ('outputs', 'depends', 'producer')
+
+    def __init__(self, outputs: Tuple[str, ...], depends: Tuple[str, ...], producer: Producer):
+        self.outputs = outputs
+        self.depends = depends
+        self.producer = producer
+
+
+class ComputedFieldRegistry:
+    """计算字段注册表"""
+
+    def __init__(self, base: Optional['ComputedFieldRegistry'] = None):
+        """
+        Args:
+            base (Optional[ComputedFieldRegistry]): 上游注册表（如Service层基于Transform层），
+                其字段可被本表字段依赖，也可通过LazyRow访问；evaluate只执行本表的计算器
+        """
+        self.base = base
+        self._fields: List[ComputedField] = []
+        self._by_output: Dict[str, ComputedField] = {}
+
+    def computes(self, *outputs: str, depends: Iterable[str] = ()) -> Callable[[Producer], Producer]:
+        """
+        注册计算器的装饰器
+
+        Args:
+            *outputs (str): 计算器产出的字段
+            depends (Iterable[str]): 输入依赖（原始列或已注册的计算字段）
+
+        Returns:
+            Callable: 装饰器，原样返回计算器
+        """
+        def decorator(producer: Producer) -> Producer:
+            self.register(outputs, producer, depends)
+            return producer
+        return decorator
+
+    def register(self, outputs: Iterable[str], producer: Producer, depends: Iterable[str] = ()) -> None:
+        """
+        注册计算器
+
+        Args:
+            outputs (Iterable[str]): 计算器产出的字段
+            producer (Producer): 计算器
+            depends (Iterable[str]): 输入依赖
+
+        Raises:
+            ValueError: 字段已注册
+        """
+        field = ComputedField(tuple(outputs), tuple(depends), producer)
+        for output in field.outputs:
+            if self.resolve(output) is not None:
+                raise ValueError(f"计算字段已注册: {output}")
+        self._fields.append(field)
+        for output in field.outputs:
+            self._by_output[output] = field
+
+    def resolve(self, output: str) -> Optional[ComputedField]:
+        """查找产出指定字段的计算器（含上游注册表）"""
+        field = self._by_output.get(output)
+        if field is None and self.base is not None:
+            return self.base.resolve(output)
+        return field
+
+    @property
+    def names(self) -> FrozenSet[str]:
+        """全部计算字段（含上游注册表）"""
+        names = frozenset(self._by_output)
+        return names | self.base.names if self.base is not None else names
+
+    def dependencies(self) -> Dict[str, Tuple[str, ...]]:
+        """计算字段 -> 输入依赖（含上游注册表），用于展开字段投影"""
+        dependencies = self.base.dependencies() if self.base is not None else {}
+        dependencies.update((output, field.depends) for output, field in self._by_output.items())
+        return dependencies
+
+    def evaluate(self, row: Dict[str, Any], fields: Optional[FrozenSet[str]] = None,
+                 context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        按注册顺序计算本表的字段（直接写入数据行）
+
+        Args:
+            row (Dict[str, Any]): 数据行
+            fields (Optional[FrozenSet[str]]): 需要的字段（已按依赖展开），为空时计算全部字段
+            context (Optional[Dict[str, Any]]): 计算上下文（如列表共用的当前时间）
+
+        Returns:
+            Dict[str, Any]: 数据行本身
+        """
+        context = {} if context is None else context
+        for field in self._fields:
+            if fields is None or not fields.isdisjoint(field.outputs):
+                field.producer(row, context)
+        return row
+
+    def lazy(self, row: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> 'LazyRow':
+        """将数据行包装为按需计算的LazyRow"""
+        return LazyRow(row, self, context)
+
+
+class LazyRow(dict):
+    """
+    按需计算的数据行
+
+    原始列直接存储；访问未计算的计算字段（row[name] / row.get(name)）时才执行对应计算器，
+    结果写回数据行。json序列化只包含已存在的键，需要完整输出时调用 materialize()。
+    """
+
+    __slots__ = ('_registry', '_context', '_evaluated')
+
+    def __init__(self, row: Dict[str, Any], registry: ComputedFieldRegistry,
+                 context: Optional[Dict[str, Any]] = None):
+        super().__init__(row)
+        self._registry = registry
+        self._context = {} if context is None else context
+        self._evaluated = set()
+
+    def __missing__(self, key: str) -> Any:
+        field = self._registry.resolve(key)
+        if field is None or id(field) in self._evaluated:
+            raise KeyError(key)
+        self._evaluated.add(id(field))
+        # 先解析依赖的计算字段，计算器内部可直接读取
+        for dependency in field.depends:
+            if not dict.__contains__(self, dependency):
+                self.get(dependency)
+        field.producer(self, self._context)
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def materialize(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        计算全部（或指定）计算字段并返回普通字典
+
+        Args:
+            fields (Optional[Iterable[str]]): 需要的计算字段，为空时计算全部字段
+
+        Returns:
+            Dict[str, Any]: 普通字典
+        """
+        for name in (self._registry.names if fields is None else fields):
+            self.get(name)
+        return dict(self)
@@ -1,364 +1,309 @@
 """
 模块数据转换器
 采用函数式编程风格，将DAO层原始数据转换为响应数据
+
+响应行单遍构建：每行只复制一次原始数据，状态映射、类型与标签关键词预先构建，
+标签只解析一次，供标签字段与搜索关键词共用。
+计算字段在注册表（COMPUTED_FIELDS）中声明，按字段投影计算或包装为LazyRow按需计算。
 """
 
-from typing import Dict, Any, List, Optional
-from .utils import (
-    pipe, format_datetime, safe_get, safe_int, safe_str, 
-    parse_tags, create_key, add_field
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+from .computed import ComputedFieldRegistry
+from .utils import parse_datetime, safe_int, safe_str, parse_tags, create_key
+
+
+# 状态 -> (显示名称, 颜色, 图标)
+_STATUS_DISPLAY: Dict[str, Tuple[str, str, str]] = {
+    'enabled': ('启用', 'success', 'check-circle'),
+    'disabled': ('禁用', 'danger', 'times-circle'),
+    'active': ('活跃', 'success', 'check-circle'),
+    'inactive': ('非活跃', 'warning', 'pause-circle'),
+    'development': ('开发中', 'info', 'code'),
+    'testing': ('测试中', 'primary', 'test-tube'),
+    'production': ('生产环境', 'success', 'server'),
+    'deprecated': ('已废弃', 'danger', 'archive')
+}
+_UNKNOWN_STATUS = ('未知', 'secondary', 'question-circle')
+
+# 状态 -> 优先级（数字越大优先级越高）
+_PRIORITY_MAP = {
+    'production': 5,
+    'active': 4,
+    'testing': 3,
+    'development': 2,
+    'inactive': 1,
+    'deprecated': 0
+}
+
+# 模块类型关键词（按顺序匹配）
+_TYPE_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ('api', ('api', 'interface', 'endpoint')),
+    ('ui', ('ui', 'page', 'view', 'component')),
+    ('service', ('service', 'business', 'logic')),
+    ('data', ('data', 'database', 'model')),
+    ('util', ('util', 'helper', 'tool')),
+    ('test', ('test', 'spec', 'mock'))
 )
 
+# 标签分类关键词（按顺序匹配，未命中归为other）
+_TAG_CATEGORIES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ('technology', ('api', 'ui', 'backend', 'frontend', 'database', 'service')),
+    ('business', ('user', 'order', 'payment', 'product', 'customer')),
+    ('environment', ('dev', 'test', 'prod', 'staging', 'local'))
+)
+_TAG_CATEGORY_ORDER = ('technology', 'business', 'environment', 'other')
+
+
+def _add_timestamp_fields(row: Dict[str, Any], value: Any, prefix: str) -> None:
+    """写入 {prefix}_formatted / {prefix的日期} 字段（无法解析时保留原值）"""
+    parsed = parse_datetime(value)
+    date_key = prefix.replace('_at', '_date')
+    if parsed is None:
+        row[f'{prefix}_formatted'] = value
+        row[date_key] = value
+    else:
+        # str(datetime) 以 'YYYY-MM-DD HH:MM:SS' 开头，切片比两次strftime快
+        text = str(parsed)
+        row[f'{prefix}_formatted'] = text[:19]
+        row[date_key] = text[:10]
+
+
+# 计算字段注册表：每个派生字段声明一次及其输入依赖
+_COMPUTED = ComputedFieldRegistry()
+
+
+@_COMPUTED.computes('module_key', depends=('id', 'system_id'))
+def _compute_module_key(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    row['module_key'] = create_key(safe_int(row.get('system_id')), safe_int(row.get('id')))
+
+
+@_COMPUTED.computes('is_active', 'priority', depends=('status',))
+def _compute_activity(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    status = row.get('status')
+    row['is_active'] = status == 'active'
+    row['priority'] = _PRIORITY_MAP.get(status, 1)
+
+
+@_COMPUTED.computes('module_type', depends=('name',))
+def _compute_module_type(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    row['module_type'] = ModuleTransform._infer_module_type(safe_str(row.get('name', '')).lower())
+
+
+@_COMPUTED.computes('created_at_formatted', 'created_date', depends=('created_at',))
+def _compute_created(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    if row.get('created_at'):
+        _add_timestamp_fields(row, row['created_at'], 'created_at')
+
+
+@_COMPUTED.computes('updated_at_formatted', 'updated_date', depends=('updated_at',))
+def _compute_updated(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    if row.get('updated_at'):
+        _add_timestamp_fields(row, row['updated_at'], 'updated_at')
+
+
+@_COMPUTED.computes('tags_list', 'tags_count', 'has_tags', 'tag_categories', depends=('tags',))
+def _compute_tags(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    ModuleTransform._add_tag_fields(row, parse_tags(safe_str(row.get('tags', ''))))
+
+
+@_COMPUTED.computes('status_display', 'status_color', 'status_icon', 'enabled', depends=('status',))
+def _compute_status_display(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    ModuleTransform._add_status_fields(row, safe_str(row.get('status', 'active')))
+
+
+@_COMPUTED.computes('description_length', 'has_description', 'name_length', depends=('name', 'description'))
+def _compute_text_stats(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    description_length = len(safe_str(row.get('description', '')))
+    row['description_length'] = description_length
+    row['has_description'] = description_length > 0
+    row['name_length'] = len(safe_str(row.get('name', '')))
+
+
+@_COMPUTED.computes('search_keywords', depends=('name', 'description', 'tags_list'))
+def _compute_search_keywords(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    # 复用已解析的标签列表
+    row['search_keywords'] = ModuleTransform._keywords(
+        safe_str(row.get('name', '')), safe_str(row.get('description', '')), row.get('tags_list') or []
+    )
+
+
+# 摘要数据包含的计算字段
+_SUMMARY_FIELDS = frozenset((
+    'status_display', 'status_color', 'status_icon', 'enabled', 'tags_list', 'tags_count', 'has_tags',
+    'tag_categories'
+))
+
 
 class ModuleTransform:
     """模块数据转换器 - 函数式编程风格"""
-    
+
+    # 计算字段注册表，供Service层展开字段投影与按需计算
+    COMPUTED_FIELDS = _COMPUTED
+
     @staticmethod
     def to_response(raw_module: Dict[str, Any]) -> Dict[str, Any]:
         """
         将DAO层原始数据转换为API响应数据
-        
+
         Args:
             raw_module (Dict[str, Any]): DAO层原始模块数据
-            
+
         Returns:
             Dict[str, Any]: 转换后的响应数据
         """
         if not raw_module:
             return {}
-        
-        return pipe(
-            raw_module,
-            ModuleTransform._add_business_fields,
-            ModuleTransform._format_timestamps,
-            ModuleTransform._process_tags,
-            ModuleTransform._add_status_display,
-            ModuleTransform._add_computed_fields
-        )
-    
+
+        return _COMPUTED.evaluate(dict(raw_module))
+
     @staticmethod
-    def to_list_response(raw_modules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def to_list_response(raw_modules: List[Dict[str, Any]],
+                         fields: Optional[FrozenSet[str]] = None) -> List[Dict[str, Any]]:
         """
         将DAO层原始数据列表转换为API响应数据列表
-        
+
         Args:
             raw_modules (List[Dict[str, Any]]): DAO层原始模块数据列表
-            
+            fields (Optional[FrozenSet[str]]): 需要计算的字段（已按依赖展开），为空时计算全部字段
+
         Returns:
             List[Dict[str, Any]]: 转换后的响应数据列表
         """
         if not raw_modules:
             return []
-        
-        return [ModuleTransform.to_response(module) for module in raw_modules]
-    
+
+        evaluate = _COMPUTED.evaluate
+        return [evaluate(dict(module), fields) if module else {} for module in raw_modules]
+
     @staticmethod
     def to_summary(raw_module: Dict[str, Any]) -> Dict[str, Any]:
         """
         将DAO层原始数据转换为摘要数据
-        
+
         Args:
             raw_module (Dict[str, Any]): DAO层原始模块数据
-            
+
         Returns:
             Dict[str, Any]: 转换后的摘要数据
         """
         if not raw_module:
             return {}
-        
-        return pipe(
-            raw_module,
-            ModuleTransform._extract_summary_fields,
-            ModuleTransform._add_status_display,
-            ModuleTransform._process_tags
-        )
-    
-    @staticmethod
-    def _add_business_fields(module: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        添加业务字段
-        
-        Args:
-            module (Dict[str, Any]): 原始模块数据
-            
-        Returns:
-            Dict[str, Any]: 添加业务字段后的数据
-        """
-        enhanced = module.copy()
-        
-        # 添加模块唯一键
-        system_id = safe_int(module.get('system_id'))
-        module_id = safe_int(module.get('id'))
-        enhanced['module_key'] = create_key(system_id, module_id)
-        
-        # 添加活跃状态
-        enhanced['is_active'] = module.get('status') == 'active'
-        
-        # 添加模块类型（基于名称推断）
-        module_name = safe_str(module.get('name', '')).lower()
-        enhanced['module_type'] = ModuleTransform._infer_module_type(module_name)
-        
-        # 添加优先级（基于状态）
-        enhanced['priority'] = ModuleTransform._calculate_priority(module.get('status'))
-        
-        return enhanced
-    
-    @staticmethod
-    def _format_timestamps(module: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        格式化时间戳
-        
-        Args:
-            module (Dict[str, Any]): 模块数据
-            
-        Returns:
-            Dict[str, Any]: 格式化时间戳后的数据
-        """
-        enhanced = module.copy()
-        
-        # 格式化创建时间
-        if module.get('created_at'):
-            enhanced['created_at_formatted'] = format_datetime(module['created_at'])
-            enhanced['created_date'] = format_datetime(module['created_at'], '%Y-%m-%d')
-        
-        # 格式化更新时间
-        if module.get('updated_at'):
-            enhanced['updated_at_formatted'] = format_datetime(module['updated_at'])
-            enhanced['updated_date'] = format_datetime(module['updated_at'], '%Y-%m-%d')
-        
-        return enhanced
-    
-    @staticmethod
-    def _process_tags(module: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        处理标签
-        
-        Args:
-            module (Dict[str, Any]): 模块数据
-            
-        Returns:
-            Dict[str, Any]: 处理标签后的数据
-        """
-        enhanced = module.copy()
-        
-        # 解析标签字符串
-        tags_str = safe_str(module.get('tags', ''))
-        tags_list = parse_tags(tags_str)
-        
-        enhanced['tags_list'] = tags_list
-        enhanced['tags_count'] = len(tags_list)
-        enhanced['has_tags'] = len(tags_list) > 0
-        
-        # 添加标签分类
-        enhanced['tag_categories'] = ModuleTransform._categorize_tags(tags_list)
-        
-        return enhanced
-    
-    @staticmethod
-    def _add_status_display(module: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        添加状态显示
-        
-        Args:
-            module (Dict[str, Any]): 模块数据
-            
-        Returns:
-            Dict[str, Any]: 添加状态显示后的数据
-        """
-        enhanced = module.copy()
-        
-        status = safe_str(module.get('status', 'active'))
-        status_map = {
-            'enabled': {'display': '启用', 'color': 'success', 'icon': 'check-circle'},
-            'disabled': {'display': '禁用', 'color': 'danger', 'icon': 'times-circle'},
-            'active': {'display': '活跃', 'color': 'success', 'icon': 'check-circle'},
-            'inactive': {'display': '非活跃', 'color': 'warning', 'icon': 'pause-circle'},
-            'development': {'display': '开发中', 'color': 'info', 'icon': 'code'},
-            'testing': {'display': '测试中', 'color': 'primary', 'icon': 'test-tube'},
-            'production': {'display': '生产环境', 'color': 'success', 'icon': 'server'},
-            'deprecated': {'display': '已废弃', 'color': 'danger', 'icon': 'archive'}
+
+        row = {
+            'id': safe_int(raw_module.get('id')),
+            'name': safe_str(raw_module.get('name')),
+            'description': safe_str(raw_module.get('description')),
+            'status': safe_str(raw_module.get('status', 'active')),
+            'system_id': safe_int(raw_module.get('system_id')),
+            'tags': safe_str(raw_module.get('tags', '')),
+            'created_at': safe_str(raw_module.get('created_at', ''))
         }
-        
-        status_info = status_map.get(status, {
-            'display': '未知', 
-            'color': 'secondary', 
-            'icon': 'question-circle'
-        })
-        
-        enhanced['status_display'] = status_info['display']
-        enhanced['status_color'] = status_info['color']
-        enhanced['status_icon'] = status_info['icon']
-        
-        # 添加enabled布尔字段供前端使用
-        enhanced['enabled'] = status == 'active'
-        
-        return enhanced
-    
+        return _COMPUTED.evaluate(row, _SUMMARY_FIELDS)
+
     @staticmethod
-    def _add_computed_fields(module: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        添加计算字段
-        
-        Args:
-            module (Dict[str, Any]): 模块数据
-            
-        Returns:
-            Dict[str, Any]: 添加计算字段后的数据
-        """
-        enhanced = module.copy()
-        
-        # 计算描述长度
-        description = safe_str(module.get('description', ''))
-        enhanced['description_length'] = len(description)
-        enhanced['has_description'] = len(description) > 0
-        
-        # 计算名称长度
-        name = safe_str(module.get('name', ''))
-        enhanced['name_length'] = len(name)
-        
-        # 添加搜索关键词
-        enhanced['search_keywords'] = ModuleTransform._generate_search_keywords(module)
-        
-        return enhanced
-    
+    def _add_tag_fields(row: Dict[str, Any], tags_list: List[str]) -> None:
+        """写入标签列表、数量与分类"""
+        row['tags_list'] = tags_list
+        row['tags_count'] = len(tags_list)
+        row['has_tags'] = len(tags_list) > 0
+        row['tag_categories'] = ModuleTransform._categorize_tags(tags_list)
+
     @staticmethod
-    def _extract_summary_fields(module: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        提取摘要字段
-        
-        Args:
-            module (Dict[str, Any]): 原始模块数据
-            
-        Returns:
-            Dict[str, Any]: 摘要数据
-        """
-        return {
-            'id': safe_int(module.get('id')),
-            'name': safe_str(module.get('name')),
-            'description': safe_str(module.get('description')),
-            'status': safe_str(module.get('status', 'active')),
-            'system_id': safe_int(module.get('system_id')),
-            'tags': safe_str(module.get('tags', '')),
-            'created_at': safe_str(module.get('created_at', ''))
-        }
-    
+    def _add_status_fields(row: Dict[str, Any], status: str) -> None:
+        """写入状态显示字段"""
+        display, color, icon = _STATUS_DISPLAY.get(status, _UNKNOWN_STATUS)
+        row['status_display'] = display
+        row['status_color'] = color
+        row['status_icon'] = icon
+        # 添加enabled布尔字段供前端使用
+        row['enabled'] = status == 'active'
+
     @staticmethod
     def _infer_module_type(module_name: str) -> str:
         """
         基于模块名称推断模块类型
-        
+
         Args:
             module_name (str): 模块名称
-            
+
         Returns:
             str: 模块类型
         """
         if not module_name:
             return 'unknown'
-        
-        type_keywords = {
-            'api': ['api', 'interface', 'endpoint'],
-            'ui': ['ui', 'page', 'view', 'component'],
-            'service': ['service', 'business', 'logic'],
-            'data': ['data', 'database', 'model'],
-            'util': ['util', 'helper', 'tool'],
-            'test': ['test', 'spec', 'mock']
-        }
-        
-        for module_type, keywords in type_keywords.items():
-            if any(keyword in module_name for keyword in keywords):
-                return module_type
-        
+
+        for module_type, keywords in _TYPE_KEYWORDS:
+            for keyword in keywords:
+                if keyword in module_name:
+                    return module_type
+
         return 'general'
-    
+
     @staticmethod
     def _calculate_priority(status: str) -> int:
         """
         基于状态计算优先级
-        
+
         Args:
             status (str): 模块状态
-            
+
         Returns:
             int: 优先级（数字越大优先级越高）
         """
-        priority_map = {
-            'production': 5,
-            'active': 4,
-            'testing': 3,
-            'development': 2,
-            'inactive': 1,
-            'deprecated': 0
-        }
-        
-        return priority_map.get(status, 1)
-    
+        return _PRIORITY_MAP.get(status, 1)
+
     @staticmethod
     def _categorize_tags(tags: List[str]) -> Dict[str, List[str]]:
         """
         标签分类
-        
+
         Args:
             tags (List[str]): 标签列表
-            
+
         Returns:
-            Dict[str, List[str]]: 分类后的标签
+            Dict[str, List[str]]: 分类后的标签（不含空分类）
         """
-        categories = {
-            'technology': [],
-            'business': [],
-            'environment': [],
-            'other': []
-        }
-        
-        tech_keywords = ['api', 'ui', 'backend', 'frontend', 'database', 'service']
-        business_keywords = ['user', 'order', 'payment', 'product', 'customer']
-        env_keywords = ['dev', 'test', 'prod', 'staging', 'local']
-        
+        if not tags:
+            return {}
+
+        categories: Dict[str, List[str]] = {}
         for tag in tags:
             tag_lower = tag.lower()
-            if any(keyword in tag_lower for keyword in tech_keywords):
-                categories['technology'].append(tag)
-            elif any(keyword in tag_lower for keyword in business_keywords):
-                categories['business'].append(tag)
-            elif any(keyword in tag_lower for keyword in env_keywords):
-                categories['environment'].append(tag)
-            else:
-                categories['other'].append(tag)
-        
-        # 移除空分类
-        return {k: v for k, v in categories.items() if v}
-    
+            category = 'other'
+            for name, keywords in _TAG_CATEGORIES:
+                if any(keyword in tag_lower for keyword in keywords):
+                    category = name
+                    break
+            categories.setdefault(category, []).append(tag)
+
+        # 保持固定的分类顺序
+        return {name: categories[name] for name in _TAG_CATEGORY_ORDER if name in categories}
+
     @staticmethod
     def _generate_search_keywords(module: Dict[str, Any]) -> List[str]:
         """
         生成搜索关键词
-        
+
         Args:
             module (Dict[str, Any]): 模块数据
-            
+
         Returns:
             List[str]: 搜索关键词列表
         """
-        keywords = []
-        
-        # 添加名称关键词
-        name = safe_str(module.get('name', ''))
-        if name:
-            keywords.extend(name.split())
-        
-        # 添加描述关键词
-        description = safe_str(module.get('description', ''))
-        if description:
-            keywords.extend(description.split())
-        
-        # 添加标签关键词
-        tags = parse_tags(safe_str(module.get('tags', '')))
-        keywords.extend(tags)
-        
-        # 去重并转为小写
-        return list(set(keyword.lower() for keyword in keywords if keyword))
-    
+        return ModuleTransform._keywords(
+            safe_str(module.get('name', '')),
+            safe_str(module.get('description', '')),
+            parse_tags(safe_str(module.get('tags', '')))
+        )
+
+    @staticmethod
+    def _keywords(name: str, description: str, tags_list: List[str]) -> List[str]:
+        """名称、描述分词与标签去重后转小写"""
+        keywords = set(name.lower().split())
+        keywords.update(description.lower().split())
+        keywords.update(tag.lower() for tag in tags_list)
+        return list(keywords)
+
     @staticmethod
     def with_system_info(module: Dict[str, Any], system_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
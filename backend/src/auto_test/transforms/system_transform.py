@@ -1,93 +1,264 @@
 """
 系统数据转换器
 采用函数式编程风格，将DAO层原始数据转换为响应数据
+
+响应行单遍构建：每行只复制一次原始数据，状态映射、类型关键词、版本正则预先编译，
+每个时间字段只解析一次，列表转换共用同一个当前时间。
+计算字段在注册表（COMPUTED_FIELDS）中声明，按字段投影计算或包装为LazyRow按需计算。
 """
 
-from typing import Dict, Any, List, Optional
-from .utils import (
-    pipe, format_datetime, safe_get, safe_int, safe_str, 
-    create_key, add_field
+import re
+from datetime import datetime
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+from .computed import ComputedFieldRegistry
+from .utils import parse_datetime, safe_int, safe_str, create_key
+
+
+# 状态 -> (显示名称, 颜色, 图标)
+_STATUS_DISPLAY: Dict[str, Tuple[str, str, str]] = {
+    'enabled': ('启用', 'success', 'check-circle'),
+    'disabled': ('禁用', 'danger', 'times-circle'),
+    'active': ('活跃', 'success', 'check-circle'),
+    'inactive': ('非活跃', 'warning', 'pause-circle'),
+    'development': ('开发中', 'info', 'code'),
+    'testing': ('测试中', 'primary', 'test-tube'),
+    'production': ('生产环境', 'success', 'server'),
+    'maintenance': ('维护中', 'warning', 'wrench'),
+    'deprecated': ('已废弃', 'danger', 'archive')
+}
+_UNKNOWN_STATUS = ('未知', 'secondary', 'question-circle')
+
+# 状态 -> 优先级（数字越大优先级越高）
+_PRIORITY_MAP = {
+    'production': 5,
+    'active': 4,
+    'testing': 3,
+    'development': 2,
+    'maintenance': 1,
+    'inactive': 1,
+    'deprecated': 0
+}
+
+# 状态 -> 健康度加分
+_HEALTH_STATUS_SCORES = {
+    'production': 30,
+    'active': 25,
+    'testing': 15,
+    'development': 10,
+    'maintenance': 5,
+    'inactive': -10,
+    'deprecated': -20
+}
+
+# 系统类型关键词（按顺序匹配）
+_TYPE_KEYWORDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ('web', ('web', 'website', 'portal', 'frontend')),
+    ('api', ('api', 'service', 'backend', 'server')),
+    ('mobile', ('mobile', 'app', 'android', 'ios')),
+    ('desktop', ('desktop', 'client', 'application')),
+    ('database', ('database', 'db', 'data', 'storage')),
+    ('microservice', ('micro', 'service', 'ms')),
+    ('admin', ('admin', 'management', 'console')),
+    ('monitoring', ('monitor', 'log', 'metric', 'alert'))
 )
 
+# 版本号模式（按顺序匹配）
+_VERSION_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'v(\d+\.\d+\.\d+)',
+    r'version\s+(\d+\.\d+\.\d+)',
+    r'(\d+\.\d+\.\d+)',
+    r'v(\d+\.\d+)',
+    r'version\s+(\d+\.\d+)',
+    r'(\d+\.\d+)'
+))
+
+
+def _add_timestamp_fields(row: Dict[str, Any], value: Any, prefix: str) -> Optional[datetime]:
+    """写入 {prefix}_formatted / {prefix的日期} 字段，返回解析结果（无法解析时保留原值）"""
+    parsed = parse_datetime(value)
+    date_key = prefix.replace('_at', '_date')
+    if parsed is None:
+        row[f'{prefix}_formatted'] = value
+        row[date_key] = value
+    else:
+        # str(datetime) 以 'YYYY-MM-DD HH:MM:SS' 开头，切片比两次strftime快
+        text = str(parsed)
+        row[f'{prefix}_formatted'] = text[:19]
+        row[date_key] = text[:10]
+    return parsed
+
+
+# 计算字段注册表：每个派生字段声明一次及其输入依赖
+_COMPUTED = ComputedFieldRegistry()
+
+
+@_COMPUTED.computes('system_key', depends=('id',))
+def _compute_system_key(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    row['system_key'] = create_key('SYS', safe_int(row.get('id')))
+
+
+@_COMPUTED.computes('is_active', 'priority', depends=('status',))
+def _compute_activity(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    status = row.get('status')
+    row['is_active'] = status == 'active'
+    row['priority'] = _PRIORITY_MAP.get(status, 1)
+
+
+@_COMPUTED.computes('system_type', depends=('name',))
+def _compute_system_type(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    row['system_type'] = SystemTransform._infer_system_type(safe_str(row.get('name', '')).lower())
+
+
+@_COMPUTED.computes('version', depends=('description',))
+def _compute_version(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    row['version'] = SystemTransform._extract_version(safe_str(row.get('description', '')))
+
+
+@_COMPUTED.computes('created_at_formatted', 'created_date', 'system_age_days', 'system_age_display',
+                    depends=('created_at',))
+def _compute_created(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    created_at = row.get('created_at')
+    if not created_at:
+        return
+    created = _add_timestamp_fields(row, created_at, 'created_at')
+    if created is None:
+        row['system_age_days'] = 0
+        row['system_age_display'] = '未知'
+    else:
+        now = datetime.now(created.tzinfo) if created.tzinfo else context.get('now') or datetime.now()
+        age_days = (now - created).days
+        row['system_age_days'] = age_days
+        row['system_age_display'] = SystemTransform._format_age(age_days)
+
+
+@_COMPUTED.computes('updated_at_formatted', 'updated_date', depends=('updated_at',))
+def _compute_updated(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    if row.get('updated_at'):
+        _add_timestamp_fields(row, row['updated_at'], 'updated_at')
+
+
+@_COMPUTED.computes('status_display', 'status_color', 'status_icon', 'enabled', depends=('status',))
+def _compute_status_display(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    status = safe_str(row.get('status', 'active'))
+    display, color, icon = _STATUS_DISPLAY.get(status, _UNKNOWN_STATUS)
+    row['status_display'] = display
+    row['status_color'] = color
+    row['status_icon'] = icon
+    # 添加enabled布尔字段供前端使用
+    row['enabled'] = status == 'active'
+
+
+@_COMPUTED.computes('description_length', 'has_description', 'name_length', depends=('name', 'description'))
+def _compute_text_stats(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    description_length = len(safe_str(row.get('description', '')))
+    row['description_length'] = description_length
+    row['has_description'] = description_length > 0
+    row['name_length'] = len(safe_str(row.get('name', '')))
+
+
+@_COMPUTED.computes('search_keywords', depends=('name', 'description', 'status'))
+def _compute_search_keywords(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    row['search_keywords'] = SystemTransform._keywords(
+        safe_str(row.get('name', '')), safe_str(row.get('description', '')), safe_str(row.get('status', ''))
+    )
+
+
+@_COMPUTED.computes('health_score', depends=('status', 'description', 'name'))
+def _compute_health_score(row: Dict[str, Any], context: Dict[str, Any]) -> None:
+    row['health_score'] = SystemTransform._calculate_health_score(row)
+
+
+# 摘要数据包含的计算字段
+_SUMMARY_FIELDS = frozenset((
+    'status_display', 'status_color', 'status_icon', 'enabled', 'description_length', 'has_description',
+    'name_length', 'search_keywords', 'health_score'
+))
+
 
 class SystemTransform:
     """系统数据转换器 - 函数式编程风格"""
-    
+
+    # 计算字段注册表，供Service层展开字段投影与按需计算
+    COMPUTED_FIELDS = _COMPUTED
+
     @staticmethod
-    def to_response(raw_system: Dict[str, Any]) -> Dict[str, Any]:
+    def to_response(raw_system: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
         """
         将DAO层原始数据转换为API响应数据
-        
+
         Args:
             raw_system (Dict[str, Any]): DAO层原始系统数据
-            
+            now (Optional[datetime]): 计算系统年龄的当前时间，为空时取当前时间
+
         Returns:
             Dict[str, Any]: 转换后的响应数据
         """
         if not raw_system:
             return {}
-        
-        return pipe(
-            raw_system,
-            SystemTransform._add_business_fields,
-            SystemTransform._format_timestamps,
-            SystemTransform._add_status_display,
-            SystemTransform._add_computed_fields
-        )
-    
+
+        return _COMPUTED.evaluate(dict(raw_system), None, {'now': now or datetime.now()})
+
     @staticmethod
-    def to_list_response(raw_systems: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def to_list_response(raw_systems: List[Dict[str, Any]],
+                         fields: Optional[FrozenSet[str]] = None) -> List[Dict[str, Any]]:
         """
         将DAO层原始数据列表转换为API响应数据列表
-        
+
         Args:
             raw_systems (List[Dict[str, Any]]): DAO层原始系统数据列表
-            
+            fields (Optional[FrozenSet[str]]): 需要计算的字段（已按依赖展开），为空时计算全部字段
+
         Returns:
             List[Dict[str, Any]]: 转换后的响应数据列表
         """
         if not raw_systems:
             return []
-        
-        return [SystemTransform.to_response(system) for system in raw_systems]
-    
+
+        context = {'now': datetime.now()}
+        evaluate = _COMPUTED.evaluate
+        return [evaluate(dict(system), fields, context) if system else {} for system in raw_systems]
+
     @staticmethod
     def to_summary(raw_system: Dict[str, Any]) -> Dict[str, Any]:
         """
         将DAO层原始数据转换为摘要数据
-        
+
         Args:
             raw_system (Dict[str, Any]): DAO层原始系统数据
-            
+
         Returns:
             Dict[str, Any]: 转换后的摘要数据
         """
         if not raw_system:
             return {}
-        
-        return pipe(
-            raw_system,
-            SystemTransform._extract_summary_fields,
-            SystemTransform._add_status_display,
-            SystemTransform._add_computed_fields
-        )
-    
+
+        row = {
+            'id': safe_int(raw_system.get('id')),
+            'name': safe_str(raw_system.get('name')),
+            'description': safe_str(raw_system.get('description')),
+            'status': safe_str(raw_system.get('status', 'active')),
+            'created_at': safe_str(raw_system.get('created_at', ''))
+        }
+        return _COMPUTED.evaluate(row, _SUMMARY_FIELDS)
+
     @staticmethod
-    def with_module_count(system: Dict[str, Any], module_count: int = 0) -> Dict[str, Any]:
+    def with_module_count(system: Dict[str, Any], module_count: int = 0,
+                          in_place: bool = False) -> Dict[str, Any]:
         """
         添加模块数量信息
-        
+
         Args:
             system (Dict[str, Any]): 系统数据
             module_count (int): 模块数量
-            
+            in_place (bool): 是否直接修改传入的数据（用于转换器刚构建的响应行）
+
         Returns:
             Dict[str, Any]: 包含模块数量的系统数据
         """
-        enhanced = system.copy()
+        enhanced = system if in_place else system.copy()
         enhanced['module_count'] = module_count
         enhanced['has_modules'] = module_count > 0
-        
+
         # 基于模块数量添加系统规模
         if module_count == 0:
             enhanced['system_scale'] = 'empty'
@@ -97,263 +268,73 @@ class SystemTransform:
             enhanced['system_scale'] = 'medium'
         else:
             enhanced['system_scale'] = 'large'
-        
-        return enhanced
-    
-    @staticmethod
-    def _add_business_fields(system: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        添加业务字段
-        
-        Args:
-            system (Dict[str, Any]): 原始系统数据
-            
-        Returns:
-            Dict[str, Any]: 添加业务字段后的数据
-        """
-        enhanced = system.copy()
-        
-        # 添加系统唯一键
-        system_id = safe_int(system.get('id'))
-        enhanced['system_key'] = create_key('SYS', system_id)
-        
-        # 添加活跃状态
-        enhanced['is_active'] = system.get('status') == 'active'
-        
-        # 添加系统类型（基于名称推断）
-        system_name = safe_str(system.get('name', '')).lower()
-        enhanced['system_type'] = SystemTransform._infer_system_type(system_name)
-        
-        # 添加优先级（基于状态）
-        enhanced['priority'] = SystemTransform._calculate_priority(system.get('status'))
-        
-        # 添加系统版本（如果有）
-        enhanced['version'] = SystemTransform._extract_version(system.get('description', ''))
-        
-        return enhanced
-    
-    @staticmethod
-    def _format_timestamps(system: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        格式化时间戳
-        
-        Args:
-            system (Dict[str, Any]): 系统数据
-            
-        Returns:
-            Dict[str, Any]: 格式化时间戳后的数据
-        """
-        enhanced = system.copy()
-        
-        # 格式化创建时间
-        if system.get('created_at'):
-            enhanced['created_at_formatted'] = format_datetime(system['created_at'])
-            enhanced['created_date'] = format_datetime(system['created_at'], '%Y-%m-%d')
-        
-        # 格式化更新时间
-        if system.get('updated_at'):
-            enhanced['updated_at_formatted'] = format_datetime(system['updated_at'])
-            enhanced['updated_date'] = format_datetime(system['updated_at'], '%Y-%m-%d')
-        
-        # 计算系统年龄（天数）
-        if system.get('created_at'):
-            from datetime import datetime
-            try:
-                created_date = datetime.fromisoformat(str(system['created_at']).replace('Z', '+00:00'))
-                age_days = (datetime.now() - created_date).days
-                enhanced['system_age_days'] = age_days
-                enhanced['system_age_display'] = SystemTransform._format_age(age_days)
-            except:
-                enhanced['system_age_days'] = 0
-                enhanced['system_age_display'] = '未知'
-        
-        return enhanced
-    
-    @staticmethod
-    def _add_status_display(system: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        添加状态显示
-        
-        Args:
-            system (Dict[str, Any]): 系统数据
-            
-        Returns:
-            Dict[str, Any]: 添加状态显示后的数据
-        """
-        enhanced = system.copy()
-        
-        status = safe_str(system.get('status', 'active'))
-        status_map = {
-            'enabled': {'display': '启用', 'color': 'success', 'icon': 'check-circle'},
-            'disabled': {'display': '禁用', 'color': 'danger', 'icon': 'times-circle'},
-            'active': {'display': '活跃', 'color': 'success', 'icon': 'check-circle'},
-            'inactive': {'display': '非活跃', 'color': 'warning', 'icon': 'pause-circle'},
-            'development': {'display': '开发中', 'color': 'info', 'icon': 'code'},
-            'testing': {'display': '测试中', 'color': 'primary', 'icon': 'test-tube'},
-            'production': {'display': '生产环境', 'color': 'success', 'icon': 'server'},
-            'maintenance': {'display': '维护中', 'color': 'warning', 'icon': 'wrench'},
-            'deprecated': {'display': '已废弃', 'color': 'danger', 'icon': 'archive'}
-        }
-        
-        status_info = status_map.get(status, {
-            'display': '未知', 
-            'color': 'secondary', 
-            'icon': 'question-circle'
-        })
-        
-        enhanced['status_display'] = status_info['display']
-        enhanced['status_color'] = status_info['color']
-        enhanced['status_icon'] = status_info['icon']
-        
-        # 添加enabled布尔字段供前端使用
-        enhanced['enabled'] = status == 'active'
-        
-        return enhanced
-    
-    @staticmethod
-    def _add_computed_fields(system: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        添加计算字段
-        
-        Args:
-            system (Dict[str, Any]): 系统数据
-            
-        Returns:
-            Dict[str, Any]: 添加计算字段后的数据
-        """
-        enhanced = system.copy()
-        
-        # 计算描述长度
-        description = safe_str(system.get('description', ''))
-        enhanced['description_length'] = len(description)
-        enhanced['has_description'] = len(description) > 0
-        
-        # 计算名称长度
-        name = safe_str(system.get('name', ''))
-        enhanced['name_length'] = len(name)
-        
-        # 添加搜索关键词
-        enhanced['search_keywords'] = SystemTransform._generate_search_keywords(system)
-        
-        # 添加系统健康度评分
-        enhanced['health_score'] = SystemTransform._calculate_health_score(system)
-        
+
         return enhanced
-    
-    @staticmethod
-    def _extract_summary_fields(system: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        提取摘要字段
-        
-        Args:
-            system (Dict[str, Any]): 原始系统数据
-            
-        Returns:
-            Dict[str, Any]: 摘要数据
-        """
-        return {
-            'id': safe_int(system.get('id')),
-            'name': safe_str(system.get('name')),
-            'description': safe_str(system.get('description')),
-            'status': safe_str(system.get('status', 'active')),
-            'created_at': safe_str(system.get('created_at', ''))
-        }
-    
+
     @staticmethod
     def _infer_system_type(system_name: str) -> str:
         """
         基于系统名称推断系统类型
-        
+
         Args:
             system_name (str): 系统名称
-            
+
         Returns:
             str: 系统类型
         """
         if not system_name:
             return 'unknown'
-        
-        type_keywords = {
-            'web': ['web', 'website', 'portal', 'frontend'],
-            'api': ['api', 'service', 'backend', 'server'],
-            'mobile': ['mobile', 'app', 'android', 'ios'],
-            'desktop': ['desktop', 'client', 'application'],
-            'database': ['database', 'db', 'data', 'storage'],
-            'microservice': ['micro', 'service', 'ms'],
-            'admin': ['admin', 'management', 'console'],
-            'monitoring': ['monitor', 'log', 'metric', 'alert']
-        }
-        
-        for system_type, keywords in type_keywords.items():
-            if any(keyword in system_name for keyword in keywords):
-                return system_type
-        
+
+        for system_type, keywords in _TYPE_KEYWORDS:
+            for keyword in keywords:
+                if keyword in system_name:
+                    return system_type
+
         return 'general'
-    
+
     @staticmethod
     def _calculate_priority(status: str) -> int:
         """
         基于状态计算优先级
-        
+
         Args:
             status (str): 系统状态
-            
+
         Returns:
             int: 优先级（数字越大优先级越高）
         """
-        priority_map = {
-            'production': 5,
-            'active': 4,
-            'testing': 3,
-            'development': 2,
-            'maintenance': 1,
-            'inactive': 1,
-            'deprecated': 0
-        }
-        
-        return priority_map.get(status, 1)
-    
+        return _PRIORITY_MAP.get(status, 1)
+
     @staticmethod
     def _extract_version(description: str) -> str:
         """
         从描述中提取版本信息
-        
+
         Args:
             description (str): 系统描述
-            
+
         Returns:
             str: 版本号
         """
-        import re
-        
         if not description:
             return 'unknown'
-        
-        # 匹配版本号模式
-        version_patterns = [
-            r'v(\d+\.\d+\.\d+)',
-            r'version\s+(\d+\.\d+\.\d+)',
-            r'(\d+\.\d+\.\d+)',
-            r'v(\d+\.\d+)',
-            r'version\s+(\d+\.\d+)',
-            r'(\d+\.\d+)'
-        ]
-        
-        for pattern in version_patterns:
-            match = re.search(pattern, description.lower())
+
+        lowered = description.lower()
+        for pattern in _VERSION_PATTERNS:
+            match = pattern.search(lowered)
             if match:
                 return match.group(1)
-        
+
         return 'unknown'
-    
+
     @staticmethod
     def _format_age(age_days: int) -> str:
         """
         格式化系统年龄显示
-        
+
         Args:
             age_days (int): 年龄天数
-            
+
         Returns:
             str: 格式化的年龄显示
         """
@@ -370,75 +351,63 @@ class SystemTransform:
         else:
             years = age_days // 365
             return f'{years}年'
-    
+
     @staticmethod
     def _generate_search_keywords(system: Dict[str, Any]) -> List[str]:
         """
         生成搜索关键词
-        
+
         Args:
             system (Dict[str, Any]): 系统数据
-            
+
         Returns:
             List[str]: 搜索关键词列表
         """
-        keywords = []
-        
-        # 添加名称关键词
-        name = safe_str(system.get('name', ''))
-        if name:
-            keywords.extend(name.split())
-        
-        # 添加描述关键词
-        description = safe_str(system.get('description', ''))
-        if description:
-            keywords.extend(description.split())
-        
-        # 添加状态关键词
-        status = safe_str(system.get('status', ''))
+        return SystemTransform._keywords(
+            safe_str(system.get('name', '')),
+            safe_str(system.get('description', '')),
+            safe_str(system.get('status', ''))
+        )
+
+    @staticmethod
+    def _keywords(name: str, description: str, status: str) -> List[str]:
+        """名称、描述分词与状态去重后转小写"""
+        keywords = set(name.lower().split())
+        keywords.update(description.lower().split())
         if status:
-            keywords.append(status)
-        
-        # 去重并转为小写
-        return list(set(keyword.lower() for keyword in keywords if keyword))
-    
+            keywords.add(status.lower())
+        return list(keywords)
+
     @staticmethod
     def _calculate_health_score(system: Dict[str, Any]) -> int:
         """
         计算系统健康度评分
-        
+
         Args:
             system (Dict[str, Any]): 系统数据
-            
+
         Returns:
             int: 健康度评分 (0-100)
         """
-        score = 50  # 基础分数
-        
-        # 状态评分
-        status = safe_str(system.get('status', 'active'))
-        status_scores = {
-            'production': 30,
-            'active': 25,
-            'testing': 15,
-            'development': 10,
-            'maintenance': 5,
-            'inactive': -10,
-            'deprecated': -20
-        }
-        score += status_scores.get(status, 0)
-        
+        return SystemTransform._health_score(
+            safe_str(system.get('status', 'active')),
+            safe_str(system.get('description', '')),
+            safe_str(system.get('name', ''))
+        )
+
+    @staticmethod
+    def _health_score(status: str, description: str, name: str) -> int:
+        """健康度评分：基础分50 + 状态分 + 描述完整性 + 名称规范性，限制在0-100"""
+        score = 50 + _HEALTH_STATUS_SCORES.get(status, 0)
+
         # 描述完整性评分
-        description = safe_str(system.get('description', ''))
         if len(description) > 50:
             score += 10
         elif len(description) > 20:
             score += 5
-        
+
         # 名称规范性评分
-        name = safe_str(system.get('name', ''))
         if len(name) > 3 and not name.isdigit():
             score += 10
-        
-        # 确保分数在0-100范围内
-        return max(0, min(100, score))
\ No newline at end of file
+
+        return max(0, min(100, score))
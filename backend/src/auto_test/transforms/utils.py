@@ -56,6 +56,28 @@ def format_datetime(datetime_str: str, format_str: str = '%Y-%m-%d %H:%M:%S') ->
         return datetime_str
 
 
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """
+    解析日期时间（ISO格式，支持Z后缀），同一字段只解析一次，供多种格式输出复用
+    
+    Args:
+        value (Any): 日期时间字符串或datetime
+        
+    Returns:
+        Optional[datetime]: 解析结果，无法解析时返回None
+    """
+    if isinstance(value, datetime):
+        return value
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        if value.endswith('Z'):
+            value = value[:-1] + '+00:00'
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
 def safe_get(data: Dict[str, Any], key: str, default: Any = None) -> Any:
     """
     安全获取字典值
@@ -5,11 +5,13 @@ Utils Module - Simplified
 提供简化的工具函数
 """
 
-from .response import success_response, error_response
+from .response import success_response, error_response, trusted_response, FastJSONResponse
 from .logger import get_logger
 
 __all__ = [
     "success_response",
     "error_response", 
+    "trusted_response",
+    "FastJSONResponse",
     "get_logger"
 ]
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""
+流式导出工具
+Streaming Export Utils
+
+将按批产出的数据行编码为NDJSON/CSV字节流，可选即时gzip压缩，封装为StreamingResponse：
+- 数据源为按主键键集分批读取的生成器，内存只与批大小相关，与导出总行数无关
+- 每批编码为一个块写出，客户端边下载边接收
+- 压缩时每批执行一次同步刷新，已写出的数据可立即解压
+- 在事件循环上逐批迭代：数据源每批都通过共享数据库连接读取（get_db_cursor 会提交/回滚），
+  不能交给线程池与其他请求并发使用该连接
+"""
+
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+
+from ..config import get_config
+from .response import dumps_json
+
+# 导出格式 -> 媒体类型
+EXPORT_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8'
+}
+
+# UTF-8 BOM：Excel按UTF-8识别中文
+_UTF8_BOM = '\ufeff'
+
+
+def validate_export_format(export_format: str) -> str:
+    """
+    校验导出格式
+
+    Args:
+        export_format (str): 导出格式
+
+    Returns:
+        str: 规范化后的导出格式
+
+    Raises:
+        ValueError: 不支持的导出格式
+    """
+    normalized = (export_format or '').lower()
+    if normalized not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"不支持的导出格式: {export_format}，支持: {', '.join(EXPORT_MEDIA_TYPES)}")
+    return normalized
+
+
+def ndjson_chunks(batches: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """每批编码为NDJSON块（每行一个JSON对象）"""
+    for batch in batches:
+        if batch:
+            yield b''.join(dumps_json(row) + b'\n' for row in batch)
+
+
+def _cell(row: Dict[str, Any], column: str) -> Any:
+    """读取单元格值：支持 a.b 形式的嵌套字段，字典/列表编码为JSON，None为空"""
+    value: Any = row
+    for key in column.split('.'):
+        value = value.get(key) if isinstance(value, dict) else None
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return value
+
+
+def csv_chunks(batches: Iterable[List[Dict[str, Any]]], columns: Sequence[str]) -> Iterator[bytes]:
+    """
+    每批编码为CSV块，首块包含BOM与表头
+
+    Args:
+        batches (Iterable[List[Dict[str, Any]]]): 按批产出的数据行
+        columns (Sequence[str]): 列名（支持 a.b 形式的嵌套字段）
+
+    Yields:
+        bytes: CSV块
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write(_UTF8_BOM)
+    writer.writerow(columns)
+    for batch in batches:
+        for row in batch:
+            writer.writerow([_cell(row, column) for column in columns])
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    # 无数据时仍输出表头
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: Optional[int] = None) -> Iterator[bytes]:
+    """
+    即时gzip压缩字节流（每块同步刷新）
+
+    Args:
+        chunks (Iterable[bytes]): 原始字节块
+        level (Optional[int]): 压缩级别，为空时使用配置 EXPORT_GZIP_LEVEL
+
+    Yields:
+        bytes: gzip格式的字节块
+    """
+    compressor = zlib.compressobj(get_config().EXPORT_GZIP_LEVEL if level is None else level,
+                                  zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def _iterate_on_loop(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    在事件循环上逐块迭代同步生成器
+
+    StreamingResponse 会把同步迭代器交给线程池迭代，数据源读取批次时就会在工作线程中
+    使用共享连接；改为异步生成器后每批的读取与编码都在事件循环上完成，块之间让出控制权。
+
+    Args:
+        chunks (Iterator[bytes]): 编码后的字节块
+
+    Yields:
+        bytes: 字节块
+    """
+    for chunk in chunks:
+        yield chunk
+
+
+def stream_export(batches: Iterable[List[Dict[str, Any]]], export_format: str, columns: Sequence[str],
+                  filename: str, compress: bool = False) -> StreamingResponse:
+    """
+    构建流式导出响应
+
+    Args:
+        batches (Iterable[List[Dict[str, Any]]]): 按批产出的数据行（同步生成器，在事件循环上迭代）
+        export_format (str): 导出格式（ndjson / csv）
+        columns (Sequence[str]): CSV列名
+        filename (str): 文件名前缀（不含扩展名与时间戳）
+        compress (bool): 是否输出gzip文件（.gz）
+
+    Returns:
+        StreamingResponse: 流式响应
+    """
+    export_format = validate_export_format(export_format)
+    chunks = ndjson_chunks(batches) if export_format == 'ndjson' else csv_chunks(batches, columns)
+    media_type = EXPORT_MEDIA_TYPES[export_format]
+    name = f"{filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+    if compress:
+        chunks = gzip_chunks(chunks)
+        media_type = 'application/gzip'
+        name += '.gz'
+    return StreamingResponse(_iterate_on_loop(chunks), media_type=media_type,
+                             headers={'Content-Disposition': f'attachment; filename="{name}"'})
@@ -0,0 +1,101 @@
+"""
+字段投影工具 - 稀疏字段集
+Field Projection Utils - Sparse Fieldsets
+
+列表接口通过 fields=id,name,status 指定需要的字段：
+- DAO层只SELECT请求字段及计算字段依赖的列
+- Transform/Service层只计算请求的计算字段
+- 返回前裁剪掉仅作为依赖取出的字段
+"""
+
+from typing import Any, Dict, FrozenSet, Iterable, Mapping, Optional
+
+
+def parse_fields(fields: Optional[str]) -> Optional[FrozenSet[str]]:
+    """
+    解析 fields 查询参数
+
+    Args:
+        fields (Optional[str]): 逗号分隔的字段名，如 "id,name,status"
+
+    Returns:
+        Optional[FrozenSet[str]]: 字段集合，未指定时返回None（表示全部字段）
+    """
+    if not fields:
+        return None
+    parsed = frozenset(name.strip() for name in fields.split(',') if name.strip())
+    return parsed or None
+
+
+def expand_fields(fields: Iterable[str], dependencies: Mapping[str, Iterable[str]]) -> FrozenSet[str]:
+    """
+    按依赖关系展开字段集合（计算字段 -> 依赖的原始列/中间字段，递归展开）
+
+    Args:
+        fields (Iterable[str]): 请求的字段
+        dependencies (Mapping[str, Iterable[str]]): 计算字段依赖表
+
+    Returns:
+        FrozenSet[str]: 包含全部依赖的字段集合
+    """
+    expanded = set()
+    pending = list(fields)
+    while pending:
+        name = pending.pop()
+        if name in expanded:
+            continue
+        expanded.add(name)
+        pending.extend(dependencies.get(name, ()))
+    return frozenset(expanded)
+
+
+def validate_fields(fields: Optional[FrozenSet[str]], known: Iterable[str]) -> None:
+    """
+    校验字段是否受支持
+
+    Args:
+        fields (Optional[FrozenSet[str]]): 请求的字段
+        known (Iterable[str]): 支持的字段
+
+    Raises:
+        ValueError: 存在不支持的字段
+    """
+    if fields is None:
+        return
+    unknown = fields.difference(known)
+    if unknown:
+        raise ValueError(f"不支持的字段: {', '.join(sorted(unknown))}")
+
+
+def select_list(columns: Mapping[str, str], fields: Optional[Iterable[str]] = None) -> str:
+    """
+    构建SELECT列清单，id列始终保留
+
+    Args:
+        columns (Mapping[str, str]): 字段名 -> SQL表达式（按SELECT顺序）
+        fields (Optional[Iterable[str]]): 需要的字段，为空时选择全部列
+
+    Returns:
+        str: 逗号分隔的列表达式
+    """
+    if fields is None:
+        return ', '.join(columns.values())
+    wanted = set(fields)
+    wanted.add('id')
+    return ', '.join(expression for name, expression in columns.items() if name in wanted)
+
+
+def project(row: Dict[str, Any], fields: Optional[FrozenSet[str]]) -> Dict[str, Any]:
+    """
+    裁剪数据行，只保留请求的字段
+
+    Args:
+        row (Dict[str, Any]): 数据行
+        fields (Optional[FrozenSet[str]]): 请求的字段，为空时原样返回
+
+    Returns:
+        Dict[str, Any]: 裁剪后的数据行
+    """
+    if fields is None:
+        return row
+    return {key: value for key, value in row.items() if key in fields}
@@ -0,0 +1,304 @@
+"""
+REST接口HTTP缓存中间件
+HTTP Caching Middleware for Read-Heavy REST Endpoints
+
+仪表盘反复轮询统计、系统、模块、API接口列表。对登记在 HTTP_CACHE_RULES 中的GET/HEAD路由：
+- 强ETag由路由、查询参数与所依赖表的版本计数器（table_versions，写入时由触发器递增）计算，
+  不对响应体做哈希；任一依赖表被写入（包括其他worker写入）后ETag随之变化
+- If-None-Match 命中时直接返回304，不进入Service层
+- 按路由设置 Cache-Control（默认 no-cache：可缓存但每次用ETag重新验证）
+- 聚合类接口（统计）可开启短TTL服务端响应缓存，同一ETag在TTL内直接返回缓存的响应体
+
+ETag中包含当天日期：响应中的系统年龄等字段按天变化。
+接口以HTTP 200 + success=false 返回业务错误，这类响应不附加ETag且不缓存（Cache-Control: no-store），
+避免客户端凭ETag把一次临时错误一直当作最新数据。
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from ..config import get_config
+from ..database.dao import TableVersionDAO
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# 业务错误响应体前缀（error_response 经JSONResponse序列化后的开头）
+_FAILURE_PREFIX = b'{"success":false'
+
+# 默认缓存策略：允许缓存，但每次使用前用ETag重新验证
+REVALIDATE = 'private, no-cache'
+# 固定枚举数据（HTTP方法、状态、页面类型等）
+STATIC = 'public, max-age=86400'
+
+
+class CacheRule:
+    """路由缓存规则"""
+
+    __slots__ = ('template', 'pattern', 'tables', 'cache_control', 'server_ttl')
+
+    def __init__(self, template: str, tables: Tuple[str, ...] = (), cache_control: str = REVALIDATE,
+                 server_ttl: bool = False):
+        """
+        Args:
+            template (str): 路由模板（如 /api/systems/v1/{system_id}）
+            tables (Tuple[str, ...]): 响应依赖的表，任一表写入后ETag变化
+            cache_control (str): Cache-Control 响应头
+            server_ttl (bool): 是否启用服务端短TTL响应缓存（用于开销较大的聚合接口）
+        """
+        self.template = template
+        self.pattern = re.compile('^' + '/'.join(
+            '[^/]+' if segment.startswith('{') else re.escape(segment) for segment in template.split('/')
+        ) + '$')
+        self.tables = tables
+        self.cache_control = cache_control
+        self.server_ttl = server_ttl
+
+
+_SYSTEMS = ('systems', 'modules')
+_MODULES = ('modules', 'systems')
+_API_INTERFACES = ('api_interfaces', 'systems', 'modules')
+_PAGES = ('pages', 'page_apis', 'api_interfaces')
+
+# 路由缓存规则（按顺序匹配，固定路径需排在同层级的路径参数之前）
+HTTP_CACHE_RULES: Tuple[CacheRule, ...] = (
+    CacheRule('/api/stats/v1/', _SYSTEMS, server_ttl=True),
+    CacheRule('/api/stats/v1/systems', _SYSTEMS, server_ttl=True),
+    CacheRule('/api/stats/v1/modules', _SYSTEMS, server_ttl=True),
+    CacheRule('/api/systems/v1/', _SYSTEMS),
+    CacheRule('/api/systems/v1/enabled', ('systems',)),
+    CacheRule('/api/systems/v1/enabled_tree', _SYSTEMS),
+    CacheRule('/api/systems/v1/enabled/{category}', ('systems',)),
+    CacheRule('/api/systems/v1/{system_id}', ('systems',)),
+    CacheRule('/api/modules/v1/', _MODULES),
+    CacheRule('/api/modules/v1/enabled', _MODULES),
+    CacheRule('/api/modules/v1/by-system/{system_id}', _MODULES),
+    CacheRule('/api/modules/v1/enabled/by-system/{system_id}', _MODULES),
+    CacheRule('/api/modules/v1/tags/list', ('modules',)),
+    CacheRule('/api/modules/v1/stats/summary', _MODULES, server_ttl=True),
+    CacheRule('/api/modules/v1/{module_id}', _MODULES),
+    CacheRule('/api/api-interfaces/v1/', _API_INTERFACES),
+    CacheRule('/api/api-interfaces/v1/search/simple', _API_INTERFACES),
+    CacheRule('/api/api-interfaces/v1/system/{system_id}', _API_INTERFACES),
+    CacheRule('/api/api-interfaces/v1/module/{module_id}', _API_INTERFACES),
+    CacheRule('/api/api-interfaces/v1/stats/summary', _API_INTERFACES, server_ttl=True),
+    CacheRule('/api/api-interfaces/v1/methods/list', cache_control=STATIC),
+    CacheRule('/api/api-interfaces/v1/statuses/list', cache_control=STATIC),
+    CacheRule('/api/api-interfaces/v1/{api_id}', _API_INTERFACES),
+    CacheRule('/api/interfaces', _API_INTERFACES),
+    CacheRule('/api/interfaces/stats/summary', _API_INTERFACES, server_ttl=True),
+    CacheRule('/api/interfaces/{api_id}', _API_INTERFACES),
+    CacheRule('/api/pages/v1/', _PAGES),
+    CacheRule('/api/pages/v1/search/simple', _PAGES),
+    CacheRule('/api/pages/v1/stats/overview', _PAGES, server_ttl=True),
+    CacheRule('/api/pages/v1/types/list', cache_control=STATIC),
+    CacheRule('/api/pages/v1/execution-types/list', cache_control=STATIC),
+    CacheRule('/api/pages/v1/{page_id}', _PAGES),
+    CacheRule('/api/pages/v1/{page_id}/apis', _PAGES)
+)
+
+
+def match_rule(path: str) -> Optional[CacheRule]:
+    """查找请求路径对应的缓存规则"""
+    for rule in HTTP_CACHE_RULES:
+        if rule.pattern.match(path):
+            return rule
+    return None
+
+
+def compute_etag(rule: CacheRule, path: str, query_string: str) -> str:
+    """
+    计算强ETag：路由 + 规范化查询参数 + 依赖表版本 + 当天日期
+
+    Args:
+        rule (CacheRule): 缓存规则
+        path (str): 请求路径
+        query_string (str): 原始查询字符串
+
+    Returns:
+        str: 带引号的ETag
+    """
+    versions = TableVersionDAO.get_versions(rule.tables) if rule.tables else {}
+    query = urlencode(sorted(parse_qsl(query_string, keep_blank_values=True)))
+    version_key = ','.join(f"{table}:{versions.get(table, 0)}" for table in rule.tables)
+    raw = f"{path}?{query}|{version_key}|{date.today().isoformat()}|{get_config().APP_VERSION}"
+    return '"' + hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 比较（按RFC 7232使用弱比较，支持多个值与 *）"""
+    if if_none_match.strip() == '*':
+        return True
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """服务端短TTL响应缓存（按ETag索引，LRU淘汰）"""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        config = get_config()
+        self.max_entries = max_entries or config.REST_CACHE_MAX_ENTRIES
+        self.ttl = config.REST_CACHE_SERVER_TTL if ttl is None else ttl
+        self._entries: "OrderedDict[str, Tuple[float, int, List[Tuple[bytes, bytes]], bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag: str) -> Optional[Tuple[int, List[Tuple[bytes, bytes]], bytes]]:
+        """获取未过期的缓存响应（状态码, 响应头, 响应体）"""
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[etag]
+                return None
+            self._entries.move_to_end(etag)
+            return entry[1], entry[2], entry[3]
+
+    def put(self, etag: str, status: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> None:
+        """写入响应"""
+        with self._lock:
+            self._entries[etag] = (time.monotonic() + self.ttl, status, headers, body)
+            self._entries.move_to_end(etag)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class HttpCacheMiddleware:
+    """
+    ETag / 304 / Cache-Control 中间件（ASGI）
+
+    需注册在GZip中间件内层：304与服务端缓存的响应体仍由外层统一压缩。
+    """
+
+    def __init__(self, app: Any, enabled: Optional[bool] = None):
+        self.app = app
+        self.enabled = get_config().REST_CACHE_ENABLED if enabled is None else enabled
+        self.response_cache = ResponseCache()
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'not_modified': 0, 'server_hits': 0, 'misses': 0, 'errors': 0}
+        http_cache_registry.append(self)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if not self.enabled or scope['type'] != 'http' or scope['method'] not in ('GET', 'HEAD'):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope['path']
+        rule = match_rule(path)
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            etag = compute_etag(rule, path, scope.get('query_string', b'').decode('latin-1'))
+        except Exception as e:
+            # 版本表不可用时退化为不缓存
+            logger.warning(f"计算ETag失败，跳过HTTP缓存: {e}")
+            self._count('errors')
+            await self.app(scope, receive, send)
+            return
+
+        self._count('requests')
+        cache_headers = [(b'etag', etag.encode('latin-1')), (b'cache-control', rule.cache_control.encode('latin-1'))]
+
+        if_none_match = self._header(scope, b'if-none-match')
+        if if_none_match and etag_matches(if_none_match, etag):
+            self._count('not_modified')
+            await send({'type': 'http.response.start', 'status': 304, 'headers': cache_headers})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        if rule.server_ttl:
+            cached = self.response_cache.get(etag)
+            if cached is not None:
+                self._count('server_hits')
+                status, headers, body = cached
+                await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+                await send({'type': 'http.response.body',
+                            'body': b'' if scope['method'] == 'HEAD' else body})
+                return
+
+        self._count('misses')
+        store = rule.server_ttl and scope['method'] == 'GET'
+        state: Dict[str, Any] = {'start': None, 'chunks': []}
+
+        async def send_with_cache_headers(message: Dict[str, Any]) -> None:
+            if message['type'] == 'http.response.start':
+                if message['status'] != 200:
+                    await send(message)
+                    return
+                # 暂存响应头，读完响应体确认业务成功后再决定缓存头（JSON响应只有一个body消息）
+                state['start'] = message
+                return
+            if state['start'] is None:
+                await send(message)
+                return
+            state['chunks'].append(message.get('body', b''))
+            if message.get('more_body', False):
+                return
+
+            start, state['start'] = state['start'], None
+            body = b''.join(state['chunks'])
+            headers = list(start.get('headers', []))
+            if body.lstrip().startswith(_FAILURE_PREFIX):
+                headers.append((b'cache-control', b'no-store'))
+            else:
+                # 路由自行设置的缓存头优先
+                names = {name.lower() for name, _ in headers}
+                headers.extend(header for header in cache_headers if header[0] not in names)
+                if store:
+                    self.response_cache.put(etag, 200, headers, body)
+            await send({**start, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': body})
+
+        await self.app(scope, receive, send_with_cache_headers)
+
+    @staticmethod
+    def _header(scope: Dict[str, Any], name: bytes) -> Optional[str]:
+        for key, value in scope.get('headers', []):
+            if key == name:
+                return value.decode('latin-1')
+        return None
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        with self._lock:
+            stats = dict(self._stats)
+        revalidated = stats['not_modified'] + stats['server_hits']
+        return {
+            'enabled': self.enabled,
+            'rules': len(HTTP_CACHE_RULES),
+            'server_entries': len(self.response_cache),
+            'hit_ratio': round(revalidated / stats['requests'], 4) if stats['requests'] else 0.0,
+            **stats
+        }
+
+
+# 已注册的中间件实例（由应用在启动时创建，供指标服务读取统计）
+http_cache_registry: List[HttpCacheMiddleware] = []
+
+
+def get_http_cache_stats() -> Dict[str, Any]:
+    """获取HTTP缓存中间件统计（未注册时返回空统计）"""
+    if not http_cache_registry:
+        return {'enabled': False}
+    return http_cache_registry[-1].get_stats()
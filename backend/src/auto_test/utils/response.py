@@ -2,10 +2,64 @@
 响应工具 - 极简版
 Response Utils - Simplified
 
-提供统一的API响应格式
+提供统一的API响应格式，以及快速JSON序列化：
+- FastJSONResponse：基于orjson的响应类（未安装orjson时回退标准库json）
+- trusted_response：Service层产出的可信数据直接序列化返回，跳过response_model的二次校验与编码
+- ResponseShape：按响应模型的字段对可信数据行做投影，输出与模型序列化一致而不构建模型实例
 """
 
-from typing import Any, Optional, Union
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，缺失时回退标准库json
+    orjson = None
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+# NDJSON事件流沿用 default=str 的时间格式（'YYYY-MM-DD HH:MM:SS'）
+_ORJSON_NDJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson is not None else 0
+
+
+def _default(value: Any) -> Any:
+    """无法直接序列化的值：pydantic模型导出为字典，集合转列表，时间转ISO格式，其余转字符串"""
+    if hasattr(value, 'model_dump'):
+        return value.model_dump(mode='json')
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    序列化为紧凑的UTF-8 JSON字节串
+
+    Args:
+        content (Any): 待序列化的数据（字典键可以是非字符串）
+
+    Returns:
+        bytes: JSON字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+                      default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """基于orjson的JSON响应类（应用默认响应类）"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
 
 def success_response(data: Any = None, message: str = "操作成功") -> dict:
     """成功响应"""
@@ -23,4 +77,86 @@ def error_response(message: str = "操作失败", code: Optional[Union[int, str]
         "success": False,
         "message": message,
         "code": code
-    }
\ No newline at end of file
+    }
+
+def too_many_requests_response(message: str, retry_after: int) -> JSONResponse:
+    """请求被拒绝（如执行队列已满）：429 + Retry-After"""
+    return JSONResponse(
+        status_code=429,
+        content=error_response(message=message, code=429),
+        headers={"Retry-After": str(retry_after)}
+    )
+
+def trusted_response(data: Any = None, message: str = "操作成功") -> FastJSONResponse:
+    """
+    可信数据的成功响应：直接序列化返回，FastAPI不再按response_model校验与编码
+
+    仅用于Service层产出、结构已确定的数据（列表/详情/导出），需要保持模型字段形状时先经ResponseShape投影。
+    信封与 ApiResponseGeneric 序列化结果一致（data 与 "code": null 始终输出）。
+
+    Args:
+        data (Any): 业务数据
+        message (str): 提示信息
+
+    Returns:
+        FastJSONResponse: 响应对象
+    """
+    return FastJSONResponse(content={"success": True, "message": message, "data": data, "code": None})
+
+
+def _is_datetime(annotation: Any) -> bool:
+    """字段类型是否为datetime或Optional[datetime]"""
+    return annotation is datetime or datetime in getattr(annotation, '__args__', ())
+
+
+class ResponseShape:
+    """
+    响应模型的字段形状
+
+    按pydantic模型的字段对可信数据行做投影：只保留模型字段，缺失字段取默认值，
+    时间字段的 'YYYY-MM-DD HH:MM:SS' 字符串转为ISO格式，与模型序列化输出一致。
+    """
+
+    def __init__(self, model: Any):
+        """
+        Args:
+            model (Any): pydantic响应模型类（如 ApiInterface）
+        """
+        self.model = model
+        self._fields: List[Tuple[str, Any, bool]] = [
+            (name, None if info.is_required() else info.get_default(call_default_factory=True),
+             _is_datetime(info.annotation))
+            for name, info in model.model_fields.items()
+        ]
+
+    def row(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        投影单行数据
+
+        Args:
+            raw (Dict[str, Any]): Service层数据行
+
+        Returns:
+            Dict[str, Any]: 只含模型字段的数据行
+        """
+        row = {}
+        for name, default, is_datetime in self._fields:
+            value = raw.get(name, default)
+            if is_datetime and isinstance(value, str) and len(value) >= 19 and value[10] == ' ':
+                value = f"{value[:10]}T{value[11:]}"
+            row[name] = value
+        return row
+
+    def rows(self, raws: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """投影多行数据"""
+        project = self.row
+        return [project(raw) for raw in raws]
+
+
+async def ndjson_lines(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """将事件流序列化为NDJSON（每行一个JSON对象），用于StreamingResponse"""
+    async for event in events:
+        if orjson is not None:
+            yield orjson.dumps(event, default=str, option=_ORJSON_NDJSON_OPTIONS).decode("utf-8") + "\n"
+        else:
+            yield json.dumps(event, ensure_ascii=False, default=str) + "\n"
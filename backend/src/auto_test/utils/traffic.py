@@ -0,0 +1,318 @@
+"""
+流量记录解析工具
+Traffic Record Parsing Utils
+
+将HAR条目与访问日志行解析为统一的请求记录，供流量回放导入使用：
+- HAR条目：方法、URL、查询参数、请求头、请求/响应体（base64解码、JSON解析）、状态码、时间、pageref
+- 访问日志：nginx/apache 通用/组合格式，以及每行一个JSON对象的结构化日志
+- 请求形状：查询参数名 + 请求体骨架（字段名与值类型，数组取首个元素），用于去重
+本模块只做纯解析，不访问数据库，按批在子进程中执行（parse_batch 为进程池入口）。
+"""
+
+import base64
+import hashlib
+import json
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+# 不写入回放用例的请求头：逐跳头、由客户端自动生成的头与凭据类头
+DROPPED_HEADERS = frozenset({
+    'host', 'content-length', 'connection', 'keep-alive', 'transfer-encoding', 'upgrade',
+    'accept-encoding', 'te', 'trailer', 'cookie', 'authorization', 'proxy-authorization',
+    'x-api-key', 'x-auth-token', 'x-csrf-token', 'x-xsrf-token', 'x-forwarded-for',
+    'x-forwarded-host', 'x-forwarded-proto', 'x-real-ip', 'via', 'forwarded'
+})
+
+# 超过该长度的请求/响应体不做JSON解析
+_MAX_PARSE_CHARS = 1024 * 1024
+
+# 组合/通用日志格式：ip - user [time] "METHOD url PROTO" status size ["referer" "agent"]
+_LOG_LINE = re.compile(
+    r'^(?P<client>\S+) \S+ \S+ \[(?P<time>[^\]]+)\] "(?P<method>[A-Z]+) (?P<url>\S+)(?: [^"]*)?" '
+    r'(?P<status>\d{3}) \S+'
+)
+_LOG_TIME_FORMAT = '%d/%b/%Y:%H:%M:%S %z'
+# 日志时间按“日期+时区”缓存当日零点的时间戳，时分秒直接累加，避免逐行调用 strptime
+_LOG_DAY_CACHE: Dict[str, Optional[float]] = {}
+# 无请求体时形状只取决于查询参数名，按参数名元组缓存
+_QUERY_SHAPE_CACHE: Dict[Tuple[str, ...], str] = {}
+_MAX_CACHE_SIZE = 4096
+
+# 未匹配路径归并：数字、UUID、长十六进制段视为参数
+_ID_SEGMENT = re.compile(
+    r'^(?:\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{16,})$'
+)
+
+
+def parse_batch(kind: str, items: List[Any], max_body_chars: int) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    解析一批流量数据（进程池入口）
+
+    Args:
+        kind (str): har（HAR条目字典）/ log（访问日志行字节串）
+        items (List[Any]): 待解析的条目或行
+        max_body_chars (int): 请求/响应体保留的最大字符数
+
+    Returns:
+        Tuple[List[Dict[str, Any]], int]: (请求记录列表, 无法解析的数量)
+    """
+    parse = parse_har_entry if kind == 'har' else parse_log_line
+    records, invalid = [], 0
+    for item in items:
+        try:
+            record = parse(item, max_body_chars)
+        except Exception:
+            record = None
+        if record is None:
+            invalid += 1
+        else:
+            records.append(record)
+    return records, invalid
+
+
+def parse_har_entry(entry: Dict[str, Any], max_body_chars: int) -> Optional[Dict[str, Any]]:
+    """解析HAR条目（log.entries[]）"""
+    request = entry.get('request') or {}
+    response = entry.get('response') or {}
+    method = (request.get('method') or '').upper()
+    url = request.get('url')
+    if not method or not url:
+        return None
+    parts = urlsplit(url)
+    query = {item['name']: item.get('value') for item in request.get('queryString') or []
+             if isinstance(item, dict) and item.get('name')}
+    if not query and parts.query:
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    post_data = request.get('postData') or {}
+    request_type = post_data.get('mimeType') or _header(request.get('headers'), 'content-type')
+    request_body = post_data.get('text')
+    if request_body is None and post_data.get('params'):
+        request_body = {item.get('name'): item.get('value') for item in post_data['params'] if isinstance(item, dict)}
+    content = response.get('content') or {}
+    response_body = content.get('text')
+    if response_body is not None and content.get('encoding') == 'base64':
+        response_body = _decode_base64(response_body)
+    return _record(
+        method=method,
+        url=url,
+        query=query,
+        status=response.get('status'),
+        timestamp=_parse_iso(entry.get('startedDateTime')),
+        session=entry.get('pageref'),
+        client=None,
+        headers=_headers(request.get('headers')),
+        request_body=request_body,
+        request_type=request_type,
+        response_body=response_body,
+        response_type=content.get('mimeType'),
+        max_body_chars=max_body_chars
+    )
+
+
+def parse_log_line(line: Any, max_body_chars: int) -> Optional[Dict[str, Any]]:
+    """解析访问日志行（组合/通用格式，或JSON结构化日志），空行返回None"""
+    if isinstance(line, bytes):
+        line = line.decode('utf-8', errors='replace')
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith('{'):
+        return _parse_json_log(json.loads(line), max_body_chars)
+    matched = _LOG_LINE.match(line)
+    if not matched:
+        return None
+    url = matched.group('url')
+    return _record(
+        method=matched.group('method'),
+        url=url,
+        query=dict(parse_qsl(urlsplit(url).query, keep_blank_values=True)),
+        status=int(matched.group('status')),
+        timestamp=_parse_log_time(matched.group('time')),
+        session=None,
+        client=matched.group('client'),
+        headers={},
+        request_body=None,
+        request_type=None,
+        response_body=None,
+        response_type=None,
+        max_body_chars=max_body_chars
+    )
+
+
+def _parse_json_log(data: Dict[str, Any], max_body_chars: int) -> Optional[Dict[str, Any]]:
+    """结构化日志：兼容常见字段名（method/request_method, url/uri/path/request_uri, status/status_code）"""
+    if not isinstance(data, dict):
+        return None
+    method = data.get('method') or data.get('request_method')
+    url = data.get('url') or data.get('uri') or data.get('request_uri') or data.get('path')
+    if not url and isinstance(data.get('request'), str):
+        parts = data['request'].split(' ')
+        if len(parts) >= 2:
+            method, url = method or parts[0], parts[1]
+    if not method or not url:
+        return None
+    timestamp = data.get('timestamp', data.get('time', data.get('@timestamp')))
+    if isinstance(timestamp, str):
+        timestamp = _parse_iso(timestamp)
+    elif isinstance(timestamp, (int, float)):
+        # 毫秒时间戳
+        timestamp = timestamp / 1000 if timestamp > 1e11 else float(timestamp)
+    else:
+        timestamp = None
+    status = data.get('status', data.get('status_code'))
+    query = data.get('query') if isinstance(data.get('query'), dict) else \
+        dict(parse_qsl(urlsplit(url).query, keep_blank_values=True))
+    headers = data.get('request_headers') or data.get('headers')
+    return _record(
+        method=str(method).upper(),
+        url=url,
+        query=query,
+        status=int(status) if str(status).isdigit() else None,
+        timestamp=timestamp,
+        session=data.get('session') or data.get('trace_id'),
+        client=data.get('remote_addr') or data.get('client_ip') or data.get('ip'),
+        headers={str(key).lower(): value for key, value in headers.items()
+                 if str(key).lower() not in DROPPED_HEADERS} if isinstance(headers, dict) else {},
+        request_body=data.get('request_body', data.get('body')),
+        request_type=None,
+        response_body=data.get('response_body'),
+        response_type=None,
+        max_body_chars=max_body_chars
+    )
+
+
+def _record(method: str, url: str, query: Dict[str, Any], status: Optional[int], timestamp: Optional[float],
+            session: Optional[str], client: Optional[str], headers: Dict[str, Any], request_body: Any,
+            request_type: Optional[str], response_body: Any, response_type: Optional[str],
+            max_body_chars: int) -> Dict[str, Any]:
+    request_body = _parse_body(request_body, request_type)
+    response_body = _parse_body(response_body, response_type)
+    return {
+        'method': method,
+        'url': url,
+        'query': query,
+        'status': status,
+        'timestamp': timestamp,
+        'session': session,
+        'client': client,
+        'headers': headers,
+        'request_body': _clip(request_body, max_body_chars),
+        'body_type': 'json' if isinstance(request_body, (dict, list)) else ('text' if request_body else None),
+        'response_body': _clip(response_body, max_body_chars),
+        'shape': request_shape(query, request_body)
+    }
+
+
+def request_shape(query: Dict[str, Any], body: Any) -> str:
+    """请求形状摘要：查询参数名集合 + 请求体骨架"""
+    names = tuple(sorted(query))
+    if body is None:
+        shape = _QUERY_SHAPE_CACHE.get(names)
+        if shape is not None:
+            return shape
+    raw = json.dumps([names, _skeleton(body)], separators=(',', ':'))
+    shape = hashlib.blake2b(raw.encode('utf-8'), digest_size=8).hexdigest()
+    if body is None and len(_QUERY_SHAPE_CACHE) < _MAX_CACHE_SIZE:
+        _QUERY_SHAPE_CACHE[names] = shape
+    return shape
+
+
+def _skeleton(value: Any, depth: int = 0) -> Any:
+    """值的结构骨架：对象保留字段名，数组取首个元素，标量取类型名"""
+    if depth > 8:
+        return '...'
+    if isinstance(value, dict):
+        return {str(key): _skeleton(item, depth + 1) for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, list):
+        return [_skeleton(value[0], depth + 1)] if value else []
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, (int, float)):
+        return 'num'
+    return 'str'
+
+
+def template_path(path: str) -> str:
+    """未匹配路径归并：ID类路径段替换为 {id}"""
+    return '/'.join('{id}' if _ID_SEGMENT.match(segment) else segment for segment in path.split('/'))
+
+
+def _parse_body(body: Any, content_type: Optional[str]) -> Any:
+    """JSON文本解析为对象（Content-Type为JSON或内容形似JSON），其余保持原样"""
+    if not isinstance(body, str) or not body or len(body) > _MAX_PARSE_CHARS:
+        return body or None
+    text = body.strip()
+    if 'json' in (content_type or '').lower() or text[:1] in ('{', '['):
+        try:
+            return json.loads(text)
+        except ValueError:
+            return body
+    return body
+
+
+def _clip(value: Any, max_chars: int) -> Any:
+    """超过长度上限的请求/响应体截断为字符串"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value if len(value) <= max_chars else value[:max_chars]
+    text = json.dumps(value, ensure_ascii=False, default=str)
+    return value if len(text) <= max_chars else text[:max_chars]
+
+
+def _headers(items: Any) -> Dict[str, Any]:
+    if not isinstance(items, list):
+        return {}
+    headers = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        name = str(item.get('name') or '').lower()
+        if name and not name.startswith(':') and name not in DROPPED_HEADERS:
+            headers[name] = item.get('value')
+    return headers
+
+
+def _header(items: Any, name: str) -> Optional[str]:
+    for item in items or []:
+        if isinstance(item, dict) and str(item.get('name') or '').lower() == name:
+            return item.get('value')
+    return None
+
+
+def _decode_base64(text: str) -> Optional[str]:
+    try:
+        return base64.b64decode(text).decode('utf-8')
+    except (ValueError, UnicodeDecodeError):
+        # 二进制响应体不保留
+        return None
+
+
+def _parse_log_time(text: str) -> Optional[float]:
+    """解析日志时间 dd/Mon/YYYY:HH:MM:SS +zzzz"""
+    day_key = text[:11] + text[20:]
+    day = _LOG_DAY_CACHE.get(day_key)
+    if day is None and day_key not in _LOG_DAY_CACHE:
+        try:
+            day = datetime.strptime(f"{text[:11]}:00:00:00{text[20:]}", _LOG_TIME_FORMAT).timestamp()
+        except ValueError:
+            day = None
+        if len(_LOG_DAY_CACHE) < _MAX_CACHE_SIZE:
+            _LOG_DAY_CACHE[day_key] = day
+    clock = text[12:20]
+    if day is None or len(clock) != 8 or clock[2] != ':' or clock[5] != ':' or not clock.replace(':', '').isdigit():
+        return None
+    return day + int(clock[:2]) * 3600 + int(clock[3:5]) * 60 + int(clock[6:8])
+
+
+def _parse_iso(value: Any) -> Optional[float]:
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
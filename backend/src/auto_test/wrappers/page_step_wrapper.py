@@ -237,18 +237,6 @@ class PageStepWrapper:
             simplified[step] = 'completed' if status == 'completed' else 'pending'
         return simplified
 
-    @staticmethod
-    def add_cache_headers(data: Dict[str, Any]) -> Dict[str, Any]:
-        """添加缓存友好的头信息"""
-        if not isinstance(data, dict):
-            return data
-        
-        # 添加缓存标识
-        data['_cache_friendly'] = True
-        data['_cache_version'] = '1.0'
-        
-        return data
-
     @staticmethod
     def remove_dynamic_fields(data: Dict[str, Any]) -> Dict[str, Any]:
         """移除动态字段，使数据更适合缓存"""